@@ -27,6 +27,9 @@ if TYPE_CHECKING:
 
 DEFAULT_METADATA_PROPERTY_NAME = "default"
 METADATA_FILE = "agent_meta.json"
+JOURNAL_FILE = "state_journal.jsonl"
+# Journals shorter than this are never compacted, regardless of the state size
+MIN_JOURNAL_COMPACTION_LENGTH = 100
 
 logger = get_logger(name=__name__)
 
@@ -181,6 +184,8 @@ class AgentState(ABC):
         instead.
         """
         self.agent = weakref.proxy(agent)
+        # Number of live updates journaled since the last full save
+        self._journal_length = 0
         self.load_data()
 
     def _get_metadata_path(self) -> str:
@@ -188,6 +193,36 @@ class AgentState(ABC):
         data_dir = self.agent.get_data_dir()
         return os.path.join(data_dir, METADATA_FILE)
 
+    def _get_journal_path(self) -> str:
+        """Return the path we expect to journal live updates in"""
+        data_dir = self.agent.get_data_dir()
+        return os.path.join(data_dir, JOURNAL_FILE)
+
+    def _read_journal(self) -> List[Dict[str, Any]]:
+        """
+        Return the entries journaled since the last full save, for
+        _load_data implementations to replay over the saved data
+        """
+        journal_path = self._get_journal_path()
+        entries = []
+        if self.agent.db.key_exists(journal_path):
+            entries = self.agent.db.read_dict_lines(journal_path)
+        self._journal_length = len(entries)
+        return entries
+
+    def _append_to_journal(self, entry: Dict[str, Any], num_entries: int) -> None:
+        """
+        Persist a live update by appending it to the journal, rather than
+        saving all of the data. Once the journal holds more than half of the
+        `num_entries` entries of the full data, it's compacted into a full save,
+        keeping the amortized cost of each update constant.
+        """
+        self._journal_length += 1
+        if self._journal_length >= max(MIN_JOURNAL_COMPACTION_LENGTH, num_entries // 2):
+            self.save_data()
+        else:
+            self.agent.db.append_dict(self._get_journal_path(), entry)
+
     def load_metadata(self) -> None:
         """Write out the metadata for this agent state to file"""
         md_path = self._get_metadata_path()
@@ -279,6 +314,12 @@ class AgentState(ABC):
         """
         self._save_data()
         self.save_metadata()
+        if self._journal_length > 0:
+            # The saved data now includes every journaled update. Replaying an
+            # update that was already saved is a no-op, so a failure between the
+            # save and this truncation loses nothing.
+            self.agent.db.write_text(self._get_journal_path(), "")
+            self._journal_length = 0
 
     @abstractmethod
     def update_data(self, live_update: Dict[str, Any]) -> None:
@@ -303,6 +344,8 @@ class AgentState(ABC):
         self.metadata.task_end = time.time()
         self._update_submit(submit_data)
         self.save_data()
+        # Submitted work shouldn't wait on a deferred write to reach the disk
+        self.agent.db.flush_writes()
 
     def get_metadata(self) -> dict:
         """Return all metadata as dict"""
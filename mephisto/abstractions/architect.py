@@ -35,6 +35,20 @@ class ArchitectArgs:
             )
         },
     )
+    packet_batch_window: float = field(
+        default=0,
+        metadata={
+            "help": (
+                "Seconds over which to coalesce packets sent between Mephisto and the "
+                "router into a single frame. 0 sends each packet in its own frame. "
+                "Only used with routers that support batching (the flask router)."
+            )
+        },
+    )
+    compress_packet_batches: bool = field(
+        default=False,
+        metadata={"help": "Whether to zlib-compress batched frames, see packet_batch_window"},
+    )
 
 
 class Architect(ABC):
@@ -4,8 +4,8 @@
 # This source code is licensed under the MIT license found in the
 # LICENSE file in the root directory of this source tree.
 
-from typing import Callable, Optional, TYPE_CHECKING
-from mephisto.data_model.packet import Packet
+from typing import Any, Callable, Dict, List, Optional, TYPE_CHECKING, Union
+from mephisto.data_model.packet import Packet, PACKET_TYPE_ALIVE
 from mephisto.operations.datatypes import LoopWrapper
 from mephisto.abstractions._subcomponents.channel import Channel, STATUS_CHECK_TIME
 
@@ -15,6 +15,7 @@ import threading
 import json
 import time
 import asyncio
+import zlib
 
 if TYPE_CHECKING:
     from websockets.client import WebSocketClientProtocol
@@ -25,6 +26,34 @@ logger = get_logger(name=__name__)
 
 MAX_RETRIES = 3
 
+# Key in the data of `alive` packets used to negotiate batched frames with the
+# router. Mephisto offers its settings, and the router echoes back what it accepts
+PACKET_BATCHING_KEY = "batching"
+BATCH_COMPRESSION_ZLIB = "zlib"
+
+
+def pack_packets(packet_dicts: List[Dict[str, Any]], compress: bool) -> Union[str, bytes]:
+    """
+    Frame the given packets for sending. A batch is a JSON list of packets,
+    sent as a zlib-compressed binary frame if `compress` is set
+    """
+    if len(packet_dicts) == 1 and not compress:
+        return json.dumps(packet_dicts[0])
+    frame = json.dumps(packet_dicts)
+    if compress:
+        return zlib.compress(frame.encode("utf-8"))
+    return frame
+
+
+def unpack_frame(frame: Union[str, bytes]) -> List[Dict[str, Any]]:
+    """Return the packets in a received frame, either single or batched"""
+    if isinstance(frame, (bytes, bytearray)):
+        frame = zlib.decompress(frame).decode("utf-8")
+    contents = json.loads(frame)
+    if isinstance(contents, list):
+        return contents
+    return [contents]
+
 
 class WebsocketChannel(Channel):
     """
@@ -38,12 +67,17 @@ class WebsocketChannel(Channel):
         on_catastrophic_disconnect: Callable[[str], None],
         on_message: Callable[[str, Packet], None],
         socket_url: str,
+        batch_window: float = 0,
+        compress_batches: bool = False,
     ):
         """
         Create a channel by the given name, and initialize any resources that
         will later be required during the `open` call.
 
-        Requires a socket_url to connect with.
+        Requires a socket_url to connect with. If `batch_window` is positive,
+        offers the router to coalesce the packets sent within that many seconds
+        into a single frame (zlib-compressed if `compress_batches` is set).
+        Routers that don't answer the offer get one frame per packet.
         """
         super().__init__(
             channel_id=channel_id,
@@ -58,6 +92,12 @@ class WebsocketChannel(Channel):
         self._is_closed = False
         self._socket_task: Optional[asyncio.Task] = None
         self._retries = MAX_RETRIES
+        self.batch_window = batch_window
+        self.compress_batches = compress_batches
+        # Batching settings accepted by the router on the current connection
+        self._batching: Optional[Dict[str, Any]] = None
+        self._flush_scheduled = False
+        self._flush_lock = threading.Lock()
 
     def is_closed(self):
         """
@@ -88,6 +128,8 @@ class WebsocketChannel(Channel):
         """Set up a socket handling thread."""
 
         def on_socket_open():
+            # Batching is negotiated anew on every connection
+            self._batching = None
             self._is_alive = True
             self.on_channel_open(self.channel_id)
             logger.info(f"channel open")
@@ -116,9 +158,14 @@ class WebsocketChannel(Channel):
         def on_message(msg_json):
             """Incoming message handler defers to the internal handler"""
             try:
-                packet_dict = json.loads(msg_json)
-                packet = Packet.from_dict(packet_dict)
-                self.on_message(self.channel_id, packet)
+                for packet_dict in unpack_frame(msg_json):
+                    if packet_dict["packet_type"] == PACKET_TYPE_ALIVE:
+                        # Only sent by routers answering our batching offer
+                        self._batching = packet_dict["data"].get(PACKET_BATCHING_KEY)
+                        logger.debug(f"Router accepted packet batching: {self._batching}")
+                        continue
+                    packet = Packet.from_dict(packet_dict)
+                    self.on_message(self.channel_id, packet)
             except Exception as e:
                 # TODO(CLEAN) properly handle only failed from_dict calls
                 logger.exception(repr(e), exc_info=True)
@@ -203,11 +250,29 @@ class WebsocketChannel(Channel):
         """
         if self.outgoing_queue.empty():
             return
-        # TODO(#651) pop all messages and batch, rather than just one
         packet = self.outgoing_queue.get()
-        send_str = json.dumps(packet.to_sendable_dict())
+        await self._async_send_frame(json.dumps(packet.to_sendable_dict()))
+
+    async def _async_send_batch(self):
+        """
+        Wait out the batch window, then send everything queued up by then as
+        a single frame
+        """
+        await asyncio.sleep(self.batch_window)
+        with self._flush_lock:
+            self._flush_scheduled = False
+        packet_dicts = []
+        while not self.outgoing_queue.empty():
+            packet_dicts.append(self.outgoing_queue.get().to_sendable_dict())
+        if len(packet_dicts) == 0:
+            return
+        batching = self._batching or {}
+        compress = batching.get("compression") == BATCH_COMPRESSION_ZLIB
+        await self._async_send_frame(pack_packets(packet_dicts, compress))
+
+    async def _async_send_frame(self, frame: Union[str, bytes]):
         try:
-            await self.socket.send(send_str)
+            await self.socket.send(frame)
         except websockets.exceptions.ConnectionClosedOK:
             pass
         except websockets.exceptions.ConnectionClosedError as e:
@@ -224,11 +289,30 @@ class WebsocketChannel(Channel):
         if self.socket.closed:
             return False
 
+        if packet.type == PACKET_TYPE_ALIVE and self.batch_window > 0:
+            batching_offer = {
+                "window": self.batch_window,
+                "compression": BATCH_COMPRESSION_ZLIB if self.compress_batches else None,
+            }
+            packet = Packet(
+                packet_type=packet.type,
+                subject_id=packet.subject_id,
+                data={**packet.data, PACKET_BATCHING_KEY: batching_offer},
+            )
+
         self.outgoing_queue.put(packet)
 
         loop_wrap = self.loop_wrap
         if loop_wrap is None:
             return False
 
-        loop_wrap.execute_coro(self._async_send_all())
+        if self._batching is None:
+            loop_wrap.execute_coro(self._async_send_all())
+            return True
+
+        with self._flush_lock:
+            if self._flush_scheduled:
+                return True
+            self._flush_scheduled = True
+        loop_wrap.execute_coro(self._async_send_batch())
         return True
@@ -114,6 +114,8 @@ class EC2Architect(Architect):
         self.router_name = f"{self.subdomain}-routing-server"
         self.full_domain = f"{self.subdomain}.{self.root_domain}"
         self.server_source_path = args.architect.get("server_source_path", None)
+        self.packet_batch_window = args.architect.packet_batch_window
+        self.compress_packet_batches = args.architect.compress_packet_batches
         self.instance_type = args.architect.instance_type
         self.profile_name = args.architect.profile_name
         self.server_type: str = args.architect.server_type
@@ -155,6 +157,8 @@ class EC2Architect(Architect):
                 on_catastrophic_disconnect=on_catastrophic_disconnect,
                 on_message=on_message,
                 socket_url=url,
+                batch_window=self.packet_batch_window,
+                compress_batches=self.compress_packet_batches,
             )
             for idx, url in enumerate(urls)
         ]
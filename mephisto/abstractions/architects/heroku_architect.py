@@ -105,6 +105,8 @@ class HerokuArchitect(Architect):
         self.build_dir = build_dir_root
         self.server_type = args.architect.server_type
         self.server_source_path = args.architect.get("server_source_path", None)
+        self.packet_batch_window = args.architect.packet_batch_window
+        self.compress_packet_batches = args.architect.compress_packet_batches
         self.heroku_config_args = dict(args.architect.heroku_config_args)
 
         # Cache-able parameters
@@ -137,6 +139,8 @@ class HerokuArchitect(Architect):
                 on_catastrophic_disconnect=on_catastrophic_disconnect,
                 on_message=on_message,
                 socket_url=url,
+                batch_window=self.packet_batch_window,
+                compress_batches=self.compress_packet_batches,
             )
             for idx, url in enumerate(urls)
         ]
@@ -78,6 +78,8 @@ class LocalArchitect(Architect):
         self.cleanup_called = False
         self.server_type = args.architect.server_type
         self.server_source_path = args.architect.get("server_source_path", None)
+        self.packet_batch_window = args.architect.packet_batch_window
+        self.compress_packet_batches = args.architect.compress_packet_batches
 
     def _get_socket_urls(self) -> List[str]:
         """Return the path to the local server socket"""
@@ -116,6 +118,8 @@ class LocalArchitect(Architect):
                 on_catastrophic_disconnect=on_catastrophic_disconnect,
                 on_message=on_message,
                 socket_url=url,
+                batch_window=self.packet_batch_window,
+                compress_batches=self.compress_packet_batches,
             )
             for idx, url in enumerate(urls)
         ]
@@ -317,6 +317,8 @@ class MockArchitect(Architect):
         self.task_run_id = task_run.db_id
         self.should_run_server = args.architect.should_run_server
         self.port = args.architect.port
+        self.packet_batch_window = args.architect.packet_batch_window
+        self.compress_packet_batches = args.architect.compress_packet_batches
         self.server: Optional["MockServer"] = None
         # TODO(#651) track state in parent class?
         self.prepared = False
@@ -347,6 +349,8 @@ class MockArchitect(Architect):
                 on_catastrophic_disconnect=on_catastrophic_disconnect,
                 on_message=on_message,
                 socket_url=url,
+                batch_window=self.packet_batch_window,
+                compress_batches=self.compress_packet_batches,
             )
             for idx, url in enumerate(urls)
         ]
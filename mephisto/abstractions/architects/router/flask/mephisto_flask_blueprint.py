@@ -7,11 +7,13 @@
 import json
 import os
 import time
+import zlib
 from typing import Any
 from typing import Dict
 from typing import List
 from typing import Optional
 from typing import TYPE_CHECKING
+from typing import Union
 from uuid import uuid4
 
 from flask import abort  # type: ignore
@@ -19,6 +21,9 @@ from flask import Blueprint
 from flask import jsonify
 from flask import request
 from flask import send_from_directory
+from gevent import spawn_later  # type: ignore
+from gevent import Timeout  # type: ignore
+from gevent.event import AsyncResult  # type: ignore
 from geventwebsocket import Resource  # type: ignore
 from geventwebsocket import WebSocketApplication
 from werkzeug.utils import secure_filename  # type: ignore
@@ -46,8 +51,14 @@ PACKET_TYPE_ERROR = "log_error"
 
 SYSTEM_CHANNEL_ID = "mephisto"
 
+# Key in the data of `alive` packets from Mephisto offering batched frames
+PACKET_BATCHING_KEY = "batching"
+BATCH_COMPRESSION_ZLIB = "zlib"
+MAX_BATCH_WINDOW = 1  # seconds
+
 FAILED_RECONNECT_TIME = 10  # seconds
 FAILED_PING_TIME = 15  # seconds
+AGENT_REQUEST_TIMEOUT = 30  # seconds
 UPLOAD_FOLDER = "/tmp/"
 ALLOWED_EXTENSIONS = {"txt", "pdf", "png", "jpg", "jpeg", "gif"}
 
@@ -113,9 +124,13 @@ class MephistoRouterState:
         self.agent_id_to_client: Dict[str, "Client"] = {}
         self.client_id_to_agent: Dict[str, LocalAgentState] = {}
         self.mephisto_socket: Optional["WebSocket"] = None
+        # Batching settings accepted for the Mephisto socket, and packets waiting
+        # to be sent to it in the next batch
+        self.mephisto_batching: Optional[Dict[str, Any]] = None
+        self.mephisto_outgoing: List[Dict[str, Any]] = []
         self.agent_id_to_agent: Dict[str, LocalAgentState] = {}
-        self.pending_agent_requests: Dict[str, bool] = {}
-        self.received_agent_responses: Dict[str, Dict[str, Any]] = {}
+        # Request id -> result to be set with the response from Mephisto
+        self.pending_agent_requests: Dict[str, AsyncResult] = {}
         self.last_mephisto_ping: float = time.time()
 
 
@@ -161,8 +176,58 @@ class MephistoRouter(WebSocketApplication):
             return
 
         packet["router_outgoing_timestamp"] = time.time()
+        state = self.mephisto_state
+        if socket is state.mephisto_socket and state.mephisto_batching is not None:
+            state.mephisto_outgoing.append(packet)
+            if len(state.mephisto_outgoing) == 1:
+                spawn_later(state.mephisto_batching["window"], self._flush_mephisto_batch)
+            return
         socket.send(json.dumps(packet))
 
+    def _flush_mephisto_batch(self) -> None:
+        """Send all of the packets waiting for the Mephisto socket as one frame"""
+        state = self.mephisto_state
+        packets, state.mephisto_outgoing = state.mephisto_outgoing, []
+        socket = state.mephisto_socket
+        if len(packets) == 0 or socket is None or socket.closed:
+            return
+        batching = state.mephisto_batching
+        if batching is None:
+            # Mephisto reconnected without batching in the meantime
+            for packet in packets:
+                socket.send(json.dumps(packet))
+            return
+        frame = json.dumps(packets)
+        if batching.get("compression") == BATCH_COMPRESSION_ZLIB:
+            socket.send(zlib.compress(frame.encode("utf-8")), binary=True)
+        else:
+            socket.send(frame)
+
+    def _negotiate_batching(self, socket: "WebSocket", alive_packet: Dict[str, Any]) -> None:
+        """
+        Accept a batching offer from Mephisto, answering with the accepted
+        settings. Without an offer, packets are sent to Mephisto one by one.
+        """
+        state = self.mephisto_state
+        offer = (alive_packet.get("data") or {}).get(PACKET_BATCHING_KEY)
+        state.mephisto_batching = None
+        if offer is None:
+            return
+        compression = offer.get("compression")
+        batching = {
+            "window": min(float(offer.get("window", 0)), MAX_BATCH_WINDOW),
+            "compression": compression if compression == BATCH_COMPRESSION_ZLIB else None,
+        }
+        self._send_message(
+            socket,
+            {
+                "packet_type": PACKET_TYPE_ALIVE,
+                "subject_id": SYSTEM_CHANNEL_ID,
+                "data": {PACKET_BATCHING_KEY: batching},
+            },
+        )
+        state.mephisto_batching = batching
+
     def _find_or_create_agent(self, agent_id: str) -> "LocalAgentState":
         """Get or create an agent state for the given id"""
         state = self.mephisto_state
@@ -180,6 +245,7 @@ class MephistoRouter(WebSocketApplication):
         state = self.mephisto_state
         if alive_packet["subject_id"] == SYSTEM_CHANNEL_ID:
             state.mephisto_socket = client.ws
+            self._negotiate_batching(client.ws, alive_packet)
         else:
             agent_id = alive_packet["subject_id"]
             agent = self._find_or_create_agent(agent_id)
@@ -282,17 +348,28 @@ class MephistoRouter(WebSocketApplication):
         debug_log("Some client connected!", current_client)
         current_client.mephisto_id = str(uuid4())
 
-    def on_message(self, message: str) -> None:
+    def on_message(self, message: Union[str, bytes]) -> None:
         """
-        Determine the type of message, and then handle via the correct handler
+        Unpack the packets in a message, which is either a single packet, a
+        JSON list of packets, or a zlib-compressed list in a binary frame
         """
         if message is None:
             return
 
+        if isinstance(message, (bytes, bytearray)):
+            message = zlib.decompress(message).decode("utf-8")
+        contents = json.loads(message)
+        packets = contents if isinstance(contents, list) else [contents]
+        for packet in packets:
+            self._handle_packet(packet)
+
+    def _handle_packet(self, packet: Dict[str, Any]) -> None:
+        """
+        Determine the type of packet, and then handle via the correct handler
+        """
         state = self.mephisto_state
         current_client = self.ws.handler.active_client
         client = current_client
-        packet = json.loads(message)
         packet["router_incoming_timestamp"] = time.time()
         if packet["packet_type"] == PACKET_TYPE_REQUEST_STATUSES:
             debug_log("Mephisto requesting status")
@@ -315,10 +392,9 @@ class MephistoRouter(WebSocketApplication):
             request_id = packet["data"].get("request_id")
             if request_id is None:
                 request_id = packet["subject_id"]
-            res_event = state.pending_agent_requests.get(request_id)
-            if res_event is not None:
-                state.received_agent_responses[request_id] = packet
-                del state.pending_agent_requests[request_id]
+            pending_result = state.pending_agent_requests.pop(request_id, None)
+            if pending_result is not None:
+                pending_result.set(packet)
         elif packet["packet_type"] == PACKET_TYPE_HEARTBEAT:
             packet["data"] = {"last_mephisto_ping": js_time(state.last_mephisto_ping)}
             agent_id = packet["subject_id"]
@@ -347,19 +423,22 @@ class MephistoRouter(WebSocketApplication):
         agent.disconnect_time = time.time()
 
     def make_agent_request(self, request_packet: Dict[str, Any]) -> Optional[Dict[str, Any]]:
-        """Make a request to the core Mephisto server, and then await the response"""
+        """
+        Make a request to the core Mephisto server, and then await the response,
+        which `on_message` sets on the pending result for this request
+        """
         request_id = request_packet["data"]["request_id"]
-
-        self.mephisto_state.pending_agent_requests[request_id] = True
-        self._send_message(self.mephisto_state.mephisto_socket, request_packet)
-        start_time = time.time()
-        res = None
-        while time.time() - start_time < 30 and res is None:
-            res = self.mephisto_state.received_agent_responses.get(request_id)
-            time.sleep(0.01)
-        if res is not None:
-            del self.mephisto_state.received_agent_responses[request_id]
-        return res
+        pending_requests = self.mephisto_state.pending_agent_requests
+
+        pending_result = AsyncResult()
+        pending_requests[request_id] = pending_result
+        try:
+            self._send_message(self.mephisto_state.mephisto_socket, request_packet)
+            return pending_result.get(timeout=AGENT_REQUEST_TIMEOUT)
+        except Timeout:
+            return None
+        finally:
+            pending_requests.pop(request_id, None)
 
 
 @mephisto_router.route("/request_agent", methods=["POST"])
@@ -310,3 +310,14 @@ class Blueprint(ABC):
         concurrently with the job.
         """
         raise NotImplementedError
+
+    def get_resumed_initialization_data(
+        self,
+    ) -> Optional[Iterable["InitializationData"]]:
+        """
+        Get the data used to initialize the tasks that a resumed task run
+        hasn't created yet. Returns None if this blueprint can't tell which
+        of its data already has tasks, in which case resuming a task run
+        only relaunches its incomplete units.
+        """
+        return None
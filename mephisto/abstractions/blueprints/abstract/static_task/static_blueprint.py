@@ -4,8 +4,6 @@
 # This source code is licensed under the MIT license found in the
 # LICENSE file in the root directory of this source tree.
 
-import csv
-import json
 import os
 import types
 from dataclasses import dataclass
@@ -15,6 +13,7 @@ from typing import ClassVar
 from typing import Dict
 from typing import Iterable
 from typing import List
+from typing import Optional
 from typing import Type
 from typing import TYPE_CHECKING
 
@@ -30,6 +29,18 @@ from mephisto.abstractions.blueprints.abstract.static_task.empty_task_builder im
 from mephisto.abstractions.blueprints.abstract.static_task.static_agent_state import (
     StaticAgentState,
 )
+from mephisto.abstractions.blueprints.abstract.static_task.static_data_source import (
+    DATA_FORMAT_CSV,
+)
+from mephisto.abstractions.blueprints.abstract.static_task.static_data_source import (
+    DATA_FORMAT_JSON,
+)
+from mephisto.abstractions.blueprints.abstract.static_task.static_data_source import (
+    DATA_FORMAT_JSONL,
+)
+from mephisto.abstractions.blueprints.abstract.static_task.static_data_source import (
+    StaticDataSource,
+)
 from mephisto.abstractions.blueprints.abstract.static_task.static_task_runner import (
     StaticTaskRunner,
 )
@@ -53,6 +64,16 @@ if TYPE_CHECKING:
 
 BLUEPRINT_TYPE_STATIC = "abstract_static"
 
+# Byte-offset index of a data file's rows, kept in the run directory
+DATA_INDEX_FILENAME = "data_index.jsonl"
+
+# Blueprint arg name, data format, and name used in messages for each data file type
+DATA_FILE_ARGS = [
+    ("data_csv", DATA_FORMAT_CSV, "csv"),
+    ("data_json", DATA_FORMAT_JSON, "JSON"),
+    ("data_jsonl", DATA_FORMAT_JSONL, "JSON-L"),
+]
+
 
 @dataclass
 class SharedStaticTaskState(
@@ -115,6 +136,16 @@ class StaticBlueprintArgs(
     data_csv: str = field(
         default=MISSING, metadata={"help": "Path to csv file containing task data"}
     )
+    data_index_stride: int = field(
+        default=1000,
+        metadata={
+            "help": (
+                "Index the byte offset of every this many rows of the task data file, "
+                "so resuming the run can seek to the first row without assignments "
+                "rather than parsing the file up to it. 0 to disable"
+            )
+        },
+    )
 
 
 class StaticBlueprint(ScreenTaskRequired, OnboardingRequired, UseGoldUnit, Blueprint):
@@ -139,108 +170,142 @@ class StaticBlueprint(ScreenTaskRequired, OnboardingRequired, UseGoldUnit, Bluep
     ):
         super().__init__(task_run, args, shared_state)
 
+        self._task_run = task_run
         # Originally just a list of dicts, but can also be a generator of dicts
-        self._initialization_data_dicts: List[Dict[str, Any]] = []
-
-        blue_args = args.blueprint
-
-        # CSV
-        if blue_args.get("data_csv", None) is not None:
-            csv_file = os.path.expanduser(blue_args.data_csv)
-            with open(csv_file, "r", encoding="utf-8-sig") as csv_fp:
-                csv_reader = csv.reader(csv_fp)
-                headers = next(csv_reader)
-                for row in csv_reader:
-                    row_data = {}
-                    for i, col in enumerate(row):
-                        row_data[headers[i]] = col
-                    self._initialization_data_dicts.append(row_data)
-
-        # JSON
-        elif blue_args.get("data_json", None) is not None:
-            json_file = os.path.expanduser(blue_args.data_json)
-            with open(json_file, "r", encoding="utf-8-sig") as json_fp:
-                json_data = json.load(json_fp)
-            for jd in json_data:
-                self._initialization_data_dicts.append(jd)
-
-        # JSONL
-        elif blue_args.get("data_jsonl", None) is not None:
-            jsonl_file = os.path.expanduser(blue_args.data_jsonl)
-            with open(jsonl_file, "r", encoding="utf-8-sig") as jsonl_fp:
-                line = jsonl_fp.readline()
-                while line:
-                    j = json.loads(line)
-                    self._initialization_data_dicts.append(j)
-                    line = jsonl_fp.readline()
+        self._initialization_data_dicts: Iterable[Dict[str, Any]] = []
+        # Data files are streamed a record at a time rather than loaded here
+        self._data_source: Optional[StaticDataSource] = self.get_data_source(args, task_run)
 
         # Task data (dynamically passed as `static_task_data` argument - not from files)
-        elif shared_state.static_task_data is not None:
+        if self._data_source is None and shared_state.static_task_data is not None:
             self._initialization_data_dicts = shared_state.static_task_data
-        else:
-            # instantiating a version of the blueprint, but not necessarily needing the data
-            pass
 
     @classmethod
-    def assert_task_args(cls, args: DictConfig, shared_state: "SharedTaskState"):
-        """Ensure that the data can be properly loaded"""
-        super().assert_task_args(args, shared_state)
-
-        assert isinstance(
-            shared_state, SharedStaticTaskState
-        ), "Must use SharedStaticTaskState for static blueprints"
-
+    def get_data_source(
+        cls, args: DictConfig, task_run: Optional["TaskRun"] = None
+    ) -> Optional[StaticDataSource]:
+        """
+        Return a source streaming the data file given in the args, if any. Row
+        offsets are only indexed in the run directory when given a task run.
+        """
         blue_args = args.blueprint
+        for arg_name, data_format, _ in DATA_FILE_ARGS:
+            data_path = blue_args.get(arg_name, None)
+            if data_path is None:
+                continue
+            index_stride = blue_args.get("data_index_stride", 0)
+            index_path = None
+            if task_run is not None and index_stride > 0:
+                index_path = os.path.join(task_run.get_run_dir(), DATA_INDEX_FILENAME)
+            return StaticDataSource(
+                data_path,
+                data_format,
+                index_path=index_path,
+                index_stride=index_stride,
+            )
+        return None
 
-        # CSV
-        if blue_args.get("data_csv", None) is not None:
-            csv_file = os.path.expanduser(blue_args.data_csv)
-
-            assert os.path.exists(csv_file), f"Provided csv file {csv_file} doesn't exist"
-
-        # JSON
-        elif blue_args.get("data_json", None) is not None:
-            json_file = os.path.expanduser(blue_args.data_json)
-
-            assert os.path.exists(json_file), f"Provided JSON file {json_file} doesn't exist"
-
-        # JSONL
-        elif blue_args.get("data_jsonl", None) is not None:
-            jsonl_file = os.path.expanduser(blue_args.data_jsonl)
-
-            assert os.path.exists(jsonl_file), f"Provided JSON-L file {jsonl_file} doesn't exist"
+    @classmethod
+    def assert_task_data(cls, args: DictConfig, shared_state: "SharedStaticTaskState"):
+        """
+        Ensure that there is task data to launch with. Only reads the first record
+        of a data file or list of tasks, generators aren't checked.
+        """
+        blue_args = args.blueprint
+        for arg_name, _, format_name in DATA_FILE_ARGS:
+            if blue_args.get(arg_name, None) is None:
+                continue
+            data_file = os.path.expanduser(blue_args.get(arg_name))
+            assert os.path.exists(
+                data_file
+            ), f"Provided {format_name} file {data_file} doesn't exist"
+            data_source = cls.get_data_source(args)
+            assert data_source is not None
+            assert (
+                data_source.first_record() is not None
+            ), f"Provided {format_name} file {data_file} has no task data"
+            return
 
         # Task data (dynamically passed as `static_task_data` argument - not from files)
-        elif shared_state.static_task_data is not None:
+        if shared_state.static_task_data is not None:
             if isinstance(shared_state.static_task_data, types.GeneratorType):
                 # TODO(#97) can we check something about this?
                 #  Some discussion here:
                 #  https://stackoverflow.com/questions/661603/how-do-i-know-if-a-generator-is-empty-from-the-start
                 pass
             else:
-                assert (
-                    len([x for x in shared_state.static_task_data]) > 0
+                assert any(
+                    True for _ in shared_state.static_task_data
                 ), "Length of data dict provided was 0"
         else:
             raise AssertionError("Must provide one of a data csv, json, json-L, or a list of tasks")
 
+    @classmethod
+    def assert_task_args(cls, args: DictConfig, shared_state: "SharedTaskState"):
+        """Ensure that the data can be properly loaded"""
+        super().assert_task_args(args, shared_state)
+
+        assert isinstance(
+            shared_state, SharedStaticTaskState
+        ), "Must use SharedStaticTaskState for static blueprints"
+
+        cls.assert_task_data(args, shared_state)
+
+    def _process_data_record(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        """Hook to update a record of task data before it becomes an assignment's data"""
+        return record
+
+    def _get_num_data_assignments(self) -> int:
+        """
+        Return how many rows of task data already have assignments in this run,
+        counted by their first units so that evaluation units are left out
+        """
+        return len(self._task_run.db.find_units(task_run_id=self._task_run.db_id, unit_index=0))
+
+    def _get_file_data(self, start_row: int) -> Iterable["InitializationData"]:
+        """Return a generator of the InitializationData of the data file from `start_row` on"""
+        assert self._data_source is not None
+        data_source = self._data_source
+        units_per_assignment = self.args.blueprint.units_per_assignment
+
+        def file_data_generator() -> Iterable["InitializationData"]:
+            for record in data_source.iter_records(start_row=start_row):
+                yield InitializationData(
+                    shared=self._process_data_record(record),
+                    unit_data=[{}] * units_per_assignment,
+                )
+
+        return file_data_generator()
+
     def get_initialization_data(self) -> Iterable["InitializationData"]:
         """Return the InitializationData retrieved from the specified stream"""
-        if isinstance(self._initialization_data_dicts, types.GeneratorType):
+        units_per_assignment = self.args.blueprint.units_per_assignment
+        if self._data_source is not None:
+            return self._get_file_data(start_row=0)
+        elif isinstance(self._initialization_data_dicts, types.GeneratorType):
 
             def data_generator() -> Iterable["InitializationData"]:
                 for item in self._initialization_data_dicts:
                     yield InitializationData(
-                        shared=item,
-                        unit_data=[{}] * self.args.blueprint.units_per_assignment,
+                        shared=self._process_data_record(item),
+                        unit_data=[{}] * units_per_assignment,
                     )
 
             return data_generator()
         else:
             return [
                 InitializationData(
-                    shared=d,
-                    unit_data=[{}] * self.args.blueprint.units_per_assignment,
+                    shared=self._process_data_record(d),
+                    unit_data=[{}] * units_per_assignment,
                 )
                 for d in self._initialization_data_dicts
             ]
+
+    def get_resumed_initialization_data(self) -> Optional[Iterable["InitializationData"]]:
+        """
+        Return the InitializationData of the data file rows that don't have
+        assignments in this run yet. Other task data can't be resumed.
+        """
+        if self._data_source is None:
+            return None
+        return self._get_file_data(start_row=self._get_num_data_assignments())
@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+
+# Copyright (c) Meta Platforms and its affiliates.
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+import codecs
+import csv
+import json
+import os
+from typing import Any
+from typing import BinaryIO
+from typing import Dict
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+from mephisto.utils.logger_core import get_logger
+
+logger = get_logger(name=__name__)
+
+DATA_FORMAT_CSV = "csv"
+DATA_FORMAT_JSON = "json"
+DATA_FORMAT_JSONL = "jsonl"
+VALID_DATA_FORMATS = [DATA_FORMAT_CSV, DATA_FORMAT_JSON, DATA_FORMAT_JSONL]
+
+# Size of the reads used to stream JSON arrays
+JSON_READ_CHUNK_SIZE = 64 * 1024
+
+
+class _OffsetLines:
+    """
+    Iterates over the decoded lines of a binary file, keeping track of the byte
+    offset of the next line so record boundaries can be indexed
+    """
+
+    def __init__(self, fp: BinaryIO):
+        self.fp = fp
+        self.offset = fp.tell()
+
+    def __iter__(self) -> "_OffsetLines":
+        return self
+
+    def __next__(self) -> str:
+        raw_line = self.fp.readline()
+        if not raw_line:
+            raise StopIteration
+        start = self.offset
+        self.offset += len(raw_line)
+        return raw_line.decode("utf-8-sig" if start == 0 else "utf-8")
+
+
+class StaticDataSource:
+    """
+    Streams the records of a csv, JSON or JSON-L task data file one at a time,
+    so that the file is never held in memory as a whole.
+
+    Optionally keeps a byte-offset index at `index_path`, recording where every
+    `index_stride`-th record starts. It's appended to as records are read, so
+    that reading again from a later row (i.e. when resuming a run) can seek
+    close to that row rather than parsing the whole file up to it. The index
+    is discarded whenever the data file changes.
+    """
+
+    def __init__(
+        self,
+        data_path: str,
+        data_format: str,
+        index_path: Optional[str] = None,
+        index_stride: int = 0,
+    ):
+        assert data_format in VALID_DATA_FORMATS, f"Unsupported data format {data_format}"
+        self.data_path = os.path.expanduser(data_path)
+        self.data_format = data_format
+        self.index_path = index_path
+        self.index_stride = index_stride if index_path is not None else 0
+        # Row number -> byte offset of that row
+        self._index: Dict[int, int] = {}
+        self._index_loaded = False
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return self.iter_records()
+
+    def first_record(self) -> Optional[Dict[str, Any]]:
+        """Return the first record in the file, or None if there are none"""
+        for record in self._iter_from_offset(None):
+            return record[1]
+        return None
+
+    def iter_records(self, start_row: int = 0) -> Iterator[Dict[str, Any]]:
+        """Yield the records of the file one by one, skipping the first `start_row`"""
+        row, offset = self._find_closest_indexed_row(start_row)
+        for record_offset, record in self._iter_from_offset(offset):
+            self._maybe_index_row(row, record_offset)
+            if row >= start_row:
+                yield record
+            row += 1
+
+    def _iter_from_offset(self, offset: Optional[int]) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        """
+        Yield (byte offset, record) pairs, starting from a record boundary at the
+        given offset, or from the beginning of the file if None
+        """
+        with open(self.data_path, "rb") as data_fp:
+            if self.data_format == DATA_FORMAT_CSV:
+                yield from self._iter_csv(data_fp, offset)
+            elif self.data_format == DATA_FORMAT_JSONL:
+                yield from self._iter_jsonl(data_fp, offset)
+            else:
+                yield from self._iter_json(data_fp, offset)
+
+    def _iter_csv(
+        self, data_fp: BinaryIO, offset: Optional[int]
+    ) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        lines = _OffsetLines(data_fp)
+        reader = csv.reader(lines)
+        headers = next(reader, None)
+        if headers is None:
+            return
+        if offset is not None:
+            data_fp.seek(offset)
+            lines.offset = offset
+        while True:
+            record_offset = lines.offset
+            row = next(reader, None)
+            if row is None:
+                return
+            yield record_offset, {headers[i]: col for i, col in enumerate(row)}
+
+    def _iter_jsonl(
+        self, data_fp: BinaryIO, offset: Optional[int]
+    ) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        if offset is not None:
+            data_fp.seek(offset)
+        lines = _OffsetLines(data_fp)
+        while True:
+            record_offset = lines.offset
+            line = next(lines, None)
+            if line is None:
+                return
+            if line.strip() == "":
+                continue
+            yield record_offset, json.loads(line)
+
+    def _iter_json(
+        self, data_fp: BinaryIO, offset: Optional[int]
+    ) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        """
+        Stream the elements of a top-level JSON array, decoding one element at
+        a time out of a buffer of the file
+        """
+        decoder = json.JSONDecoder()
+        byte_decoder = codecs.getincrementaldecoder("utf-8")()
+        buffer = ""
+        at_eof = False
+        if offset is None:
+            # Skip over a byte order mark, keeping the offsets in bytes
+            offset = len(codecs.BOM_UTF8) if data_fp.read(3) == codecs.BOM_UTF8 else 0
+            is_start = True
+        else:
+            is_start = False
+        data_fp.seek(offset)
+        # Byte offset in the file of the start of the buffer
+        buffer_offset = offset
+
+        def fill_buffer() -> bool:
+            nonlocal buffer, at_eof
+            chunk = data_fp.read(JSON_READ_CHUNK_SIZE)
+            at_eof = len(chunk) == 0
+            buffer += byte_decoder.decode(chunk, final=at_eof)
+            return not at_eof
+
+        def consume(num_chars: int) -> None:
+            nonlocal buffer, buffer_offset
+            buffer_offset += len(buffer[:num_chars].encode("utf-8"))
+            buffer = buffer[num_chars:]
+
+        def next_token() -> Optional[str]:
+            """Drop whitespace, and return the next character without consuming it"""
+            while True:
+                stripped = buffer.lstrip()
+                consume(len(buffer) - len(stripped))
+                if len(buffer) > 0:
+                    return buffer[0]
+                if not fill_buffer() and len(buffer) == 0:
+                    return None
+
+        if is_start:
+            token = next_token()
+            if token is None:
+                return
+            if token != "[":
+                raise ValueError(f"JSON task data in {self.data_path} must be a list")
+            consume(1)
+
+        while True:
+            token = next_token()
+            if token is None:
+                raise ValueError(f"JSON task data in {self.data_path} ended unexpectedly")
+            if token == "]":
+                return
+            if token == ",":
+                consume(1)
+                continue
+            while True:
+                try:
+                    record, end = decoder.raw_decode(buffer)
+                    # A value at the very end of the buffer may be cut short
+                    if end < len(buffer) or at_eof:
+                        break
+                except json.JSONDecodeError:
+                    if at_eof:
+                        raise
+                fill_buffer()
+            record_offset = buffer_offset
+            consume(end)
+            yield record_offset, record
+
+    def _find_closest_indexed_row(self, start_row: int) -> Tuple[int, Optional[int]]:
+        """Return the last indexed (row, offset) at or before `start_row`"""
+        self._load_index()
+        indexed_rows = [row for row in self._index.keys() if row <= start_row]
+        if len(indexed_rows) == 0:
+            return 0, None
+        row = max(indexed_rows)
+        return row, self._index[row]
+
+    def _get_file_signature(self) -> Dict[str, Any]:
+        stat = os.stat(self.data_path)
+        return {
+            "data_path": os.path.abspath(self.data_path),
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "stride": self.index_stride,
+        }
+
+    def _load_index(self) -> None:
+        """Load the index from disk, discarding it if it doesn't match the data file"""
+        if self._index_loaded or self.index_stride <= 0:
+            return
+        self._index_loaded = True
+        assert self.index_path is not None
+        if not os.path.exists(self.index_path):
+            self._write_index_header()
+            return
+
+        with open(self.index_path, "r") as index_fp:
+            lines = index_fp.readlines()
+        if len(lines) == 0 or json.loads(lines[0]) != self._get_file_signature():
+            logger.info(f"Data file {self.data_path} changed, rebuilding its index")
+            self._write_index_header()
+            return
+        for line in lines[1:]:
+            try:
+                row, offset = json.loads(line)
+            except ValueError:
+                # Partially written last entry
+                continue
+            self._index[row] = offset
+
+    def _write_index_header(self) -> None:
+        assert self.index_path is not None
+        os.makedirs(os.path.dirname(os.path.abspath(self.index_path)), exist_ok=True)
+        with open(self.index_path, "w") as index_fp:
+            index_fp.write(json.dumps(self._get_file_signature()) + "\n")
+        self._index = {}
+
+    def _maybe_index_row(self, row: int, offset: int) -> None:
+        """Record the offset of every `index_stride`-th row that isn't indexed yet"""
+        if self.index_stride <= 0 or row % self.index_stride != 0 or row in self._index:
+            return
+        assert self.index_path is not None
+        self._index[row] = offset
+        with open(self.index_path, "a") as index_fp:
+            index_fp.write(json.dumps([row, offset]) + "\n")
+
+    def get_indexed_rows(self) -> List[int]:
+        """Return the rows that currently have a known offset"""
+        self._load_index()
+        return sorted(self._index.keys())
@@ -21,7 +21,8 @@ if TYPE_CHECKING:
 class ParlAIChatAgentState(AgentState):
     """
     Holds information about ParlAI-style chat. Data is stored in json files
-    containing every act from the ParlAI world.
+    containing every act from the ParlAI world, with acts that arrive between
+    full saves appended to a journal.
     """
 
     def _set_init_state(self, data: Any):
@@ -66,6 +67,10 @@ class ParlAIChatAgentState(AgentState):
                 )
             else:
                 self.metadata = _AgentStateMetadata()
+        for entry in self._read_journal():
+            # Acts journaled before the last full save are already in the messages
+            if entry["index"] >= len(self.messages):
+                self.messages.append(entry["message"])
 
     def get_data(self) -> Dict[str, Any]:
         """Return dict with the messages of this agent"""
@@ -126,7 +131,10 @@ class ParlAIChatAgentState(AgentState):
         """
         live_update["timestamp"] = time.time()
         self.messages.append(live_update)
-        self.save_data()
+        self._append_to_journal(
+            {"index": len(self.messages) - 1, "message": live_update},
+            len(self.messages),
+        )
 
     def _update_submit(self, submitted_data: Dict[str, Any]) -> None:
         """Append any final submission to this state"""
@@ -27,6 +27,7 @@ class RemoteRequest:
 class RemoteProcedureAgentState(AgentState):
     """
     Holds information about tasks with live interactions in a remote query model.
+    Requests that arrive between full saves are appended to a journal.
     """
 
     def _set_init_state(self, data: Any):
@@ -71,6 +72,8 @@ class RemoteProcedureAgentState(AgentState):
             if "start_time" in state:
                 self.metadata.task_start = state["start_time"]
                 self.metadata.task_end = state["end_time"]
+        for entry in self._read_journal():
+            self.requests[entry["uuid"]] = RemoteRequest(**entry)
 
     def get_data(self) -> Dict[str, Any]:
         """Return dict with the messages of this agent"""
@@ -110,6 +113,7 @@ class RemoteProcedureAgentState(AgentState):
                 timestamp=time.time(),
             )
             self.requests[response_id] = response
+            self._append_to_journal(response.to_dict(), len(self.requests))
         else:
             # incoming
             request = RemoteRequest(
@@ -120,6 +124,7 @@ class RemoteProcedureAgentState(AgentState):
                 timestamp=time.time(),
             )
             self.requests[live_update["request_id"]] = request
+            self._append_to_journal(request.to_dict(), len(self.requests))
 
     def _update_submit(self, submitted_data: Dict[str, Any]) -> None:
         """Append any final submission to this state"""
@@ -8,6 +8,8 @@ import os
 import types
 from dataclasses import dataclass
 from dataclasses import field
+from typing import Any
+from typing import Dict
 from typing import Optional
 from typing import TYPE_CHECKING
 
@@ -109,9 +111,12 @@ class StaticHTMLBlueprint(StaticBlueprint):
                     f"was not found from {os.getcwd()}"
                 )
 
-        task_file_name = os.path.basename(self.html_file)
-        for entry in self._initialization_data_dicts:
-            entry["html"] = task_file_name
+        self.task_file_name = os.path.basename(self.html_file)
+
+    def _process_data_record(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        """Point every assignment to the task's html file"""
+        record["html"] = self.task_file_name
+        return record
 
     @classmethod
     def assert_task_args(cls, args: DictConfig, shared_state: "SharedTaskState"):
@@ -126,21 +131,7 @@ class StaticHTMLBlueprint(StaticBlueprint):
         if isinstance(shared_state.static_task_data, types.GeneratorType):
             raise AssertionError("You can't launch an HTML static task on a generator")
 
-        if blue_args.get("data_csv", None) is not None:
-            csv_file = os.path.expanduser(blue_args.data_csv)
-            assert os.path.exists(csv_file), f"Provided csv file {csv_file} doesn't exist"
-        elif blue_args.get("data_json", None) is not None:
-            json_file = os.path.expanduser(blue_args.data_json)
-            assert os.path.exists(json_file), f"Provided JSON file {json_file} doesn't exist"
-        elif blue_args.get("data_jsonl", None) is not None:
-            jsonl_file = os.path.expanduser(blue_args.data_jsonl)
-            assert os.path.exists(jsonl_file), f"Provided JSON-L file {jsonl_file} doesn't exist"
-        elif shared_state.static_task_data is not None:
-            assert (
-                len([w for w in shared_state.static_task_data]) > 0
-            ), "Length of data dict provided was 0"
-        else:
-            raise AssertionError("Must provide one of a data csv, json, json-L, or a list of tasks")
+        StaticBlueprint.assert_task_data(args, shared_state)
 
         if blue_args.get("onboarding_qualification", None) is not None:
             assert blue_args.get("onboarding_source", None) is not None, (
@@ -5,6 +5,7 @@
 # LICENSE file in the root directory of this source tree.
 
 
+import json
 import os
 import warnings
 from abc import ABC
@@ -14,6 +15,7 @@ from typing import Dict
 from typing import List
 from typing import Mapping
 from typing import Optional
+from typing import Tuple
 from typing import Union
 
 from prometheus_client import Histogram  # type: ignore
@@ -21,6 +23,7 @@ from prometheus_client import Histogram  # type: ignore
 from mephisto.data_model.agent import Agent
 from mephisto.data_model.agent import OnboardingAgent
 from mephisto.data_model.assignment import Assignment
+from mephisto.data_model.assignment import AssignmentState
 from mephisto.data_model.project import Project
 from mephisto.data_model.qualification import GrantedQualification
 from mephisto.data_model.qualification import Qualification
@@ -32,7 +35,9 @@ from mephisto.data_model.worker import Worker
 from mephisto.operations.registry import get_crowd_provider_from_type
 from mephisto.operations.registry import get_valid_provider_types
 from mephisto.utils.dirs import get_data_dir
+from mephisto.utils.logger_core import get_logger
 
+logger = get_logger(name=__name__)
 
 # TODO(#101) investigate cursors for DB queries as the project scales
 
@@ -53,11 +58,14 @@ GET_TASK_RUN_LATENCY = DATABASE_LATENCY.labels(method="get_task_run")
 FIND_TASK_RUNS_LATENCY = DATABASE_LATENCY.labels(method="find_task_runs")
 UPDATE_TASK_RUN_LATENCY = DATABASE_LATENCY.labels(method="update_task_run")
 NEW_ASSIGNMENT_LATENCY = DATABASE_LATENCY.labels(method="new_assignment")
+NEW_ASSIGNMENTS_BULK_LATENCY = DATABASE_LATENCY.labels(method="new_assignments_bulk")
 GET_ASSIGNMENT_LATENCY = DATABASE_LATENCY.labels(method="get_assignment")
 FIND_ASSIGNMENTS_LATENCY = DATABASE_LATENCY.labels(method="find_assignments")
 NEW_UNIT_LATENCY = DATABASE_LATENCY.labels(method="new_unit")
+NEW_UNITS_BULK_LATENCY = DATABASE_LATENCY.labels(method="new_units_bulk")
 GET_UNIT_LATENCY = DATABASE_LATENCY.labels(method="get_unit")
 FIND_UNITS_LATENCY = DATABASE_LATENCY.labels(method="find_units")
+FIND_LAUNCHABLE_UNITS_LATENCY = DATABASE_LATENCY.labels(method="find_launchable_units_for_worker")
 UPDATE_UNIT_LATENCY = DATABASE_LATENCY.labels(method="update_unit")
 NEW_REQUESTER_LATENCY = DATABASE_LATENCY.labels(method="new_requester")
 GET_REQUESTER_LATENCY = DATABASE_LATENCY.labels(method="get_requester")
@@ -70,6 +78,8 @@ GET_AGENT_LATENCY = DATABASE_LATENCY.labels(method="get_agent")
 FIND_AGENTS_LATENCY = DATABASE_LATENCY.labels(method="find_agents")
 UPDATE_AGENT_LATENCY = DATABASE_LATENCY.labels(method="update_agent")
 CLEAR_UNIT_AGENT_ASSIGNMENT_LATENCY = DATABASE_LATENCY.labels(method="clear_unit_agent_assignment")
+TRY_RESERVE_UNIT_LATENCY = DATABASE_LATENCY.labels(method="try_reserve_unit")
+CLEAR_UNIT_RESERVATION_LATENCY = DATABASE_LATENCY.labels(method="clear_unit_reservation")
 NEW_ONBOARDING_AGENT_LATENCY = DATABASE_LATENCY.labels(method="new_onboarding_agent")
 GET_ONBOARDING_AGENT_LATENCY = DATABASE_LATENCY.labels(method="get_onboarding_agent")
 FIND_ONBOARDING_AGENTS_LATENCY = DATABASE_LATENCY.labels(method="find_onboarding_agents")
@@ -414,6 +424,61 @@ class MephistoDB(ABC):
             sandbox=sandbox,
         )
 
+    def _new_assignments_bulk(
+        self,
+        task_id: str,
+        task_run_id: str,
+        requester_id: str,
+        task_type: str,
+        provider_type: str,
+        count: int,
+        sandbox: bool = True,
+    ) -> List[Mapping[str, Any]]:
+        """
+        new_assignments_bulk implementation. Databases that can insert many rows
+        at once should override this, by default assignments are made one by one.
+        """
+        return [
+            self._get_assignment(
+                self._new_assignment(
+                    task_id=task_id,
+                    task_run_id=task_run_id,
+                    requester_id=requester_id,
+                    task_type=task_type,
+                    provider_type=provider_type,
+                    sandbox=sandbox,
+                )
+            )
+            for _ in range(count)
+        ]
+
+    @NEW_ASSIGNMENTS_BULK_LATENCY.time()
+    def new_assignments_bulk(
+        self,
+        task_id: str,
+        task_run_id: str,
+        requester_id: str,
+        task_type: str,
+        provider_type: str,
+        count: int,
+        sandbox: bool = True,
+    ) -> List[Mapping[str, Any]]:
+        """
+        Create `count` new assignments for the given task run at once,
+        returning their rows in creation order
+        """
+        if count == 0:
+            return []
+        return self._new_assignments_bulk(
+            task_id=task_id,
+            task_run_id=task_run_id,
+            requester_id=requester_id,
+            task_type=task_type,
+            provider_type=provider_type,
+            count=count,
+            sandbox=sandbox,
+        )
+
     @abstractmethod
     def _get_assignment(self, assignment_id: str) -> Mapping[str, Any]:
         """get_assignment implementation"""
@@ -510,6 +575,68 @@ class MephistoDB(ABC):
             sandbox=sandbox,
         )
 
+    def _new_units_bulk(
+        self,
+        task_id: str,
+        task_run_id: str,
+        requester_id: str,
+        unit_specs: List[Tuple[str, int]],
+        pay_amount: float,
+        provider_type: str,
+        task_type: str,
+        sandbox: bool = True,
+    ) -> List[Mapping[str, Any]]:
+        """
+        new_units_bulk implementation. Databases that can insert many rows
+        at once should override this, by default units are made one by one.
+        """
+        return [
+            self._get_unit(
+                self.new_unit(
+                    task_id=task_id,
+                    task_run_id=task_run_id,
+                    requester_id=requester_id,
+                    assignment_id=assignment_id,
+                    unit_index=unit_index,
+                    pay_amount=pay_amount,
+                    provider_type=provider_type,
+                    task_type=task_type,
+                    sandbox=sandbox,
+                )
+            )
+            for assignment_id, unit_index in unit_specs
+        ]
+
+    @NEW_UNITS_BULK_LATENCY.time()
+    def new_units_bulk(
+        self,
+        task_id: str,
+        task_run_id: str,
+        requester_id: str,
+        unit_specs: List[Tuple[str, int]],
+        pay_amount: float,
+        provider_type: str,
+        task_type: str,
+        sandbox: bool = True,
+    ) -> List[Mapping[str, Any]]:
+        """
+        Create a new unit for every (assignment_id, unit_index) pair in `unit_specs`
+        at once, all within the given task run. Returns the rows in the same order.
+        Raises EntryAlreadyExistsException if any of the pairs already has a unit.
+        """
+        if len(unit_specs) == 0:
+            return []
+        return self._new_units_bulk(
+            task_id=task_id,
+            task_run_id=task_run_id,
+            requester_id=requester_id,
+            unit_specs=unit_specs,
+            pay_amount=pay_amount,
+            provider_type=provider_type,
+            task_type=task_type,
+            sandbox=sandbox,
+        )
+
     @abstractmethod
     def _get_unit(self, unit_id: str) -> Mapping[str, Any]:
         """get_unit implementation"""
@@ -576,6 +703,35 @@ class MephistoDB(ABC):
             status=status,
         )
 
+    def _find_launchable_units_for_worker(self, task_run_id: str, worker_id: str) -> List[Unit]:
+        """
+        find_launchable_units_for_worker implementation. Databases that can select
+        these units directly should override this, by default all of the task run's
+        units are loaded and filtered.
+        """
+        task_units = self.find_units(task_run_id=task_run_id)
+        worker_assignment_ids = set(u.assignment_id for u in task_units if u.worker_id == worker_id)
+        return [
+            u
+            for u in task_units
+            if u.db_status == AssignmentState.LAUNCHED
+            and u.unit_index >= 0
+            and u.assignment_id not in worker_assignment_ids
+        ]
+
+    @FIND_LAUNCHABLE_UNITS_LATENCY.time()
+    def find_launchable_units_for_worker(self, task_run_id: str, worker_id: str) -> List[Unit]:
+        """
+        Return the units of the task run that the given worker could be assigned
+        to, in creation order. These are launched units with a non-negative index
+        (special units have negative indices), in assignments that the worker
+        doesn't already have a unit in.
+        """
+        return self._find_launchable_units_for_worker(
+            task_run_id=task_run_id,
+            worker_id=worker_id,
+        )
+
     @abstractmethod
     def _clear_unit_agent_assignment(self, unit_id: str) -> None:
         """clear_unit_agent_assignment implementation"""
@@ -589,6 +745,33 @@ class MephistoDB(ABC):
         """
         return self._clear_unit_agent_assignment(unit_id=unit_id)
 
+    @abstractmethod
+    def _try_reserve_unit(self, unit_id: str) -> bool:
+        """try_reserve_unit implementation"""
+        raise NotImplementedError()
+
+    @TRY_RESERVE_UNIT_LATENCY.time()
+    def try_reserve_unit(self, unit_id: str) -> bool:
+        """
+        Atomically move the given unit from launched to assigned, so that it can be
+        given to exactly one worker. Return False if the unit wasn't launched, such
+        as when another worker already reserved it.
+        """
+        return self._try_reserve_unit(unit_id=unit_id)
+
+    @abstractmethod
+    def _clear_unit_reservation(self, unit_id: str) -> bool:
+        """clear_unit_reservation implementation"""
+        raise NotImplementedError()
+
+    @CLEAR_UNIT_RESERVATION_LATENCY.time()
+    def clear_unit_reservation(self, unit_id: str) -> bool:
+        """
+        Return a unit reserved with try_reserve_unit to launched, if no agent was
+        assigned to it since. Return whether the reservation was cleared.
+        """
+        return self._clear_unit_reservation(unit_id=unit_id)
+
     @abstractmethod
     def _update_unit(
         self, unit_id: str, agent_id: Optional[str] = None, status: Optional[str] = None
@@ -1179,3 +1362,38 @@ class MephistoDB(ABC):
     def key_exists(self, path_key: str) -> bool:
         """See if the given path refers to a known file"""
         raise NotImplementedError()
+
+    def flush_writes(self) -> None:
+        """
+        Block until every file write made so far is durably stored, raising the
+        error of any that couldn't be. Databases that defer file writes should
+        override this, as by default writes are made immediately.
+        """
+        pass
+
+    def append_dict(self, path_key: str, target_dict: Dict[str, Any]) -> None:
+        """
+        Append an object to the given key as a line of JSON. Databases that can
+        append to stored data in place should override this, as by default the
+        whole key is rewritten.
+        """
+        existing = self.read_text(path_key) if self.key_exists(path_key) else ""
+        if existing and not existing.endswith("\n"):
+            # Don't extend the partial line left by an interrupted append
+            existing += "\n"
+        self.write_text(path_key, existing + json.dumps(target_dict) + "\n")
+
+    def read_dict_lines(self, path_key: str) -> List[Dict[str, Any]]:
+        """
+        Return the objects appended to the given key with `append_dict`, in order.
+        Partially written lines, left by interrupted appends, are skipped.
+        """
+        entries = []
+        for line in self.read_text(path_key).splitlines():
+            if not line.strip():
+                continue
+            try:
+                entries.append(json.loads(line))
+            except json.JSONDecodeError:
+                logger.warning(f"Skipping partially written line in {path_key}")
+        return entries
@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+
+# Copyright (c) Meta Platforms and its affiliates.
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Set
+from typing import Tuple
+from weakref import WeakValueDictionary
+
+from prometheus_client import Counter  # type: ignore
+from prometheus_client import Gauge
+
+ENTITY_CACHE_LOOKUPS = Counter(
+    "singleton_db_cache_lookups",
+    "Lookups into the MephistoSingletonDB entity cache",
+    ["entity", "result"],
+)
+ENTITY_CACHE_EVICTIONS = Counter(
+    "singleton_db_cache_evictions",
+    "Entries evicted from the MephistoSingletonDB entity cache LRU",
+    ["entity", "reason"],
+)
+ENTITY_CACHE_SIZE = Gauge(
+    "singleton_db_cache_size",
+    "Entries held strongly by the MephistoSingletonDB entity cache LRU",
+    ["entity"],
+)
+
+DEFAULT_CACHE_MAX_SIZE = 10000
+DEFAULT_INDEX_MAX_COUNT = 100
+
+
+class EntityCache:
+    """
+    Cache for loaded data model objects of a single class.
+
+    Every object put in the cache is tracked in a WeakValueDictionary, so any
+    object still referenced elsewhere (like the agents and units tracked by a
+    live run's WorkerPool and TaskRunner) always resolves to the same instance.
+    On top of that, recently used objects are held strongly in an LRU bounded by
+    `max_size` entries and, optionally, `max_age` seconds since last access.
+    Anything evicted from the LRU and unreferenced elsewhere gets garbage
+    collected, and is loaded from the database again on next access.
+    """
+
+    def __init__(
+        self,
+        entity_name: str,
+        max_size: Optional[int] = DEFAULT_CACHE_MAX_SIZE,
+        max_age: Optional[float] = None,
+    ):
+        self.entity_name = entity_name
+        self.max_size = max_size
+        self.max_age = max_age
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._lru: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._weak_values: "WeakValueDictionary[str, Any]" = WeakValueDictionary()
+        self._lock = threading.Lock()
+
+        self._hit_counter = ENTITY_CACHE_LOOKUPS.labels(entity=entity_name, result="hit")
+        self._miss_counter = ENTITY_CACHE_LOOKUPS.labels(entity=entity_name, result="miss")
+        self._size_gauge = ENTITY_CACHE_SIZE.labels(entity=entity_name)
+
+    def __len__(self) -> int:
+        return len(self._lru)
+
+    def __contains__(self, db_id: str) -> bool:
+        return db_id in self._lru or db_id in self._weak_values
+
+    def get(self, db_id: str) -> Optional[Any]:
+        """Return the cached object for the given id, or None if not cached"""
+        with self._lock:
+            entry = self._lru.get(db_id)
+            value = entry[1] if entry is not None else self._weak_values.get(db_id)
+            if value is None:
+                self.misses += 1
+                self._miss_counter.inc()
+                return None
+
+            self.hits += 1
+            self._hit_counter.inc()
+            self._touch(db_id, value)
+            return value
+
+    def put(self, db_id: str, value: Any) -> None:
+        """Store the given object, making it the most recently used"""
+        with self._lock:
+            self._weak_values[db_id] = value
+            self._touch(db_id, value)
+
+    def remove(self, db_id: str) -> None:
+        """Drop the given id from the cache entirely"""
+        with self._lock:
+            self._lru.pop(db_id, None)
+            self._weak_values.pop(db_id, None)
+            self._size_gauge.set(len(self._lru))
+
+    def _touch(self, db_id: str, value: Any) -> None:
+        """Mark the entry as just used, and evict anything over the bounds"""
+        now = time.monotonic()
+        self._lru[db_id] = (now, value)
+        self._lru.move_to_end(db_id)
+
+        if self.max_size is not None:
+            while len(self._lru) > self.max_size:
+                self._lru.popitem(last=False)
+                self._record_eviction("size")
+
+        if self.max_age is not None:
+            while len(self._lru) > 0:
+                last_access, _ = next(iter(self._lru.values()))
+                if now - last_access <= self.max_age:
+                    break
+                self._lru.popitem(last=False)
+                self._record_eviction("age")
+
+        self._size_gauge.set(len(self._lru))
+
+    def _record_eviction(self, reason: str) -> None:
+        self.evictions += 1
+        ENTITY_CACHE_EVICTIONS.labels(entity=self.entity_name, reason=reason).inc()
+
+
+class EntityIndex:
+    """
+    Index over the ids of one kind of entity within a scope (like the units of
+    a task run, or the agents of a worker), by worker and by status.
+
+    The index holds no objects and does no queries of its own. It's loaded once
+    from the database, and then kept up to date by the owning database on every
+    write, so it only stays coherent for writes that go through that database.
+    Not thread safe on its own, the owner is expected to lock around it.
+    """
+
+    def __init__(self):
+        # Insertion position of every id, used to return ids in creation order
+        self._positions: Dict[str, int] = {}
+        self._worker_ids: Dict[str, Optional[str]] = {}
+        self._statuses: Dict[str, str] = {}
+        self._by_worker: Dict[Optional[str], Set[str]] = {}
+        self._by_status: Dict[str, Set[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    def __contains__(self, db_id: str) -> bool:
+        return db_id in self._positions
+
+    def add(self, db_id: str, worker_id: Optional[str], status: str) -> None:
+        """Add an entity at the end of the creation order"""
+        if db_id in self._positions:
+            self.set_worker(db_id, worker_id)
+            self.set_status(db_id, status)
+            return
+        self._positions[db_id] = len(self._positions)
+        self._worker_ids[db_id] = worker_id
+        self._statuses[db_id] = status
+        self._by_worker.setdefault(worker_id, set()).add(db_id)
+        self._by_status.setdefault(status, set()).add(db_id)
+
+    def set_worker(self, db_id: str, worker_id: Optional[str]) -> None:
+        """Move the given entity to a different worker, if it is indexed"""
+        if db_id not in self._positions:
+            return
+        self._move(self._by_worker, self._worker_ids[db_id], worker_id, db_id)
+        self._worker_ids[db_id] = worker_id
+
+    def set_status(self, db_id: str, status: str) -> None:
+        """Move the given entity to a different status, if it is indexed"""
+        if db_id not in self._positions:
+            return
+        self._move(self._by_status, self._statuses[db_id], status, db_id)
+        self._statuses[db_id] = status
+
+    def select(self, worker_id: Optional[str] = None, status: Optional[str] = None) -> List[str]:
+        """
+        Return the ids matching the given worker and status in creation order,
+        where None matches anything
+        """
+        candidates: List[Set[str]] = []
+        if worker_id is not None:
+            candidates.append(self._by_worker.get(worker_id, set()))
+        if status is not None:
+            candidates.append(self._by_status.get(status, set()))
+        if len(candidates) == 0:
+            return list(self._positions.keys())
+
+        candidates.sort(key=len)
+        smallest, rest = candidates[0], candidates[1:]
+        selected = [db_id for db_id in smallest if all(db_id in c for c in rest)]
+        return sorted(selected, key=self._positions.__getitem__)
+
+    @staticmethod
+    def _move(
+        buckets: Dict[Any, Set[str]],
+        old_key: Any,
+        new_key: Any,
+        db_id: str,
+    ) -> None:
+        if old_key == new_key:
+            return
+        old_bucket = buckets.get(old_key)
+        if old_bucket is not None:
+            old_bucket.discard(db_id)
+            if len(old_bucket) == 0:
+                del buckets[old_key]
+        buckets.setdefault(new_key, set()).add(db_id)
+
+
+class UnitIndex(EntityIndex):
+    """
+    EntityIndex over units, that also tracks the assignment of every unit and
+    which units are special (with a negative unit index), so that the units a
+    worker could be assigned to are found without going over the whole scope.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._assignment_ids: Dict[str, str] = {}
+        self._special_ids: Set[str] = set()
+
+    def add(
+        self,
+        db_id: str,
+        worker_id: Optional[str],
+        status: str,
+        assignment_id: Optional[str] = None,
+        unit_index: int = 0,
+    ) -> None:
+        """Add a unit at the end of the creation order"""
+        if db_id not in self._positions:
+            assert assignment_id is not None, "Units must be indexed with their assignment"
+            self._assignment_ids[db_id] = assignment_id
+            if unit_index < 0:
+                self._special_ids.add(db_id)
+        super().add(db_id, worker_id, status)
+
+    def select_for_new_worker(self, worker_id: str, status: str) -> List[str]:
+        """
+        Return the ids of non-special units with the given status in creation
+        order, leaving out any unit in an assignment the worker has a unit in
+        """
+        worker_assignment_ids = set(
+            self._assignment_ids[db_id] for db_id in self._by_worker.get(worker_id, set())
+        )
+        selected = [
+            db_id
+            for db_id in self._by_status.get(status, set())
+            if db_id not in self._special_ids
+            and self._assignment_ids[db_id] not in worker_assignment_ids
+        ]
+        return sorted(selected, key=self._positions.__getitem__)
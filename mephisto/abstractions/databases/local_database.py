@@ -6,11 +6,14 @@
 
 import json
 import os
+import queue
 import sqlite3
 import threading
+from contextlib import contextmanager
 from sqlite3 import Connection
 from typing import Any
 from typing import Dict
+from typing import Iterator
 from typing import List
 from typing import Mapping
 from typing import Optional
@@ -41,10 +44,17 @@ from mephisto.utils.db import MephistoDBException
 from mephisto.utils.db import retry_generate_id
 from mephisto.utils.logger_core import get_logger
 from . import local_database_tables as tables
+from .write_behind_flusher import DEFAULT_WRITE_BEHIND_WINDOW
+from .write_behind_flusher import WriteBehindFlusher
 from .migrations import migrations
 
 logger = get_logger(name=__name__)
 
+# Max number of concurrently open reader connections when running in WAL mode
+DEFAULT_READ_POOL_SIZE = 8
+# Max number of ids looked up with a single query, below SQLite's bound parameters limit
+MAX_IDS_PER_QUERY = 500
+
 
 def nonesafe_int(in_string: Optional[Union[str, int]]) -> Optional[int]:
     """Cast input to an int or None"""
@@ -95,29 +105,122 @@ class LocalMephistoDB(MephistoDB):
     local files and a database.
     """
 
-    def __init__(self, database_path=None):
+    def __init__(
+        self,
+        database_path=None,
+        use_wal: bool = False,
+        read_pool_size: int = DEFAULT_READ_POOL_SIZE,
+        write_behind: bool = False,
+        write_behind_window: float = DEFAULT_WRITE_BEHIND_WINDOW,
+    ):
         logger.debug(f"database path: {database_path}")
         self.conn: Dict[int, Connection] = {}
         self.table_access_condition = threading.Condition()
+
+        # WAL mode: all writes go through one writer connection (guarded by
+        # `table_access_condition`), while reads check out a connection from a
+        # bounded pool and run concurrently with each other and with the writer
+        self.use_wal = use_wal
+        self.read_pool_size = read_pool_size
+        self._writer_conn: Optional[Connection] = None
+        self._writer_conn_lock = threading.Lock()
+        self._read_pool: "queue.LifoQueue[Connection]" = queue.LifoQueue()
+        self._read_pool_slots = threading.BoundedSemaphore(read_pool_size)
+        self._read_conns: List[Connection] = []
+
+        # Write-behind: `write_dict` and `write_text` only queue the file contents,
+        # which a background thread writes out after coalescing them for a window
+        self._file_flusher: Optional[WriteBehindFlusher] = None
+        if write_behind:
+            self._file_flusher = WriteBehindFlusher(write_behind_window)
+
         super().__init__(database_path)
 
+    def _connect(self) -> Connection:
+        """Open a new connection to the database file"""
+        try:
+            conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            conn.row_factory = StringIDRow
+        except sqlite3.Error as e:
+            raise MephistoDBException(e)
+        return conn
+
     def get_connection(self) -> Connection:
         """Returns a singular database connection to be shared amongst all
         calls for a given thread.
+
+        In WAL mode this is the single writer connection shared by all threads,
+        so callers must hold `table_access_condition` while using it.
         """
+        if self.use_wal:
+            return self._get_writer_connection()
+
         curr_thread = threading.get_ident()
         if curr_thread not in self.conn or self.conn[curr_thread] is None:
-            try:
-                conn = sqlite3.connect(self.db_path, check_same_thread=False)
-                conn.row_factory = StringIDRow
-                self.conn[curr_thread] = conn
-            except sqlite3.Error as e:
-                raise MephistoDBException(e)
+            self.conn[curr_thread] = self._connect()
         return self.conn[curr_thread]
 
+    def _get_writer_connection(self) -> Connection:
+        """Lazily open the WAL-mode writer connection"""
+        with self._writer_conn_lock:
+            if self._writer_conn is None:
+                conn = self._connect()
+                conn.execute("PRAGMA journal_mode = WAL;")
+                conn.execute("PRAGMA synchronous = NORMAL;")
+                conn.execute("PRAGMA foreign_keys = on;")
+                self._writer_conn = conn
+            return self._writer_conn
+
+    @contextmanager
+    def _read_connection(self) -> Iterator[Connection]:
+        """
+        Provide a connection for a read-only query. Outside of WAL mode this is
+        the thread's connection under the global table lock, otherwise it is a
+        pooled reader connection that doesn't take the lock at all.
+        """
+        if not self.use_wal:
+            with self.table_access_condition:
+                yield self.get_connection()
+            return
+
+        with self._read_pool_slots:
+            try:
+                conn = self._read_pool.get_nowait()
+            except queue.Empty:
+                conn = self._connect()
+                conn.isolation_level = None
+                conn.execute("PRAGMA query_only = on;")
+                with self._writer_conn_lock:
+                    self._read_conns.append(conn)
+            try:
+                yield conn
+            finally:
+                self._read_pool.put(conn)
+
     def shutdown(self) -> None:
-        """Close all open connections"""
+        """
+        Close all open connections, after writing out any deferred file writes. Raises
+        the error of a deferred write that failed, once the connections are closed
+        """
+        try:
+            if self._file_flusher is not None:
+                self._file_flusher.shutdown()
+        finally:
+            self._close_connections()
+
+    def _close_connections(self) -> None:
         with self.table_access_condition:
+            if self.use_wal:
+                with self._writer_conn_lock:
+                    for conn in self._read_conns:
+                        conn.close()
+                    self._read_conns = []
+                    self._read_pool = queue.LifoQueue()
+                    if self._writer_conn is not None:
+                        self._writer_conn.close()
+                        self._writer_conn = None
+                return
+
             curr_thread = threading.get_ident()
             self.conn[curr_thread].close()
             del self.conn[curr_thread]
@@ -145,6 +248,9 @@ class LocalMephistoDB(MephistoDB):
                 c.execute(tables.CREATE_IF_NOT_EXISTS_ONBOARDING_AGENTS_TABLE)
                 c.execute(tables.CREATE_IF_NOT_EXISTS_UNIT_REVIEW_TABLE)
                 c.execute(tables.CREATE_IF_NOT_EXISTS_IMPORT_DATA_TABLE)
+                c.execute(tables.CREATE_IF_NOT_EXISTS_TASK_STATS_FLAGS_TABLE)
+                c.execute(tables.CREATE_IF_NOT_EXISTS_TASK_STATS_TABLE)
+                c.execute(tables.CREATE_IF_NOT_EXISTS_TASK_STATS_UNITS_TABLE)
                 c.execute(tables.CREATE_IF_NOT_EXISTS_MIGRATIONS_TABLE)
 
             apply_migrations(self, migrations)
@@ -161,8 +267,7 @@ class LocalMephistoDB(MephistoDB):
         Try to request the row for the given table and entry,
         raise EntryDoesNotExistException if it isn't present
         """
-        with self.table_access_condition:
-            conn = self.get_connection()
+        with self._read_connection() as conn:
             c = conn.cursor()
             c.execute(
                 f"""
@@ -176,6 +281,25 @@ class LocalMephistoDB(MephistoDB):
                 raise EntryDoesNotExistException(f"Table {table_name} has no {id_name} {db_id}")
             return results[0]
 
+    @staticmethod
+    def _get_rows_by_ids(
+        conn: Connection, table_name: str, id_name: str, db_ids: List[int]
+    ) -> List[Mapping[str, Any]]:
+        """Return the rows with the given ids in the same order, as seen by the given connection"""
+        c = conn.cursor()
+        rows_by_id = {}
+        for start in range(0, len(db_ids), MAX_IDS_PER_QUERY):
+            chunk_ids = db_ids[start : start + MAX_IDS_PER_QUERY]
+            c.execute(
+                f"""
+                SELECT * FROM {table_name}
+                WHERE {id_name} IN ({",".join("?" * len(chunk_ids))})
+                """,
+                chunk_ids,
+            )
+            rows_by_id.update({row[id_name]: row for row in c.fetchall()})
+        return [rows_by_id[str(db_id)] for db_id in db_ids]
+
     @staticmethod
     def __create_query_and_tuple(
         arg_list: List[str],
@@ -254,8 +378,7 @@ class LocalMephistoDB(MephistoDB):
         Try to find any project that matches the above. When called with no arguments,
         return all projects.
         """
-        with self.table_access_condition:
-            conn = self.get_connection()
+        with self._read_connection() as conn:
             c = conn.cursor()
             additional_query, arg_tuple = self.__create_query_and_tuple(
                 ["project_name"], [project_name]
@@ -337,8 +460,7 @@ class LocalMephistoDB(MephistoDB):
         Try to find any task that matches the above. When called with no arguments,
         return all tasks.
         """
-        with self.table_access_condition:
-            conn = self.get_connection()
+        with self._read_connection() as conn:
             c = conn.cursor()
             additional_query, arg_tuple = self.__create_query_and_tuple(
                 ["task_name", "project_id", "parent_task_id"],
@@ -480,8 +602,7 @@ class LocalMephistoDB(MephistoDB):
         Try to find any task_run that matches the above. When called with no arguments,
         return all task_runs.
         """
-        with self.table_access_condition:
-            conn = self.get_connection()
+        with self._read_connection() as conn:
             c = conn.cursor()
             additional_query, arg_tuple = self.__create_query_and_tuple(
                 ["task_id", "requester_id", "is_completed"],
@@ -568,6 +689,64 @@ class LocalMephistoDB(MephistoDB):
                     )
                 raise MephistoDBException(e)
 
+    @retry_generate_id(caught_excs=[EntryAlreadyExistsException])
+    def _new_assignments_bulk(
+        self,
+        task_id: str,
+        task_run_id: str,
+        requester_id: str,
+        task_type: str,
+        provider_type: str,
+        count: int,
+        sandbox: bool = True,
+    ) -> List[Mapping[str, Any]]:
+        """
+        Create `count` new assignments for the given task run within a single
+        transaction, so either all of them are created or none are
+        """
+        # Ensure task run exists
+        self.get_task_run(task_run_id)
+        # Rows created together share a creation_date, sorted ids keep them in order
+        assignment_ids = sorted(make_randomized_int_id() for _ in range(count))
+        with self.table_access_condition, self.get_connection() as conn:
+            c = conn.cursor()
+            try:
+                c.executemany(
+                    """
+                    INSERT INTO assignments(
+                        assignment_id,
+                        task_id,
+                        task_run_id,
+                        requester_id,
+                        task_type,
+                        provider_type,
+                        sandbox
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?);
+                    """,
+                    [
+                        (
+                            assignment_id,
+                            int(task_id),
+                            int(task_run_id),
+                            int(requester_id),
+                            task_type,
+                            provider_type,
+                            sandbox,
+                        )
+                        for assignment_id in assignment_ids
+                    ],
+                )
+                return self._get_rows_by_ids(conn, "assignments", "assignment_id", assignment_ids)
+            except sqlite3.IntegrityError as e:
+                if is_unique_failure(e):
+                    raise EntryAlreadyExistsException(
+                        e,
+                        db=self,
+                        table_name="assignments",
+                        original_exc=e,
+                    )
+                raise MephistoDBException(e)
+
     def _get_assignment(self, assignment_id: str) -> Mapping[str, Any]:
         """
         Return assignment's fields by assignment_id, raise EntryDoesNotExistException
@@ -590,8 +769,7 @@ class LocalMephistoDB(MephistoDB):
         Try to find any task that matches the above. When called with no arguments,
         return all tasks.
         """
-        with self.table_access_condition:
-            conn = self.get_connection()
+        with self._read_connection() as conn:
             c = conn.cursor()
             additional_query, arg_tuple = self.__create_query_and_tuple(
                 [
@@ -688,6 +866,73 @@ class LocalMephistoDB(MephistoDB):
                     )
                 raise MephistoDBException(e)
 
+    @retry_generate_id(caught_excs=[EntryAlreadyExistsException])
+    def _new_units_bulk(
+        self,
+        task_id: str,
+        task_run_id: str,
+        requester_id: str,
+        unit_specs: List[Tuple[str, int]],
+        pay_amount: float,
+        provider_type: str,
+        task_type: str,
+        sandbox: bool = True,
+    ) -> List[Mapping[str, Any]]:
+        """
+        Create a unit for every (assignment_id, unit_index) pair within a single
+        transaction, so either all of them are created or none are
+        """
+        # Rows created together share a creation_date, sorted ids keep them in order
+        unit_ids = sorted(make_randomized_int_id() for _ in unit_specs)
+        with self.table_access_condition, self.get_connection() as conn:
+            c = conn.cursor()
+            try:
+                c.executemany(
+                    """
+                    INSERT INTO units(
+                        unit_id,
+                        task_id,
+                        task_run_id,
+                        requester_id,
+                        assignment_id,
+                        unit_index,
+                        pay_amount,
+                        provider_type,
+                        task_type,
+                        sandbox,
+                        status
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?);
+                    """,
+                    [
+                        (
+                            unit_id,
+                            int(task_id),
+                            int(task_run_id),
+                            int(requester_id),
+                            int(assignment_id),
+                            unit_index,
+                            pay_amount,
+                            provider_type,
+                            task_type,
+                            sandbox,
+                            AssignmentState.CREATED,
+                        )
+                        for unit_id, (assignment_id, unit_index) in zip(unit_ids, unit_specs)
+                    ],
+                )
+                return self._get_rows_by_ids(conn, "units", "unit_id", unit_ids)
+            except sqlite3.IntegrityError as e:
+                if is_key_failure(e):
+                    raise EntryDoesNotExistException(e)
+                elif is_unique_failure(e):
+                    raise EntryAlreadyExistsException(
+                        e,
+                        db=self,
+                        table_name="units",
+                        original_exc=e,
+                    )
+                raise MephistoDBException(e)
+
     def _get_unit(self, unit_id: str) -> Mapping[str, Any]:
         """
         Return unit's fields by unit_id, raise EntryDoesNotExistException
@@ -715,8 +960,7 @@ class LocalMephistoDB(MephistoDB):
         Try to find any unit that matches the above. When called with no arguments,
         return all units.
         """
-        with self.table_access_condition:
-            conn = self.get_connection()
+        with self._read_connection() as conn:
             c = conn.cursor()
             additional_query, arg_tuple = self.__create_query_and_tuple(
                 [
@@ -757,6 +1001,29 @@ class LocalMephistoDB(MephistoDB):
             rows = c.fetchall()
             return [Unit(self, str(r["unit_id"]), row=r, _used_new_call=True) for r in rows]
 
+    def _find_launchable_units_for_worker(self, task_run_id: str, worker_id: str) -> List[Unit]:
+        """
+        Select the launched units of the task run outside of the worker's assignments
+        """
+        with self._read_connection() as conn:
+            c = conn.cursor()
+            c.execute(
+                """
+                SELECT * FROM units
+                WHERE task_run_id = ?1
+                AND status = ?2
+                AND unit_index >= 0
+                AND assignment_id NOT IN (
+                    SELECT assignment_id FROM units
+                    WHERE task_run_id = ?1 AND worker_id = ?3
+                )
+                ORDER BY creation_date ASC
+                """,
+                (int(task_run_id), AssignmentState.LAUNCHED, int(worker_id)),
+            )
+            rows = c.fetchall()
+            return [Unit(self, str(r["unit_id"]), row=r, _used_new_call=True) for r in rows]
+
     def _clear_unit_agent_assignment(self, unit_id: str) -> None:
         """
         Update the given unit by removing the agent that is assigned to it, thus updating
@@ -780,6 +1047,40 @@ class LocalMephistoDB(MephistoDB):
                     )
                 raise MephistoDBException(e)
 
+    def _try_reserve_unit(self, unit_id: str) -> bool:
+        """
+        Reserve the unit with a conditional update, that only applies if it's
+        still launched
+        """
+        with self.table_access_condition, self.get_connection() as conn:
+            c = conn.cursor()
+            c.execute(
+                """
+                UPDATE units
+                SET status = ?
+                WHERE unit_id = ? AND status = ?;
+                """,
+                (AssignmentState.ASSIGNED, int(unit_id), AssignmentState.LAUNCHED),
+            )
+            return c.rowcount == 1
+
+    def _clear_unit_reservation(self, unit_id: str) -> bool:
+        """
+        Return the unit to launched with a conditional update, that only applies
+        if it's still assigned without an agent
+        """
+        with self.table_access_condition, self.get_connection() as conn:
+            c = conn.cursor()
+            c.execute(
+                """
+                UPDATE units
+                SET status = ?
+                WHERE unit_id = ? AND status = ? AND agent_id IS NULL;
+                """,
+                (AssignmentState.LAUNCHED, int(unit_id), AssignmentState.ASSIGNED),
+            )
+            return c.rowcount == 1
+
     def _update_unit(
         self, unit_id: str, agent_id: Optional[str] = None, status: Optional[str] = None
     ) -> None:
@@ -872,8 +1173,7 @@ class LocalMephistoDB(MephistoDB):
         Try to find any requester that matches the above. When called with no arguments,
         return all requesters.
         """
-        with self.table_access_condition:
-            conn = self.get_connection()
+        with self._read_connection() as conn:
             c = conn.cursor()
             additional_query, arg_tuple = self.__create_query_and_tuple(
                 ["requester_name", "provider_type"], [requester_name, provider_type]
@@ -949,8 +1249,7 @@ class LocalMephistoDB(MephistoDB):
         Try to find any worker that matches the above. When called with no arguments,
         return all workers.
         """
-        with self.table_access_condition:
-            conn = self.get_connection()
+        with self._read_connection() as conn:
             c = conn.cursor()
             additional_query, arg_tuple = self.__create_query_and_tuple(
                 ["worker_name", "provider_type"], [worker_name, provider_type]
@@ -1081,8 +1380,7 @@ class LocalMephistoDB(MephistoDB):
         Try to find any agent that matches the above. When called with no arguments,
         return all agents.
         """
-        with self.table_access_condition:
-            conn = self.get_connection()
+        with self._read_connection() as conn:
             c = conn.cursor()
             additional_query, arg_tuple = self.__create_query_and_tuple(
                 [
@@ -1149,8 +1447,7 @@ class LocalMephistoDB(MephistoDB):
         """
         Find a qualification. If no name is supplied, returns all qualifications.
         """
-        with self.table_access_condition:
-            conn = self.get_connection()
+        with self._read_connection() as conn:
             c = conn.cursor()
             additional_query, arg_tuple = self.__create_query_and_tuple(
                 ["qualification_name"], [qualification_name]
@@ -1287,8 +1584,7 @@ class LocalMephistoDB(MephistoDB):
         """
         Find granted qualifications that match the given specifications
         """
-        with self.table_access_condition:
-            conn = self.get_connection()
+        with self._read_connection() as conn:
             c = conn.cursor()
             c.execute(
                 """
@@ -1319,8 +1615,7 @@ class LocalMephistoDB(MephistoDB):
 
         See GrantedQualification for the expected fields for the returned mapping
         """
-        with self.table_access_condition:
-            conn = self.get_connection()
+        with self._read_connection() as conn:
             c = conn.cursor()
             c.execute(
                 f"""
@@ -1438,8 +1733,7 @@ class LocalMephistoDB(MephistoDB):
         Try to find any onboarding agent that matches the above. When called with no arguments,
         return all onboarding agents.
         """
-        with self.table_access_condition:
-            conn = self.get_connection()
+        with self._read_connection() as conn:
             c = conn.cursor()
             additional_query, arg_tuple = self.__create_query_and_tuple(
                 [
@@ -1615,19 +1909,23 @@ class LocalMephistoDB(MephistoDB):
     def write_dict(self, path_key: str, target_dict: Dict[str, Any]):
         """Write an object to the given key"""
         self._assert_path_in_domain(path_key)
+        if self._file_flusher is not None:
+            self._file_flusher.write(path_key, json.dumps(target_dict))
+            return
         os.makedirs(os.path.dirname(path_key), exist_ok=True)
         with open(path_key, "w+") as data_file:
             json.dump(target_dict, data_file)
 
     def read_dict(self, path_key: str) -> Dict[str, Any]:
         """Return the dict loaded from the given path key"""
-        self._assert_path_in_domain(path_key)
-        with open(path_key, "r") as data_file:
-            return json.load(data_file)
+        return json.loads(self.read_text(path_key))
 
     def write_text(self, path_key: str, data_string: str):
         """Write the given text to the given key"""
         self._assert_path_in_domain(path_key)
+        if self._file_flusher is not None:
+            self._file_flusher.write(path_key, data_string)
+            return
         os.makedirs(os.path.dirname(path_key), exist_ok=True)
         with open(path_key, "w+") as data_file:
             data_file.write(data_string)
@@ -1635,10 +1933,41 @@ class LocalMephistoDB(MephistoDB):
     def read_text(self, path_key: str) -> str:
         """Get text data stored at the given key"""
         self._assert_path_in_domain(path_key)
+        if self._file_flusher is not None:
+            pending = self._file_flusher.get_pending(path_key)
+            if pending is not None:
+                return pending
         with open(path_key, "r") as data_file:
             return data_file.read()
 
     def key_exists(self, path_key: str) -> bool:
         """See if the given path refers to a known file"""
         self._assert_path_in_domain(path_key)
+        if self._file_flusher is not None and self._file_flusher.get_pending(path_key) is not None:
+            return True
         return os.path.exists(path_key)
+
+    def append_dict(self, path_key: str, target_dict: Dict[str, Any]) -> None:
+        """Append an object to the given key as a line of JSON"""
+        self._assert_path_in_domain(path_key)
+        if self._file_flusher is not None and self._file_flusher.get_pending(path_key) is not None:
+            # Appends go straight to disk, so a deferred write replacing this file
+            # (and the writes queued before it) must land first
+            self._file_flusher.flush()
+        os.makedirs(os.path.dirname(path_key), exist_ok=True)
+        line = (json.dumps(target_dict) + "\n").encode()
+        with open(path_key, "ab+") as data_file:
+            if data_file.seek(0, os.SEEK_END) > 0:
+                data_file.seek(-1, os.SEEK_END)
+                if data_file.read(1) != b"\n":
+                    # Don't extend the partial line left by an interrupted append
+                    line = b"\n" + line
+            data_file.write(line)
+
+    def flush_writes(self) -> None:
+        """
+        Write out any deferred file writes, blocking until they're on disk. Raises the
+        error of a write that failed, which stays queued to be retried
+        """
+        if self._file_flusher is not None:
+            self._file_flusher.flush()
@@ -194,6 +194,37 @@ CREATE_IF_NOT_EXISTS_IMPORT_DATA_TABLE = """
     );
 """
 
+# Derived data (recomputable from tasks' data), thus not exported by DB Data Porter
+CREATE_IF_NOT_EXISTS_TASK_STATS_FLAGS_TABLE = """
+    CREATE TABLE IF NOT EXISTS task_stats_flags (
+        task_id INTEGER PRIMARY KEY,
+        has_stats BOOLEAN NOT NULL,
+        creation_date DATETIME DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (task_id) REFERENCES tasks (task_id)
+    );
+"""
+
+# Derived data (stats accumulated from units' data), thus not exported by DB Data Porter
+CREATE_IF_NOT_EXISTS_TASK_STATS_TABLE = """
+    CREATE TABLE IF NOT EXISTS task_stats (
+        task_id INTEGER PRIMARY KEY,
+        stats TEXT NOT NULL,  /* JSON */
+        creation_date DATETIME DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (task_id) REFERENCES tasks (task_id)
+    );
+"""
+
+# Units that have already been added to `task_stats`
+CREATE_IF_NOT_EXISTS_TASK_STATS_UNITS_TABLE = """
+    CREATE TABLE IF NOT EXISTS task_stats_units (
+        unit_id INTEGER PRIMARY KEY,
+        task_id INTEGER NOT NULL,
+        creation_date DATETIME DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (unit_id) REFERENCES units (unit_id),
+        FOREIGN KEY (task_id) REFERENCES tasks (task_id)
+    );
+"""
+
 # WARNING: Changing this table, be careful, it will affect all datastores too
 CREATE_IF_NOT_EXISTS_MIGRATIONS_TABLE = """
     CREATE TABLE IF NOT EXISTS migrations (
@@ -213,11 +244,16 @@ CREATE_IF_NOT_EXISTS_CORE_INDICES = """
     CREATE INDEX IF NOT EXISTS unit_by_assignment_id_index ON units(assignment_id);
     CREATE INDEX IF NOT EXISTS unit_by_task_run_index ON units(task_run_id);
     CREATE INDEX IF NOT EXISTS unit_by_task_run_by_worker_by_status_index ON units(task_run_id, worker_id, status);
+    CREATE INDEX IF NOT EXISTS unit_by_task_run_by_status_index ON units(task_run_id, status);
     CREATE INDEX IF NOT EXISTS unit_by_task_by_worker_index ON units(task_id, worker_id);
+    CREATE INDEX IF NOT EXISTS unit_by_task_by_creation_date_index ON units(task_id, creation_date, unit_id);
+    CREATE INDEX IF NOT EXISTS unit_by_task_by_status_index ON units(task_id, status);
     CREATE INDEX IF NOT EXISTS agent_by_worker_by_status_index ON agents(worker_id, status);
     CREATE INDEX IF NOT EXISTS agent_by_task_run_index ON agents(task_run_id);
     CREATE INDEX IF NOT EXISTS assignment_by_task_run_index ON assignments(task_run_id);
     CREATE INDEX IF NOT EXISTS task_run_by_requester_index ON task_runs(requester_id);
     CREATE INDEX IF NOT EXISTS task_run_by_task_index ON task_runs(task_id);
     CREATE INDEX IF NOT EXISTS worker_review_by_unit_index ON worker_review(unit_id);
+    CREATE INDEX IF NOT EXISTS worker_review_by_task_by_status_index ON worker_review(task_id, status);
+    CREATE INDEX IF NOT EXISTS task_stats_unit_by_task_index ON task_stats_units(task_id);
 """  # noqa: E501
@@ -5,14 +5,22 @@
 # LICENSE file in the root directory of this source tree.
 
 import threading
+from collections import OrderedDict
 from typing import Any
 from typing import Dict
 from typing import List
 from typing import Mapping
 from typing import Optional
+from typing import Tuple
 
+from mephisto.abstractions.databases.entity_cache import DEFAULT_CACHE_MAX_SIZE
+from mephisto.abstractions.databases.entity_cache import DEFAULT_INDEX_MAX_COUNT
+from mephisto.abstractions.databases.entity_cache import EntityCache
+from mephisto.abstractions.databases.entity_cache import EntityIndex
+from mephisto.abstractions.databases.entity_cache import UnitIndex
 from mephisto.abstractions.databases.local_database import LocalMephistoDB
 from mephisto.data_model.agent import Agent
+from mephisto.data_model.agent import AgentState
 from mephisto.data_model.agent import OnboardingAgent
 from mephisto.data_model.assignment import Assignment
 from mephisto.data_model.assignment import AssignmentState
@@ -25,10 +33,6 @@ from mephisto.data_model.unit import Unit
 from mephisto.data_model.worker import Worker
 from mephisto.utils.logger_core import get_logger
 
-# We should be using WeakValueDictionary rather than a full dict once
-# we're better able to trade-off between memory and space.
-# from weakref import WeakValueDictionary
-
 logger = get_logger(name=__name__)
 
 
@@ -39,8 +43,19 @@ class MephistoSingletonDB(LocalMephistoDB):
     """
     Class that creates a singleton storage for all accessed data.
 
-    Tries to keep the data usage down with weak references, but it's
-    still subject to memory leaks.
+    Keeps the data usage down with an EntityCache per class: objects that are
+    still referenced elsewhere (i.e. by live runs) stay pinned through weak
+    references, and everything else is held in an LRU bounded by
+    `cache_max_size` entries and, optionally, `cache_max_age` seconds.
+
+    On top of that, the units of a task run (or of a task) are indexed by worker
+    and status (the task run index also tracking which assignments each worker
+    is in), and agents by worker, so the queries made on every worker
+    registration are answered from memory. These indexes are loaded on first
+    use and then written through on every unit and agent update. A task run's
+    index is dropped once the run completes, and the least recently used unit
+    indexes beyond `index_max_count` (and agent indexes beyond `cache_max_size`)
+    are dropped too, to be loaded again if needed.
 
     This is a tradeoff to have more speed for not making db queries from disk
     """
@@ -59,19 +74,36 @@ class MephistoSingletonDB(LocalMephistoDB):
         Requester,
     ]
 
-    def __init__(self, database_path=None):
-        super().__init__(database_path=database_path)
+    def __init__(
+        self,
+        database_path=None,
+        cache_max_size: Optional[int] = DEFAULT_CACHE_MAX_SIZE,
+        cache_max_age: Optional[float] = None,
+        index_max_count: Optional[int] = DEFAULT_INDEX_MAX_COUNT,
+        **kwargs,
+    ):
+        super().__init__(database_path=database_path, **kwargs)
 
-        # Create singleton dictionaries for entries
-        self._singleton_cache = {k: dict() for k in self._cached_classes}
-        self._assignment_to_unit_mapping: Dict[str, List[Unit]] = {}
+        # Create singleton caches for entries
+        self._singleton_cache = {
+            k: EntityCache(k.__name__, max_size=cache_max_size, max_age=cache_max_age)
+            for k in self._cached_classes
+        }
+        # Only ids are kept here, so units can still be evicted from their cache
+        self._assignment_to_unit_mapping: Dict[str, List[str]] = {}
 
-    def shutdown(self) -> None:
-        """Close all open connections"""
-        with self.table_access_condition:
-            curr_thread = threading.get_ident()
-            self.conn[curr_thread].close()
-            del self.conn[curr_thread]
+        # Write-through indexes of unit and agent ids. Unit writes hold the lock
+        # for the full write, so an index can't be loaded in between a write to
+        # the database and the matching index update
+        self._index_lock = threading.RLock()
+        self._index_max_count = index_max_count
+        self._agent_index_max_count = cache_max_size
+        self._task_run_unit_indexes: "OrderedDict[str, UnitIndex]" = OrderedDict()
+        self._task_unit_indexes: "OrderedDict[str, UnitIndex]" = OrderedDict()
+        # Task and task run of every unit in a loaded unit index
+        self._unit_index_scopes: Dict[str, Tuple[str, str]] = {}
+        self._worker_agent_indexes: "OrderedDict[str, EntityIndex]" = OrderedDict()
+        self._agent_to_worker_mapping: Dict[str, str] = {}
 
     def optimized_load(
         self,
@@ -92,10 +124,25 @@ class MephistoSingletonDB(LocalMephistoDB):
         """Store the result of a load for caching reasons"""
         for stored_class in self._cached_classes:
             if issubclass(target_cls, stored_class):
-                self._singleton_cache[stored_class][value.db_id] = value
+                self._singleton_cache[stored_class].put(value.db_id, value)
                 break
         return None
 
+    def _load_by_ids(self, target_cls, table_name: str, id_name: str, db_ids: List[str]) -> List:
+        """
+        Return the objects with the given ids in the same order, loading all of
+        the ones missing from the cache with a single query
+        """
+        cache = self._singleton_cache[target_cls]
+        loaded = {db_id: cache.get(db_id) for db_id in db_ids}
+        missing_ids = [int(db_id) for db_id, obj in loaded.items() if obj is None]
+        if len(missing_ids) > 0:
+            with self._read_connection() as conn:
+                rows = self._get_rows_by_ids(conn, table_name, id_name, missing_ids)
+            for row in rows:
+                loaded[row[id_name]] = target_cls.get(self, row[id_name], row=row)
+        return [loaded[db_id] for db_id in db_ids]
+
     def _new_agent(
         self,
         worker_id: str,
@@ -110,15 +157,23 @@ class MephistoSingletonDB(LocalMephistoDB):
         Wrapper around the new_agent call that finds and updates the unit locally
         too, as this isn't guaranteed otherwise but is an important part of the singleton
         """
-        agent_id = super()._new_agent(
-            worker_id,
-            unit_id,
-            task_id,
-            task_run_id,
-            assignment_id,
-            task_type,
-            provider_type,
-        )
+        with self._index_lock:
+            agent_id = super()._new_agent(
+                worker_id,
+                unit_id,
+                task_id,
+                task_run_id,
+                assignment_id,
+                task_type,
+                provider_type,
+            )
+            for unit_index in self._get_loaded_unit_indexes(unit_id):
+                unit_index.set_worker(unit_id, worker_id)
+                unit_index.set_status(unit_id, AssignmentState.ASSIGNED)
+            agent_index = self._worker_agent_indexes.get(worker_id)
+            if agent_index is not None:
+                agent_index.add(agent_id, worker_id, AgentState.STATUS_NONE)
+                self._agent_to_worker_mapping[agent_id] = worker_id
         agent = Agent.get(self, agent_id)
         unit = agent.get_unit()
         unit.agent_id = agent_id
@@ -126,6 +181,48 @@ class MephistoSingletonDB(LocalMephistoDB):
         unit.worker_id = agent.worker_id
         return agent_id
 
+    def _update_agent(self, agent_id: str, status: Optional[str] = None) -> None:
+        """Update the agent, and move it to its new status in the worker's index"""
+        with self._index_lock:
+            super()._update_agent(agent_id, status=status)
+            worker_id = self._agent_to_worker_mapping.get(agent_id)
+            if worker_id is not None and status is not None:
+                self._worker_agent_indexes[worker_id].set_status(agent_id, status)
+
+    def _find_agents(
+        self,
+        status: Optional[str] = None,
+        unit_id: Optional[str] = None,
+        worker_id: Optional[str] = None,
+        task_id: Optional[str] = None,
+        task_run_id: Optional[str] = None,
+        assignment_id: Optional[str] = None,
+        task_type: Optional[str] = None,
+        provider_type: Optional[str] = None,
+    ) -> List[Agent]:
+        """
+        Answers the per-worker queries (optionally by status) from the worker's
+        agent index. Defers to the underlying DB for anything else.
+        """
+        if worker_id is not None and all(
+            v is None
+            for v in [unit_id, task_id, task_run_id, assignment_id, task_type, provider_type]
+        ):
+            with self._index_lock:
+                agent_ids = self._get_worker_agent_index(worker_id).select(status=status)
+            return self._load_by_ids(Agent, "agents", "agent_id", agent_ids)
+
+        return super()._find_agents(
+            status=status,
+            unit_id=unit_id,
+            worker_id=worker_id,
+            task_id=task_id,
+            task_run_id=task_run_id,
+            assignment_id=assignment_id,
+            task_type=task_type,
+            provider_type=provider_type,
+        )
+
     def _find_units(
         self,
         task_id: Optional[str] = None,
@@ -165,12 +262,44 @@ class MephistoSingletonDB(LocalMephistoDB):
                     status,
                 ]
             ):
-                units = self._assignment_to_unit_mapping.get(assignment_id)
-                if units is None:
-                    units = super()._find_units(assignment_id=assignment_id)
-                    self._assignment_to_unit_mapping[assignment_id] = units
+                unit_ids = self._assignment_to_unit_mapping.get(assignment_id)
+                if unit_ids is not None:
+                    unit_cache = self._singleton_cache[Unit]
+                    cached_units = [unit_cache.get(unit_id) for unit_id in unit_ids]
+                    found_units = [u for u in cached_units if u is not None]
+                    if len(found_units) == len(unit_ids):
+                        return found_units
+                # Either never queried, or some of the units were evicted
+                units = super()._find_units(assignment_id=assignment_id)
+                self._assignment_to_unit_mapping[assignment_id] = [u.db_id for u in units]
                 return units
 
+        # The queries made while assigning units to a worker are scoped to a run
+        # (or a task), and optionally a worker and status. These are answered
+        # from the write-through indexes.
+        if all(
+            v is None
+            for v in [
+                requester_id,
+                assignment_id,
+                unit_index,
+                provider_type,
+                task_type,
+                agent_id,
+                sandbox,
+            ]
+        ):
+            indexed_unit_ids: Optional[List[str]] = None
+            with self._index_lock:
+                if task_run_id is not None and task_id is None:
+                    index = self._get_task_run_unit_index(task_run_id)
+                    indexed_unit_ids = index.select(worker_id=worker_id, status=status)
+                elif task_id is not None and task_run_id is None and worker_id is not None:
+                    index = self._get_task_unit_index(task_id)
+                    indexed_unit_ids = index.select(worker_id=worker_id, status=status)
+            if indexed_unit_ids is not None:
+                return self._load_by_ids(Unit, "units", "unit_id", indexed_unit_ids)
+
         # Any other cases are less common and more complicated, and so we don't cache
         return super()._find_units(
             task_id=task_id,
@@ -186,6 +315,13 @@ class MephistoSingletonDB(LocalMephistoDB):
             status=status,
         )
 
+    def _find_launchable_units_for_worker(self, task_run_id: str, worker_id: str) -> List[Unit]:
+        """Answers from the task run's unit index, only loading the selected units"""
+        with self._index_lock:
+            index = self._get_task_run_unit_index(task_run_id)
+            unit_ids = index.select_for_new_worker(worker_id, AssignmentState.LAUNCHED)
+        return self._load_by_ids(Unit, "units", "unit_id", unit_ids)
+
     def new_unit(
         self,
         task_id: str,
@@ -204,14 +340,213 @@ class MephistoSingletonDB(LocalMephistoDB):
         """
         if assignment_id in self._assignment_to_unit_mapping:
             del self._assignment_to_unit_mapping[assignment_id]
-        return super()._new_unit(
-            task_id=task_id,
-            task_run_id=task_run_id,
-            requester_id=requester_id,
-            assignment_id=assignment_id,
-            unit_index=unit_index,
-            pay_amount=pay_amount,
-            provider_type=provider_type,
-            task_type=task_type,
-            sandbox=sandbox,
-        )
+        with self._index_lock:
+            unit_id = super()._new_unit(
+                task_id=task_id,
+                task_run_id=task_run_id,
+                requester_id=requester_id,
+                assignment_id=assignment_id,
+                unit_index=unit_index,
+                pay_amount=pay_amount,
+                provider_type=provider_type,
+                task_type=task_type,
+                sandbox=sandbox,
+            )
+            self._add_to_loaded_unit_indexes(
+                unit_id, str(task_id), str(task_run_id), str(assignment_id), unit_index
+            )
+        return unit_id
+
+    def _new_units_bulk(
+        self,
+        task_id: str,
+        task_run_id: str,
+        requester_id: str,
+        unit_specs: List[Tuple[str, int]],
+        pay_amount: float,
+        provider_type: str,
+        task_type: str,
+        sandbox: bool = True,
+    ) -> List[Mapping[str, Any]]:
+        """Create the units in bulk, and add them to any loaded indexes"""
+        for assignment_id, _ in unit_specs:
+            self._assignment_to_unit_mapping.pop(assignment_id, None)
+        with self._index_lock:
+            unit_rows = super()._new_units_bulk(
+                task_id=task_id,
+                task_run_id=task_run_id,
+                requester_id=requester_id,
+                unit_specs=unit_specs,
+                pay_amount=pay_amount,
+                provider_type=provider_type,
+                task_type=task_type,
+                sandbox=sandbox,
+            )
+            for row, (assignment_id, unit_index) in zip(unit_rows, unit_specs):
+                self._add_to_loaded_unit_indexes(
+                    row["unit_id"], str(task_id), str(task_run_id), str(assignment_id), unit_index
+                )
+        return unit_rows
+
+    def _update_task_run(self, task_run_id: str, is_completed: bool):
+        """Update the task run, dropping its unit index once it's completed"""
+        super()._update_task_run(task_run_id, is_completed=is_completed)
+        if is_completed:
+            with self._index_lock:
+                self._drop_unit_index(self._task_run_unit_indexes, str(task_run_id))
+
+    def _update_unit(
+        self, unit_id: str, agent_id: Optional[str] = None, status: Optional[str] = None
+    ) -> None:
+        """Update the unit, and move it to its new status in the loaded indexes"""
+        with self._index_lock:
+            super()._update_unit(unit_id, agent_id=agent_id, status=status)
+            if status is not None:
+                for index in self._get_loaded_unit_indexes(unit_id):
+                    index.set_status(unit_id, status)
+
+    def _clear_unit_agent_assignment(self, unit_id: str) -> None:
+        """Clear the unit's agent, and return it to launched in the loaded indexes"""
+        with self._index_lock:
+            super()._clear_unit_agent_assignment(unit_id)
+            for index in self._get_loaded_unit_indexes(unit_id):
+                index.set_worker(unit_id, None)
+                index.set_status(unit_id, AssignmentState.LAUNCHED)
+
+    def _try_reserve_unit(self, unit_id: str) -> bool:
+        """Reserve the unit, and mark it assigned in the loaded indexes"""
+        with self._index_lock:
+            reserved = super()._try_reserve_unit(unit_id)
+            if reserved:
+                for index in self._get_loaded_unit_indexes(unit_id):
+                    index.set_status(unit_id, AssignmentState.ASSIGNED)
+        return reserved
+
+    def _clear_unit_reservation(self, unit_id: str) -> bool:
+        """Clear the unit's reservation, and return it to launched in the loaded indexes"""
+        with self._index_lock:
+            cleared = super()._clear_unit_reservation(unit_id)
+            if cleared:
+                for index in self._get_loaded_unit_indexes(unit_id):
+                    index.set_status(unit_id, AssignmentState.LAUNCHED)
+        return cleared
+
+    def _get_loaded_unit_indexes(self, unit_id: str) -> List[UnitIndex]:
+        """Return the already loaded indexes that the given unit belongs to"""
+        scope = self._unit_index_scopes.get(unit_id)
+        if scope is None:
+            return []
+        task_id, task_run_id = scope
+        indexes = [
+            self._task_unit_indexes.get(task_id),
+            self._task_run_unit_indexes.get(task_run_id),
+        ]
+        return [index for index in indexes if index is not None]
+
+    def _add_to_loaded_unit_indexes(
+        self,
+        unit_id: str,
+        task_id: str,
+        task_run_id: str,
+        assignment_id: str,
+        unit_index: int,
+    ) -> None:
+        """Add a newly created unit to the indexes of its task and task run, if loaded"""
+        if (
+            task_id not in self._task_unit_indexes
+            and task_run_id not in self._task_run_unit_indexes
+        ):
+            return
+        self._unit_index_scopes[unit_id] = (task_id, task_run_id)
+        for index in self._get_loaded_unit_indexes(unit_id):
+            index.add(unit_id, None, AssignmentState.CREATED, assignment_id, unit_index)
+
+    def _cache_unit_index(self, indexes: "OrderedDict[str, UnitIndex]", key: str) -> None:
+        """Mark the index as just used, and drop the least recently used ones over the bound"""
+        indexes.move_to_end(key)
+        if self._index_max_count is None:
+            return
+        while len(indexes) > self._index_max_count:
+            self._drop_unit_index(indexes, next(iter(indexes)))
+
+    def _drop_unit_index(self, indexes: "OrderedDict[str, UnitIndex]", key: str) -> None:
+        """Drop the given unit index, along with the scopes of units no longer indexed"""
+        index = indexes.pop(key, None)
+        if index is None:
+            return
+        for unit_id in index.select():
+            scope = self._unit_index_scopes.get(unit_id)
+            if scope is not None and len(self._get_loaded_unit_indexes(unit_id)) == 0:
+                del self._unit_index_scopes[unit_id]
+
+    def _load_unit_index(self, column: str, value: str) -> UnitIndex:
+        """Build an index over all units with the given task or task run id"""
+        assert column in ["task_id", "task_run_id"], f"Can't index units by {column}"
+        index = UnitIndex()
+        with self._read_connection() as conn:
+            c = conn.cursor()
+            c.execute(
+                f"""
+                SELECT unit_id, task_id, task_run_id, assignment_id, unit_index, worker_id, status
+                FROM units
+                WHERE {column} = ?
+                ORDER BY creation_date ASC
+                """,
+                (int(value),),
+            )
+            for row in c.fetchall():
+                unit_id = row["unit_id"]
+                index.add(
+                    unit_id,
+                    row["worker_id"],
+                    row["status"],
+                    row["assignment_id"],
+                    row["unit_index"],
+                )
+                self._unit_index_scopes[unit_id] = (row["task_id"], row["task_run_id"])
+        return index
+
+    def _get_task_run_unit_index(self, task_run_id: str) -> UnitIndex:
+        index = self._task_run_unit_indexes.get(task_run_id)
+        if index is None:
+            index = self._load_unit_index("task_run_id", task_run_id)
+            self._task_run_unit_indexes[task_run_id] = index
+        self._cache_unit_index(self._task_run_unit_indexes, task_run_id)
+        return index
+
+    def _get_task_unit_index(self, task_id: str) -> UnitIndex:
+        index = self._task_unit_indexes.get(task_id)
+        if index is None:
+            index = self._load_unit_index("task_id", task_id)
+            self._task_unit_indexes[task_id] = index
+        self._cache_unit_index(self._task_unit_indexes, task_id)
+        return index
+
+    def _get_worker_agent_index(self, worker_id: str) -> EntityIndex:
+        index = self._worker_agent_indexes.get(worker_id)
+        if index is not None:
+            self._worker_agent_indexes.move_to_end(worker_id)
+            return index
+
+        index = EntityIndex()
+        with self._read_connection() as conn:
+            c = conn.cursor()
+            c.execute(
+                """
+                SELECT agent_id, status FROM agents
+                WHERE worker_id = ?
+                ORDER BY creation_date ASC
+                """,
+                (int(worker_id),),
+            )
+            for row in c.fetchall():
+                index.add(row["agent_id"], worker_id, row["status"])
+                self._agent_to_worker_mapping[row["agent_id"]] = worker_id
+        self._worker_agent_indexes[worker_id] = index
+
+        if self._agent_index_max_count is not None:
+            while len(self._worker_agent_indexes) > self._agent_index_max_count:
+                _, evicted_index = self._worker_agent_indexes.popitem(last=False)
+                for agent_id in evicted_index.select():
+                    self._agent_to_worker_mapping.pop(agent_id, None)
+        return index
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+
+# Copyright (c) Meta Platforms and its affiliates.
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+import atexit
+import os
+import tempfile
+import threading
+import time
+from typing import Dict
+from typing import Optional
+from typing import Set
+from weakref import WeakSet
+
+from prometheus_client import Counter  # type: ignore
+
+from mephisto.utils.logger_core import get_logger
+
+logger = get_logger(name=__name__)
+
+FILE_WRITES_COALESCED = Counter(
+    "local_db_file_writes_coalesced",
+    "File writes replaced by a later write to the same path before being flushed",
+)
+
+DEFAULT_WRITE_BEHIND_WINDOW = 0.05
+# Longest wait between background retries of failing writes
+MAX_RETRY_DELAY = 5.0
+
+# Flushers with a running background thread, flushed once more at interpreter exit
+_active_flushers: "WeakSet[WriteBehindFlusher]" = WeakSet()
+
+
+@atexit.register
+def _flush_active_flushers() -> None:
+    for flusher in list(_active_flushers):
+        try:
+            flusher.flush()
+        except Exception:
+            logger.exception("Failed to write deferred files at exit")
+
+
+def write_file_atomically(path: str, contents: str) -> None:
+    """
+    Write the given contents to a temporary file next to `path` and rename it into
+    place, so that readers never see a partially written file
+    """
+    dir_name = os.path.dirname(path)
+    os.makedirs(dir_name, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=dir_name, prefix=f".{os.path.basename(path)}.")
+    try:
+        with os.fdopen(fd, "w") as tmp_file:
+            tmp_file.write(contents)
+            tmp_file.flush()
+            os.fsync(tmp_file.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+
+class WriteBehindFlusher:
+    """
+    Defers file writes to a background thread. A write is held for `window`
+    seconds before being flushed, and any later write to the same path in the
+    meantime replaces it, so bursts of saves to one file cost one disk write.
+
+    Pending contents are served by `get_pending`, so readers going through the
+    owning file store always see their own writes. Files are flushed in the
+    order they were first written, each with an atomic rename. A failed write
+    stays queued to be retried, without holding up writes to other files.
+    """
+
+    def __init__(self, window: float = DEFAULT_WRITE_BEHIND_WINDOW):
+        self.window = window
+        # Path -> latest contents, for writes that haven't been flushed yet
+        self._pending: Dict[str, str] = {}
+        # Path -> contents, for writes being flushed right now
+        self._in_flight: Dict[str, str] = {}
+        self._condition = threading.Condition()
+        # Held for the whole of a flush, so flushes can't reorder writes
+        self._flush_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._is_shutdown = False
+
+    def write(self, path: str, contents: str) -> None:
+        """Queue the given contents to be written to the path"""
+        with self._condition:
+            if path in self._pending:
+                FILE_WRITES_COALESCED.inc()
+            self._pending[path] = contents
+            if self._thread is None:
+                self._is_shutdown = False
+                self._thread = threading.Thread(
+                    target=self._run, name="write-behind-flusher", daemon=True
+                )
+                self._thread.start()
+                _active_flushers.add(self)
+            self._condition.notify()
+
+    def get_pending(self, path: str) -> Optional[str]:
+        """Return the contents queued for the path, if any are yet to be written"""
+        with self._condition:
+            if path in self._pending:
+                return self._pending[path]
+            return self._in_flight.get(path)
+
+    def flush(self) -> None:
+        """
+        Write out everything queued so far, blocking until it's on disk. Failed
+        writes are queued again, and the first of their errors is raised once
+        the other files are written
+        """
+        failures = self._write_queued()
+        if len(failures) > 0:
+            raise next(iter(failures.values()))
+
+    def _write_queued(self) -> Dict[str, Exception]:
+        """Write every queued file, returning the errors of the failed ones by path"""
+        failures: Dict[str, Exception] = {}
+        with self._flush_lock:
+            with self._condition:
+                self._in_flight = self._pending
+                self._pending = {}
+            try:
+                for path, contents in list(self._in_flight.items()):
+                    try:
+                        write_file_atomically(path, contents)
+                    except Exception as e:
+                        failures[path] = e
+                        continue
+                    with self._condition:
+                        del self._in_flight[path]
+            finally:
+                with self._condition:
+                    # Later writes to the same files replace the unwritten ones
+                    self._in_flight.update(self._pending)
+                    self._pending = self._in_flight
+                    self._in_flight = {}
+        return failures
+
+    def _run(self) -> None:
+        """
+        Flush queued writes once they've been held for the window, backing off
+        while some keep failing
+        """
+        delay = self.window
+        failing_paths: Set[str] = set()
+        while True:
+            with self._condition:
+                while len(self._pending) == 0 and not self._is_shutdown:
+                    self._condition.wait()
+                # Shutdown flushes whatever is left, so it isn't held up here
+                self._condition.wait_for(lambda: self._is_shutdown, timeout=delay)
+                if self._is_shutdown:
+                    return
+            failures = self._write_queued()
+            for path, error in failures.items():
+                if path not in failing_paths:
+                    logger.error(
+                        f"Failed to write deferred file {path}, retrying later", exc_info=error
+                    )
+            for path in failing_paths - failures.keys():
+                logger.info(f"Wrote deferred file {path} after earlier failures")
+            failing_paths = set(failures.keys())
+            if len(failures) > 0:
+                delay = max(self.window, min(delay * 2, MAX_RETRY_DELAY))
+            else:
+                delay = self.window
+
+    def shutdown(self) -> None:
+        """Stop the background thread and flush anything still queued"""
+        with self._condition:
+            thread = self._thread
+            self._thread = None
+            self._is_shutdown = True
+            self._condition.notify()
+        if thread is not None:
+            thread.join()
+        _active_flushers.discard(self)
+        self.flush()
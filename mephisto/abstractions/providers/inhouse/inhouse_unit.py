@@ -5,8 +5,10 @@
 # LICENSE file in the root directory of this source tree.
 
 from typing import Any
+from typing import List
 from typing import Mapping
 from typing import Optional
+from typing import Tuple
 from typing import TYPE_CHECKING
 
 from mephisto.abstractions.providers.inhouse.provider_type import PROVIDER_TYPE
@@ -103,3 +105,15 @@ class InhouseUnit(Unit):
         unit = InhouseUnit._register_unit(db, assignment, index, pay_amount, PROVIDER_TYPE)
         logger.debug(f'{InhouseUnit.log_prefix}Created Unit "{unit.db_id}"')
         return unit
+
+    @classmethod
+    def new_bulk(
+        cls,
+        db: "MephistoDB",
+        unit_specs: List[Tuple["Assignment", int]],
+        pay_amount: float,
+    ) -> List["Unit"]:
+        """Create Units for all of the given (assignment, index) pairs at once"""
+        units = InhouseUnit._register_units_bulk(db, unit_specs, pay_amount, PROVIDER_TYPE)
+        logger.debug(f"{InhouseUnit.log_prefix}Created {len(units)} Units")
+        return units
@@ -78,3 +78,13 @@ class MockUnit(Unit):
     def new(db: "MephistoDB", assignment: "Assignment", index: int, pay_amount: float) -> "Unit":
         """Create a Unit for the given assignment"""
         return MockUnit._register_unit(db, assignment, index, pay_amount, PROVIDER_TYPE)
+
+    @classmethod
+    def new_bulk(
+        cls,
+        db: "MephistoDB",
+        unit_specs: List[Tuple["Assignment", int]],
+        pay_amount: float,
+    ) -> List["Unit"]:
+        """Create Units for all of the given (assignment, index) pairs at once"""
+        return MockUnit._register_units_bulk(db, unit_specs, pay_amount, PROVIDER_TYPE)
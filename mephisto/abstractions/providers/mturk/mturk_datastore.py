@@ -8,16 +8,19 @@ import os
 import sqlite3
 import threading
 import time
-from collections import defaultdict
 from typing import Any
 from typing import Dict
+from typing import List
 from typing import Optional
+from typing import Tuple
 
 import boto3  # type: ignore
 from botocore.exceptions import ClientError  # type: ignore
 from botocore.exceptions import ProfileNotFound  # type: ignore
 
 from mephisto.abstractions.databases.local_database import is_unique_failure
+from mephisto.abstractions.providers.mturk.mturk_status_sync import MTurkHitStatusSync
+from mephisto.utils.block_list_cache import BlockListCache
 from mephisto.utils.db import apply_migrations
 from mephisto.utils.logger_core import get_logger
 from . import mturk_datastore_tables as tables
@@ -40,14 +43,21 @@ class MTurkDatastore:
     def __init__(self, datastore_root: str):
         """Initialize the session storage to empty, initialize tables if needed"""
         self.session_storage: Dict[str, boto3.Session] = {}
+        # boto3 Sessions aren't thread safe, so sessions and their clients are only
+        # created under this lock. The cached clients themselves are thread safe.
+        self.session_lock = threading.RLock()
+        self.client_storage: Dict[Tuple[str, bool], Any] = {}
         self.table_access_condition = threading.Condition()
         self.conn: Dict[int, sqlite3.Connection] = {}
         self.db_path = os.path.join(datastore_root, "mturk.db")
         self.init_tables()
         self.datastore_root = datastore_root
-        self._last_hit_mapping_update_times: Dict[str, float] = defaultdict(
-            lambda: time.monotonic()
-        )
+        # Units whose HIT mapping was never changed by this process have no entry
+        self._last_hit_mapping_update_times: Dict[str, float] = {}
+        # Shared snapshot of HIT statuses, for resolving unit statuses in bulk
+        self.hit_status_sync = MTurkHitStatusSync(self)
+        # Workers blocked by each requester, by requester name
+        self.worker_block_cache = BlockListCache()
 
     def get_connection(self) -> sqlite3.Connection:
         """
@@ -101,13 +111,20 @@ class MTurkDatastore:
         """
         Determine if a cached value from the given compare time is still valid
         """
-        return compare_time > self._last_hit_mapping_update_times[unit_id]
+        return compare_time > self._last_hit_mapping_update_times.get(unit_id, 0.0)
 
     def new_hit(self, hit_id: str, hit_link: str, duration: int, run_id: str) -> None:
         """Register a new HIT mapping in the table"""
+        self.new_hits_bulk([(hit_id, hit_link, duration, run_id)])
+
+    def new_hits_bulk(self, hits: List[Tuple[str, str, int, str]]) -> None:
+        """
+        Register the HIT mappings for many new HITs, given as
+        (hit_id, hit_link, duration, run_id), in one transaction
+        """
         with self.table_access_condition, self.get_connection() as conn:
             c = conn.cursor()
-            c.execute(
+            c.executemany(
                 """
                 INSERT INTO hits(
                     hit_id,
@@ -115,16 +132,16 @@ class MTurkDatastore:
                     assignment_time_in_seconds
                 ) VALUES (?, ?, ?);
                 """,
-                (hit_id, hit_link, duration),
+                [(hit_id, hit_link, duration) for hit_id, hit_link, duration, _ in hits],
             )
-            c.execute(
+            c.executemany(
                 """
                 INSERT INTO run_mappings(
                     hit_id,
                     run_id
                 ) VALUES (?, ?);
                 """,
-                (hit_id, run_id),
+                [(hit_id, run_id) for hit_id, _, _, run_id in hits],
             )
 
     def get_unassigned_hit_ids(self, run_id: str):
@@ -152,6 +169,22 @@ class MTurkDatastore:
             results = c.fetchall()
             return [r["hit_id"] for r in results]
 
+    def get_hit_ids_for_run(self, run_id: str) -> List[str]:
+        """
+        Return the ids of all HITs created for the given run
+        """
+        with self.table_access_condition:
+            conn = self.get_connection()
+            c = conn.cursor()
+            c.execute(
+                """
+                SELECT hit_id FROM run_mappings
+                WHERE run_id = ?;
+                """,
+                (run_id,),
+            )
+            return [r["hit_id"] for r in c.fetchall()]
+
     def register_assignment_to_hit(
         self,
         hit_id: str,
@@ -191,6 +224,83 @@ class MTurkDatastore:
             if unit_id is not None:
                 self._mark_hit_mapping_update(unit_id)
 
+    def claim_unassigned_hit(self, run_id: str, unit_id: str) -> Optional[str]:
+        """
+        Map one of the run's unassigned HITs to the given unit and return its id,
+        or None if there are no unassigned HITs left. A HIT is only claimed if it's
+        still unassigned at the moment of update, so concurrent callers never share one
+        """
+        while True:
+            unassigned_hit_ids = self.get_unassigned_hit_ids(run_id)
+            if len(unassigned_hit_ids) == 0:
+                return None
+
+            for hit_id in unassigned_hit_ids:
+                with self.table_access_condition, self.get_connection() as conn:
+                    c = conn.cursor()
+                    c.execute(
+                        """
+                        UPDATE hits
+                        SET unit_id = ?
+                        WHERE hit_id = ?
+                        AND unit_id IS NULL
+                        """,
+                        (unit_id, hit_id),
+                    )
+                    is_claimed = c.rowcount == 1
+
+                if is_claimed:
+                    self._mark_hit_mapping_update(unit_id)
+                    return hit_id
+            # Every HIT we've seen was claimed by someone else, look for more
+
+    def clear_returned_assignments(
+        self, run_id: str, assignable_hit_ids: List[str], since: float
+    ) -> Tuple[List[str], float]:
+        """
+        Clear the assignment ids of the run's HITs that MTurk lists as assignable
+        again (i.e. whose assignments were returned) in one transaction. Mappings
+        registered after `since` are newer than that listing, so they're kept.
+        Returns the ids of the units whose mappings were updated, and a time
+        after their updates but before any later mapping change
+        """
+        assignable_hit_ids_set = set(assignable_hit_ids)
+        with self.table_access_condition, self.get_connection() as conn:
+            c = conn.cursor()
+            c.execute(
+                """
+                SELECT
+                    hit_id,
+                    unit_id
+                FROM
+                    hits
+                INNER JOIN run_mappings
+                    USING  (hit_id)
+                WHERE assignment_id IS NOT NULL
+                AND run_id = ?;
+                """,
+                (run_id,),
+            )
+            returned_hits = [
+                (r["hit_id"], r["unit_id"])
+                for r in c.fetchall()
+                if r["hit_id"] in assignable_hit_ids_set
+                and (r["unit_id"] is None or self.is_hit_mapping_in_sync(r["unit_id"], since))
+            ]
+            c.executemany(
+                """
+                UPDATE hits
+                SET assignment_id = NULL
+                WHERE hit_id = ?
+                """,
+                [(hit_id,) for hit_id, _ in returned_hits],
+            )
+            unit_ids = [unit_id for _, unit_id in returned_hits if unit_id is not None]
+            for unit_id in unit_ids:
+                self._mark_hit_mapping_update(unit_id)
+            cleared_time = time.monotonic()
+        return unit_ids, cleared_time
+
     def clear_hit_from_unit(self, unit_id: str) -> None:
         """
         Clear the hit mapping that maps the given unit,
@@ -369,26 +479,37 @@ class MTurkDatastore:
         Either create a new session for the given requester or return
         the existing one if it has already been created
         """
-        if requester_name not in self.session_storage:
-            session = boto3.Session(profile_name=requester_name, region_name=MTURK_REGION_NAME)
-            self.session_storage[requester_name] = session
+        with self.session_lock:
+            if requester_name not in self.session_storage:
+                session = boto3.Session(profile_name=requester_name, region_name=MTURK_REGION_NAME)
+                self.session_storage[requester_name] = session
 
-        return self.session_storage[requester_name]
+            return self.session_storage[requester_name]
 
     def get_client_for_requester(self, requester_name: str) -> Any:
         """
         Return the client for the given requester, which should allow
         direct calls to the mturk surface
         """
-        return self.get_session_for_requester(requester_name).client("mturk")
+        with self.session_lock:
+            client_key = (requester_name, False)
+            if client_key not in self.client_storage:
+                session = self.get_session_for_requester(requester_name)
+                self.client_storage[client_key] = session.client("mturk")
+            return self.client_storage[client_key]
 
     def get_sandbox_client_for_requester(self, requester_name: str) -> Any:
         """
         Return the client for the given requester, which should allow
         direct calls to the mturk surface
         """
-        return self.get_session_for_requester(requester_name).client(
-            service_name="mturk",
-            region_name="us-east-1",
-            endpoint_url="https://mturk-requester-sandbox.us-east-1.amazonaws.com",
-        )
+        with self.session_lock:
+            client_key = (requester_name, True)
+            if client_key not in self.client_storage:
+                session = self.get_session_for_requester(requester_name)
+                self.client_storage[client_key] = session.client(
+                    service_name="mturk",
+                    region_name="us-east-1",
+                    endpoint_url="https://mturk-requester-sandbox.us-east-1.amazonaws.com",
+                )
+            return self.client_storage[client_key]
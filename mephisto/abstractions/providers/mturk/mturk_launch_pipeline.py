@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+
+# Copyright (c) Meta Platforms and its affiliates.
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+from concurrent.futures import FIRST_COMPLETED
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import wait
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
+from typing import TYPE_CHECKING
+
+from mephisto.abstractions.providers.mturk.mturk_utils import create_hit_with_hit_type
+from mephisto.abstractions.providers.mturk.mturk_utils import MTurkClient
+from mephisto.abstractions.providers.mturk.mturk_utils import retry_throttled_call
+from mephisto.data_model.constants.assignment_state import AssignmentState
+from mephisto.utils.concurrency import TokenBucket
+from mephisto.utils.logger_core import get_logger
+
+if TYPE_CHECKING:
+    from mephisto.abstractions.providers.mturk.mturk_unit import MTurkUnit
+
+logger = get_logger(name=__name__)
+
+DEFAULT_LAUNCH_CONCURRENCY = 8
+# HIT creations per second. MTurk doesn't document a fixed request rate, and asks that
+# throttled calls be retried after a backoff instead, which every creation already does,
+# so a client side limit is opt-in
+DEFAULT_LAUNCH_RATE_LIMIT = 0.0
+DEFAULT_DATASTORE_BATCH_SIZE = 100
+DEFAULT_TASK_LIFETIME_SECONDS = 60 * 60 * 24 * 31
+
+
+def create_hit_with_retries(
+    client: MTurkClient,
+    frame_height: int,
+    page_url: str,
+    hit_type_id: str,
+    lifetime_in_seconds: int = DEFAULT_TASK_LIFETIME_SECONDS,
+    rate_limiter: Optional[TokenBucket] = None,
+) -> Tuple[str, str, Dict[str, Any]]:
+    """
+    create_hit_with_hit_type, waiting on the rate limiter before every call and
+    retrying calls that MTurk throttles after an exponential backoff with jitter
+    """
+    return retry_throttled_call(
+        "create_hit_with_hit_type",
+        lambda: create_hit_with_hit_type(
+            client,
+            frame_height,
+            page_url,
+            hit_type_id,
+            lifetime_in_seconds=lifetime_in_seconds,
+        ),
+        rate_limiter=rate_limiter,
+    )
+
+
+class MTurkHitLauncher:
+    """
+    Creates the HITs for many MTurk units of a task run at once.
+
+    HITs are created from a pool of `concurrency` threads, at most `rate_limit`
+    per second (0 for no limit), and creations that MTurk throttles are retried
+    after a backoff. Each new HIT mapping is written to the datastore as soon as its
+    HIT is created, with HITs created at the same time written together in batches
+    of up to `batch_size`, after which their units are marked as launched.
+    """
+
+    def __init__(
+        self,
+        concurrency: int = DEFAULT_LAUNCH_CONCURRENCY,
+        rate_limit: float = DEFAULT_LAUNCH_RATE_LIMIT,
+        batch_size: int = DEFAULT_DATASTORE_BATCH_SIZE,
+    ):
+        self.concurrency = max(1, concurrency)
+        self.rate_limit = rate_limit
+        self.batch_size = max(1, batch_size)
+
+    def _register_hits(
+        self,
+        created_hits: List[Tuple["MTurkUnit", str, str]],
+        duration: int,
+        run_id: str,
+    ) -> None:
+        """Write the mappings for the given created HITs, then mark their units launched"""
+        for batch_start in range(0, len(created_hits), self.batch_size):
+            batch = created_hits[batch_start : batch_start + self.batch_size]
+            datastore = batch[0][0].datastore
+            datastore.new_hits_bulk(
+                [(hit_id, hit_link, duration, run_id) for _, hit_link, hit_id in batch]
+            )
+            for unit, _, _ in batch:
+                unit.set_db_status(AssignmentState.LAUNCHED)
+
+    def launch(self, units: List["MTurkUnit"], task_url: str) -> None:
+        """
+        Create a HIT for each of the given units, all from the same task run. If any
+        HIT fails to be created, the rest are still launched before the first error
+        is raised.
+        """
+        if len(units) == 0:
+            return
+        task_run = units[0].get_task_run()
+        task_args = task_run.get_task_args()
+        duration = task_args.assignment_duration_in_seconds
+        lifetime_in_seconds = task_args.task_lifetime_in_seconds or DEFAULT_TASK_LIFETIME_SECONDS
+        run_id = task_run.db_id
+        run_details = units[0].datastore.get_run(run_id)
+        client = units[0]._get_client(units[0].get_requester()._requester_name)
+        rate_limiter = None
+        if self.rate_limit > 0:
+            rate_limiter = TokenBucket(self.rate_limit, capacity=self.concurrency)
+
+        def create_hit(unit: "MTurkUnit") -> Tuple["MTurkUnit", str, str]:
+            hit_link, hit_id, _ = create_hit_with_retries(
+                client,
+                run_details["frame_height"],
+                task_url,
+                run_details["hit_type_id"],
+                lifetime_in_seconds=lifetime_in_seconds,
+                rate_limiter=rate_limiter,
+            )
+            return unit, hit_link, hit_id
+
+        hit_link = None
+        first_error: Optional[Exception] = None
+        with ThreadPoolExecutor(
+            max_workers=self.concurrency, thread_name_prefix="mturk-hit-launcher"
+        ) as executor:
+            pending = {executor.submit(create_hit, unit) for unit in units}
+            while len(pending) > 0:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                created_hits: List[Tuple["MTurkUnit", str, str]] = []
+                for future in done:
+                    try:
+                        created_hit = future.result()
+                    except Exception as e:
+                        logger.exception(f"Failed to create a HIT: {e}", exc_info=True)
+                        first_error = first_error or e
+                        continue
+                    created_hits.append(created_hit)
+                    hit_link = created_hit[1]
+                # Write the mappings right away, as the HITs can already be accepted
+                self._register_hits(created_hits, duration, run_id)
+
+        # All of a run's HITs share the same preview link
+        if hit_link is not None:
+            logger.info(f"Launched HITs can be previewed at {hit_link}")
+        if first_error is not None:
+            raise first_error
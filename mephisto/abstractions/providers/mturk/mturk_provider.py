@@ -7,6 +7,10 @@
 import os
 from mephisto.abstractions.providers.mturk.provider_type import PROVIDER_TYPE
 from mephisto.abstractions.providers.mturk.mturk_datastore import MTurkDatastore
+from mephisto.abstractions.providers.mturk.mturk_launch_pipeline import (
+    DEFAULT_LAUNCH_CONCURRENCY,
+    DEFAULT_LAUNCH_RATE_LIMIT,
+)
 from mephisto.abstractions.crowd_provider import CrowdProvider, ProviderArgs
 from mephisto.data_model.requester import RequesterArgs
 from mephisto.abstractions.providers.mturk.mturk_agent import MTurkAgent
@@ -14,6 +18,8 @@ from mephisto.abstractions.providers.mturk.mturk_requester import MTurkRequester
 from mephisto.abstractions.providers.mturk.mturk_unit import MTurkUnit
 from mephisto.abstractions.providers.mturk.mturk_worker import MTurkWorker
 from mephisto.abstractions.providers.mturk.mturk_utils import (
+    DEFAULT_EXPIRE_CONCURRENCY,
+    DEFAULT_EXPIRE_RATE_LIMIT,
     create_hit_type,
     create_hit_config,
     delete_qualification,
@@ -39,6 +45,32 @@ class MTurkProviderArgs(ProviderArgs):
     """Provider args for an MTurk provider"""
 
     _provider_type: str = PROVIDER_TYPE
+    launch_concurrency: int = field(
+        default=DEFAULT_LAUNCH_CONCURRENCY,
+        metadata={"help": "Number of HITs to create on MTurk at the same time when launching"},
+    )
+    launch_rate_limit: float = field(
+        default=DEFAULT_LAUNCH_RATE_LIMIT,
+        metadata={
+            "help": (
+                "Most HITs to create per second when launching, to stay under MTurk's "
+                "request throttling. 0 for no limit, relying on retries of throttled calls"
+            )
+        },
+    )
+    expire_concurrency: int = field(
+        default=DEFAULT_EXPIRE_CONCURRENCY,
+        metadata={"help": "Number of HITs to expire on MTurk at the same time when shutting down"},
+    )
+    expire_rate_limit: float = field(
+        default=DEFAULT_EXPIRE_RATE_LIMIT,
+        metadata={
+            "help": (
+                "Most HITs to start expiring per second when shutting down, to stay under "
+                "MTurk's request throttling. 0 for no limit"
+            )
+        },
+    )
 
 
 @register_mephisto_abstraction()
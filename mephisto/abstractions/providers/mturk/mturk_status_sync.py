@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+
+# Copyright (c) Meta Platforms and its affiliates.
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+from typing import Any
+from typing import Dict
+from typing import NamedTuple
+from typing import Optional
+from typing import Set
+from typing import TYPE_CHECKING
+
+from mephisto.abstractions.providers.mturk.mturk_utils import list_hits_for_hit_type
+from mephisto.abstractions.providers.mturk.mturk_utils import MTurkClient
+from mephisto.abstractions.providers.snapshot_cache import SnapshotCache
+from mephisto.utils.logger_core import get_logger
+
+if TYPE_CHECKING:
+    from mephisto.abstractions.providers.mturk.mturk_datastore import MTurkDatastore
+
+logger = get_logger(name=__name__)
+
+DEFAULT_HIT_STATUS_SYNC_SECONDS = 5
+DEFAULT_SNAPSHOT_MAX_AGE_SECONDS = 60
+
+
+class RunHitsSnapshot(NamedTuple):
+    # HIT data by HIT id
+    hits: Dict[str, Dict[str, Any]]
+    # Units whose returned assignments the sync cleared, and when it was done
+    cleared_unit_ids: Set[str]
+    cleared_time: float
+
+
+class MTurkHitStatusSync:
+    """
+    Keeps a snapshot of the HITs of each MTurk task run, so that the statuses of
+    all units in a run can be resolved without a `get_hit` call for each. Each sync
+    also clears the assignments of returned HITs from their mappings in bulk.
+    """
+
+    def __init__(
+        self,
+        datastore: "MTurkDatastore",
+        sync_interval: float = DEFAULT_HIT_STATUS_SYNC_SECONDS,
+        snapshot_max_age: float = DEFAULT_SNAPSHOT_MAX_AGE_SECONDS,
+    ):
+        self.datastore = datastore
+        self.snapshots: SnapshotCache[RunHitsSnapshot] = SnapshotCache(
+            sync_interval, snapshot_max_age
+        )
+
+    def _list_run_hits(self, client: MTurkClient, run_id: str, sync_time: float) -> RunHitsSnapshot:
+        hit_type_id = self.datastore.get_run(run_id)["hit_type_id"]
+        hit_ids = self.datastore.get_hit_ids_for_run(run_id)
+        hits = list_hits_for_hit_type(client, hit_type_id, hit_ids)
+        assignable_hit_ids = [h["HITId"] for h in hits if h["HITStatus"] == "Assignable"]
+        cleared_unit_ids, cleared_time = self.datastore.clear_returned_assignments(
+            run_id, assignable_hit_ids, sync_time
+        )
+        logger.debug(f"Synced {len(hits)} HITs for run {run_id}")
+        return RunHitsSnapshot(
+            hits={hit["HITId"]: hit for hit in hits},
+            cleared_unit_ids=set(cleared_unit_ids),
+            cleared_time=cleared_time,
+        )
+
+    def sync_run(self, client: MTurkClient, run_id: str) -> Dict[str, Dict[str, Any]]:
+        """Refresh the snapshot of the given run's HITs from MTurk"""
+        _, snapshot = self.snapshots.sync(
+            run_id, lambda sync_time: self._list_run_hits(client, run_id, sync_time)
+        )
+        return snapshot.hits
+
+    def get_hit_for_unit(
+        self,
+        client: MTurkClient,
+        run_id: str,
+        unit_id: str,
+        hit_id: str,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Return the HIT data for the given unit's HIT from the run's snapshot,
+        syncing first if the snapshot is stale. Returns None if the HIT isn't
+        in the snapshot, or the unit's HIT mapping changed since it was taken,
+        in which case the HIT should be queried directly.
+        """
+        sync_time, snapshot = self.snapshots.get(
+            run_id, lambda sync_time: self._list_run_hits(client, run_id, sync_time)
+        )
+        # The sync's own clearing of a returned assignment agrees with the snapshot
+        if unit_id in snapshot.cleared_unit_ids:
+            sync_time = snapshot.cleared_time
+        if not self.datastore.is_hit_mapping_in_sync(unit_id, sync_time):
+            return None
+        return snapshot.hits.get(hit_id)
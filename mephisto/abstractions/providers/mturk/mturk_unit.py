@@ -9,10 +9,18 @@ from datetime import datetime
 from mephisto.data_model.unit import Unit
 from mephisto.data_model.constants.assignment_state import AssignmentState
 from mephisto.abstractions.blueprint import AgentState
+from mephisto.abstractions.providers.mturk.mturk_launch_pipeline import (
+    DEFAULT_LAUNCH_CONCURRENCY,
+    DEFAULT_LAUNCH_RATE_LIMIT,
+    DEFAULT_TASK_LIFETIME_SECONDS,
+    MTurkHitLauncher,
+    create_hit_with_retries,
+)
 from mephisto.abstractions.providers.mturk.mturk_utils import (
+    DEFAULT_EXPIRE_CONCURRENCY,
+    DEFAULT_EXPIRE_RATE_LIMIT,
     expire_hit,
     get_hit,
-    create_hit_with_hit_type,
     get_bonuses_for_assignment,
     calculate_mturk_task_fee,
     calculate_mturk_bonus_fee,
@@ -25,6 +33,7 @@ from typing import List, Optional, Tuple, Mapping, Dict, Any, Type, cast, TYPE_C
 if TYPE_CHECKING:
     from mephisto.abstractions.database import MephistoDB
     from mephisto.data_model.assignment import Assignment
+    from mephisto.data_model.task_run import TaskRun
     from mephisto.abstractions.providers.mturk.mturk_agent import MTurkAgent
     from mephisto.abstractions.providers.mturk.mturk_requester import MTurkRequester
     from mephisto.abstractions.providers.mturk.mturk_datastore import MTurkDatastore
@@ -235,10 +244,15 @@ class MTurkUnit(Unit):
 
         requester = self.get_requester()
         client = self._get_client(requester._requester_name)
-        hit = get_hit(client, mturk_hit_id)
-        if hit is None:
-            return AssignmentState.EXPIRED
-        hit_data = hit["HIT"]
+        hit_data = self.datastore.hit_status_sync.get_hit_for_unit(
+            client, self.task_run_id, self.db_id, mturk_hit_id
+        )
+        if hit_data is None:
+            # Not in the latest snapshot of the run's HITs, ask for it directly
+            hit = get_hit(client, mturk_hit_id)
+            if hit is None:
+                return AssignmentState.EXPIRED
+            hit_data = hit["HIT"]
 
         local_status = self.db_status
         external_status = self.db_status
@@ -285,24 +299,18 @@ class MTurkUnit(Unit):
     def launch(self, task_url: str) -> None:
         """Create this HIT on MTurk (making it available) and register the ids in the local db"""
         task_run = self.get_assignment().get_task_run()
-        duration = task_run.get_task_args().assignment_duration_in_seconds
-        task_lifetime_in_seconds = (
-            task_run.get_task_args().task_lifetime_in_seconds
-            if task_run.get_task_args().task_lifetime_in_seconds
-            else 60 * 60 * 24 * 31
-        )
+        task_args = task_run.get_task_args()
+        duration = task_args.assignment_duration_in_seconds
+        lifetime_in_seconds = task_args.task_lifetime_in_seconds or DEFAULT_TASK_LIFETIME_SECONDS
         run_id = task_run.db_id
         run_details = self.datastore.get_run(run_id)
-        hit_type_id = run_details["hit_type_id"]
-        requester = self.get_requester()
-        client = self._get_client(requester._requester_name)
-        frame_height = run_details["frame_height"]
-        hit_link, hit_id, response = create_hit_with_hit_type(
+        client = self._get_client(self.get_requester()._requester_name)
+        hit_link, hit_id, _ = create_hit_with_retries(
             client,
-            frame_height,
+            run_details["frame_height"],
             task_url,
-            hit_type_id,
-            lifetime_in_seconds=task_lifetime_in_seconds,
+            run_details["hit_type_id"],
+            lifetime_in_seconds=lifetime_in_seconds,
         )
         # TODO(OWN) get this link to the mephisto frontend
         print(hit_link)
@@ -311,7 +319,26 @@ class MTurkUnit(Unit):
         # necessarily match with the same HIT that was launched for it.
         self.datastore.new_hit(hit_id, hit_link, duration, run_id)
         self.set_db_status(AssignmentState.LAUNCHED)
-        return None
+
+    @classmethod
+    def launch_bulk(cls, units: List["Unit"], task_url: str) -> None:
+        """
+        Create HITs for all of the given units, using the task run's
+        launch_concurrency and launch_rate_limit provider args
+        """
+        if len(units) == 0:
+            return
+        if len(units) == 1:
+            units[0].launch(task_url)
+            return
+        provider_args = units[0].get_task_run().args.provider
+        launcher = MTurkHitLauncher(
+            concurrency=provider_args.get("launch_concurrency", DEFAULT_LAUNCH_CONCURRENCY),
+            rate_limit=provider_args.get("launch_rate_limit", DEFAULT_LAUNCH_RATE_LIMIT),
+        )
+        # We create a hit for each unit, but note that a unit may not
+        # necessarily match with the same HIT that was launched for it.
+        launcher.launch(cast(List["MTurkUnit"], units), task_url)
 
     def expire(self) -> float:
         """
@@ -336,17 +363,26 @@ class MTurkUnit(Unit):
             expire_hit(client, mturk_hit_id)
             return delay
         else:
-            unassigned_hit_ids = self.datastore.get_unassigned_hit_ids(self.task_run_id)
+            # Units can be expired concurrently, so claim a HIT atomically
+            # to make sure that every unassigned HIT is expired exactly once
+            hit_id = self.datastore.claim_unassigned_hit(self.task_run_id, self.db_id)
 
-            if len(unassigned_hit_ids) == 0:
+            if hit_id is None:
                 self.set_db_status(AssignmentState.EXPIRED)
                 return delay
-            hit_id = unassigned_hit_ids[0]
             expire_hit(client, hit_id)
-            self.datastore.register_assignment_to_hit(hit_id, self.db_id)
             self.set_db_status(AssignmentState.EXPIRED)
             return delay
 
+    @classmethod
+    def get_expire_limits(cls, task_run: "TaskRun") -> Tuple[int, float]:
+        """Use the task run's expire_concurrency and expire_rate_limit provider args"""
+        provider_args = task_run.args.provider
+        return (
+            provider_args.get("expire_concurrency", DEFAULT_EXPIRE_CONCURRENCY),
+            provider_args.get("expire_rate_limit", DEFAULT_EXPIRE_RATE_LIMIT),
+        )
+
     def is_expired(self) -> bool:
         """
         Determine if this unit is expired as according to the vendor.
@@ -361,6 +397,16 @@ class MTurkUnit(Unit):
         """Create a Unit for the given assignment"""
         return MTurkUnit._register_unit(db, assignment, index, pay_amount, PROVIDER_TYPE)
 
+    @classmethod
+    def new_bulk(
+        cls,
+        db: "MephistoDB",
+        unit_specs: List[Tuple["Assignment", int]],
+        pay_amount: float,
+    ) -> List["Unit"]:
+        """Create Units for all of the given (assignment, index) pairs at once"""
+        return MTurkUnit._register_units_bulk(db, unit_specs, pay_amount, PROVIDER_TYPE)
+
     def __repr__(self) -> str:
         return (
             f"{self.__class__.__name__}({self.db_id}, {self.get_mturk_hit_id()}, {self.db_status})"
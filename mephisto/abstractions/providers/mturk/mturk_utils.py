@@ -7,18 +7,20 @@
 import boto3  # type: ignore
 import os
 import json
+import random
 import re
 import time
-from tqdm import tqdm  # type: ignore
-from typing import Dict, Optional, Tuple, List, Any, TYPE_CHECKING
+from typing import Callable, Dict, Iterable, Optional, Tuple, List, Any, TypeVar, TYPE_CHECKING
 from datetime import datetime
 
 from botocore import client  # type: ignore
 from botocore.exceptions import ClientError, ProfileNotFound  # type: ignore
 from botocore.config import Config  # type: ignore
 from omegaconf import DictConfig
+from prometheus_client import Counter
 
 from mephisto.data_model.qualification import QUAL_EXISTS, QUAL_NOT_EXIST
+from mephisto.utils.concurrency import CallGroup, TokenBucket, run_call_groups
 from mephisto.utils.logger_core import get_logger, format_loud
 from mephisto.operations.config_handler import get_config_arg, DEFAULT_CONFIG_FOLDER
 
@@ -40,6 +42,21 @@ botoconfig = Config(retries=dict(max_attempts=10))
 
 QUALIFICATION_TYPE_EXISTS_MESSAGE = "You have already created a QualificationType with this name."
 
+DEFAULT_EXPIRE_CONCURRENCY = 8
+DEFAULT_EXPIRE_RATE_LIMIT = 20.0  # HIT expirations per second
+MAX_THROTTLED_RETRIES = 6
+RETRY_BACKOFF_SECONDS = 0.5
+MAX_RETRY_BACKOFF_SECONDS = 16
+THROTTLING_ERROR_CODES = ["ThrottlingException", "ServiceUnavailable"]
+
+THROTTLED_MTURK_CALLS = Counter(
+    "mturk_throttled_calls",
+    "Number of MTurk API calls throttled by MTurk and retried",
+    ["operation"],
+)
+
+T = TypeVar("T")
+
 
 def client_is_sandbox(client: MTurkClient) -> bool:
     """
@@ -526,6 +543,32 @@ def create_compensation_hit_with_hit_type(
     return hit_link, hit_id, response
 
 
+def retry_throttled_call(
+    operation: str,
+    call: Callable[[], T],
+    rate_limiter: Optional[TokenBucket] = None,
+) -> T:
+    """
+    Make an MTurk API call, waiting on the rate limiter before every attempt and
+    retrying attempts that MTurk throttles after an exponential backoff with jitter
+    """
+    attempt = 0
+    while True:
+        if rate_limiter is not None:
+            rate_limiter.acquire()
+        try:
+            return call()
+        except ClientError as e:
+            error_code = e.response.get("Error", {}).get("Code")
+            if error_code not in THROTTLING_ERROR_CODES or attempt >= MAX_THROTTLED_RETRIES:
+                raise
+        THROTTLED_MTURK_CALLS.labels(operation=operation).inc()
+        backoff = min(MAX_RETRY_BACKOFF_SECONDS, RETRY_BACKOFF_SECONDS * 2**attempt)
+        attempt += 1
+        logger.debug(f"MTurk {operation} throttled, retry {attempt} in up to {backoff}s")
+        time.sleep(random.uniform(backoff / 2, backoff))
+
+
 def create_hit_with_hit_type(
     client: MTurkClient,
     frame_height: int,
@@ -573,7 +616,10 @@ def create_hit_with_hit_type(
 def expire_hit(client: MTurkClient, hit_id: str):
     # Update expiration to a time in the past, the HIT expires instantly
     past_time = datetime(2015, 1, 1)
-    client.update_expiration_for_hit(HITId=hit_id, ExpireAt=past_time)
+    retry_throttled_call(
+        "update_expiration_for_hit",
+        lambda: client.update_expiration_for_hit(HITId=hit_id, ExpireAt=past_time),
+    )
 
 
 def get_hit(client: MTurkClient, hit_id: str) -> Dict[str, Any]:
@@ -586,6 +632,33 @@ def get_hit(client: MTurkClient, hit_id: str) -> Dict[str, Any]:
     return {}
 
 
+def list_hits_for_hit_type(
+    client: MTurkClient, hit_type_id: str, hit_ids: Optional[Iterable[str]] = None
+) -> List[Dict[str, Any]]:
+    """
+    Page through the requester's HITs, returning those of the given HIT type.
+    MTurk can't filter the listing, so this costs a request per 100 HITs in the
+    account. If given the `hit_ids` to look for, paging stops once all are found
+    """
+    hits: List[Dict[str, Any]] = []
+    missing_hit_ids = None if hit_ids is None else set(hit_ids)
+    if missing_hit_ids is not None and len(missing_hit_ids) == 0:
+        return hits
+    list_kwargs: Dict[str, Any] = {"MaxResults": 100}
+    while True:
+        response = retry_throttled_call("list_hits", lambda: client.list_hits(**list_kwargs))
+        page_hits = [h for h in response.get("HITs", []) if h["HITTypeId"] == hit_type_id]
+        hits += page_hits
+        if missing_hit_ids is not None:
+            missing_hit_ids.difference_update(h["HITId"] for h in page_hits)
+            if len(missing_hit_ids) == 0:
+                return hits
+        next_token = response.get("NextToken")
+        if next_token is None or len(response.get("HITs", [])) == 0:
+            return hits
+        list_kwargs["NextToken"] = next_token
+
+
 def get_assignment(client: MTurkClient, assignment_id: str) -> Dict[str, Any]:
     """Gets assignment from mturk by assignment_id. Only works if the
     assignment is in a completed state
@@ -641,11 +714,29 @@ def unblock_worker(client: MTurkClient, worker_id: str, reason: str) -> None:
     client.delete_worker_block(WorkerId=worker_id, Reason=reason)
 
 
+def list_blocked_worker_ids(client: MTurkClient) -> List[str]:
+    """Page through all of the workers blocked by this client"""
+    blocked_ids: List[str] = []
+    list_kwargs: Dict[str, Any] = {"MaxResults": 100}
+    while True:
+        response = retry_throttled_call(
+            "list_worker_blocks", lambda: client.list_worker_blocks(**list_kwargs)
+        )
+        blocks = response.get("WorkerBlocks", [])
+        blocked_ids += [block["WorkerId"] for block in blocks]
+        next_token = response.get("NextToken")
+        if next_token is None or len(blocks) == 0:
+            return blocked_ids
+        list_kwargs["NextToken"] = next_token
+
+
 def is_worker_blocked(client: MTurkClient, worker_id: str) -> bool:
-    """Determine if the given worker is blocked by this client"""
-    blocks = client.list_worker_blocks(MaxResults=100)["WorkerBlocks"]
-    blocked_ids = [x["WorkerId"] for x in blocks]
-    return worker_id in blocked_ids
+    """
+    Determine if the given worker is blocked by this client. This lists all of the
+    client's blocks, so repeated checks should go through the datastore's
+    worker_block_cache instead
+    """
+    return worker_id in list_blocked_worker_ids(client)
 
 
 def pay_bonus(
@@ -708,20 +799,39 @@ def get_outstanding_hits(client: MTurkClient) -> Dict[str, List[Dict[str, Any]]]
 
 
 def expire_and_dispose_hits(
-    client: MTurkClient, hits: List[Dict[str, Any]], quiet: bool = False
+    client: MTurkClient,
+    hits: List[Dict[str, Any]],
+    quiet: bool = False,
+    concurrency: int = DEFAULT_EXPIRE_CONCURRENCY,
+    rate_limit: float = DEFAULT_EXPIRE_RATE_LIMIT,
 ) -> List[Dict[str, Any]]:
     """
-    Loops over attempting to expire and dispose any hits in the hits list that can be disposed
-    Returns any HITs that could not be disposed of
+    Attempts to dispose of all the hits in the hits list, expiring any that can't be
+    disposed. Works on up to `concurrency` hits at once, starting at most `rate_limit`
+    per second (0 for no limit). Returns any HITs that could not be disposed of
     """
-    non_disposed_hits = []
-    for h in tqdm(hits, disable=quiet):
+
+    def dispose_hit(hit: Dict[str, Any]) -> bool:
         try:
-            client.delete_hit(HITId=h["HITId"])
+            retry_throttled_call("delete_hit", lambda: client.delete_hit(HITId=hit["HITId"]))
+            return True
         except Exception as e:
-            client.update_expiration_for_hit(HITId=h["HITId"], ExpireAt=datetime(2015, 1, 1))
-            h["dispose_exception"] = e
-            non_disposed_hits.append(h)
+            hit["dispose_exception"] = e
+        expire_hit(client, hit["HITId"])
+        return False
+
+    results = run_call_groups(
+        [CallGroup("mturk-dispose", hits, dispose_hit, concurrency, rate_limit)],
+        description="Disposing HITs",
+        quiet=quiet,
+    )
+    non_disposed_hits = []
+    for result in results:
+        if result.error is not None:
+            logger.warning(f"Failed to expire HIT {result.item['HITId']}: {result.error}")
+        elif result.result:
+            continue
+        non_disposed_hits.append(result.item)
     return non_disposed_hits
 
 
@@ -15,7 +15,7 @@ from uuid import uuid4
 from mephisto.abstractions.providers.mturk.mturk_utils import block_worker
 from mephisto.abstractions.providers.mturk.mturk_utils import email_worker
 from mephisto.abstractions.providers.mturk.mturk_utils import give_worker_qualification
-from mephisto.abstractions.providers.mturk.mturk_utils import is_worker_blocked
+from mephisto.abstractions.providers.mturk.mturk_utils import list_blocked_worker_ids
 from mephisto.abstractions.providers.mturk.mturk_utils import pay_bonus
 from mephisto.abstractions.providers.mturk.mturk_utils import remove_worker_qualification
 from mephisto.abstractions.providers.mturk.mturk_utils import unblock_worker
@@ -158,6 +158,7 @@ class MTurkWorker(Worker):
         requester = cast("MTurkRequester", requester)
         client = self._get_client(requester._requester_name)
         block_worker(client, self._worker_name, reason)
+        self.datastore.worker_block_cache.add_block(requester._requester_name, self._worker_name)
         return True, ""
 
     def unblock_worker(self, reason: str, requester: "Requester") -> bool:
@@ -165,13 +166,20 @@ class MTurkWorker(Worker):
         requester = cast("MTurkRequester", requester)
         client = self._get_client(requester._requester_name)
         unblock_worker(client, self._worker_name, reason)
+        self.datastore.worker_block_cache.remove_block(requester._requester_name, self._worker_name)
         return True
 
     def is_blocked(self, requester: "Requester") -> bool:
-        """Determine if a worker is blocked"""
+        """
+        Determine if a worker is blocked, from the requester's cached list of blocks
+        """
         requester = cast("MTurkRequester", requester)
-        client = self._get_client(requester._requester_name)
-        return is_worker_blocked(client, self._worker_name)
+        requester_name = requester._requester_name
+        return self.datastore.worker_block_cache.is_blocked(
+            requester_name,
+            self._worker_name,
+            lambda: list_blocked_worker_ids(self._get_client(requester_name)),
+        )
 
     def is_eligible(self, task_run: "TaskRun") -> bool:
         """
@@ -6,11 +6,14 @@
 
 import json
 import os
+import threading
 from typing import Optional
 from typing import Union
 from urllib.parse import urljoin
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from mephisto.utils import http_status
 from mephisto.utils.logger_core import get_logger
@@ -23,6 +26,18 @@ BASE_URL = os.environ.get("PROLIFIC_BASE_URL", "https://api.prolific.co/api/v1/"
 CREDENTIALS_CONFIG_DIR = "~/.prolific/"
 CREDENTIALS_CONFIG_PATH = os.path.join(CREDENTIALS_CONFIG_DIR, "credentials")
 
+# Retries for failed connections and throttled or failing responses. Only requests
+# with idempotent methods (so not POST or PATCH) are retried on error responses
+MAX_REQUEST_RETRIES = 3
+REQUEST_RETRY_BACKOFF_FACTOR = 0.5
+REQUEST_RETRY_STATUS_CODES = [
+    http_status.HTTP_429_TOO_MANY_REQUESTS,
+    http_status.HTTP_500_INTERNAL_SERVER_ERROR,
+    http_status.HTTP_502_BAD_GATEWAY,
+    http_status.HTTP_503_SERVICE_UNAVAILABLE,
+    http_status.HTTP_504_GATEWAY_TIMEOUT,
+]
+
 logger = get_logger(name=__name__)
 
 
@@ -40,6 +55,32 @@ def get_prolific_api_key() -> Union[str, None]:
 PROLIFIC_API_KEY = os.environ.get("PROLIFIC_API_KEY", "") or get_prolific_api_key()
 
 
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+
+def get_prolific_session() -> requests.Session:
+    """
+    Return the keep-alive session shared by all API resources, so that requests
+    reuse pooled connections rather than each doing a new TLS handshake
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            retry = Retry(
+                total=MAX_REQUEST_RETRIES,
+                backoff_factor=REQUEST_RETRY_BACKOFF_FACTOR,
+                status_forcelist=REQUEST_RETRY_STATUS_CODES,
+                # Return the last error response, so it's handled like any other
+                raise_on_status=False,
+            )
+            session = requests.Session()
+            session.mount("https://", HTTPAdapter(max_retries=retry))
+            session.mount("http://", HTTPAdapter(max_retries=retry))
+            _session = session
+        return _session
+
+
 class HTTPMethod:
     GET = "get"
     POST = "post"
@@ -78,17 +119,18 @@ class BaseAPIResource(object):
 
             logger.debug(f"{log_prefix} {method} {url}. Params: {params}")
 
+            session = get_prolific_session()
             if method == HTTPMethod.GET:
-                response = requests.get(url, headers=headers, json=params)
+                response = session.get(url, headers=headers, json=params)
 
             elif method == HTTPMethod.POST:
-                response = requests.post(url, headers=headers, json=params)
+                response = session.post(url, headers=headers, json=params)
 
             elif method == HTTPMethod.PATCH:
-                response = requests.patch(url, headers=headers, json=params)
+                response = session.patch(url, headers=headers, json=params)
 
             elif method == HTTPMethod.DELETE:
-                response = requests.delete(url, headers=headers, json=params)
+                response = session.delete(url, headers=headers, json=params)
 
             else:
                 raise ProlificException("Invalid HTTP method.")
@@ -83,8 +83,14 @@ class ParticipantGroups(BaseAPIResource):
         https://docs.prolific.co/docs/api-docs/public/#tag/
             Participant-Groups/paths/~1api~1v1~1participant-groups~1%7Bid%7D~1participants~1/get
         """
-        response_json = cls.get(cls.list_participants_for_group_api_endpoint.format(id=id))
-        participants = [Participant(**s) for s in response_json["results"]]
+        endpoint = cls.list_participants_for_group_api_endpoint.format(id=id)
+        participants = []
+        # Results are paginated, with a link to the next page until the last
+        while endpoint:
+            response_json = cls.get(endpoint)
+            participants += [Participant(**s) for s in response_json["results"]]
+            next_link = (response_json.get("_links") or {}).get("next") or {}
+            endpoint = next_link.get("href")
         return participants
 
     @classmethod
@@ -28,8 +28,13 @@ class Submissions(BaseAPIResource):
         endpoint = cls.list_api_endpoint
         if study_id:
             endpoint = f"{endpoint}?study={study_id}"
-        response_json = cls.get(endpoint)
-        submissions = [ListSubmission(**s) for s in response_json["results"]]
+        submissions = []
+        # Results are paginated, with a link to the next page until the last
+        while endpoint:
+            response_json = cls.get(endpoint)
+            submissions += [ListSubmission(**s) for s in response_json["results"]]
+            next_link = (response_json.get("_links") or {}).get("next") or {}
+            endpoint = next_link.get("href")
         return submissions
 
     @classmethod
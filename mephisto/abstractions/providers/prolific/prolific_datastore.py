@@ -9,7 +9,6 @@ import os
 import sqlite3
 import threading
 import time
-from collections import defaultdict
 from typing import Any
 from typing import Dict
 from typing import List
@@ -18,6 +17,7 @@ from typing import Optional
 from mephisto.abstractions.databases.local_database import is_unique_failure
 from mephisto.abstractions.providers.prolific.api.constants import StudyStatus
 from mephisto.abstractions.providers.prolific.provider_type import PROVIDER_TYPE
+from mephisto.utils.block_list_cache import BlockListCache
 from mephisto.utils.db import apply_migrations
 from mephisto.utils.db import check_if_row_with_params_exists
 from mephisto.utils.db import EntryAlreadyExistsException
@@ -30,6 +30,7 @@ from . import prolific_datastore_tables as tables
 from .api.client import ProlificClient
 from .migrations import migrations
 from .prolific_datastore_export import export_datastore
+from .prolific_status_cache import ProlificStatusCache
 from .prolific_utils import get_authenticated_client
 
 logger = get_logger(name=__name__)
@@ -45,9 +46,11 @@ class ProlificDatastore:
         self.db_path = os.path.join(datastore_root, f"{PROVIDER_TYPE}.db")
         self.init_tables()
         self.datastore_root = datastore_root
-        self._last_study_mapping_update_times: Dict[str, float] = defaultdict(
-            lambda: time.monotonic()
-        )
+        # Units whose Study mapping was never changed by this process have no entry
+        self._last_study_mapping_update_times: Dict[str, float] = {}
+        self.status_cache = ProlificStatusCache(self)
+        # Workers in each block list Participant Group
+        self.worker_block_cache = BlockListCache()
 
     def get_connection(self) -> sqlite3.Connection:
         """
@@ -92,7 +95,7 @@ class ProlificDatastore:
 
     def is_study_mapping_in_sync(self, unit_id: str, compare_time: float):
         """Determine if a cached value from the given compare time is still valid"""
-        return compare_time > self._last_study_mapping_update_times[unit_id]
+        return compare_time > self._last_study_mapping_update_times.get(unit_id, 0.0)
 
     @retry_generate_id(caught_excs=[EntryAlreadyExistsException])
     def new_study(
@@ -543,6 +546,7 @@ class ProlificDatastore:
                 (prolific_submission_id, unit_id),
             )
             conn.commit()
+            self._mark_study_mapping_update(unit_id)
             return None
 
     def get_session_for_requester(self, requester_name: str) -> ProlificClient:
@@ -32,8 +32,8 @@ from mephisto.abstractions.providers.prolific.prolific_worker import ProlificWor
 from mephisto.abstractions.providers.prolific.provider_type import PROVIDER_TYPE
 from mephisto.operations.registry import register_mephisto_abstraction
 from mephisto.utils.logger_core import get_logger
+from mephisto.utils.qualifications import QualificationEvaluator
 from mephisto.utils.qualifications import QualificationType
-from mephisto.utils.qualifications import worker_is_qualified
 from .api.client import ProlificClient
 from .api.data_models import ParticipantGroup
 from .api.data_models import Project
@@ -192,9 +192,9 @@ class ProlificProvider(CrowdProvider):
         # `worker_name` is Prolific Participant ID in provider-specific datastore
         available_workers = [w for w in workers if w.worker_name not in bloked_participant_ids]
 
+        evaluator = QualificationEvaluator(self.db, qualifications, self._get_last_task_run())
         for worker in available_workers:
-            task_run = self._get_last_task_run()
-            if worker_is_qualified(worker, qualifications, task_run):
+            if evaluator.is_qualified(worker):
                 qualified_workers.append(worker)
 
         return qualified_workers
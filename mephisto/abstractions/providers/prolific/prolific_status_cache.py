@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+
+# Copyright (c) Meta Platforms and its affiliates.
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+from typing import Dict
+from typing import Optional
+from typing import TYPE_CHECKING
+
+from mephisto.abstractions.providers.prolific import prolific_utils
+from mephisto.abstractions.providers.prolific.api.client import ProlificClient
+from mephisto.abstractions.providers.prolific.api.data_models import ListSubmission
+from mephisto.abstractions.providers.prolific.api.data_models import Study
+from mephisto.abstractions.providers.snapshot_cache import SnapshotCache
+from mephisto.utils.logger_core import get_logger
+
+if TYPE_CHECKING:
+    from mephisto.abstractions.providers.prolific.prolific_datastore import ProlificDatastore
+
+logger = get_logger(name=__name__)
+
+DEFAULT_STATUS_SYNC_SECONDS = 5
+DEFAULT_SNAPSHOT_MAX_AGE_SECONDS = 60
+
+
+class ProlificStatusCache:
+    """
+    Keeps snapshots of Prolific Studies and of their Submissions, so that a sweep
+    over the units of a Study costs one Study request and one paged Submissions
+    listing, rather than a pair of requests per unit
+    """
+
+    def __init__(
+        self,
+        datastore: "ProlificDatastore",
+        sync_interval: float = DEFAULT_STATUS_SYNC_SECONDS,
+        snapshot_max_age: float = DEFAULT_SNAPSHOT_MAX_AGE_SECONDS,
+    ):
+        self.datastore = datastore
+        self.studies: SnapshotCache[Study] = SnapshotCache(sync_interval, snapshot_max_age)
+        # Submissions of each Study by Submission id
+        self.submissions: SnapshotCache[Dict[str, ListSubmission]] = SnapshotCache(
+            sync_interval, snapshot_max_age
+        )
+
+    def _get_study(self, client: ProlificClient, study_id: str) -> Study:
+        study = prolific_utils.get_study(client, study_id)
+        self.datastore.update_study_status(study.id, study.status)
+        return study
+
+    def _list_submissions(self, client: ProlificClient, study_id: str) -> Dict[str, ListSubmission]:
+        submissions = prolific_utils.list_submissions_for_study(client, study_id)
+        logger.debug(f"Synced {len(submissions)} Submissions for Study {study_id}")
+        return {submission.id: submission for submission in submissions}
+
+    def get_study(self, client: ProlificClient, study_id: str) -> Study:
+        """Return the Study, retrieving it from Prolific if the snapshot is stale"""
+        _, study = self.studies.get(study_id, lambda _: self._get_study(client, study_id))
+        return study
+
+    def sync_submissions(self, client: ProlificClient, study_id: str) -> Dict[str, ListSubmission]:
+        """Refresh the snapshot of the given Study's Submissions from Prolific"""
+        _, snapshot = self.submissions.sync(
+            study_id, lambda _: self._list_submissions(client, study_id)
+        )
+        return snapshot
+
+    def get_submission_for_unit(
+        self,
+        client: ProlificClient,
+        study_id: str,
+        unit_id: str,
+        submission_id: str,
+    ) -> Optional[ListSubmission]:
+        """
+        Return the given unit's Submission from the Study's snapshot, syncing
+        first if the snapshot is stale. Returns None if the Submission isn't in
+        the snapshot, or the unit's Study mapping changed since it was taken,
+        in which case the Submission should be retrieved directly.
+        """
+        sync_time, snapshot = self.submissions.get(
+            study_id, lambda _: self._list_submissions(client, study_id)
+        )
+        if not self.datastore.is_study_mapping_in_sync(unit_id, sync_time):
+            return None
+        return snapshot.get(submission_id)
+
+    def clear_study(self, study_id: str) -> None:
+        """Drop the snapshots for the given Study"""
+        self.studies.clear(study_id)
+        self.submissions.clear(study_id)
+        logger.debug(f"Dropped snapshots for Study {study_id}")
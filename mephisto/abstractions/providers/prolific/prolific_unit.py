@@ -151,11 +151,11 @@ class ProlificUnit(Unit):
 
         # time.sleep(2)  # Prolific servers may take time to bring their data up-to-date
 
-        # Get Study from Prolific, record status
-        study = prolific_utils.get_study(client, self.get_prolific_study_id())
+        # Get Study from Prolific (at most once per sync interval), record status
+        study_id = self.get_prolific_study_id()
+        study = self.datastore.status_cache.get_study(client, study_id)
         if study is None:
             return AssignmentState.EXPIRED
-        self.datastore.update_study_status(study.id, study.status)
         study_is_completed = study.status in [
             StudyStatus.COMPLETED,
             StudyStatus.AWAITING_REVIEW,
@@ -166,7 +166,13 @@ class ProlificUnit(Unit):
         prolific_submission_id = datastore_unit["prolific_submission_id"]
         prolific_submission = None
         if prolific_submission_id:
-            prolific_submission = prolific_utils.get_submission(client, prolific_submission_id)
+            # Resolve from the Study's Submissions snapshot, only asking Prolific
+            # for this one Submission if the snapshot can't answer for it
+            prolific_submission = self.datastore.status_cache.get_submission_for_unit(
+                client, study_id, self.db_id, prolific_submission_id
+            )
+            if prolific_submission is None:
+                prolific_submission = prolific_utils.get_submission(client, prolific_submission_id)
             self.datastore.update_submission_status(
                 prolific_submission_id,
                 prolific_submission.status,
@@ -356,6 +362,7 @@ class ProlificUnit(Unit):
                 requester = self.get_requester()
                 client = self._get_client(requester.requester_name)
                 prolific_utils.stop_study(client, datastore_task_run["prolific_study_id"])
+                self.datastore.status_cache.clear_study(datastore_task_run["prolific_study_id"])
 
         # Update status
         if status in [AssignmentState.EXPIRED, AssignmentState.COMPLETED]:
@@ -377,6 +384,7 @@ class ProlificUnit(Unit):
         # Operator expires only units (not studies), so we expire study when no active units left
         if self.datastore.all_study_units_are_expired(self.task_run_id):
             prolific_utils.expire_study(client, prolific_study_id)
+            self.datastore.status_cache.clear_study(prolific_study_id)
 
         return delay
 
@@ -20,6 +20,7 @@ from jsonschema.exceptions import ValidationError
 from omegaconf import DictConfig
 
 from mephisto.abstractions.architects.ec2 import ec2_architect
+from mephisto.utils.block_list_cache import BlockListCache
 from mephisto.utils.logger_core import get_logger
 from . import api as prolific_api
 from .api import constants
@@ -28,6 +29,7 @@ from .api.base_api_resource import CREDENTIALS_CONFIG_DIR
 from .api.base_api_resource import CREDENTIALS_CONFIG_PATH
 from .api.client import ProlificClient
 from .api.data_models import BonusPayments
+from .api.data_models import ListSubmission
 from .api.data_models import Message
 from .api.data_models import Participant
 from .api.data_models import ParticipantGroup
@@ -655,16 +657,38 @@ def _get_block_list_qualification(
     return block_list_qualification
 
 
+def _get_block_list_key(task_run_config: "DictConfig") -> str:
+    """Key of the run's block list (Participant Group) in a BlockListCache"""
+    provider_args = task_run_config.provider
+    return "/".join(
+        [
+            provider_args.prolific_workspace_name,
+            provider_args.prolific_project_name,
+            provider_args.prolific_block_list_group_name,
+        ]
+    )
+
+
 def block_worker(
     client: ProlificClient,
     task_run_config: "DictConfig",
     worker_id: str,
     *args,
+    block_list_cache: Optional[BlockListCache] = None,
     **kwargs,
 ) -> None:
-    """Block a worker by id using the Prolific client, passes reason along"""
+    """
+    Block a worker by id using the Prolific client, passes reason along.
+    With a `block_list_cache`, workers already in the block list aren't added again.
+    """
     block_list_qualification = _get_block_list_qualification(client, task_run_config)
+    if block_list_cache is not None and is_worker_blocked(
+        client, task_run_config, worker_id, block_list_cache
+    ):
+        return
     give_worker_qualification(client, worker_id, block_list_qualification.id)
+    if block_list_cache is not None:
+        block_list_cache.add_block(_get_block_list_key(task_run_config), worker_id)
 
 
 def unblock_worker(
@@ -672,23 +696,28 @@ def unblock_worker(
     task_run_config: "DictConfig",
     worker_id: str,
     *args,
+    block_list_cache: Optional[BlockListCache] = None,
     **kwargs,
 ) -> None:
-    """Remove a block on the given worker"""
+    """
+    Remove a block on the given worker.
+    With a `block_list_cache`, workers not in the block list aren't removed again.
+    """
     block_list_qualification = _get_block_list_qualification(client, task_run_config)
+    if block_list_cache is not None and not is_worker_blocked(
+        client, task_run_config, worker_id, block_list_cache
+    ):
+        return
     remove_worker_qualification(client, worker_id, block_list_qualification.id)
+    if block_list_cache is not None:
+        block_list_cache.remove_block(_get_block_list_key(task_run_config), worker_id)
 
 
-def is_worker_blocked(
+def list_blocked_worker_ids(
     client: ProlificClient,
     task_run_config: "DictConfig",
-    worker_id: str,
-) -> bool:
-    """Determine if the given worker is blocked by this client
-
-    Note that we're currently not using this check against Prolific "Blocked Participants" group
-    and simply looked at `is_blocked` column in our datastore.
-    """
+) -> List[str]:
+    """Get the ids of all workers in the block list Participant Group"""
     workspace = find_or_create_prolific_workspace(
         client,
         title=task_run_config.provider.prolific_workspace_name,
@@ -705,7 +734,7 @@ def is_worker_blocked(
     )
 
     if not block_list_qualification:
-        return False
+        return []
 
     try:
         participants: List[Participant] = client.ParticipantGroups.list_participants_for_group(
@@ -717,11 +746,31 @@ def is_worker_blocked(
         )
         raise
 
-    participants_ids = [p.participant_id for p in participants]
-    if worker_id in participants_ids:
-        return True
+    return [p.participant_id for p in participants]
 
-    return False
+
+def is_worker_blocked(
+    client: ProlificClient,
+    task_run_config: "DictConfig",
+    worker_id: str,
+    block_list_cache: Optional[BlockListCache] = None,
+) -> bool:
+    """Determine if the given worker is in the block list Participant Group of this client
+
+    Note that `ProlificWorker.is_blocked` doesn't use this check, and simply looks at
+    the `is_blocked` column in our datastore.
+
+    Without a `block_list_cache` every call looks up the block list Participant Group and
+    lists all of its participants. With one, that only happens when the cached list is stale.
+    """
+    if block_list_cache is None:
+        return worker_id in list_blocked_worker_ids(client, task_run_config)
+
+    return block_list_cache.is_blocked(
+        _get_block_list_key(task_run_config),
+        worker_id,
+        lambda: list_blocked_worker_ids(client, task_run_config),
+    )
 
 
 def calculate_pay_amount(
@@ -749,6 +798,16 @@ def get_submission(client: ProlificClient, submission_id: str) -> Submission:
     return submission
 
 
+def list_submissions_for_study(client: ProlificClient, study_id: str) -> List[ListSubmission]:
+    """Get all Submissions of a Study, paging through the results"""
+    try:
+        submissions: List[ListSubmission] = client.Submissions.list(study_id=study_id)
+    except (ProlificException, ValidationError):
+        logger.exception(f'Could not list Submissions for a Study "{study_id}"')
+        raise
+    return submissions
+
+
 def approve_work(
     client: ProlificClient,
     submission_id: str,
@@ -142,7 +142,13 @@ class ProlificWorker(Worker):
         task_run_args = task_run.args
         requester: "ProlificRequester" = cast("ProlificRequester", requester)
         client = self._get_client(requester.requester_name)
-        prolific_utils.block_worker(client, task_run_args, self.worker_name, reason)
+        prolific_utils.block_worker(
+            client,
+            task_run_args,
+            self.worker_name,
+            reason,
+            block_list_cache=self.datastore.worker_block_cache,
+        )
         self.datastore.set_worker_blocked(self.worker_name, is_blocked=True)
 
         # Find all previously granted qualifications for this worker,
@@ -178,7 +184,13 @@ class ProlificWorker(Worker):
         task_run_args = task_run.args
         requester: "ProlificRequester" = cast("ProlificRequester", requester)
         client = self._get_client(requester.requester_name)
-        prolific_utils.unblock_worker(client, task_run_args, self.worker_name, reason)
+        prolific_utils.unblock_worker(
+            client,
+            task_run_args,
+            self.worker_name,
+            reason,
+            block_list_cache=self.datastore.worker_block_cache,
+        )
         self.datastore.set_worker_blocked(self.worker_name, is_blocked=False)
 
         # Include unblocked Worker into all Participant Groups for currently running Studies,
@@ -191,6 +203,7 @@ class ProlificWorker(Worker):
     def is_blocked(self, requester: "Requester") -> bool:
         """Determine if a worker is blocked"""
         task_run = self._get_last_task_run(requester)
+        # Our datastore is the authority on blocks, as in `_grant_crowd_qualifications`
         is_blocked = self.datastore.get_worker_blocked(self.get_prolific_participant_id())
 
         logger.debug(
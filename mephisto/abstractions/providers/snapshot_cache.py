@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+
+# Copyright (c) Meta Platforms and its affiliates.
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+import threading
+import time
+from typing import Callable
+from typing import Dict
+from typing import Generic
+from typing import List
+from typing import Tuple
+from typing import TypeVar
+
+T = TypeVar("T")
+
+
+class SnapshotCache(Generic[T]):
+    """
+    Snapshots of crowd provider data by key (such as a task run or a Study), each
+    refreshed at most once every `sync_interval` seconds, so that many lookups in the
+    same snapshot cost one provider listing. Snapshots that weren't refreshed for
+    `max_age` seconds are dropped, so long-lived processes don't keep every past one.
+    """
+
+    def __init__(self, sync_interval: float, max_age: float):
+        self.sync_interval = sync_interval
+        self.max_age = max_age
+        # Key -> (time of the sync, snapshot)
+        self._snapshots: Dict[str, Tuple[float, T]] = {}
+        self._key_locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def _acquire_key_lock(self, key: str) -> threading.Lock:
+        """Acquire the lock syncing the given key, one that `clear` didn't drop meanwhile"""
+        while True:
+            with self._lock:
+                key_lock = self._key_locks.setdefault(key, threading.Lock())
+            key_lock.acquire()
+            with self._lock:
+                if self._key_locks.get(key) is key_lock:
+                    return key_lock
+            key_lock.release()
+
+    def keys(self) -> List[str]:
+        """Keys that currently have a snapshot"""
+        with self._lock:
+            return list(self._snapshots.keys())
+
+    def get(self, key: str, fetch: Callable[[float], T]) -> Tuple[float, T]:
+        """
+        Return the time of the sync and the snapshot for the given key, first refreshing
+        it with `fetch` if it's missing or stale. `fetch` gets the time of the sync,
+        taken before the provider is asked, and is only called by one thread per key
+        """
+        return self._get(key, fetch, force_sync=False)
+
+    def sync(self, key: str, fetch: Callable[[float], T]) -> Tuple[float, T]:
+        """Refresh the snapshot for the given key with `fetch`, as in `get`"""
+        return self._get(key, fetch, force_sync=True)
+
+    def _get(self, key: str, fetch: Callable[[float], T], force_sync: bool) -> Tuple[float, T]:
+        key_lock = self._acquire_key_lock(key)
+        is_synced = False
+        try:
+            with self._lock:
+                snapshot_entry = self._snapshots.get(key)
+            if (
+                force_sync
+                or snapshot_entry is None
+                or time.monotonic() - snapshot_entry[0] > self.sync_interval
+            ):
+                sync_time = time.monotonic()
+                snapshot_entry = (sync_time, fetch(sync_time))
+                with self._lock:
+                    self._snapshots[key] = snapshot_entry
+                is_synced = True
+        finally:
+            key_lock.release()
+
+        if is_synced:
+            self.evict_stale()
+        return snapshot_entry
+
+    def evict_stale(self) -> List[str]:
+        """Drop snapshots that weren't synced within `max_age`, returning their keys"""
+        now = time.monotonic()
+        with self._lock:
+            stale_keys = [
+                key
+                for key, (sync_time, _) in self._snapshots.items()
+                if now - sync_time > self.max_age
+            ]
+            # Locks that were held when their snapshots were cleared
+            lock_only_keys = [key for key in self._key_locks if key not in self._snapshots]
+        for key in stale_keys + lock_only_keys:
+            self.clear(key)
+        return stale_keys
+
+    def clear(self, key: str) -> None:
+        """
+        Drop the snapshot for the given key. Its lock is only dropped if nobody holds it,
+        otherwise a sync in progress and a later one could run under different locks
+        """
+        with self._lock:
+            self._snapshots.pop(key, None)
+            key_lock = self._key_locks.get(key)
+            if key_lock is not None and key_lock.acquire(blocking=False):
+                del self._key_locks[key]
+                key_lock.release()
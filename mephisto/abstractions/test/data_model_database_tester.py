@@ -6,7 +6,9 @@
 
 
 import json
+import threading
 import unittest
+from typing import List
 from typing import Optional
 
 from omegaconf import OmegaConf
@@ -684,6 +686,76 @@ class BaseDatabaseTests(unittest.TestCase):
         units = db.find_units()
         self.assertEqual(len(units), 1)
 
+    def test_bulk_assignments_and_units(self) -> None:
+        """Ensure assignments and units can be created in bulk"""
+        assert self.db is not None, "No db initialized"
+        db: MephistoDB = self.db
+
+        task_run = TaskRun.get(db, get_test_task_run(db))
+        assignment_rows = db.new_assignments_bulk(
+            task_run.task_id,
+            task_run.db_id,
+            task_run.requester_id,
+            task_run.task_type,
+            task_run.provider_type,
+            3,
+            sandbox=task_run.sandbox,
+        )
+        assignment_ids = [row["assignment_id"] for row in assignment_rows]
+        for row in assignment_rows:
+            self.assertEqual(row["task_run_id"], task_run.db_id)
+        self.assertEqual(len(assignment_ids), 3)
+        self.assertEqual(len(set(assignment_ids)), 3)
+        self.assertEqual(
+            sorted(a.db_id for a in db.find_assignments(task_run_id=task_run.db_id)),
+            sorted(assignment_ids),
+        )
+
+        unit_specs = [(assignment_id, idx) for assignment_id in assignment_ids for idx in range(2)]
+        unit_rows = db.new_units_bulk(
+            task_run.task_id,
+            task_run.db_id,
+            task_run.requester_id,
+            unit_specs,
+            15.0,
+            PROVIDER_TYPE,
+            task_run.task_type,
+            sandbox=task_run.sandbox,
+        )
+        self.assertEqual(len(unit_rows), 6)
+        for row, (assignment_id, unit_index) in zip(unit_rows, unit_specs):
+            unit = Unit.get(db, row["unit_id"])
+            self.assertEqual(unit.assignment_id, assignment_id)
+            self.assertEqual(unit.unit_index, unit_index)
+            self.assertEqual(unit.db_status, AssignmentState.CREATED)
+        self.assertEqual(len(db.find_units(task_run_id=task_run.db_id)), 6)
+        self.assertEqual(len(db.find_units(assignment_id=assignment_ids[0])), 2)
+
+        # Can't create the same units again
+        with self.assertRaises(EntryAlreadyExistsException):
+            db.new_units_bulk(
+                task_run.task_id,
+                task_run.db_id,
+                task_run.requester_id,
+                unit_specs[:1],
+                15.0,
+                PROVIDER_TYPE,
+                task_run.task_type,
+                sandbox=task_run.sandbox,
+            )
+
+        self.assertEqual(
+            db.new_assignments_bulk(
+                task_run.task_id,
+                task_run.db_id,
+                task_run.requester_id,
+                task_run.task_type,
+                task_run.provider_type,
+                0,
+            ),
+            [],
+        )
+
     def test_unit_updates(self) -> None:
         """Test updating a unit's status"""
         assert self.db is not None, "No db initialized"
@@ -705,6 +777,121 @@ class BaseDatabaseTests(unittest.TestCase):
         with self.assertRaises(MephistoDBException):
             db.update_unit(unit_id, status="FAKE_STATUS")
 
+    def test_find_launchable_units_for_worker(self) -> None:
+        """Test finding the units a worker could be assigned to"""
+        assert self.db is not None, "No db initialized"
+        db: MephistoDB = self.db
+
+        task_run = TaskRun.get(db, get_test_task_run(db))
+        joined = Assignment.get(db, get_test_assignment(db, task_run))
+        other = Assignment.get(db, get_test_assignment(db, task_run))
+        joined_ids = [get_test_unit(db, idx, joined) for idx in range(2)]
+        other_ids = [get_test_unit(db, idx, other) for idx in range(2)]
+        special_id = get_test_unit(db, -1, other)
+        for unit_id in joined_ids + other_ids[:1] + [special_id]:
+            Unit.get(db, unit_id).set_db_status(AssignmentState.LAUNCHED)
+        _, worker_id = get_test_worker(db)
+        _, other_worker_id = get_test_worker(db, "other_worker")
+
+        def launchable(worker_id: str) -> set:
+            # Units created within the same second may come in either order
+            units = db.find_launchable_units_for_worker(task_run.db_id, worker_id)
+            unit_ids = set(u.db_id for u in units)
+            self.assertEqual(len(units), len(unit_ids))
+            return unit_ids
+
+        self.assertEqual(launchable(worker_id), set(joined_ids + other_ids[:1]))
+
+        # Once the worker joins an assignment, none of its units are launchable
+        # for them, but the remaining ones are for other workers
+        unit = Unit.get(db, joined_ids[0])
+        db.new_agent(
+            worker_id,
+            unit.db_id,
+            unit.task_id,
+            unit.task_run_id,
+            unit.assignment_id,
+            unit.task_type,
+            unit.provider_type,
+        )
+        self.assertEqual(launchable(worker_id), set(other_ids[:1]))
+        self.assertEqual(launchable(other_worker_id), set(joined_ids[1:] + other_ids[:1]))
+
+        Unit.get(db, other_ids[1]).set_db_status(AssignmentState.LAUNCHED)
+        self.assertEqual(launchable(worker_id), set(other_ids))
+
+        # Released units can be launched again, for any worker
+        Unit.get(db, joined_ids[0]).clear_assigned_agent()
+        self.assertEqual(launchable(worker_id), set(joined_ids + other_ids))
+
+    def test_unit_reservation(self) -> None:
+        """Test that launched units can only be reserved once, even under contention"""
+        assert self.db is not None, "No db initialized"
+        db: MephistoDB = self.db
+
+        task_run = TaskRun.get(db, get_test_task_run(db))
+        assignment = Assignment.get(db, get_test_assignment(db, task_run))
+        unit = Unit.get(db, get_test_unit(db, 0, assignment))
+
+        # Only launched units can be reserved, and only once
+        self.assertFalse(db.try_reserve_unit(unit.db_id))
+        unit.set_db_status(AssignmentState.LAUNCHED)
+        self.assertTrue(db.try_reserve_unit(unit.db_id))
+        self.assertFalse(db.try_reserve_unit(unit.db_id))
+        self.assertEqual(db.get_unit(unit.db_id)["status"], AssignmentState.ASSIGNED)
+
+        # Clearing the reservation makes it available again
+        self.assertTrue(db.clear_unit_reservation(unit.db_id))
+        self.assertFalse(db.clear_unit_reservation(unit.db_id))
+        self.assertEqual(db.get_unit(unit.db_id)["status"], AssignmentState.LAUNCHED)
+
+        # Once an agent is assigned, the reservation is no longer cleared
+        unit = Unit.get(db, unit.db_id)
+        self.assertEqual(task_run.reserve_unit(unit), unit)
+        self.assertIsNone(task_run.reserve_unit(unit))
+        self.assertEqual(unit.db_status, AssignmentState.ASSIGNED)
+        _, worker_id = get_test_worker(db)
+        db.new_agent(
+            worker_id,
+            unit.db_id,
+            unit.task_id,
+            unit.task_run_id,
+            unit.assignment_id,
+            unit.task_type,
+            unit.provider_type,
+        )
+        task_run.clear_reservation(unit)
+        unit_row = db.get_unit(unit.db_id)
+        self.assertEqual(unit_row["status"], AssignmentState.ASSIGNED)
+        self.assertEqual(unit_row["worker_id"], worker_id)
+
+        # Many threads racing for the same units each get a distinct one
+        num_units = 10
+        unit_ids = [get_test_unit(db, idx, assignment) for idx in range(1, num_units + 1)]
+        for unit_id in unit_ids:
+            Unit.get(db, unit_id).set_db_status(AssignmentState.LAUNCHED)
+        _, other_worker_id = get_test_worker(db, "other_worker")
+        launchable = db.find_launchable_units_for_worker(task_run.db_id, other_worker_id)
+        self.assertEqual(len(launchable), num_units)
+        start_barrier = threading.Barrier(20)
+        reserved: List[str] = []
+        reserved_lock = threading.Lock()
+
+        def reserve_all() -> None:
+            start_barrier.wait()
+            for unit_id in unit_ids:
+                if db.try_reserve_unit(unit_id):
+                    with reserved_lock:
+                        reserved.append(unit_id)
+
+        threads = [threading.Thread(target=reserve_all) for _ in range(20)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertCountEqual(reserved, unit_ids)
+        self.assertEqual(db.find_launchable_units_for_worker(task_run.db_id, other_worker_id), [])
+
     def test_agent(self) -> None:
         """Test creation and querying of agents"""
         assert self.db is not None, "No db initialized"
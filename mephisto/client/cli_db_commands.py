@@ -51,7 +51,7 @@ def db_cli():
     "--export-indent",
     type=int,
     default=2,
-    help="make dump easy to read via formatting JSON with indentations (Default 2)",
+    help="make dump metadata easy to read via formatting JSON with indentations (Default 2)",
 )
 @click.option(
     "-tn",
@@ -313,6 +313,17 @@ def export(ctx: click.Context, **options: dict):
     is_flag=True,
     help="import only data related to worker qualifications",
 )
+@click.option(
+    "-b",
+    "--bulk",
+    type=bool,
+    default=False,
+    is_flag=True,
+    help=(
+        "import rows of each table in large chunks (much faster for large dumps, "
+        "but unexpected errors will not point at a specific row)"
+    ),
+)
 @click.option("-v", "--verbosity", type=int, default=VERBOSITY_DEFAULT_VALUE, help=VERBOSITY_HELP)
 def _import(ctx: click.Context, **options: dict):
     """
@@ -327,6 +338,7 @@ def _import(ctx: click.Context, **options: dict):
     conflict_resolver: Optional[str] = options.get("conflict_resolver", DEFAULT_CONFLICT_RESOLVER)
     keep_import_metadata: Optional[bool] = options.get("keep_import_metadata", False)
     qualification_only: bool = options.get("qualification_only", False)
+    bulk: bool = options.get("bulk", False)
     verbosity: int = options.get("verbosity", VERBOSITY_DEFAULT_VALUE)
 
     has_conflicting_qualification_only_options = (
@@ -366,6 +378,7 @@ def _import(ctx: click.Context, **options: dict):
         keep_import_metadata=keep_import_metadata,
         qualification_only=qualification_only,
         verbosity=verbosity,
+        bulk=bulk,
     )
     if qualification_only:
         logger.info(
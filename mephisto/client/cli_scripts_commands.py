@@ -8,7 +8,17 @@ from typing import Optional
 
 import click
 
+import mephisto.scripts.benchmarks.chat_agent_state as chat_agent_state_benchmarks
+import mephisto.scripts.benchmarks.create_assignments as create_assignments_benchmarks
+import mephisto.scripts.benchmarks.expire_units as expire_units_benchmarks
+import mephisto.scripts.benchmarks.import_dump as import_dump_benchmarks
+import mephisto.scripts.benchmarks.mturk_launch as mturk_launch_benchmarks
+import mephisto.scripts.benchmarks.register_worker as register_worker_benchmarks
+import mephisto.scripts.benchmarks.request_agent as request_agent_benchmarks
+import mephisto.scripts.benchmarks.review_tasks as review_tasks_benchmarks
+import mephisto.scripts.benchmarks.valid_units as valid_units_benchmarks
 import mephisto.scripts.form_composer.rebuild_all_apps as rebuild_all_apps_form_composer
+import mephisto.scripts.form_composer.rebuild_task_stats as rebuild_task_stats_form_composer
 import mephisto.scripts.heroku.initialize_heroku as initialize_heroku
 import mephisto.scripts.local_db.clear_worker_onboarding as clear_worker_onboarding_local_db
 import mephisto.scripts.local_db.load_data_to_mephisto_db as load_data_local_db
@@ -25,8 +35,20 @@ from mephisto.scripts import tests
 from mephisto.scripts.local_db import auto_generate_all_docs_reference_md
 from mephisto.utils.console_writer import ConsoleWriter
 
+BENCHMARKS_VALID_SCRIPTS_NAMES = [
+    "register_worker",
+    "create_assignments",
+    "request_agent",
+    "chat_agent_state",
+    "valid_units",
+    "mturk_launch",
+    "expire_units",
+    "review_tasks",
+    "import_dump",
+]
 FORM_COMPOSER_VALID_SCRIPTS_NAMES = [
     "rebuild_all_apps",
+    "rebuild_task_stats",
 ]
 HEROKU_VALID_SCRIPTS_NAMES = [
     "initialize",
@@ -56,6 +78,7 @@ TESTS_VALID_SCRIPTS_NAMES = [
     "rebuild_all_mephisto_react_apps",
 ]
 VALID_SCRIPT_TYPES = [
+    "benchmarks",
     "form_composer",
     "heroku",
     "local_db",
@@ -122,10 +145,25 @@ def run_script(script_type, script_name, args: Optional[Any] = None):
                 MTURK_VALID_SCRIPTS_NAMES[4]: soft_block_workers_by_mturk_id_mturk.main,
             },
         },
+        "benchmarks": {
+            "valid_script_names": BENCHMARKS_VALID_SCRIPTS_NAMES,
+            "scripts": {
+                BENCHMARKS_VALID_SCRIPTS_NAMES[0]: register_worker_benchmarks.main,
+                BENCHMARKS_VALID_SCRIPTS_NAMES[1]: create_assignments_benchmarks.main,
+                BENCHMARKS_VALID_SCRIPTS_NAMES[2]: request_agent_benchmarks.main,
+                BENCHMARKS_VALID_SCRIPTS_NAMES[3]: chat_agent_state_benchmarks.main,
+                BENCHMARKS_VALID_SCRIPTS_NAMES[4]: valid_units_benchmarks.main,
+                BENCHMARKS_VALID_SCRIPTS_NAMES[5]: mturk_launch_benchmarks.main,
+                BENCHMARKS_VALID_SCRIPTS_NAMES[6]: expire_units_benchmarks.main,
+                BENCHMARKS_VALID_SCRIPTS_NAMES[7]: review_tasks_benchmarks.main,
+                BENCHMARKS_VALID_SCRIPTS_NAMES[8]: import_dump_benchmarks.main,
+            },
+        },
         "form_composer": {
             "valid_script_names": FORM_COMPOSER_VALID_SCRIPTS_NAMES,
             "scripts": {
                 FORM_COMPOSER_VALID_SCRIPTS_NAMES[0]: rebuild_all_apps_form_composer.main,
+                FORM_COMPOSER_VALID_SCRIPTS_NAMES[1]: rebuild_task_stats_form_composer.main,
             },
         },
         "tests": {
@@ -429,6 +429,8 @@ class Agent(_AgentBase, MephistoDataModelComponentMixin, metaclass=MephistoDBBac
         if self.agent_in_active_run():
             live_run = self.get_live_run()
             live_run.loop_wrap.execute_coro(live_run.worker_pool.push_status_update(self))
+            if new_status in AgentState.complete():
+                live_run.worker_pool.handle_agent_finished(self)
         if new_status in [
             AgentState.STATUS_RETURNED,
             AgentState.STATUS_DISCONNECT,
@@ -149,6 +149,14 @@ class Assignment(MephistoDataModelComponentMixin, metaclass=MephistoDBBackedMeta
             self.__task_run = TaskRun.get(self.db, self.task_run_id)
         return self.__task_run
 
+    def _set_task_run(self, task_run: TaskRun) -> None:
+        """
+        Share an already loaded task run with this assignment, to skip loading
+        (and parsing the config of) the same task run again for each assignment
+        """
+        assert task_run.db_id == self.task_run_id, "Task run must be this assignment's run"
+        self.__task_run = task_run
+
     def get_task(self) -> Task:
         """
         Return the task run that this assignment is part of
@@ -121,6 +121,24 @@ class TaskRunArgs:
             )
         },
     )
+    assignment_creation_chunk_size: int = field(
+        default=1000,
+        metadata={
+            "help": (
+                "Number of assignments (and their units) written to the database "
+                "together when creating them from static assignment data."
+            )
+        },
+    )
+    event_driven_unit_launch: bool = field(
+        default=False,
+        metadata={
+            "help": (
+                "Launch units as soon as a unit status change frees a slot under "
+                "max_num_concurrent_units, rather than polling every launched unit."
+            )
+        },
+    )
     submission_timeout: int = field(
         default=600,
         metadata={
@@ -285,27 +303,11 @@ class TaskRun(MephistoDataModelComponentMixin, metaclass=MephistoDBBackedMeta):
                     )
                     return []  # Currently at the maximum number of units for this task
 
-        task_units: List["Unit"] = self.get_units()
-        unit_assigns: Dict[str, List["Unit"]] = {}
-        for unit in task_units:
-            assignment_id = unit.assignment_id
-            if assignment_id not in unit_assigns:
-                unit_assigns[assignment_id] = []
-            unit_assigns[assignment_id].append(unit)
-
-        # Cannot pair with self
-        units: List["Unit"] = []
-        for unit_set in unit_assigns.values():
-            is_self_set = map(lambda u: u.worker_id == worker.db_id, unit_set)
-            if not any(is_self_set):
-                units += unit_set
-
-        # Valid units must be launched and must not be special units (negative indices)
-        # Can use db_status directly rather than polling in the critical path, as in
-        # the worst case we miss the transition from an active to launched unit
-        valid_units = [
-            u for u in units if u.db_status == AssignmentState.LAUNCHED and u.unit_index >= 0
-        ]
+        # Valid units must be launched, must not be special units (negative indices),
+        # and cannot pair with self. Uses the stored unit statuses rather than polling in
+        # the critical path, as in the worst case we miss the transition from an active
+        # to launched unit
+        valid_units = self.db.find_launchable_units_for_worker(self.db_id, worker.db_id)
         logger.debug(f"Found {len(valid_units)} available units")
 
         # Should load cached blueprint for SharedTaskState
@@ -318,29 +320,22 @@ class TaskRun(MephistoDataModelComponentMixin, metaclass=MephistoDBBackedMeta):
 
     def clear_reservation(self, unit: "Unit") -> None:
         """
-        Remove the holder used to reserve a unit
+        Release a unit reserved with reserve_unit, if no agent was assigned to it
         """
-        file_name = f"unit_res_{unit.db_id}"
-        write_dir = os.path.join(self.get_run_dir(), "reservations")
-        if os.path.exists(os.path.join(write_dir, file_name)):
-            os.unlink(os.path.join(write_dir, file_name))
-            logger.debug(f"Cleared reservation {file_name} for {unit}")
+        if self.db.clear_unit_reservation(unit.db_id):
+            unit.set_db_status(AssignmentState.LAUNCHED)
+            logger.debug(f"Cleared reservation for {unit}")
 
     def reserve_unit(self, unit: "Unit") -> Optional["Unit"]:
         """
-        'Atomically' reserve a unit by writing to the filesystem. If
-        the file creation fails, return none
+        Atomically reserve a unit by moving it from launched to assigned in
+        the database. If it was already reserved, return none
         """
-        file_name = f"unit_res_{unit.db_id}"
-        write_dir = os.path.join(self.get_run_dir(), "reservations")
-        os.makedirs(write_dir, exist_ok=True)
-        try:
-            with open(os.path.join(write_dir, file_name), "x") as res_file:
-                pass  # Creating the file is sufficient
-        except FileExistsError:
-            print(os.path.join(write_dir, file_name), " existed")
+        if not self.db.try_reserve_unit(unit.db_id):
+            logger.debug(f"{unit} was already reserved")
             return None
-        logger.debug(f"Reserved {unit} with {file_name}")
+        unit._mark_agent_assignment()
+        logger.debug(f"Reserved {unit}")
         return unit
 
     def get_blueprint(
@@ -4,12 +4,17 @@
 # This source code is licensed under the MIT license found in the
 # LICENSE file in the root directory of this source tree.
 
+import threading
 from collections import defaultdict
 from datetime import datetime
 from typing import Any
+from typing import Callable
 from typing import DefaultDict
+from typing import Dict
+from typing import List
 from typing import Mapping
 from typing import Optional
+from typing import Tuple
 from typing import Type
 from typing import TYPE_CHECKING
 from typing import Union
@@ -57,6 +62,32 @@ for status in AssignmentState.valid_unit():
 
 logger = get_logger(name=__name__)
 
+# Called with the unit, its previous status and its new status
+UnitStatusListener = Callable[["Unit", str, str], None]
+
+# Listeners for unit status transitions, by the task run of the unit
+_unit_status_listeners: Dict[str, List[UnitStatusListener]] = {}
+_unit_status_listeners_lock = threading.Lock()
+
+
+def register_unit_status_listener(task_run_id: str, listener: UnitStatusListener) -> None:
+    """
+    Call the given listener on every status change set on a unit of the given task run
+    in this process, from the thread making the change
+    """
+    with _unit_status_listeners_lock:
+        _unit_status_listeners.setdefault(task_run_id, []).append(listener)
+
+
+def unregister_unit_status_listener(task_run_id: str, listener: UnitStatusListener) -> None:
+    """Stop calling a listener added with `register_unit_status_listener`"""
+    with _unit_status_listeners_lock:
+        listeners = _unit_status_listeners.get(task_run_id, [])
+        if listener in listeners:
+            listeners.remove(listener)
+        if len(listeners) == 0:
+            _unit_status_listeners.pop(task_run_id, None)
+
 
 class Unit(MephistoDataModelComponentMixin, metaclass=MephistoDBBackedABCMeta):
     """
@@ -180,11 +211,22 @@ class Unit(MephistoDataModelComponentMixin, metaclass=MephistoDBBackedABCMeta):
         ACTIVE_UNIT_STATUSES.labels(
             status=status, unit_type=INDEX_TO_TYPE_MAP[self.unit_index]
         ).inc()
+        old_status = self.db_status
         self.db_status = status
         self.db.update_unit(self.db_id, status=status)
 
+        with _unit_status_listeners_lock:
+            listeners = list(_unit_status_listeners.get(self.task_run_id, []))
+        for listener in listeners:
+            try:
+                listener(self, old_status, status)
+            except Exception as e:
+                logger.exception(f"Unit status listener failed for {self}: {e}", exc_info=True)
+
     def _mark_agent_assignment(self) -> None:
         """Special helper to mark the transition from LAUNCHED to ASSIGNED"""
+        if self.db_status == AssignmentState.ASSIGNED:
+            return  # Already marked when the unit was reserved
         assert self.db_status == AssignmentState.LAUNCHED, "can only mark LAUNCHED units"
         ACTIVE_UNIT_STATUSES.labels(
             status=AssignmentState.LAUNCHED,
@@ -194,6 +236,7 @@ class Unit(MephistoDataModelComponentMixin, metaclass=MephistoDBBackedABCMeta):
             status=AssignmentState.ASSIGNED,
             unit_type=INDEX_TO_TYPE_MAP[self.unit_index],
         ).inc()
+        self.db_status = AssignmentState.ASSIGNED
 
     def get_assignment(self) -> "Assignment":
         """
@@ -312,6 +355,43 @@ class Unit(MephistoDataModelComponentMixin, metaclass=MephistoDBBackedABCMeta):
         logger.debug(f"Registered new unit {unit} for {assignment}.")
         return unit
 
+    @staticmethod
+    def _register_units_bulk(
+        db: "MephistoDB",
+        unit_specs: List[Tuple["Assignment", int]],
+        pay_amount: float,
+        provider_type: str,
+    ) -> List["Unit"]:
+        """
+        Create entries for all of the given (assignment, index) pairs in the database
+        at once. All of the assignments must belong to the same task run.
+        """
+        if len(unit_specs) == 0:
+            return []
+        first_assignment = unit_specs[0][0]
+        assert all(
+            a.task_run_id == first_assignment.task_run_id for a, _ in unit_specs
+        ), "Can only register units in bulk for a single task run"
+        rows = db.new_units_bulk(
+            first_assignment.task_id,
+            first_assignment.task_run_id,
+            first_assignment.requester_id,
+            [(assignment.db_id, index) for assignment, index in unit_specs],
+            pay_amount,
+            provider_type,
+            first_assignment.task_type,
+            sandbox=first_assignment.sandbox,
+        )
+        units = [Unit.get(db, row["unit_id"], row=row) for row in rows]
+        for _, index in unit_specs:
+            ACTIVE_UNIT_STATUSES.labels(
+                status=AssignmentState.CREATED, unit_type=INDEX_TO_TYPE_MAP[index]
+            ).inc()
+        logger.debug(
+            f"Registered {len(units)} new units for task run {first_assignment.task_run_id}."
+        )
+        return units
+
     def get_pay_amount(self) -> float:
         """
         Return the amount that this Unit is costing against the budget,
@@ -397,6 +477,17 @@ class Unit(MephistoDataModelComponentMixin, metaclass=MephistoDBBackedABCMeta):
         """
         raise NotImplementedError()
 
+    @classmethod
+    def launch_bulk(cls, units: List["Unit"], task_url: str) -> None:
+        """
+        Launch all of the given units of a task run
+
+        By default this calls `launch` for every unit. Implementations whose launches
+        are slow calls to the crowd provider can override this to make them concurrently.
+        """
+        for unit in units:
+            unit.launch(task_url)
+
     def expire(self) -> float:
         """
         Expire this unit, removing it from being workable on the vendor.
@@ -404,6 +495,18 @@ class Unit(MephistoDataModelComponentMixin, metaclass=MephistoDBBackedABCMeta):
         """
         raise NotImplementedError()
 
+    @classmethod
+    def get_expire_limits(cls, task_run: "TaskRun") -> Tuple[int, float]:
+        """
+        Return the most `expire` calls to make at once for this provider's units
+        of the given task run, and the most to start per second (0 for no limit)
+
+        By default units are expired one at a time, as `expire` implementations
+        needn't be thread safe. Implementations whose expirations are slow calls to
+        the crowd provider can raise these limits.
+        """
+        return 1, 0
+
     def is_expired(self) -> bool:
         """Determine if this unit is expired as according to the vendor."""
         raise NotImplementedError()
@@ -417,3 +520,19 @@ class Unit(MephistoDataModelComponentMixin, metaclass=MephistoDBBackedABCMeta):
         can be successfully created to have it put into the db.
         """
         raise NotImplementedError()
+
+    @classmethod
+    def new_bulk(
+        cls,
+        db: "MephistoDB",
+        unit_specs: List[Tuple["Assignment", int]],
+        pay_amount: float,
+    ) -> List["Unit"]:
+        """
+        Create Units for all of the given (assignment, index) pairs of a task run
+
+        By default this calls `new` for every unit. Implementations that have no
+        provider-side setup for new units should return the result of
+        _register_units_bulk instead, to put them all into the db at once.
+        """
+        return [cls.new(db, assignment, index, pay_amount) for assignment, index in unit_specs]
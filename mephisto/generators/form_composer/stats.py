@@ -6,12 +6,21 @@
 
 from typing import List
 
+from mephisto.data_model.constants.assignment_state import AssignmentState
 from mephisto.data_model.task import Task
 from mephisto.data_model.unit import Unit
 from mephisto.tools.data_browser import DataBrowser
+from mephisto.utils.db import add_units_to_task_stats
+from mephisto.utils.db import count_task_workers
+from mephisto.utils.db import delete_task_stats
+from mephisto.utils.db import find_unit_ids_missing_from_task_stats
+from mephisto.utils.db import get_task_stats
 
 FIELD_TYPES_FOR_HISTOGRAM = ["radio", "checkbox", "select"]
 
+# Number of units whose data is added to stats in one DB transaction
+STATS_UPDATE_CHUNK_SIZE = 1000
+
 
 def _get_unit_data(data_browser: DataBrowser, unit: Unit) -> dict:
     # We need to propogate raising an exception and return all what we know about this unit
@@ -77,28 +86,78 @@ def _update_data_for_histogram(data: dict, fields: dict, unit_outputs: dict) ->
     return data
 
 
-def collect_task_stats(task: Task) -> dict:
-    data_for_histogram = {}
+def _merge_data_for_histogram(data: dict, units_data: List[dict]) -> dict:
+    for unit_data in units_data:
+        for histogram_name, unit_histogram_value in unit_data.items():
+            prev_histogram_value = data.get(histogram_name, {})
+
+            for option_name, option_value in unit_histogram_value.items():
+                prev_option_value = prev_histogram_value.get(option_name, 0)
+                prev_histogram_value[option_name] = prev_option_value + option_value
 
+            data[histogram_name] = prev_histogram_value
+
+    return data
+
+
+def update_task_stats(task: Task) -> dict:
+    """
+    Add completed units of the Task, that were not added yet, to its stats stored in DB.
+    This way data of every unit is read from disk only once
+    """
     data_browser = DataBrowser(db=task.db)
 
-    units: List[Unit] = task.db.find_units(task_id=task.db_id)
-    for unit in units:
-        unit_data = _get_unit_data(data_browser, unit)
-        unit_inputs = unit_data["unit_inputs"]
-        unit_outputs = unit_data["unit_outputs"]
-        unit_fields_for_histogram = _get_unit_fields_for_histogram(unit_inputs)
-        data_for_histogram = _update_data_for_histogram(
-            data_for_histogram,
-            unit_fields_for_histogram,
-            unit_outputs,
+    unit_ids = find_unit_ids_missing_from_task_stats(
+        task.db,
+        task.db_id,
+        statuses=AssignmentState.completed(),
+    )
+
+    # Save stats by chunks, not to lose the progress of a long update
+    stats = get_task_stats(task.db, task.db_id) or {}
+    for i in range(0, len(unit_ids), STATS_UPDATE_CHUNK_SIZE):
+        units_data_for_histogram = {}
+        for unit_id in unit_ids[i : i + STATS_UPDATE_CHUNK_SIZE]:
+            unit = Unit.get(task.db, unit_id)
+            unit_data = _get_unit_data(data_browser, unit)
+            unit_fields_for_histogram = _get_unit_fields_for_histogram(unit_data["unit_inputs"])
+            units_data_for_histogram[unit_id] = _update_data_for_histogram(
+                {},
+                unit_fields_for_histogram,
+                unit_data["unit_outputs"],
+            )
+
+        # Only units that have not been added by a concurrent update are merged in
+        stats = add_units_to_task_stats(
+            task.db,
+            task.db_id,
+            list(units_data_for_histogram.keys()),
+            lambda data, new_unit_ids: _merge_data_for_histogram(
+                data,
+                [units_data_for_histogram[unit_id] for unit_id in new_unit_ids],
+            ),
         )
 
+    return stats
+
+
+def rebuild_task_stats(task: Task) -> dict:
+    """Recalculate stats of the Task from scratch (e.g. to backfill them)"""
+    delete_task_stats(task.db, task.db_id)
+    return update_task_stats(task)
+
+
+def collect_task_stats(task: Task) -> dict:
     return {
-        "stats": data_for_histogram,
+        "stats": update_task_stats(task),
         "task_id": task.db_id,
         "task_name": task.task_name,
-        "workers_count": len(set(([u.worker_id for u in units]))),
+        # Counted over the same (completed) units as the stats
+        "workers_count": count_task_workers(
+            task.db,
+            task.db_id,
+            statuses=AssignmentState.completed(),
+        ),
     }
 
 
@@ -10,11 +10,11 @@ from queue import Queue
 from typing import Any
 from typing import Dict
 from typing import Optional
-from typing import Set
 from typing import Tuple
 from typing import TYPE_CHECKING
 
-from prometheus_client import Histogram  # type: ignore
+from prometheus_client import Gauge  # type: ignore
+from prometheus_client import Histogram
 
 from mephisto.abstractions._subcomponents.channel import Channel
 from mephisto.abstractions._subcomponents.channel import STATUS_CHECK_TIME
@@ -35,6 +35,7 @@ from mephisto.data_model.packet import PACKET_TYPE_SUBMIT_ONBOARDING
 from mephisto.data_model.packet import PACKET_TYPE_SUBMIT_UNIT
 from mephisto.data_model.packet import PACKET_TYPE_UPDATE_STATUS
 from mephisto.operations.datatypes import LiveTaskRun
+from mephisto.utils.expiring_store import ExpiringStore
 from mephisto.utils.logger_core import format_loud
 from mephisto.utils.logger_core import get_logger
 
@@ -74,6 +75,11 @@ for packet_type in [
         "e2e_time",
     ]:
         E2E_PACKET_LATENCY.labels(packet_type=packet_type, stage=stage)
+TRACKED_IDS = Gauge(
+    "client_io_handler_tracked_ids",
+    "Request and live update ids held in the IO handler's expiring stores",
+    ["store"],
+)
 
 
 class ClientIOHandler:
@@ -97,14 +103,22 @@ class ClientIOHandler:
         # Message handling
         self.message_queue: "Queue[Packet]" = Queue()
         self.agent_id_to_channel_id: Dict[str, str] = {}
-        # Map from a request id to the channel that issued it
-        self.request_id_to_channel_id: Dict[str, str] = {}
-        self.request_id_to_packet: Dict[str, Packet] = {}  # For metrics purposes
+        # Map from a request id to the channel that issued it. Requests that are
+        # never answered expire from these, rather than being held for the run
+        self.request_id_to_channel_id: ExpiringStore[str, str] = ExpiringStore(
+            size_gauge=TRACKED_IDS.labels(store="request_id_to_channel_id")
+        )
+        self.request_id_to_packet: ExpiringStore[str, Packet] = ExpiringStore(
+            size_gauge=TRACKED_IDS.labels(store="request_id_to_packet")
+        )  # For metrics purposes
 
         self.is_shutdown = False
         self.last_submission_time = time.time()  # For patience tracking
 
-        self.seen_update_ids: Set[str] = set()
+        # Ids of recent live updates, to drop duplicated packets
+        self.seen_update_ids: ExpiringStore[str, None] = ExpiringStore(
+            size_gauge=TRACKED_IDS.labels(store="seen_update_ids")
+        )
 
         # Deferred initializiation
         self._live_run: Optional["LiveTaskRun"] = None
@@ -376,11 +390,10 @@ class ClientIOHandler:
             )
         )
         self.process_outgoing_queue(self.message_queue)
-        self.log_metrics_for_packet(self.request_id_to_packet[request_id])
-
-        # TODO Sometimes this request ID is lost, and we don't quite know why
-        del self.request_id_to_channel_id[request_id]
-        del self.request_id_to_packet[request_id]
+        self.request_id_to_channel_id.pop(request_id, None)
+        request_packet = self.request_id_to_packet.pop(request_id, None)
+        if request_packet is not None:
+            self.log_metrics_for_packet(request_packet)
 
     def _on_message(self, packet: Packet, channel_id: str):
         """Handle incoming messages from the channel"""
@@ -403,7 +416,8 @@ class ClientIOHandler:
                     return  # Processing duplicated packet
                 self._on_live_update(packet, channel_id)
                 self.log_metrics_for_packet(packet)
-                self.seen_update_ids.add(update_id)
+                if update_id is not None:
+                    self.seen_update_ids.add(update_id)
             elif packet.type == PACKET_TYPE_REGISTER_AGENT:
                 self._register_agent(packet, channel_id)
             elif packet.type == PACKET_TYPE_RETURN_STATUSES:
@@ -476,6 +490,9 @@ class ClientIOHandler:
             self.channels[channel_id].close()
             del self.channels[channel_id]
         self.is_shutdown = True
+        self.request_id_to_channel_id.clear()
+        self.request_id_to_packet.clear()
+        self.seen_update_ids.clear()
 
         logger.debug(f"Cancelling status ping task")
         try:
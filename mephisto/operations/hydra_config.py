@@ -13,7 +13,7 @@ from mephisto.utils.logger_core import get_logger, warn_once
 from mephisto.utils.dirs import get_run_file_dir
 from dataclasses import dataclass, field, fields, Field
 from omegaconf import OmegaConf, MISSING, DictConfig
-from typing import List, Type, Dict, Any, TYPE_CHECKING
+from typing import List, Type, Dict, Any, Optional, TYPE_CHECKING
 
 
 if TYPE_CHECKING:
@@ -28,6 +28,13 @@ config = ConfigStoreWithProvider("mephisto")
 @dataclass
 class DatabaseArgs:
     _database_type: str = "singleton"  # default DB is performant singleton
+    wal_mode: bool = False  # concurrent pooled readers with a single SQLite writer
+    read_pool_size: int = 8  # max concurrent reader connections in WAL mode
+    cache_max_size: int = 10000  # per-class LRU size of the singleton entity cache
+    cache_max_age: Optional[float] = None  # seconds before unused singleton entries expire
+    index_max_count: int = 100  # unit indexes of tasks (and of task runs) kept by the singleton
+    write_behind: bool = False  # write agent state files from a background thread
+    write_behind_window: float = 0.05  # seconds to coalesce repeated writes to one file
 
 
 @dataclass
@@ -29,8 +29,11 @@ from mephisto.abstractions.blueprints.mixins.onboarding_required import (
 from mephisto.abstractions.database import MephistoDB
 from mephisto.data_model.qualification import QUAL_NOT_EXIST
 from mephisto.utils.db import EntryDoesNotExistException
+from mephisto.utils.db import get_task_has_stats
+from mephisto.utils.db import set_task_has_stats
 from mephisto.utils.qualifications import make_qualification_dict
 from mephisto.operations.task_launcher import TaskLauncher
+from mephisto.operations.unit_expiration import expire_units
 from mephisto.operations.client_io_handler import ClientIOHandler
 from mephisto.operations.worker_pool import WorkerPool
 from mephisto.operations.registry import (
@@ -180,6 +183,8 @@ class Operator:
             task_run,
             initialization_data_iterable,
             max_num_concurrent_units=run_config.task.max_num_concurrent_units,
+            assignment_chunk_size=run_config.task.assignment_creation_chunk_size,
+            event_driven_launch=run_config.task.event_driven_unit_launch,
         )
 
         worker_pool = WorkerPool(self.db)
@@ -201,6 +206,14 @@ class Operator:
 
         return live_run
 
+    def _reset_task_has_stats(self, task_id: str) -> None:
+        """
+        Drop the cached flag that the task has no fields for stats (shown in Review App),
+        as units of a new run may bring them. The Review App finds it out again lazily
+        """
+        if get_task_has_stats(self.db, task_id) is False:
+            set_task_has_stats(self.db, task_id, None)
+
     def validate_and_run_config_or_die(
         self, run_config: DictConfig, shared_state: Optional[SharedTaskState] = None
     ) -> str:
@@ -264,6 +277,7 @@ class Operator:
             requester.is_sandbox(),
         )
         task_run = TaskRun.get(self.db, new_run_id)
+        self._reset_task_has_stats(task_run.task_id)
 
         live_run = self._create_live_task_run(
             run_config,
@@ -365,9 +379,11 @@ class Operator:
         self.is_shutdown = True
 
         def end_launchers_and_expire_units():
+            units_to_expire = []
             for tracked_run in self._task_runs_tracked.values():
                 tracked_run.task_launcher.shutdown()
-                tracked_run.task_launcher.expire_units()
+                units_to_expire += tracked_run.task_launcher.units
+            expire_units(units_to_expire)
 
         def end_architects():
             for tracked_run in self._task_runs_tracked.values():
@@ -393,10 +409,13 @@ class Operator:
             if not shutdown_thread.is_alive():
                 # Only join if the shutdown fully completed
                 shutdown_thread.join()
-        if not self._event_loop.is_running():
-            self._event_loop.run_until_complete(self.shutdown_async())
-        else:
-            self._event_loop.create_task(self.shutdown_async())
+        try:
+            self.db.flush_writes()
+        finally:
+            if not self._event_loop.is_running():
+                self._event_loop.run_until_complete(self.shutdown_async())
+            else:
+                self._event_loop.create_task(self.shutdown_async())
 
     async def shutdown_async(self):
         """Shut down the asyncio parts of the Operator"""
@@ -413,22 +432,27 @@ class Operator:
         logger.info("operator shutting down")
         self.is_shutdown = True
         runs_to_check = list(self._task_runs_tracked.items())
+        units_to_expire = []
         for run_id, tracked_run in runs_to_check:
-            logger.info(f"Expiring units for task run {run_id}.")
             try:
                 tracked_run.task_launcher.shutdown()
             except (KeyboardInterrupt, SystemExit) as e:
                 logger.info(f"Skipping waiting for launcher threads to join on task run {run_id}.")
+            units_to_expire += tracked_run.task_launcher.units
 
-            def cant_cancel_expirations(sig, frame):
-                logger.warning(
-                    "Ignoring ^C during unit expirations. ^| if you NEED to exit and you will "
-                    "have to clean up units that hadn't been expired afterwards."
-                )
+        def cant_cancel_expirations(sig, frame):
+            logger.warning(
+                "Ignoring ^C during unit expirations. ^| if you NEED to exit and you will "
+                "have to clean up units that hadn't been expired afterwards."
+            )
 
-            old_handler = signal.signal(signal.SIGINT, cant_cancel_expirations)
-            tracked_run.task_launcher.expire_units()
-            signal.signal(signal.SIGINT, old_handler)
+        # Expire the units of all runs together, so they're expired concurrently
+        logger.info(f"Expiring units for {len(runs_to_check)} task runs.")
+        old_handler = signal.signal(signal.SIGINT, cant_cancel_expirations)
+        max_delay = expire_units(units_to_expire)
+        signal.signal(signal.SIGINT, old_handler)
+        if max_delay > 0:
+            logger.info(f"In-flight units may take up to {max_delay} seconds to be taken down.")
 
         remaining_runs = []
         try:
@@ -486,12 +510,15 @@ class Operator:
             runs_to_close = list(self._task_runs_tracked.keys())
             for run_id in runs_to_close:
                 self._task_runs_tracked[run_id].shutdown()
-            if not self._event_loop.is_running():
-                self._event_loop.run_until_complete(self.shutdown_async())
-            else:
-                self._event_loop.create_task(self.shutdown_async())
-            if self._using_prometheus:
-                shutdown_prometheus_server()
+            try:
+                self.db.flush_writes()
+            finally:
+                if not self._event_loop.is_running():
+                    self._event_loop.run_until_complete(self.shutdown_async())
+                else:
+                    self._event_loop.create_task(self.shutdown_async())
+                if self._using_prometheus:
+                    shutdown_prometheus_server()
 
     def validate_and_run_config(
         self, run_config: DictConfig, shared_state: Optional[SharedTaskState] = None
@@ -738,7 +765,9 @@ class Operator:
             raise e
 
         logger.debug(f"Resuming assignments")
-        live_run.task_launcher.resume_assignments()
+        # Data that the run hadn't created assignments for yet is picked up where it left off
+        remaining_data = live_run.blueprint.get_resumed_initialization_data()
+        live_run.task_launcher.resume_assignments(remaining_data)
         logger.debug(f"Launching units")
         live_run.task_launcher.launch_units(url=task_url)
 
@@ -15,10 +15,13 @@ from mephisto.data_model.unit import (
     SCREENING_UNIT_INDEX,
     GOLD_UNIT_INDEX,
     COMPENSATION_UNIT_INDEX,
+    register_unit_status_listener,
+    unregister_unit_status_listener,
 )
+from mephisto.operations.unit_expiration import expire_units
 
-from typing import Dict, Optional, List, Any, TYPE_CHECKING, Iterator, Iterable
-from tqdm import tqdm  # type: ignore
+from typing import Dict, Optional, List, Any, Set, TYPE_CHECKING, Iterator, Iterable
+import itertools
 import os
 import time
 import enum
@@ -33,7 +36,11 @@ import types
 logger = get_logger(name=__name__)
 
 UNIT_GENERATOR_WAIT_SECONDS = 10
+# With event driven launching, how often to still check every launched unit
+# in case of status changes made outside of this process
+UNIT_STATUS_RECONCILE_SECONDS = 60
 ASSIGNMENT_GENERATOR_WAIT_SECONDS = 0.5
+DEFAULT_ASSIGNMENT_CHUNK_SIZE = 1000
 
 
 class GeneratorType(enum.Enum):
@@ -55,6 +62,8 @@ class TaskLauncher:
         task_run: "TaskRun",
         assignment_data_iterator: Iterable[InitializationData],
         max_num_concurrent_units: int = 0,
+        assignment_chunk_size: int = DEFAULT_ASSIGNMENT_CHUNK_SIZE,
+        event_driven_launch: bool = False,
     ):
         """Prepare the task launcher to get it ready to launch the assignments"""
         self.db = db
@@ -65,21 +74,20 @@ class TaskLauncher:
         self.provider_type = task_run.get_provider().PROVIDER_TYPE
         self.UnitClass = task_run.get_provider().UnitClass
         self.max_num_concurrent_units = max_num_concurrent_units
+        self.assignment_chunk_size = max(1, assignment_chunk_size)
         self.launched_units: Dict[str, Unit] = {}
         self.unlaunched_units: Dict[str, Unit] = {}
         self.keep_launching_units: bool = False
         self.finished_generators: bool = False
         self.assignment_thread_done: bool = True
         self.launch_url: Optional[str] = None
+        # Event driven launching refills free slots on unit status changes
+        # rather than polling all launched units
+        self.event_driven_launch = event_driven_launch
+        self._units_to_check: Set[str] = set()
 
         self.unlaunched_units_access_condition = threading.Condition()
-        if isinstance(self.assignment_data_iterable, types.GeneratorType):
-            self.generator_type = GeneratorType.ASSIGNMENT
-            self.assignment_thread_done = False
-        elif max_num_concurrent_units != 0:
-            self.generator_type = GeneratorType.UNIT
-        else:
-            self.generator_type = GeneratorType.NONE
+        self._set_generator_type()
         run_dir = task_run.get_run_dir()
         os.makedirs(run_dir, exist_ok=True)
 
@@ -87,46 +95,90 @@ class TaskLauncher:
         self.units_thread: Optional[threading.Thread] = None
         self.assignments_thread: Optional[threading.Thread] = None
 
+    def _set_generator_type(self) -> None:
+        """Determine how units are generated for the current assignment data iterable"""
+        if isinstance(self.assignment_data_iterable, types.GeneratorType):
+            self.generator_type = GeneratorType.ASSIGNMENT
+            self.assignment_thread_done = False
+        elif self.max_num_concurrent_units != 0:
+            self.generator_type = GeneratorType.UNIT
+        else:
+            self.generator_type = GeneratorType.NONE
+
     def _create_single_assignment(self, assignment_data) -> None:
         """Create a single assignment in the database using its read assignment_data"""
+        self._create_assignments([assignment_data])
+
+    def _create_assignments(self, assignment_data_list: List[InitializationData]) -> None:
+        """
+        Create assignments for a chunk of read assignment_data, and all of their units,
+        with one bulk database call for each
+        """
         task_run = self.task_run
         task_args = task_run.get_task_args()
-        assignment_id = self.db.new_assignment(
+        assignment_rows = self.db.new_assignments_bulk(
             task_run.task_id,
             task_run.db_id,
             task_run.requester_id,
             task_run.task_type,
             task_run.provider_type,
-            task_run.sandbox,
+            len(assignment_data_list),
+            sandbox=task_run.sandbox,
         )
-        assignment = Assignment.get(self.db, assignment_id)
-        assignment.write_assignment_data(assignment_data)
-        self.assignments.append(assignment)
-        unit_count = len(assignment_data.unit_data)
-        for unit_idx in range(unit_count):
-            unit = self.UnitClass.new(self.db, assignment, unit_idx, task_args.task_reward)
-            self.units.append(unit)
-            with self.unlaunched_units_access_condition:
+        assignments = [
+            Assignment.get(self.db, row["assignment_id"], row=row) for row in assignment_rows
+        ]
+        unit_specs = []
+        for assignment, assignment_data in zip(assignments, assignment_data_list):
+            assignment._set_task_run(task_run)
+            # Every assignment keeps its data in a file in its own data directory, which
+            # is where it's read from (also by other processes), so these stay per file
+            assignment.write_assignment_data(assignment_data)
+            unit_specs += [(assignment, idx) for idx in range(len(assignment_data.unit_data))]
+        self.assignments += assignments
+
+        units = self.UnitClass.new_bulk(self.db, unit_specs, task_args.task_reward)
+        self.units += units
+        with self.unlaunched_units_access_condition:
+            for unit in units:
                 self.unlaunched_units[unit.db_id] = unit
+            self.unlaunched_units_access_condition.notify_all()
 
     def _try_generating_assignments(
         self, assignment_data_iterator: Iterator[InitializationData]
     ) -> None:
-        """Try to generate more assignments from the assignments_data_iterator"""
+        """
+        Try to generate more assignments from the assignments_data_iterator, creating
+        them in chunks of whatever was generated within ASSIGNMENT_GENERATOR_WAIT_SECONDS
+        (up to the chunk size), so slow generators still get their assignments promptly
+        """
         while not self.finished_generators:
-            try:
-                data = next(assignment_data_iterator)
-                self._create_single_assignment(data)
-            except StopIteration:
+            chunk: List[InitializationData] = []
+            chunk_deadline = time.monotonic() + ASSIGNMENT_GENERATOR_WAIT_SECONDS
+            generator_exhausted = False
+            while len(chunk) < self.assignment_chunk_size and time.monotonic() < chunk_deadline:
+                try:
+                    chunk.append(next(assignment_data_iterator))
+                except StopIteration:
+                    generator_exhausted = True
+                    break
+            if len(chunk) > 0:
+                self._create_assignments(chunk)
+            if generator_exhausted:
                 self.assignment_thread_done = True
-            time.sleep(ASSIGNMENT_GENERATOR_WAIT_SECONDS)
+                self._wake_unit_launcher()
+                break
 
     def create_assignments(self) -> None:
         """Create an assignment and associated units for the generated assignment data"""
         self.keep_launching_units = True
         if self.generator_type != GeneratorType.ASSIGNMENT:
-            for data in self.assignment_data_iterable:
-                self._create_single_assignment(data)
+            data_iterator = iter(self.assignment_data_iterable)
+            while True:
+                chunk = list(itertools.islice(data_iterator, self.assignment_chunk_size))
+                if len(chunk) == 0:
+                    break
+                self._create_assignments(chunk)
         else:
             assert isinstance(
                 self.assignment_data_iterable, types.GeneratorType
@@ -143,6 +195,14 @@ class TaskLauncher:
         units generator which checks that only 'max_num_concurrent_units' running at the same time,
         i.e. in the LAUNCHED or ASSIGNED states
         """
+        for units in self._generate_unit_batches():
+            yield from units
+
+    def _generate_unit_batches(self) -> Iterator[List[Unit]]:
+        """
+        Generate the units that can be launched every UNIT_GENERATOR_WAIT_SECONDS, in batches,
+        such that only 'max_num_concurrent_units' are in the LAUNCHED or ASSIGNED states
+        """
         while self.keep_launching_units:
             units_id_to_remove = []
             for db_id, unit in self.launched_units.items():
@@ -159,20 +219,29 @@ class TaskLauncher:
                 else num_avail_units
             )
 
-            units_id_to_remove = []
+            units_to_launch: List[Unit] = []
             with self.unlaunched_units_access_condition:
                 for i, item in enumerate(self.unlaunched_units.items()):
                     db_id, unit = item
                     if i < num_avail_units:
                         self.launched_units[unit.db_id] = unit
-                        units_id_to_remove.append(db_id)
-                        yield unit
+                        units_to_launch.append(unit)
                     else:
                         break
-                for db_id in units_id_to_remove:
-                    self.unlaunched_units.pop(db_id)
+                for unit in units_to_launch:
+                    self.unlaunched_units.pop(unit.db_id)
+            if len(units_to_launch) > 0:
+                yield units_to_launch
 
-            time.sleep(UNIT_GENERATOR_WAIT_SECONDS)
+            with self.unlaunched_units_access_condition:
+                is_waiting_for_new_units = (
+                    len(self.unlaunched_units) == 0 and not self.assignment_thread_done
+                )
+                if is_waiting_for_new_units:
+                    # Launch units as soon as the assignment generator creates them
+                    self.unlaunched_units_access_condition.wait(timeout=UNIT_GENERATOR_WAIT_SECONDS)
+            if not is_waiting_for_new_units:
+                time.sleep(UNIT_GENERATOR_WAIT_SECONDS)
             if not self.unlaunched_units:
                 break
 
@@ -186,19 +255,93 @@ class TaskLauncher:
         while not self.finished_generators and (
             len(self.unlaunched_units) > 0 or not self.assignment_thread_done
         ):
-            for unit in self.generate_units():
-                if unit is None:
-                    break
-                unit.launch(url)
+            for units in self._generate_unit_batches():
+                self.UnitClass.launch_bulk(units, url)
             if self.generator_type == GeneratorType.NONE:
                 break
         self.finished_generators = True
 
+    def _handle_unit_status_change(self, unit: "Unit", old_status: str, new_status: str) -> None:
+        """Free the launch slot of a unit of this run that's no longer launched or assigned"""
+        if new_status in [AssignmentState.LAUNCHED, AssignmentState.ASSIGNED]:
+            return
+        with self.unlaunched_units_access_condition:
+            if self.launched_units.pop(unit.db_id, None) is not None:
+                self.unlaunched_units_access_condition.notify_all()
+
+    def notify_unit_status_update(self, unit_id: str) -> None:
+        """
+        Mark that the status of a unit may have changed without its db status being
+        set yet (such as when its agent finishes), so it should be checked once
+        """
+        if not self.event_driven_launch:
+            return
+        with self.unlaunched_units_access_condition:
+            if unit_id in self.launched_units:
+                self._units_to_check.add(unit_id)
+                self.unlaunched_units_access_condition.notify_all()
+
+    def _wake_unit_launcher(self) -> None:
+        with self.unlaunched_units_access_condition:
+            self.unlaunched_units_access_condition.notify_all()
+
+    def _check_launched_unit_statuses(self, unit_ids: List[str]) -> None:
+        """Query the given launched units, freeing the slots of any that finished"""
+        for unit_id in unit_ids:
+            unit = self.launched_units.get(unit_id)
+            if unit is None:
+                continue
+            # Any change to the db status frees the slot through the status listener
+            status = unit.get_status()
+            if status not in [AssignmentState.LAUNCHED, AssignmentState.ASSIGNED]:
+                with self.unlaunched_units_access_condition:
+                    self.launched_units.pop(unit_id, None)
+
+    def _launch_units_on_events(self, url: str) -> None:
+        """
+        Launch units whenever there's a free slot under max_num_concurrent_units,
+        waking up on unit status changes and new units rather than on a timer
+        """
+        condition = self.unlaunched_units_access_condition
+        last_reconcile_time = time.monotonic()
+        while not self.finished_generators and (
+            len(self.unlaunched_units) > 0 or not self.assignment_thread_done
+        ):
+            if time.monotonic() - last_reconcile_time > UNIT_STATUS_RECONCILE_SECONDS:
+                self._check_launched_unit_statuses(list(self.launched_units.keys()))
+                last_reconcile_time = time.monotonic()
+
+            with condition:
+                units_to_check = list(self._units_to_check)
+                self._units_to_check.clear()
+            self._check_launched_unit_statuses(units_to_check)
+
+            units_to_launch: List[Unit] = []
+            with condition:
+                if self.max_num_concurrent_units == 0:
+                    num_avail_units = len(self.unlaunched_units)
+                else:
+                    num_avail_units = self.max_num_concurrent_units - len(self.launched_units)
+                for db_id in list(self.unlaunched_units.keys())[: max(num_avail_units, 0)]:
+                    unit = self.unlaunched_units.pop(db_id)
+                    self.launched_units[db_id] = unit
+                    units_to_launch.append(unit)
+                if len(units_to_launch) == 0 and len(self._units_to_check) == 0:
+                    condition.wait(timeout=UNIT_STATUS_RECONCILE_SECONDS)
+
+            if len(units_to_launch) > 0:
+                self.UnitClass.launch_bulk(units_to_launch, url)
+        self.finished_generators = True
+
     def launch_units(self, url: str) -> None:
         """launch any units registered by this TaskLauncher"""
         self.launch_url = url
+        launch_target = self._launch_limited_units
+        if self.event_driven_launch:
+            register_unit_status_listener(self.task_run.db_id, self._handle_unit_status_change)
+            launch_target = self._launch_units_on_events
         self.units_thread = threading.Thread(
-            target=self._launch_limited_units,
+            target=launch_target,
             args=(url,),
             name="unit-generator",
         )
@@ -240,33 +383,38 @@ class TaskLauncher:
     def get_assignments_are_all_created(self) -> bool:
         return self.assignment_thread_done
 
-    def expire_units(self) -> None:
-        """Clean up all units on this TaskLauncher"""
+    def expire_units(self) -> float:
+        """
+        Clean up all units on this TaskLauncher, returning the longest time needed
+        to wait before we know they're all taken down
+        """
         self.keep_launching_units = False
         self.finished_generators = True
-        for unit in tqdm(self.units):
-            try:
-                unit.expire()
-            except Exception as e:
-                logger.exception(
-                    f"Warning: failed to expire unit {unit.db_id}. Stated error: {e}",
-                    exc_info=True,
-                )
+        self._wake_unit_launcher()
+        return expire_units(self.units)
 
     def shutdown(self) -> None:
         """Clean up running threads for generating assignments and units"""
         self.assignment_thread_done = True
         self.keep_launching_units = False
         self.finished_generators = True
+        self._wake_unit_launcher()
+        if self.event_driven_launch:
+            unregister_unit_status_listener(self.task_run.db_id, self._handle_unit_status_change)
         if self.assignments_thread is not None:
             self.assignments_thread.join()
         if self.units_thread is not None:
             self.units_thread.join()
 
-    def resume_assignments(self) -> None:
+    def resume_assignments(
+        self, remaining_data: Optional[Iterable[InitializationData]] = None
+    ) -> None:
         """
         Experimental function to go through a resume expired (or incomplete) tasks from a specific
         task run that may have been left incomplete.
+
+        If given the `remaining_data` that the run didn't create assignments for
+        yet, those assignments are created as well.
         """
         # TODO: Remove debug loggers after testing this feature
         logger.debug(f"Resuming assignments")
@@ -299,7 +447,12 @@ class TaskLauncher:
                     with self.unlaunched_units_access_condition:
                         self.unlaunched_units[unit.db_id] = unit
 
-        assert len(self.units) > 0, "Cannot relaunch a job with no incomplete units!"
+        if remaining_data is not None:
+            self.assignment_data_iterable = remaining_data
+            self._set_generator_type()
+            self.create_assignments()
+        else:
+            assert len(self.units) > 0, "Cannot relaunch a job with no incomplete units!"
 
         logger.debug(f"Resuming assignments finished successfuly")
         self.keep_launching_units = True
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+
+# Copyright (c) Meta Platforms and its affiliates.
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import TYPE_CHECKING
+
+from mephisto.data_model.constants.assignment_state import AssignmentState
+from mephisto.utils.concurrency import CallGroup
+from mephisto.utils.concurrency import run_call_groups
+from mephisto.utils.logger_core import get_logger
+
+if TYPE_CHECKING:
+    from mephisto.data_model.unit import Unit
+
+logger = get_logger(name=__name__)
+
+
+def _may_call_provider(unit: "Unit") -> bool:
+    """Units that are done only update local state when expired, so skip the rate limit"""
+    return unit.db_status in AssignmentState.incomplete()
+
+
+def expire_units(units: Iterable["Unit"], quiet: bool = False) -> float:
+    """
+    Expire all of the given units, possibly from many task runs and providers, and
+    return the longest time needed to wait before we know they're all taken down.
+
+    Units are grouped by provider, and each provider's units are expired concurrently
+    within the limits of its Unit class's `get_expire_limits`, while all providers'
+    groups are worked on at once. Failures to expire a unit are logged and skipped.
+    """
+    units_by_provider: Dict[str, List["Unit"]] = {}
+    for unit in units:
+        units_by_provider.setdefault(unit.provider_type, []).append(unit)
+
+    groups = []
+    for provider_type, provider_units in units_by_provider.items():
+        # Limits are per provider, so apply the first run's to all of them
+        concurrency, rate_limit = type(provider_units[0]).get_expire_limits(
+            provider_units[0].get_task_run()
+        )
+        groups.append(
+            CallGroup(
+                name=f"expire-{provider_type}",
+                items=provider_units,
+                call=lambda unit: unit.expire(),
+                concurrency=concurrency,
+                rate_limit=rate_limit,
+                is_rate_limited=_may_call_provider,
+            )
+        )
+
+    max_delay = 0.0
+    for result in run_call_groups(groups, description="Expiring units", quiet=quiet):
+        if result.error is not None:
+            logger.error(
+                f"Warning: failed to expire unit {result.item.db_id}. "
+                f"Stated error: {result.error}",
+                exc_info=result.error,
+            )
+            continue
+        max_delay = max(max_delay, result.result or 0)
+    return max_delay
@@ -33,7 +33,7 @@ from mephisto.data_model.worker import Worker
 from mephisto.operations.datatypes import LiveTaskRun
 from mephisto.operations.datatypes import WorkerFailureReasons
 from mephisto.utils.logger_core import get_logger
-from mephisto.utils.qualifications import worker_is_qualified
+from mephisto.utils.qualifications import QualificationEvaluator
 
 if TYPE_CHECKING:
     from mephisto.abstractions.database import MephistoDB
@@ -121,6 +121,16 @@ class WorkerPool:
 
         # Deferred initializiation
         self._live_run: Optional["LiveTaskRun"] = None
+        self._qualification_evaluator: Optional[QualificationEvaluator] = None
+
+    def _get_qualification_evaluator(self) -> QualificationEvaluator:
+        """Get the evaluator for the live run's qualifications, shared by all workers"""
+        if self._qualification_evaluator is None:
+            live_run = self.get_live_run()
+            self._qualification_evaluator = QualificationEvaluator(
+                self.db, live_run.qualifications, live_run.task_run
+            )
+        return self._qualification_evaluator
 
     def _get_submission_deadline_utc(self, agent: Agent):
         submission_deadline_utc = None
@@ -220,7 +230,7 @@ class WorkerPool:
         # 4. Check if Worker qualified to work on this task
         is_qualified = await loop.run_in_executor(
             None,
-            partial(worker_is_qualified, worker, live_run.qualifications, live_run.task_run),
+            partial(self._get_qualification_evaluator().is_qualified, worker),
         )
         if not is_qualified:
             # 4a. Send an error message to the client
@@ -264,16 +274,25 @@ class WorkerPool:
                 ).to_dict(),
             )
         else:
-            agent = await loop.run_in_executor(
-                None,
-                partial(
-                    crowd_provider.AgentClass.new_from_provider_data,
-                    self.db,
-                    worker,
-                    unit,
-                    crowd_data,
-                ),
-            )
+            try:
+                agent = await loop.run_in_executor(
+                    None,
+                    partial(
+                        crowd_provider.AgentClass.new_from_provider_data,
+                        self.db,
+                        worker,
+                        unit,
+                        crowd_data,
+                    ),
+                )
+            except Exception:
+                # Release the reserved unit, so that it can still be given to a worker
+                logger.exception(f"Failed to create an agent for {unit}, releasing it")
+                if self.db.get_unit(unit.db_id)["agent_id"] is not None:
+                    unit.clear_assigned_agent()
+                else:
+                    task_run.clear_reservation(unit)
+                raise
             agent.set_live_run(live_run)
             live_run.client_io.associate_agent_with_registration(
                 agent.get_agent_id(),
@@ -701,6 +720,14 @@ class WorkerPool:
         live_run = self.get_live_run()
         live_run.client_io.send_status_update(agent.get_agent_id(), status)
 
+    def handle_agent_finished(self, agent: Agent) -> None:
+        """
+        Let the task launcher know that the unit of an agent that reached a final
+        status may have finished, freeing its launch slot
+        """
+        live_run = self.get_live_run()
+        live_run.task_launcher.notify_unit_status_update(agent.unit_id)
+
     def handle_updated_agent_status(self, status_map: Dict[str, str]):
         """
         Handle updating the local statuses for agents based on
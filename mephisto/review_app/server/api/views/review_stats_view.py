@@ -4,6 +4,7 @@
 # This source code is licensed under the MIT license found in the
 # LICENSE file in the root directory of this source tree.
 
+from typing import Any
 from typing import List
 from typing import Optional
 
@@ -16,19 +17,18 @@ from werkzeug.exceptions import BadRequest
 
 from mephisto.abstractions.blueprint import AgentState
 from mephisto.abstractions.databases.local_database import nonesafe_int
-from mephisto.abstractions.databases.local_database import StringIDRow
 from mephisto.data_model.constants.assignment_state import AssignmentState
 
 
-def _find_worker_reviews(
+def _count_worker_reviews(
     db,
     worker_id: Optional[str] = None,
     task_id: Optional[str] = None,
     status: Optional[str] = None,
     since: Optional[str] = None,
     limit: Optional[int] = None,
-) -> List[StringIDRow]:
-    params = []
+) -> int:
+    params: List[Any] = []
 
     worker_query = "worker_id = ?" if worker_id else ""
     if worker_id:
@@ -71,27 +71,28 @@ def _find_worker_reviews(
         c = conn.cursor()
         c.execute(
             f"""
-            SELECT * FROM worker_review
-            {where_query}
-            ORDER BY creation_date ASC
-            {limit_query};
+            SELECT COUNT(*) AS count FROM (
+                SELECT 1 FROM worker_review
+                {where_query}
+                ORDER BY creation_date ASC
+                {limit_query}
+            );
             """,
             params,
         )
 
-        results = c.fetchall()
-        return results
+        return c.fetchone()["count"]
 
 
-def _find_units_for_worker(
+def _count_units_for_worker(
     db,
     worker_id: Optional[str] = None,
     task_id: Optional[str] = None,
     statuses: Optional[List[str]] = None,
     since: Optional[str] = None,
     limit: Optional[int] = None,
-) -> List[StringIDRow]:
-    params = []
+) -> int:
+    params: List[Any] = []
 
     worker_query = "worker_id = ?" if worker_id else ""
     if worker_id:
@@ -101,8 +102,9 @@ def _find_units_for_worker(
     if task_id:
         params.append(nonesafe_int(task_id))
 
-    statuses_string = ",".join([f"'{s}'" for s in statuses])
-    status_query = f"status IN ({statuses_string})" if statuses else ""
+    status_query = f"status IN ({','.join('?' * len(statuses))})" if statuses else ""
+    if statuses:
+        params += statuses
 
     since_query = "creation_date >= ?" if since else ""
     if since:
@@ -133,15 +135,16 @@ def _find_units_for_worker(
         c = conn.cursor()
         c.execute(
             f"""
-            SELECT * FROM units
-            {where_query}
-            ORDER BY creation_date ASC {limit_query};
+            SELECT COUNT(*) AS count FROM (
+                SELECT 1 FROM units
+                {where_query}
+                ORDER BY creation_date ASC {limit_query}
+            );
             """,
             params,
         )
 
-        results = c.fetchall()
-        return results
+        return c.fetchone()["count"]
 
 
 class ReviewStatsView(MethodView):
@@ -160,7 +163,7 @@ class ReviewStatsView(MethodView):
             except ParserError:
                 raise BadRequest("Wrong date format.")
 
-        approved_worker_reviews = _find_worker_reviews(
+        approved_count = _count_worker_reviews(
             db=app.db,
             worker_id=worker_id,
             task_id=task_id,
@@ -168,7 +171,7 @@ class ReviewStatsView(MethodView):
             since=since,
             limit=limit,
         )
-        rejected_worker_reviews = _find_worker_reviews(
+        rejected_count = _count_worker_reviews(
             db=app.db,
             worker_id=worker_id,
             task_id=task_id,
@@ -176,7 +179,7 @@ class ReviewStatsView(MethodView):
             since=since,
             limit=limit,
         )
-        soft_rejected_worker_reviews = _find_worker_reviews(
+        soft_rejected_count = _count_worker_reviews(
             db=app.db,
             worker_id=worker_id,
             task_id=task_id,
@@ -184,7 +187,7 @@ class ReviewStatsView(MethodView):
             since=since,
             limit=limit,
         )
-        all_units_for_worker = _find_units_for_worker(
+        total_count = _count_units_for_worker(
             db=app.db,
             worker_id=worker_id,
             task_id=task_id,
@@ -193,16 +196,12 @@ class ReviewStatsView(MethodView):
             limit=limit,
         )
 
-        reviewed_reviews = (
-            approved_worker_reviews + rejected_worker_reviews + soft_rejected_worker_reviews
-        )
-
         return {
             "stats": {
-                "total_count": len(all_units_for_worker),  # within the scope of the filters
-                "reviewed_count": len(reviewed_reviews),
-                "approved_count": len(approved_worker_reviews),
-                "rejected_count": len(rejected_worker_reviews),
-                "soft_rejected_count": len(soft_rejected_worker_reviews),
+                "total_count": total_count,  # within the scope of the filters
+                "reviewed_count": approved_count + rejected_count + soft_rejected_count,
+                "approved_count": approved_count,
+                "rejected_count": rejected_count,
+                "soft_rejected_count": soft_rejected_count,
             },
         }
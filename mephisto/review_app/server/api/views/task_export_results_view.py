@@ -4,19 +4,21 @@
 # This source code is licensed under the MIT license found in the
 # LICENSE file in the root directory of this source tree.
 
-import json
 import os
 from pathlib import Path
-from typing import List
 
 from flask import current_app as app
 from flask.views import MethodView
 from werkzeug.exceptions import BadRequest
 
 from mephisto.abstractions.databases.local_database import StringIDRow
-from mephisto.data_model.unit import Unit
+from mephisto.review_app.server.db_queries import count_units_by_task_and_status
+from mephisto.review_app.server.utils.results_export import get_completed_units_fingerprint
+from mephisto.review_app.server.utils.results_export import is_results_file_up_to_date
+from mephisto.review_app.server.utils.results_export import iter_completed_units_data
+from mephisto.review_app.server.utils.results_export import write_results_file
 from .tasks_view import check_if_task_reviewed
-from .tasks_view import find_completed_units
+from .tasks_view import summarize_unit_statuses
 
 ENABLE_INCOMPLETE_TASK_RESULTS_EXPORT = True
 
@@ -38,7 +40,6 @@ class TaskExportResultsView(MethodView):
         db_task: StringIDRow = app.db.get_task(task_id)
         app.logger.debug(f"Found Task in DB: {db_task}")
 
-        db_units: List[StringIDRow] = find_completed_units(int(task_id))
         is_reviewed = check_if_task_reviewed(int(task_id))
 
         allow_export_task_resultt = ENABLE_INCOMPLETE_TASK_RESULTS_EXPORT or is_reviewed
@@ -48,28 +49,20 @@ class TaskExportResultsView(MethodView):
                 "Please review it completely before requesting the results."
             )
 
-        task_units_data = {}
-        for db_unit in db_units:
-            unit_id = db_unit["unit_id"]
-            unit: Unit = Unit.get(app.db, unit_id)
-
-            try:
-                unit_data = app.data_browser.get_data_from_unit(unit)
-            except AssertionError:
-                # in case unit does not have an agent somehow
-                unit_data = {}
-
-            task_units_data[unit_id] = unit_data
+        unit_counts = count_units_by_task_and_status(app.db, int(task_id)).get(str(task_id), {})
+        n_units = summarize_unit_statuses(unit_counts)["unit_completed_count"]
 
         # Save file with results, so it can be copied later from the repo if needed
         results_dir = get_results_dir()
-        results_file_path = get_result_file_path(results_dir, task_id, len(db_units))
+        results_file_path = get_result_file_path(results_dir, task_id, n_units)
 
-        # File is cached only if we did not add any new reviewed units to the task
-        if not os.path.exists(results_file_path):
+        # File is cached only if none of the task's completed units has changed
+        fingerprint = get_completed_units_fingerprint(app.db, int(task_id))
+        if not is_results_file_up_to_date(results_file_path, fingerprint):
             os.makedirs(results_dir, exist_ok=True)
-            with open(results_file_path, "w") as f:
-                f.write(json.dumps(task_units_data, indent=4))
+            # Units' data is written as it's loaded, not to keep data of all units in memory
+            units_data = iter_completed_units_data(app.db, app.data_browser, int(task_id))
+            write_results_file(results_file_path, units_data, fingerprint)
 
         return {
             "file_created": True,
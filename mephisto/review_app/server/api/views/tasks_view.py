@@ -4,6 +4,7 @@
 # This source code is licensed under the MIT license found in the
 # LICENSE file in the root directory of this source tree.
 
+from typing import Dict
 from typing import List
 
 from dateutil.parser import parse
@@ -18,22 +19,10 @@ from mephisto.data_model.task_run import TaskRun
 from mephisto.generators.form_composer.config_validation.config_validation_constants import (
     FORM_COMPOSER_TASK_TAG,
 )
+from mephisto.review_app.server.db_queries import count_units_by_task_and_status
+from mephisto.review_app.server.db_queries import find_tasks_with_stats_flags
 from mephisto.review_app.server.db_queries import find_units
-
-
-def _find_tasks(db, debug: bool = False) -> List[StringIDRow]:
-    with db.table_access_condition:
-        conn = db.get_connection()
-
-        c = conn.cursor()
-        c.execute(
-            """
-            SELECT * from tasks
-            """
-        )
-        rows = c.fetchall()
-
-        return rows
+from mephisto.utils.db import set_task_has_stats
 
 
 def find_all_units(task_id: int) -> List[StringIDRow]:
@@ -49,18 +38,37 @@ def find_completed_units(task_id: int) -> List[StringIDRow]:
     )
 
 
-def check_if_task_reviewed(task_id: int) -> bool:
+def summarize_unit_statuses(status_counts: Dict[str, int]) -> dict:
+    """Get Task unit counts (and whether it's reviewed) from its units' counts by status"""
+    unit_completed_count = sum(
+        count for status, count in status_counts.items() if status in AssignmentState.completed()
+    )
+    unit_finished_count = sum(
+        count for status, count in status_counts.items() if status in AssignmentState.final_agent()
+    )
     # As we can review only completed Units,
     # Task can be considered reviewed, if we count only these Units
-    db_units: List[StringIDRow] = find_completed_units(task_id)
-    unit_count = len(db_units)
-    is_reviewed = unit_count > 0 and all(
-        [u["status"] != AssignmentState.COMPLETED for u in db_units]
-    )
-    return is_reviewed
+    is_reviewed = unit_completed_count > 0 and status_counts.get(AssignmentState.COMPLETED, 0) == 0
+
+    return {
+        "is_reviewed": is_reviewed,
+        "unit_all_count": sum(status_counts.values()),
+        "unit_completed_count": unit_completed_count,
+        "unit_finished_count": unit_finished_count,
+    }
+
+
+def check_if_task_reviewed(task_id: int) -> bool:
+    unit_counts = count_units_by_task_and_status(app.db, task_id)
+    status_counts = unit_counts.get(str(task_id), {})
+    return summarize_unit_statuses(status_counts)["is_reviewed"]
 
 
 def _check_task_has_stats(task_id: str) -> bool:
+    """
+    Find out if Task has stats by its units' data, if the flag is not cached yet.
+    The result is cached once it cannot change anymore
+    """
     task: Task = Task.get(db=app.db, db_id=task_id)
     task_runs: List[TaskRun] = task.get_runs()
 
@@ -70,47 +78,51 @@ def _check_task_has_stats(task_id: str) -> bool:
     last_task_run: TaskRun = task_runs[-1]
     last_task_run_config: DictConfig = last_task_run.get_task_args()
 
-    if FORM_COMPOSER_TASK_TAG in last_task_run_config.task_tags:
-        from mephisto.generators.form_composer.stats import check_task_has_fields_for_stats
+    if FORM_COMPOSER_TASK_TAG not in last_task_run_config.task_tags:
+        set_task_has_stats(app.db, task_id, False)
+        return False
+
+    from mephisto.generators.form_composer.stats import check_task_has_fields_for_stats
 
-        return check_task_has_fields_for_stats(task)
+    has_stats = check_task_has_fields_for_stats(task)
+    # Units of running tasks may still bring fields for stats
+    if has_stats or all(task_run.get_is_completed() for task_run in task_runs):
+        set_task_has_stats(app.db, task_id, has_stats)
 
-    return False
+    return has_stats
 
 
 class TasksView(MethodView):
     def get(self) -> dict:
         """Get all available tasks (to select one for review)"""
 
-        db_tasks: List[StringIDRow] = _find_tasks(app.db, debug=app.debug)
+        db_tasks: List[StringIDRow] = find_tasks_with_stats_flags(app.db)
         app.logger.debug(f"Found tasks in DB: {[t['task_id'] for t in db_tasks]}")
 
+        # Unit counts for all tasks at once
+        unit_counts = count_units_by_task_and_status(app.db)
+
         tasks = []
         for t in db_tasks:
-            db_units: List[StringIDRow] = find_all_units(int(t["task_id"]))
-            app.logger.debug(f"All found units: {[u['unit_id'] for u in db_units]}")
+            unit_summary = summarize_unit_statuses(unit_counts.get(t["task_id"], {}))
 
-            unit_all_count = len(db_units)
-            unit_completed_count = len(find_completed_units(int(t["task_id"])))
-            unit_finished_count = len(
-                [u for u in db_units if u["status"] in AssignmentState.final_agent()]
-            )
-            is_reviewed = check_if_task_reviewed(task_id=t["task_id"])
-            has_stats = _check_task_has_stats(task_id=t["task_id"])
+            has_stats = t["has_stats"]
+            if has_stats is None:
+                has_stats = _check_task_has_stats(task_id=t["task_id"])
 
             tasks.append(
                 {
                     "created_at": parse(t["creation_date"]).isoformat(),
-                    "has_stats": has_stats,
+                    "has_stats": bool(has_stats),
                     "id": t["task_id"],
-                    "is_reviewed": is_reviewed,
+                    "is_reviewed": unit_summary["is_reviewed"],
                     "name": t["task_name"],
                     # To show how many Units Task has
-                    "unit_all_count": unit_all_count,
+                    "unit_all_count": unit_summary["unit_all_count"],
                     # To download results file (we use it in URL)
-                    "unit_completed_count": unit_completed_count,
+                    "unit_completed_count": unit_summary["unit_completed_count"],
                     # To show how many Units were finished among all
-                    "unit_finished_count": unit_finished_count,
+                    "unit_finished_count": unit_summary["unit_finished_count"],
                 }
             )
 
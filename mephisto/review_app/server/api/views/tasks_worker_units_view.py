@@ -11,42 +11,44 @@ from flask.views import MethodView
 
 from mephisto.abstractions.databases.local_database import StringIDRow
 from mephisto.data_model.constants.assignment_state import AssignmentState
-from mephisto.review_app.server.db_queries import find_units
+from mephisto.review_app.server.db_queries import find_units_page
+from mephisto.review_app.server.utils.pagination import get_units_page_params
+from mephisto.review_app.server.utils.pagination import split_units_page
 
 
 class TaskUnitIdsView(MethodView):
     def get(self, task_id) -> dict:
         """
-        Get full, unpaginated list of unit IDs within a task
-        (for subsequent client-side grouping by worker_id and GET /task-units pagination)
+        Get list of unit IDs within a task
+        (for subsequent client-side grouping by worker_id and GET /task-units pagination).
+        Unpaginated unless `page_size` is passed, with the `after` cursor returned as `next_cursor`
         """
 
         db_task: StringIDRow = app.db.get_task(task_id)
         app.logger.debug(f"Found task in DB: {dict(db_task)}")
 
-        db_units: List[StringIDRow] = find_units(
+        page_size, after = get_units_page_params()
+
+        db_units: List[StringIDRow] = find_units_page(
             app.db,
-            int(db_task["task_id"]),
-            statuses=AssignmentState.completed(),
-            debug=app.debug,
+            task_id=int(db_task["task_id"]),
+            statuses=[AssignmentState.COMPLETED],
+            after=after,
+            limit=page_size + 1 if page_size else None,
         )
+        db_units, next_cursor = split_units_page(db_units, page_size)
 
-        app.logger.debug(f"All units: {[u['unit_id'] for u in db_units]}")
-
-        worker_units_ids = []
-        for db_unit in db_units:
-            if db_unit["status"] != AssignmentState.COMPLETED:
-                continue
-
-            worker_units_ids.append(
-                {
-                    "worker_id": db_unit["worker_id"],
-                    "unit_id": db_unit["unit_id"],
-                }
-            )
+        worker_units_ids = [
+            {
+                "worker_id": db_unit["worker_id"],
+                "unit_id": db_unit["unit_id"],
+            }
+            for db_unit in db_units
+        ]
 
         app.logger.debug(f"Worker Units IDs: {worker_units_ids}")
 
         return {
+            "next_cursor": next_cursor,
             "worker_units_ids": worker_units_ids,
         }
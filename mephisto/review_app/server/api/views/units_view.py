@@ -7,14 +7,18 @@
 from typing import List
 from typing import Optional
 
+from dateutil.parser import parse
 from flask import current_app as app
 from flask import request
 from flask.views import MethodView
 from werkzeug.exceptions import BadRequest
 
+from mephisto.abstractions.databases.local_database import StringIDRow
 from mephisto.data_model.constants.assignment_state import AssignmentState
 from mephisto.data_model.task import Task
-from mephisto.data_model.unit import Unit
+from mephisto.review_app.server.db_queries import find_units_page
+from mephisto.review_app.server.utils.pagination import get_units_page_params
+from mephisto.review_app.server.utils.pagination import split_units_page
 
 
 class UnitsView(MethodView):
@@ -22,7 +26,8 @@ class UnitsView(MethodView):
         """
         Get workers' results (filtered by `task_id` and/or `unit_ids`, etc) -
         without full details of input/output.
-        At least one filtering parameter must be specified
+        At least one filtering parameter must be specified.
+        Paginated by `page_size` and the `after` cursor returned as `next_cursor`
         """
 
         task_id_param = request.args.get("task_id")
@@ -49,39 +54,43 @@ class UnitsView(MethodView):
         # Check if task with past `task_id` exists
         if task_id_param:
             Task.get(app.db, str(task_id_param))
-            if not unit_ids_param:
-                unit_ids = [int(u.db_id) for u in app.db.find_units(task_id=task_id_param)]
 
-        # Prepare response
-        units = []
-        for unit_id in unit_ids:
-            unit: Unit = Unit.get(app.db, str(unit_id))
-
-            if task_id_param and unit.task_id != task_id_param:
-                continue
+        page_size, after = get_units_page_params()
 
-            if completed_param and unit.db_status != AssignmentState.COMPLETED:
-                continue
+        # Summaries come straight from the DB, without loading units or their agents' data
+        db_units: List[StringIDRow] = find_units_page(
+            app.db,
+            task_id=int(task_id_param) if task_id_param else None,
+            unit_ids=unit_ids,
+            statuses=[AssignmentState.COMPLETED] if completed_param else None,
+            after=after,
+            limit=page_size + 1 if page_size else None,
+        )
+        db_units, next_cursor = split_units_page(db_units, page_size)
 
-            try:
-                unit_data = app.data_browser.get_data_from_unit(unit)
-            except AssertionError:
-                # in case this is Expired Unit. It raises and axceptions
-                unit_data = {}
+        if unit_ids and not page_size:
+            # Keep the order the units were requested in
+            unit_positions = {str(unit_id): i for i, unit_id in enumerate(unit_ids)}
+            db_units.sort(key=lambda db_unit: unit_positions[db_unit["unit_id"]])
 
-            bonus = unit_data.get("bonus")
-            review_note = unit_data.get("review_note")
-            is_reviewed = unit.db_status in AssignmentState.reviewed()
+        # Prepare response
+        units = []
+        for db_unit in db_units:
+            bonus = db_unit["bonus"]
+            review_note = db_unit["review_note"]
+            is_reviewed = db_unit["status"] in AssignmentState.reviewed()
 
             units.append(
                 {
-                    "creation_date": unit.creation_date.isoformat(),
-                    "id": unit.db_id,
+                    "creation_date": parse(db_unit["creation_date"]).isoformat(),
+                    "id": db_unit["unit_id"],
                     "is_reviewed": is_reviewed,
-                    "pay_amount": unit.pay_amount,
+                    "pay_amount": db_unit["pay_amount"],
                     "results": {
-                        "start": unit_data.get("task_start"),
-                        "end": unit_data.get("task_end"),
+                        # Task start and end are only kept in agent data files,
+                        # they are returned with the rest of that data by `/units/details`
+                        "start": None,
+                        "end": None,
                         "inputs_preview": None,  # optional TODO(#1058): [Review APP]
                         "outputs_preview": None,  # optional TODO(#1058): [Review APP]
                     },
@@ -89,12 +98,13 @@ class UnitsView(MethodView):
                         "bonus": int(bonus) if bonus else None,
                         "review_note": review_note if review_note else None,
                     },
-                    "status": unit.db_status,
-                    "task_id": unit.task_id or None,
-                    "worker_id": unit.worker_id or None,
+                    "status": db_unit["status"],
+                    "task_id": db_unit["task_id"] or None,
+                    "worker_id": db_unit["worker_id"] or None,
                 }
             )
 
         return {
+            "next_cursor": next_cursor,
             "units": units,
         }
@@ -4,8 +4,14 @@
 # This source code is licensed under the MIT license found in the
 # LICENSE file in the root directory of this source tree.
 
+import base64
+import binascii
+import json
+from typing import Any
+from typing import Dict
 from typing import List
 from typing import Optional
+from typing import Tuple
 
 from mephisto.abstractions.databases.local_database import nonesafe_int
 from mephisto.abstractions.databases.local_database import StringIDRow
@@ -44,3 +50,199 @@ def find_units(
         rows = c.fetchall()
 
         return rows
+
+
+def encode_units_cursor(unit_row: StringIDRow) -> str:
+    """Opaque cursor pointing right after the given unit row, for `find_units_page`"""
+    position = json.dumps([unit_row["creation_date"], int(unit_row["unit_id"])])
+    return base64.urlsafe_b64encode(position.encode()).decode()
+
+
+def decode_units_cursor(cursor: str) -> Tuple[str, int]:
+    """Get (creation_date, unit_id) back from a cursor, raising ValueError if it's invalid"""
+    try:
+        creation_date, unit_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (binascii.Error, TypeError, UnicodeDecodeError, ValueError):
+        raise ValueError(f"Invalid cursor: {cursor}")
+    if not isinstance(creation_date, str) or not isinstance(unit_id, int):
+        raise ValueError(f"Invalid cursor: {cursor}")
+    return creation_date, unit_id
+
+
+def find_units_page(
+    db,
+    task_id: Optional[int] = None,
+    unit_ids: Optional[List[int]] = None,
+    worker_id: Optional[int] = None,
+    statuses: Optional[List[str]] = None,
+    after: Optional[Tuple[str, int]] = None,
+    limit: Optional[int] = None,
+) -> List[StringIDRow]:
+    """
+    Find summaries of units ordered by (creation_date, unit_id), along with the bonus and
+    review note of their latest review. Pass the (creation_date, unit_id) of the last unit
+    of a page as `after` to get the next one
+    """
+    params: List[Any] = []
+    conditions = []
+
+    if task_id:
+        conditions.append("u.task_id = ?")
+        params.append(nonesafe_int(task_id))
+
+    if unit_ids:
+        conditions.append(f"u.unit_id IN ({','.join('?' * len(unit_ids))})")
+        params += [nonesafe_int(unit_id) for unit_id in unit_ids]
+
+    if worker_id:
+        conditions.append("u.worker_id = ?")
+        params.append(nonesafe_int(worker_id))
+
+    if statuses:
+        conditions.append(f"u.status IN ({','.join('?' * len(statuses))})")
+        params += statuses
+
+    if after:
+        after_creation_date, after_unit_id = after
+        conditions.append("(u.creation_date, u.unit_id) > (?, ?)")
+        params += [after_creation_date, after_unit_id]
+
+    where_query = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+    limit_query = "LIMIT ?" if limit else ""
+    if limit:
+        params.append(nonesafe_int(limit))
+
+    with db.table_access_condition:
+        conn = db.get_connection()
+        c = conn.cursor()
+        c.execute(
+            f"""
+            SELECT
+                u.unit_id,
+                u.task_id,
+                u.worker_id,
+                u.status,
+                u.pay_amount,
+                u.creation_date,
+                wr.bonus,
+                wr.review_note
+            FROM units u
+            LEFT JOIN worker_review wr ON wr.id = (
+                SELECT id FROM worker_review
+                WHERE unit_id = u.unit_id
+                ORDER BY creation_date DESC
+                LIMIT 1
+            )
+            {where_query}
+            ORDER BY u.creation_date ASC, u.unit_id ASC
+            {limit_query};
+            """,
+            params,
+        )
+        rows = c.fetchall()
+
+        return rows
+
+
+def find_tasks_with_stats_flags(db) -> List[StringIDRow]:
+    """
+    Find all tasks along with their cached `has_stats` flag
+    (`None` for tasks it wasn't cached for, e.g. launched before the flag existed or imported)
+    """
+    with db.table_access_condition:
+        conn = db.get_connection()
+        c = conn.cursor()
+        c.execute(
+            """
+            SELECT
+                t.task_id,
+                t.task_name,
+                t.creation_date,
+                f.has_stats
+            FROM tasks t
+            LEFT JOIN task_stats_flags f ON f.task_id = t.task_id
+            ORDER BY t.task_id ASC;
+            """
+        )
+        rows = c.fetchall()
+
+        return rows
+
+
+def count_units_by_task_and_status(
+    db,
+    task_id: Optional[int] = None,
+) -> Dict[str, Dict[str, int]]:
+    """
+    Count units of all tasks (or of the one with `task_id`) by their status,
+    as `{task_id: {status: count}}`, in a single grouped query
+    """
+    params = []
+    where_query = ""
+    if task_id:
+        where_query = "WHERE task_id = ?"
+        params.append(nonesafe_int(task_id))
+
+    with db.table_access_condition:
+        conn = db.get_connection()
+        c = conn.cursor()
+        c.execute(
+            f"""
+            SELECT task_id, status, COUNT(*) AS units_count
+            FROM units
+            {where_query}
+            GROUP BY task_id, status;
+            """,
+            params,
+        )
+        rows = c.fetchall()
+
+    counts: Dict[str, Dict[str, int]] = {}
+    for row in rows:
+        counts.setdefault(row["task_id"], {})[row["status"]] = row["units_count"]
+
+    return counts
+
+
+def find_units_statuses_page(
+    db,
+    task_id: int,
+    statuses: List[str],
+    after_unit_id: Optional[int] = None,
+    limit: int = 10000,
+) -> List[StringIDRow]:
+    """
+    Find statuses of Task units (with given statuses) and of their agents, ordered by unit_id.
+    Pass unit_id of the last unit of a page as `after_unit_id` to get the next one
+    """
+    params: List[Any] = [nonesafe_int(task_id), *statuses]
+
+    after_query = ""
+    if after_unit_id:
+        after_query = "AND u.unit_id > ?"
+        params.append(nonesafe_int(after_unit_id))
+
+    params.append(nonesafe_int(limit))
+
+    with db.table_access_condition:
+        conn = db.get_connection()
+        c = conn.cursor()
+        c.execute(
+            f"""
+            SELECT
+                u.unit_id,
+                u.status,
+                u.agent_id,
+                a.status AS agent_status
+            FROM units u
+            LEFT JOIN agents a ON a.agent_id = u.agent_id
+            WHERE u.task_id = ? AND u.status IN ({','.join('?' * len(statuses))}) {after_query}
+            ORDER BY u.unit_id ASC
+            LIMIT ?;
+            """,
+            params,
+        )
+        rows = c.fetchall()
+
+        return rows
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+
+# Copyright (c) Meta Platforms and its affiliates.
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+from flask import request
+from werkzeug.exceptions import BadRequest
+
+from mephisto.abstractions.databases.local_database import StringIDRow
+from mephisto.review_app.server.db_queries import decode_units_cursor
+from mephisto.review_app.server.db_queries import encode_units_cursor
+
+MAX_PAGE_SIZE = 1000
+
+
+def get_units_page_params() -> Tuple[Optional[int], Optional[Tuple[str, int]]]:
+    """
+    Parse the `page_size` and `after` (cursor) GET parameters of a paginated units request.
+    Without a `page_size` all units are returned at once
+    """
+    page_size_param: Optional[str] = request.args.get("page_size")
+    after_param: Optional[str] = request.args.get("after")
+
+    page_size = None
+    if page_size_param:
+        try:
+            page_size = int(page_size_param)
+        except ValueError:
+            raise BadRequest("`page_size` must be an integer.")
+
+        if not 0 < page_size <= MAX_PAGE_SIZE:
+            raise BadRequest(f"`page_size` must be between 1 and {MAX_PAGE_SIZE}.")
+
+    after = None
+    if after_param:
+        if page_size is None:
+            raise BadRequest("`after` can only be used with `page_size`.")
+
+        try:
+            after = decode_units_cursor(after_param)
+        except ValueError:
+            raise BadRequest("`after` must be a cursor returned by a previous page.")
+
+    return page_size, after
+
+
+def split_units_page(
+    unit_rows: List[StringIDRow],
+    page_size: Optional[int],
+) -> Tuple[List[StringIDRow], Optional[str]]:
+    """
+    Split units found with a limit of `page_size + 1` into the page itself
+    and the cursor of the next page (`None` if this is the last one)
+    """
+    if page_size is None or len(unit_rows) <= page_size:
+        return unit_rows, None
+
+    page = unit_rows[:page_size]
+    return page, encode_units_cursor(page[-1])
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+
+# Copyright (c) Meta Platforms and its affiliates.
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+import hashlib
+import json
+import os
+import tempfile
+import textwrap
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+from mephisto.abstractions.databases.local_database import StringIDRow
+from mephisto.data_model.constants.assignment_state import AssignmentState
+from mephisto.data_model.unit import Unit
+from mephisto.review_app.server.db_queries import find_units_page
+from mephisto.review_app.server.db_queries import find_units_statuses_page
+from mephisto.tools.data_browser import DataBrowser
+
+# Number of units whose data is loaded (in parallel) and kept in memory at once
+EXPORT_UNITS_PAGE_SIZE = 100
+
+# Max number of threads loading units' data
+EXPORT_MAX_WORKERS = 8
+
+FINGERPRINT_UNITS_PAGE_SIZE = 10000
+
+
+def iter_completed_units_pages(
+    db,
+    task_id: int,
+    page_size: int = EXPORT_UNITS_PAGE_SIZE,
+) -> Iterator[List[StringIDRow]]:
+    """Iterate over pages of completed units of the Task in (creation_date, unit_id) order"""
+    after: Optional[Tuple[str, int]] = None
+    while True:
+        db_units = find_units_page(
+            db,
+            task_id=task_id,
+            statuses=AssignmentState.completed(),
+            after=after,
+            limit=page_size,
+        )
+        if db_units:
+            yield db_units
+
+        if len(db_units) < page_size:
+            return
+
+        after = (db_units[-1]["creation_date"], int(db_units[-1]["unit_id"]))
+
+
+def _get_unit_data(db, data_browser: DataBrowser, unit_id: str) -> dict:
+    unit: Unit = Unit.get(db, unit_id)
+
+    try:
+        return data_browser.get_data_from_unit(unit)
+    except AssertionError:
+        # in case unit does not have an agent somehow
+        return {}
+
+
+def iter_completed_units_data(
+    db,
+    data_browser: DataBrowser,
+    task_id: int,
+    max_workers: int = EXPORT_MAX_WORKERS,
+) -> Iterator[Tuple[str, dict]]:
+    """
+    Iterate over (unit_id, unit data) of completed units of the Task. Data of a page of units
+    is loaded by a bounded pool of threads, and only one page is kept in memory at a time
+    """
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="results_export") as pool:
+        for db_units in iter_completed_units_pages(db, task_id):
+            unit_ids = [u["unit_id"] for u in db_units]
+            units_data = pool.map(lambda i: _get_unit_data(db, data_browser, i), unit_ids)
+            yield from zip(unit_ids, units_data)
+
+
+def get_completed_units_fingerprint(db, task_id: int) -> str:
+    """
+    Hash of completed units of the Task and statuses of their agents,
+    that changes whenever their exported data would change
+    """
+    fingerprint = hashlib.sha256()
+    after_unit_id = None
+    while True:
+        db_units = find_units_statuses_page(
+            db,
+            task_id=task_id,
+            statuses=AssignmentState.completed(),
+            after_unit_id=after_unit_id,
+            limit=FINGERPRINT_UNITS_PAGE_SIZE,
+        )
+        for u in db_units:
+            row = [u["unit_id"], u["status"], u["agent_id"], u["agent_status"]]
+            fingerprint.update(json.dumps(row).encode())
+
+        if len(db_units) < FINGERPRINT_UNITS_PAGE_SIZE:
+            return fingerprint.hexdigest()
+
+        after_unit_id = int(db_units[-1]["unit_id"])
+
+
+def get_fingerprint_file_path(results_file_path: str) -> str:
+    return f"{results_file_path}.fingerprint"
+
+
+def is_results_file_up_to_date(results_file_path: str, fingerprint: str) -> bool:
+    fingerprint_file_path = get_fingerprint_file_path(results_file_path)
+    if not os.path.exists(results_file_path) or not os.path.exists(fingerprint_file_path):
+        return False
+
+    with open(fingerprint_file_path) as f:
+        return f.read() == fingerprint
+
+
+def write_results_file(
+    results_file_path: str,
+    units_data: Iterable[Tuple[str, dict]],
+    fingerprint: str,
+) -> None:
+    """
+    Write units' data into a JSON file (same as `json.dumps(data, indent=4)` would) unit by unit.
+    It's written into a temporary file first, so that a partially written file is never served
+    """
+    results_dir = os.path.dirname(results_file_path)
+    fd, tmp_file_path = tempfile.mkstemp(dir=results_dir, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as f:
+            f.write("{")
+            is_empty = True
+            for unit_id, unit_data in units_data:
+                unit_json = textwrap.indent(json.dumps(unit_data, indent=4), " " * 4).lstrip()
+                f.write(f"{'' if is_empty else ','}\n    {json.dumps(unit_id)}: {unit_json}")
+                is_empty = False
+            f.write("}" if is_empty else "\n}")
+
+        os.replace(tmp_file_path, results_file_path)
+    except BaseException:
+        os.remove(tmp_file_path)
+        raise
+
+    with open(get_fingerprint_file_path(results_file_path), "w") as f:
+        f.write(fingerprint)
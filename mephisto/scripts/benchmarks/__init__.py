@@ -0,0 +1,11 @@
+#!/usr/bin/env python3
+
+# Copyright (c) Meta Platforms and its affiliates.
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+
+"""
+.. include:: README.md
+"""
+__docformat__ = "restructuredtext"
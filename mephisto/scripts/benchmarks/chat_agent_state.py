@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+
+# Copyright (c) Meta Platforms and its affiliates.
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""
+Benchmark for persisting the live updates of a ParlAI chat agent state.
+
+Plays `num_turns` chat messages into a `ParlAIChatAgentState`, once rewriting
+the whole state file on every message (as it used to) and once appending each
+message to the state journal, and reports the bytes written to disk and the
+per-message latency for each.
+
+To run this command:
+    mephisto scripts benchmarks chat_agent_state
+"""
+
+import json
+import os
+import shutil
+import tempfile
+import time
+from typing import Any
+from typing import Dict
+
+from mephisto.abstractions.blueprints.parlai_chat.parlai_chat_agent_state import (
+    ParlAIChatAgentState,
+)
+from mephisto.abstractions.databases.local_database import LocalMephistoDB
+from mephisto.data_model.agent import Agent
+from mephisto.utils.rich import console
+from mephisto.utils.rich import create_table
+from mephisto.utils.testing import get_test_agent
+
+MESSAGE_TEXT = "This is a fairly typical chat message from a crowd worker. " * 3
+
+
+class _ByteCountingDB(LocalMephistoDB):
+    """LocalMephistoDB that tallies the bytes written through its file methods"""
+
+    bytes_written = 0
+
+    def write_dict(self, path_key: str, target_dict: Dict[str, Any]):
+        self.bytes_written += len(json.dumps(target_dict))
+        super().write_dict(path_key, target_dict)
+
+    def write_text(self, path_key: str, data_string: str):
+        self.bytes_written += len(data_string)
+        super().write_text(path_key, data_string)
+
+    def append_dict(self, path_key: str, target_dict: Dict[str, Any]) -> None:
+        self.bytes_written += len(json.dumps(target_dict)) + 1
+        super().append_dict(path_key, target_dict)
+
+
+class _FullSaveChatAgentState(ParlAIChatAgentState):
+    """ParlAIChatAgentState that saves all of its data on every message"""
+
+    def update_data(self, live_update: Dict[str, Any]) -> None:
+        live_update["timestamp"] = time.time()
+        self.messages.append(live_update)
+        self.save_data()
+
+
+def run_chat_agent_state_benchmark(num_turns: int, journal: bool = True) -> Dict[str, Any]:
+    """
+    Play `num_turns` messages into a fresh chat agent state, either journaling
+    them or saving the full state on each, and return the bytes written and the
+    per-message latency
+    """
+    data_dir = tempfile.mkdtemp()
+    db = _ByteCountingDB(os.path.join(data_dir, "mephisto.db"))
+    try:
+        agent = Agent.get(db, get_test_agent(db))
+        state_class = ParlAIChatAgentState if journal else _FullSaveChatAgentState
+        state = state_class(agent)
+        state.set_init_state({"persona": "benchmark"})
+        db.bytes_written = 0
+
+        latencies = []
+        for idx in range(num_turns):
+            message = {
+                "id": f"agent_{idx % 2}",
+                "text": MESSAGE_TEXT,
+                "episode_done": False,
+                "task_data": {},
+            }
+            start_time = time.monotonic()
+            state.update_data(message)
+            latencies.append(time.monotonic() - start_time)
+        live_bytes = db.bytes_written
+        state.update_submit({"rating": 5})
+
+        # The saved state holds every message, however it was persisted
+        assert len(state_class(agent).messages) == num_turns
+
+        latencies.sort()
+        return {
+            "num_turns": num_turns,
+            "journal": journal,
+            "live_bytes_written": live_bytes,
+            "total_bytes_written": db.bytes_written,
+            "mean_latency": sum(latencies) / num_turns,
+            "p99_latency": latencies[min(num_turns - 1, int(num_turns * 0.99))],
+        }
+    finally:
+        db.shutdown()
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+
+def main():
+    table = create_table(
+        ["Turns", "Persistence", "Live KB written", "Total KB written", "Mean (ms)", "p99 (ms)"],
+        "ParlAIChatAgentState live update persistence",
+    )
+    for num_turns in [100, 500]:
+        for journal in [False, True]:
+            result = run_chat_agent_state_benchmark(num_turns, journal=journal)
+            table.add_row(
+                str(result["num_turns"]),
+                "journal" if result["journal"] else "full save",
+                f"{result['live_bytes_written'] / 1024:.1f}",
+                f"{result['total_bytes_written'] / 1024:.1f}",
+                f"{result['mean_latency'] * 1000:.3f}",
+                f"{result['p99_latency'] * 1000:.3f}",
+            )
+    console.print(table)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+
+# Copyright (c) Meta Platforms and its affiliates.
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""
+Benchmark for creating the assignments and units of a task run from static data.
+
+Runs `TaskLauncher.create_assignments` over `num_rows` rows of assignment data,
+creating them one at a time (a chunk size of 1) and in bulk chunks, and reports
+assignments created per second for each.
+
+To run this command:
+    mephisto scripts benchmarks create_assignments
+"""
+
+import os
+import shutil
+import tempfile
+import time
+from typing import Any
+from typing import Dict
+
+from mephisto.abstractions.databases.local_database import LocalMephistoDB
+from mephisto.data_model.assignment import InitializationData
+from mephisto.data_model.task_run import TaskRun
+from mephisto.operations.task_launcher import DEFAULT_ASSIGNMENT_CHUNK_SIZE
+from mephisto.operations.task_launcher import TaskLauncher
+from mephisto.utils.rich import console
+from mephisto.utils.rich import create_table
+from mephisto.utils.testing import get_test_task_run
+
+
+def run_create_assignments_benchmark(
+    num_rows: int,
+    chunk_size: int = DEFAULT_ASSIGNMENT_CHUNK_SIZE,
+    units_per_assignment: int = 1,
+) -> Dict[str, Any]:
+    """
+    Create `num_rows` assignments against a fresh database in chunks of `chunk_size`,
+    and return the elapsed time and throughput
+    """
+    data_dir = tempfile.mkdtemp()
+    db = LocalMephistoDB(os.path.join(data_dir, "mephisto.db"))
+    try:
+        task_run = TaskRun.get(db, get_test_task_run(db))
+        assignment_data = [
+            InitializationData(
+                shared={"row": idx},
+                unit_data=[{} for _ in range(units_per_assignment)],
+            )
+            for idx in range(num_rows)
+        ]
+        launcher = TaskLauncher(db, task_run, assignment_data, assignment_chunk_size=chunk_size)
+
+        start_time = time.time()
+        launcher.create_assignments()
+        elapsed = time.time() - start_time
+
+        return {
+            "num_rows": num_rows,
+            "chunk_size": chunk_size,
+            "num_assignments": len(launcher.assignments),
+            "num_units": len(launcher.units),
+            "elapsed_seconds": elapsed,
+            "assignments_per_second": num_rows / elapsed if elapsed > 0 else 0.0,
+        }
+    finally:
+        db.shutdown()
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+
+def main():
+    table = create_table(
+        ["Rows", "Chunk size", "Units", "Seconds", "Assignments/s"],
+        "TaskLauncher.create_assignments throughput",
+    )
+    for num_rows in [10000, 100000]:
+        for chunk_size in [1, DEFAULT_ASSIGNMENT_CHUNK_SIZE]:
+            result = run_create_assignments_benchmark(num_rows, chunk_size=chunk_size)
+            table.add_row(
+                str(result["num_rows"]),
+                str(result["chunk_size"]),
+                str(result["num_units"]),
+                f"{result['elapsed_seconds']:.2f}",
+                f"{result['assignments_per_second']:.1f}",
+            )
+    console.print(table)
+
+
+if __name__ == "__main__":
+    main()
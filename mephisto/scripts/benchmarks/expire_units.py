@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+
+# Copyright (c) Meta Platforms and its affiliates.
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""
+Benchmark for expiring the units of a run being shut down, and disposing their HITs.
+
+Expires `num_units` launched MTurk units through `expire_units` (what
+`Operator.shutdown` calls), then disposes of their HITs through
+`expire_and_dispose_hits` (what the MTurk cleanup script calls), against a
+stand-in boto client that takes `latency` seconds per call and throttles calls
+beyond `server_rate` per second the way MTurk does. Reports the units expired and
+HITs disposed per second for a serial shutdown and for different concurrency
+levels and rate limits.
+
+To run this command:
+    mephisto scripts benchmarks expire_units
+"""
+
+import os
+import shutil
+import tempfile
+import threading
+import time
+from typing import Any
+from typing import cast
+from typing import Dict
+from typing import List
+from typing import Tuple
+from unittest import mock
+
+from botocore.exceptions import ClientError  # type: ignore
+
+from mephisto.abstractions.databases.local_database import LocalMephistoDB
+from mephisto.abstractions.providers.mturk import mturk_utils
+from mephisto.abstractions.providers.mturk.mturk_datastore import MTurkDatastore
+from mephisto.abstractions.providers.mturk.mturk_unit import MTurkUnit
+from mephisto.abstractions.providers.mturk.mturk_utils import expire_and_dispose_hits
+from mephisto.abstractions.providers.mturk.provider_type import PROVIDER_TYPE
+from mephisto.data_model.assignment import Assignment
+from mephisto.data_model.constants.assignment_state import AssignmentState
+from mephisto.data_model.task_run import TaskRun
+from mephisto.operations.unit_expiration import expire_units
+from mephisto.utils.concurrency import TokenBucket
+from mephisto.utils.rich import console
+from mephisto.utils.rich import create_table
+from mephisto.utils.testing import get_test_task_run
+
+REQUESTER_NAME = "benchmark_mturk_requester"
+HIT_TYPE_ID = "benchmark_hit_type"
+HIT_DURATION = 600
+LIST_HITS_PAGE_SIZE = 100
+
+
+class _FakeMTurkClient:
+    """Boto MTurk client stand-in, with a fixed call latency and server-side throttling"""
+
+    def __init__(self, hit_ids: List[str], latency: float, server_rate: float):
+        self.hits = [
+            {
+                "HITId": hit_id,
+                "HITTypeId": HIT_TYPE_ID,
+                "HITStatus": "Assignable",
+                "NumberOfAssignmentsAvailable": 1,
+            }
+            for hit_id in hit_ids
+        ]
+        self.latency = latency
+        self.server_limit = TokenBucket(server_rate, capacity=server_rate / 10)
+        self.expired_hit_ids: List[str] = []
+        self.num_throttled = 0
+        self._lock = threading.Lock()
+
+    def _call(self, operation: str) -> None:
+        if not self.server_limit.try_acquire():
+            with self._lock:
+                self.num_throttled += 1
+            raise ClientError(
+                {"Error": {"Code": "ThrottlingException", "Message": "Rate exceeded"}},
+                operation,
+            )
+        time.sleep(self.latency)
+
+    def list_hits(self, MaxResults: int, NextToken: str = "0") -> Dict[str, Any]:
+        start = int(NextToken)
+        page = self.hits[start : start + LIST_HITS_PAGE_SIZE]
+        return {"HITs": page, "NextToken": str(start + LIST_HITS_PAGE_SIZE)}
+
+    def update_expiration_for_hit(self, HITId: str, ExpireAt: Any) -> None:
+        self._call("UpdateExpirationForHIT")
+        with self._lock:
+            self.expired_hit_ids.append(HITId)
+
+    def delete_hit(self, HITId: str) -> None:
+        self._call("DeleteHIT")
+
+
+def _make_launched_units(
+    db: LocalMephistoDB, task_run: TaskRun, num_units: int
+) -> Tuple[List[MTurkUnit], List[str]]:
+    datastore = cast(MTurkDatastore, db.get_datastore_for_provider(PROVIDER_TYPE))
+    assignment_rows = db.new_assignments_bulk(
+        task_run.task_id,
+        task_run.db_id,
+        task_run.requester_id,
+        task_run.task_type,
+        PROVIDER_TYPE,
+        num_units,
+    )
+    unit_specs = [(Assignment.get(db, row["assignment_id"], row=row), 0) for row in assignment_rows]
+    units = cast(List[MTurkUnit], MTurkUnit.new_bulk(db, unit_specs, 1.0))
+    hit_ids = [f"HIT_{idx}" for idx in range(num_units)]
+    datastore.new_hits_bulk(
+        [(hit_id, "unused", HIT_DURATION, task_run.db_id) for hit_id in hit_ids]
+    )
+    # Like real launched units, these aren't mapped to HITs until a worker accepts one,
+    # so every unit claims one of the run's unassigned HITs to expire it
+    for unit in units:
+        unit.set_db_status(AssignmentState.LAUNCHED)
+    return units, hit_ids
+
+
+def run_expire_units_benchmark(
+    num_units: int,
+    concurrency: int,
+    rate_limit: float = 0,
+    latency: float = 0.05,
+    server_rate: float = 200,
+) -> Dict[str, Any]:
+    """
+    Expire `num_units` launched MTurk units and then dispose of their HITs at the
+    given concurrency and rate limit, and return the throughput of each
+    """
+    data_dir = tempfile.mkdtemp()
+    db = LocalMephistoDB(os.path.join(data_dir, "mephisto.db"))
+    # Don't wait out real backoffs against the fake client
+    original_backoff = mturk_utils.RETRY_BACKOFF_SECONDS
+    mturk_utils.RETRY_BACKOFF_SECONDS = 0.05
+    try:
+        datastore = cast(MTurkDatastore, db.get_datastore_for_provider(PROVIDER_TYPE))
+        requester_id = db.new_requester(REQUESTER_NAME, PROVIDER_TYPE)
+        task_run = TaskRun.get(db, get_test_task_run(db, requester_id=requester_id))
+        datastore.register_run(task_run.db_id, HIT_TYPE_ID, "unused")
+        units, hit_ids = _make_launched_units(db, task_run, num_units)
+        client = _FakeMTurkClient(hit_ids, latency, server_rate)
+
+        with mock.patch.object(MTurkUnit, "_get_client", return_value=client), mock.patch.object(
+            MTurkUnit, "get_expire_limits", return_value=(concurrency, rate_limit)
+        ):
+            start_time = time.monotonic()
+            expire_units(units, quiet=True)
+            expire_seconds = time.monotonic() - start_time
+
+        start_time = time.monotonic()
+        remaining_hits = expire_and_dispose_hits(
+            client, client.hits, quiet=True, concurrency=concurrency, rate_limit=rate_limit
+        )
+        dispose_seconds = time.monotonic() - start_time
+
+        return {
+            "num_units": num_units,
+            "concurrency": concurrency,
+            "rate_limit": rate_limit,
+            "units_expired_per_second": num_units / expire_seconds,
+            "hits_disposed_per_second": num_units / dispose_seconds,
+            "throttled_calls": client.num_throttled,
+            # Calls that were still throttled after all of their retries
+            "not_expired": num_units - len(set(client.expired_hit_ids)),
+            "expired_more_than_once": len(client.expired_hit_ids)
+            - len(set(client.expired_hit_ids)),
+            "not_disposed": len(remaining_hits),
+        }
+    finally:
+        mturk_utils.RETRY_BACKOFF_SECONDS = original_backoff
+        db.shutdown()
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+
+def main():
+    num_units = 200
+    latency = 0.2
+    configurations: List[Tuple[int, float]] = [(1, 0), (8, 20), (8, 0), (32, 0), (64, 180)]
+    table = create_table(
+        [
+            "Units",
+            "Concurrency",
+            "Rate limit (/s)",
+            "Units expired/s",
+            "HITs disposed/s",
+            "Throttled calls",
+            "Not expired",
+            "Not disposed",
+        ],
+        "Shutdown expiry throughput (200ms calls, throttled above 200/s)",
+    )
+    for concurrency, rate_limit in configurations:
+        result = run_expire_units_benchmark(
+            num_units, concurrency, rate_limit=rate_limit, latency=latency
+        )
+        table.add_row(
+            str(result["num_units"]),
+            str(result["concurrency"]),
+            str(result["rate_limit"] or "none"),
+            f"{result['units_expired_per_second']:.1f}",
+            f"{result['hits_disposed_per_second']:.1f}",
+            str(result["throttled_calls"]),
+            str(result["not_expired"]),
+            str(result["not_disposed"]),
+        )
+    console.print(table)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+
+# Copyright (c) Meta Platforms and its affiliates.
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""
+Benchmark for importing a dump with `mephisto db import`.
+
+Builds a synthetic dump of a task run with `num_units` units (and as many assignments),
+done by `num_workers` workers with a granted qualification, then times importing it into
+a database that already has half of these workers (so that they go through the conflict
+resolver), importing rows one by one against importing them in bulk (`--bulk` option).
+
+To run this command:
+    mephisto scripts benchmarks import_dump
+"""
+
+import os
+import shutil
+import tempfile
+import time
+from copy import deepcopy
+from typing import Any
+from typing import Dict
+
+from mephisto.abstractions.databases.local_database import LocalMephistoDB
+from mephisto.data_model.task_run import TaskRun
+from mephisto.tools.db_data_porter.constants import DEFAULT_CONFLICT_RESOLVER
+from mephisto.tools.db_data_porter.constants import MEPHISTO_DUMP_KEY
+from mephisto.tools.db_data_porter.import_dump import import_single_db
+from mephisto.utils import db as db_utils
+from mephisto.utils.rich import console
+from mephisto.utils.rich import create_table
+from mephisto.utils.testing import get_test_qualification
+from mephisto.utils.testing import get_test_task_run
+from mephisto.utils.testing import get_test_worker
+from mephisto.utils.testing import grant_test_qualification
+from mephisto.utils.testing import make_completed_units_bulk
+
+
+def _make_dump_data(data_dir: str, num_units: int, num_workers: int) -> dict:
+    db = LocalMephistoDB(os.path.join(data_dir, "source.db"))
+    try:
+        qualification_id = get_test_qualification(db)
+        worker_ids = []
+        for i in range(num_workers):
+            _, worker_id = get_test_worker(db, f"worker_{i}")
+            grant_test_qualification(db, qualification_id, worker_id)
+            worker_ids.append(worker_id)
+
+        task_run = TaskRun.get(db, get_test_task_run(db))
+        make_completed_units_bulk(db, task_run, worker_ids, num_units)
+
+        return db_utils.db_or_datastore_to_dict(db)
+    finally:
+        db.shutdown()
+
+
+def _time_import(data_dir: str, db_name: str, dump_data: dict, num_workers: int, bulk: bool):
+    db = LocalMephistoDB(os.path.join(data_dir, db_name))
+    try:
+        # Half of workers from the dump already exist in local DB, with other IDs
+        for i in range(0, num_workers, 2):
+            get_test_worker(db, f"worker_{i}")
+
+        start_time = time.monotonic()
+        results = import_single_db(
+            db=db,
+            provider_type=MEPHISTO_DUMP_KEY,
+            dump_data=deepcopy(dump_data),
+            conflict_resolver_name=DEFAULT_CONFLICT_RESOLVER,
+            labels=["benchmark"],
+            bulk=bulk,
+        )
+        duration = time.monotonic() - start_time
+
+        assert not results["errors"], results["errors"]
+        num_imported_units = len(db_utils.select_all_table_rows(db, "units"))
+        assert num_imported_units == len(dump_data["units"])
+        return duration
+    finally:
+        db.shutdown()
+
+
+def run_import_dump_benchmark(num_units: int, num_workers: int = 100) -> Dict[str, Any]:
+    """
+    Build a dump with `num_units` units of `num_workers` workers and return the time
+    to import it row by row and in bulk
+    """
+    data_dir = tempfile.mkdtemp()
+    try:
+        dump_data = _make_dump_data(data_dir, num_units, num_workers)
+        num_rows = sum(len(rows) for rows in dump_data.values())
+        return {
+            "num_units": num_units,
+            "num_rows": num_rows,
+            "row_by_row_seconds": _time_import(
+                data_dir, "row_by_row.db", dump_data, num_workers, bulk=False
+            ),
+            "bulk_seconds": _time_import(data_dir, "bulk.db", dump_data, num_workers, bulk=True),
+        }
+    finally:
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+
+def main():
+    table = create_table(
+        ["Units", "Dump rows", "Row by row (s)", "Bulk (s)", "Speedup"],
+        "Dump import time",
+    )
+    for num_units in [1000, 10000]:
+        result = run_import_dump_benchmark(num_units)
+        table.add_row(
+            str(result["num_units"]),
+            str(result["num_rows"]),
+            f"{result['row_by_row_seconds']:.2f}",
+            f"{result['bulk_seconds']:.2f}",
+            f"{result['row_by_row_seconds'] / result['bulk_seconds']:.1f}x",
+        )
+    console.print(table)
+
+
+if __name__ == "__main__":
+    main()
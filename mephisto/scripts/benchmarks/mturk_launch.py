@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+
+# Copyright (c) Meta Platforms and its affiliates.
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""
+Benchmark for launching the units of an MTurk task run.
+
+Launches `num_units` MTurk units through `MTurkHitLauncher` against a stand-in
+boto client, that takes `latency` seconds per `create_hit_with_hit_type` call
+and throttles calls beyond `server_rate` per second the way MTurk does. Reports
+the HITs launched per second and the number of throttled calls, for a serial
+launch, a launch with the default launch args, and launches at different
+concurrency levels and rate limits.
+
+To run this command:
+    mephisto scripts benchmarks mturk_launch
+"""
+
+import os
+import shutil
+import tempfile
+import threading
+import time
+from typing import Any
+from typing import cast
+from typing import Dict
+from typing import List
+from typing import Tuple
+
+from botocore.exceptions import ClientError  # type: ignore
+
+from mephisto.abstractions.databases.local_database import LocalMephistoDB
+from mephisto.abstractions.providers.mturk.mturk_datastore import MTurkDatastore
+from mephisto.abstractions.providers.mturk.mturk_launch_pipeline import DEFAULT_LAUNCH_CONCURRENCY
+from mephisto.abstractions.providers.mturk.mturk_launch_pipeline import DEFAULT_LAUNCH_RATE_LIMIT
+from mephisto.abstractions.providers.mturk.mturk_launch_pipeline import MTurkHitLauncher
+from mephisto.abstractions.providers.mturk.mturk_unit import MTurkUnit
+from mephisto.abstractions.providers.mturk.mturk_utils import SANDBOX_ENDPOINT
+from mephisto.abstractions.providers.mturk.provider_type import PROVIDER_TYPE
+from mephisto.data_model.assignment import Assignment
+from mephisto.data_model.constants.assignment_state import AssignmentState
+from mephisto.data_model.task_run import TaskRun
+from mephisto.utils.concurrency import TokenBucket
+from mephisto.utils.rich import console
+from mephisto.utils.rich import create_table
+from mephisto.utils.testing import get_test_task_run
+
+REQUESTER_NAME = "benchmark_mturk_requester"
+HIT_TYPE_ID = "benchmark_hit_type"
+
+
+class _FakeMTurkClient:
+    """Boto MTurk client stand-in, with a fixed call latency and server-side throttling"""
+
+    def __init__(self, latency: float, server_rate: float):
+        self.meta = type("meta", (), {"endpoint_url": SANDBOX_ENDPOINT})()
+        self.latency = latency
+        self.server_limit = TokenBucket(server_rate, capacity=server_rate / 10)
+        self.num_created = 0
+        self.num_throttled = 0
+        self._lock = threading.Lock()
+
+    def create_hit_with_hit_type(self, HITTypeId: str, **kwargs) -> Dict[str, Any]:
+        if not self.server_limit.try_acquire():
+            with self._lock:
+                self.num_throttled += 1
+            raise ClientError(
+                {"Error": {"Code": "ThrottlingException", "Message": "Rate exceeded"}},
+                "CreateHITWithHITType",
+            )
+        time.sleep(self.latency)
+        with self._lock:
+            self.num_created += 1
+            hit_id = f"HIT_{self.num_created}"
+        return {"HIT": {"HITId": hit_id, "HITTypeId": HITTypeId}}
+
+
+class _FakeSession:
+    def __init__(self, client: _FakeMTurkClient):
+        self._client = client
+
+    def client(self, *args, **kwargs) -> _FakeMTurkClient:
+        return self._client
+
+
+def _make_units(db: LocalMephistoDB, task_run: TaskRun, num_units: int) -> List[MTurkUnit]:
+    assignment_rows = db.new_assignments_bulk(
+        task_run.task_id,
+        task_run.db_id,
+        task_run.requester_id,
+        task_run.task_type,
+        PROVIDER_TYPE,
+        num_units,
+    )
+    unit_specs = [(Assignment.get(db, row["assignment_id"], row=row), 0) for row in assignment_rows]
+    return cast(List[MTurkUnit], MTurkUnit.new_bulk(db, unit_specs, 1.0))
+
+
+def run_mturk_launch_benchmark(
+    num_units: int,
+    concurrency: int = DEFAULT_LAUNCH_CONCURRENCY,
+    rate_limit: float = DEFAULT_LAUNCH_RATE_LIMIT,
+    latency: float = 0.05,
+    server_rate: float = 200,
+) -> Dict[str, Any]:
+    """
+    Launch `num_units` MTurk units at the given concurrency and rate limit (the
+    launcher's defaults if not given), and return the launch throughput along with
+    the number of throttled calls
+    """
+    data_dir = tempfile.mkdtemp()
+    db = LocalMephistoDB(os.path.join(data_dir, "mephisto.db"))
+    try:
+        datastore = cast(MTurkDatastore, db.get_datastore_for_provider(PROVIDER_TYPE))
+        client = _FakeMTurkClient(latency, server_rate)
+        datastore.session_storage[REQUESTER_NAME] = _FakeSession(client)
+        requester_id = db.new_requester(REQUESTER_NAME, PROVIDER_TYPE)
+        task_run = TaskRun.get(db, get_test_task_run(db, requester_id=requester_id))
+        datastore.register_run(task_run.db_id, HIT_TYPE_ID, "unused")
+        units = _make_units(db, task_run, num_units)
+
+        launcher = MTurkHitLauncher(concurrency=concurrency, rate_limit=rate_limit)
+        start_time = time.monotonic()
+        launcher.launch(units, "https://example.com/task")
+        elapsed = time.monotonic() - start_time
+
+        assert all(u.get_db_status() == AssignmentState.LAUNCHED for u in units)
+        assert len(datastore.get_unassigned_hit_ids(task_run.db_id)) == num_units
+        return {
+            "num_units": num_units,
+            "concurrency": concurrency,
+            "rate_limit": rate_limit,
+            "seconds": elapsed,
+            "hits_per_second": num_units / elapsed,
+            "throttled_calls": client.num_throttled,
+        }
+    finally:
+        db.shutdown()
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+
+def main():
+    num_units = 500
+    configurations: List[Tuple[int, float]] = [
+        (1, 0),
+        (DEFAULT_LAUNCH_CONCURRENCY, DEFAULT_LAUNCH_RATE_LIMIT),
+        (32, 0),
+        (64, 0),
+        (64, 180),
+    ]
+    table = create_table(
+        ["Units", "Concurrency", "Rate limit (/s)", "HITs/s", "Throttled calls"],
+        "MTurk HIT launch throughput (50ms calls, throttled above 200/s)",
+    )
+    for concurrency, rate_limit in configurations:
+        result = run_mturk_launch_benchmark(num_units, concurrency, rate_limit=rate_limit)
+        table.add_row(
+            str(result["num_units"]),
+            str(result["concurrency"]),
+            str(result["rate_limit"] or "none"),
+            f"{result['hits_per_second']:.1f}",
+            str(result["throttled_calls"]),
+        )
+    console.print(table)
+
+
+if __name__ == "__main__":
+    main()
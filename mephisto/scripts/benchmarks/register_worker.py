@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+
+# Copyright (c) Meta Platforms and its affiliates.
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""
+Benchmark for the worker registration path of a live run.
+
+Fires a burst of concurrent `WorkerPool.register_worker` calls (each one doing
+worker lookup/creation, authorization and qualification checks, finding valid
+units and creating an agent in the default executor) and reports registrations
+per second for the `LocalMephistoDB` with its global lock and in WAL mode.
+
+To run this command:
+    mephisto scripts benchmarks register_worker
+"""
+
+import asyncio
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import TYPE_CHECKING
+
+from omegaconf import OmegaConf
+
+from mephisto.abstractions.blueprints.mock.mock_blueprint import MockBlueprint
+from mephisto.abstractions.blueprints.mock.mock_blueprint import MockSharedState
+from mephisto.abstractions.blueprints.mock.mock_task_runner import MockTaskRunner
+from mephisto.abstractions.databases.local_database import LocalMephistoDB
+from mephisto.abstractions.providers.mock.mock_provider import MockProvider
+from mephisto.data_model.assignment import AssignmentState
+from mephisto.data_model.qualification import QUAL_EXISTS
+from mephisto.data_model.task_run import TaskRun
+from mephisto.operations.datatypes import LiveTaskRun
+from mephisto.operations.datatypes import LoopWrapper
+from mephisto.operations.task_launcher import TaskLauncher
+from mephisto.operations.worker_pool import WorkerPool
+from mephisto.utils.qualifications import make_qualification_dict
+from mephisto.utils.rich import console
+from mephisto.utils.rich import create_table
+from mephisto.utils.testing import get_test_task_run
+from mephisto.utils.testing import MOCK_CONFIG
+
+if TYPE_CHECKING:
+    from mephisto.data_model.agent import Agent
+    from mephisto.data_model.assignment import Assignment
+    from mephisto.data_model.unit import Unit
+
+
+class _RecordingClientIO:
+    """Stands in for the ClientIOHandler, only keeping the sent agent details"""
+
+    def __init__(self):
+        self.agent_details: Dict[str, Dict[str, Any]] = {}
+        # There are no channels to push status updates through
+        self.is_shutdown = True
+
+    def enqueue_agent_details(self, request_id: str, additional_data: Dict[str, Any]) -> None:
+        self.agent_details[request_id] = additional_data
+
+    def associate_agent_with_registration(
+        self, agent_id: str, request_id: str, registration_id: str
+    ) -> None:
+        pass
+
+
+class _IdleTaskRunner(MockTaskRunner):
+    """Task runner that never starts unit threads, we only measure registration"""
+
+    def execute_unit(self, unit: "Unit", agent: "Agent") -> None:
+        pass
+
+    def execute_assignment(self, assignment: "Assignment", agents: List["Agent"]) -> None:
+        pass
+
+
+def _prepare_live_run(
+    db: LocalMephistoDB,
+    num_units: int,
+    num_qualifications: int,
+    executor_threads: int,
+) -> LiveTaskRun:
+    """Create a mock task run with `num_units` launched units, wrapped as a live run"""
+    task_run = TaskRun.get(db, get_test_task_run(db))
+    config = OmegaConf.structured(MOCK_CONFIG)
+    config.blueprint.num_assignments = num_units // 2
+
+    shared_state = MockSharedState()
+    qualifications: List[Dict[str, Any]] = []
+    for idx in range(num_qualifications):
+        qualification_name = f"benchmark_qualification_{idx}"
+        db.make_qualification(qualification_name)
+        qualifications.append(make_qualification_dict(qualification_name, QUAL_EXISTS, None))
+
+    blueprint = MockBlueprint(task_run, config, shared_state)
+    launcher = TaskLauncher(db, task_run, blueprint.get_initialization_data())
+    launcher.create_assignments()
+    for unit in launcher.units:
+        unit.set_db_status(AssignmentState.LAUNCHED)
+
+    loop = asyncio.new_event_loop()
+    loop.set_default_executor(ThreadPoolExecutor(max_workers=executor_threads))
+    worker_pool = WorkerPool(db)
+    live_run = LiveTaskRun(
+        task_run=task_run,
+        architect=None,  # type: ignore
+        blueprint=blueprint,
+        provider=MockProvider(db),
+        qualifications=qualifications,
+        task_runner=_IdleTaskRunner(task_run, config, shared_state),
+        task_launcher=launcher,
+        client_io=_RecordingClientIO(),  # type: ignore
+        worker_pool=worker_pool,
+        loop_wrap=LoopWrapper(loop),
+    )
+    worker_pool.register_run(live_run)
+    return live_run
+
+
+def _grant_all_qualifications(db: LocalMephistoDB, num_workers: int) -> None:
+    """Pre-create workers holding every benchmark qualification"""
+    qualifications = db.find_qualifications()
+    for idx in range(num_workers):
+        worker_id = db.new_worker(f"benchmark_worker_{idx}_sandbox", "mock")
+        for qualification in qualifications:
+            db.grant_qualification(qualification.db_id, worker_id)
+
+
+def run_register_worker_benchmark(
+    use_wal: bool,
+    num_workers: int = 200,
+    num_qualifications: int = 5,
+    executor_threads: int = 32,
+) -> Dict[str, Any]:
+    """
+    Register `num_workers` workers concurrently against a fresh database and
+    return the elapsed time and throughput
+    """
+    data_dir = tempfile.mkdtemp()
+    db = LocalMephistoDB(os.path.join(data_dir, "mephisto.db"), use_wal=use_wal)
+    try:
+        live_run = _prepare_live_run(db, num_workers * 2, num_qualifications, executor_threads)
+        _grant_all_qualifications(db, num_workers)
+        loop = live_run.loop_wrap.loop
+
+        registrations = [
+            live_run.worker_pool.register_worker(
+                {
+                    "worker_name": f"benchmark_worker_{idx}",
+                    "agent_registration_id": f"benchmark_registration_{idx}",
+                },
+                f"benchmark_request_{idx}",
+            )
+            for idx in range(num_workers)
+        ]
+
+        async def register_all():
+            await asyncio.gather(*registrations)
+
+        start_time = time.time()
+        loop.run_until_complete(register_all())
+        elapsed = time.time() - start_time
+
+        client_io = live_run.client_io
+        assigned = [
+            d for d in client_io.agent_details.values() if d.get("agent_id") is not None  # type: ignore
+        ]
+        loop.close()
+        return {
+            "use_wal": use_wal,
+            "num_workers": num_workers,
+            "num_assigned": len(assigned),
+            "elapsed_seconds": elapsed,
+            "registrations_per_second": num_workers / elapsed if elapsed > 0 else 0.0,
+        }
+    finally:
+        db.shutdown()
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+
+def main():
+    table = create_table(
+        ["Mode", "Workers", "Assigned", "Seconds", "Registrations/s"],
+        "WorkerPool.register_worker throughput",
+    )
+    for num_workers in [200, 1000]:
+        for use_wal in [False, True]:
+            result = run_register_worker_benchmark(use_wal=use_wal, num_workers=num_workers)
+            table.add_row(
+                "WAL" if use_wal else "global lock",
+                str(result["num_workers"]),
+                str(result["num_assigned"]),
+                f"{result['elapsed_seconds']:.2f}",
+                f"{result['registrations_per_second']:.1f}",
+            )
+    console.print(table)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+
+# Copyright (c) Meta Platforms and its affiliates.
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""
+Load test for the `/request_agent` endpoint of the Flask router.
+
+Starts the router in a subprocess (under gevent, as it's deployed), connects a
+stand-in for the Mephisto server that answers every agent registration after
+`response_delay` seconds, then opens `num_requests` concurrent `/request_agent`
+calls. Reports the p50/p99 request latency and the CPU time the router spent
+serving the burst.
+
+To run this command:
+    mephisto scripts benchmarks request_agent
+"""
+
+import asyncio
+import json
+import signal
+import socket
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+from typing import Dict
+from typing import List
+
+import requests
+import websockets
+
+from mephisto.abstractions.architects.router.flask.mephisto_flask_blueprint import (
+    PACKET_TYPE_AGENT_DETAILS,
+)
+from mephisto.abstractions.architects.router.flask.mephisto_flask_blueprint import (
+    PACKET_TYPE_ALIVE,
+)
+from mephisto.abstractions.architects.router.flask.mephisto_flask_blueprint import (
+    PACKET_TYPE_REGISTER_AGENT,
+)
+from mephisto.abstractions.architects.router.flask.mephisto_flask_blueprint import (
+    PACKET_TYPE_REQUEST_STATUSES,
+)
+from mephisto.abstractions.architects.router.flask.mephisto_flask_blueprint import (
+    PACKET_TYPE_RETURN_STATUSES,
+)
+from mephisto.abstractions.architects.router.flask.mephisto_flask_blueprint import (
+    SYSTEM_CHANNEL_ID,
+)
+from mephisto.utils.rich import console
+from mephisto.utils.rich import create_table
+
+ROUTER_STARTUP_TIMEOUT = 30  # seconds
+
+# Runs the router like `router/flask/app.py`, printing its CPU time on SIGUSR1
+ROUTER_SCRIPT = """
+from gevent import monkey
+
+monkey.patch_all()
+
+import resource
+import signal
+import sys
+
+import gevent
+from flask import Flask
+from geventwebsocket import Resource
+from geventwebsocket import WebSocketServer
+
+from mephisto.abstractions.architects.router.flask.mephisto_flask_blueprint import MephistoRouter
+from mephisto.abstractions.architects.router.flask.mephisto_flask_blueprint import mephisto_router
+
+
+def report_cpu_time():
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    print(usage.ru_utime + usage.ru_stime, flush=True)
+
+
+flask_app = Flask(__name__)
+flask_app.register_blueprint(mephisto_router, url_prefix=r"/")
+gevent.signal_handler(signal.SIGUSR1, report_cpu_time)
+WebSocketServer(
+    ("127.0.0.1", int(sys.argv[1])),
+    Resource([("^/.*", MephistoRouter), ("^/.*", flask_app)]),
+    debug=False,
+).serve_forever()
+"""
+
+
+def _get_free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _get_router_cpu_time(router: subprocess.Popen) -> float:
+    """Ask the router subprocess for the CPU time it has used so far"""
+    assert router.stdout is not None
+    router.send_signal(signal.SIGUSR1)
+    return float(router.stdout.readline())
+
+
+async def _answer_agent_requests(
+    url: str, response_delay: float, connected: threading.Event
+) -> None:
+    """
+    Act as the Mephisto server, answering every agent registration request.
+    Sets `connected` once the router has registered this socket.
+    """
+
+    async def answer(websocket, packet: Dict[str, Any]) -> None:
+        await asyncio.sleep(response_delay)
+        request_id = packet["data"]["request_id"]
+        await websocket.send(
+            json.dumps(
+                {
+                    "packet_type": PACKET_TYPE_AGENT_DETAILS,
+                    "subject_id": request_id,
+                    "data": {"request_id": request_id, "agent_id": f"agent_{request_id}"},
+                }
+            )
+        )
+
+    async with websockets.connect(url) as websocket:
+        await websocket.send(
+            json.dumps({"packet_type": PACKET_TYPE_ALIVE, "subject_id": SYSTEM_CHANNEL_ID})
+        )
+        # The router only answers status requests on the registered Mephisto socket
+        await websocket.send(
+            json.dumps(
+                {
+                    "packet_type": PACKET_TYPE_REQUEST_STATUSES,
+                    "subject_id": SYSTEM_CHANNEL_ID,
+                    "data": {},
+                    "server_timestamp": time.time(),
+                }
+            )
+        )
+        try:
+            async for message in websocket:
+                packet = json.loads(message)
+                if packet["packet_type"] == PACKET_TYPE_RETURN_STATUSES:
+                    connected.set()
+                elif packet["packet_type"] == PACKET_TYPE_REGISTER_AGENT:
+                    asyncio.ensure_future(answer(websocket, packet))
+        except websockets.exceptions.ConnectionClosed:
+            pass
+
+
+def _request_agent(base_url: str, timeout: float) -> float:
+    """Make a single `/request_agent` call, returning its latency"""
+    start_time = time.monotonic()
+    response = requests.post(
+        f"{base_url}/request_agent",
+        json={"provider_data": {}, "client_timestamp": time.time()},
+        timeout=timeout,
+    )
+    response.raise_for_status()
+    return time.monotonic() - start_time
+
+
+def _percentile(values: List[float], percentile: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(percentile / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def run_request_agent_benchmark(
+    num_requests: int = 200,
+    response_delay: float = 2,
+    request_timeout: float = 60,
+) -> Dict[str, Any]:
+    """
+    Fire `num_requests` concurrent `/request_agent` calls at a local router, and
+    return their latency percentiles and the router's CPU time over the burst
+    """
+    port = _get_free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    router = subprocess.Popen(
+        [sys.executable, "-c", ROUTER_SCRIPT, str(port)],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        text=True,
+    )
+    connected = threading.Event()
+    mephisto_thread = threading.Thread(
+        target=asyncio.run,
+        args=(_answer_agent_requests(f"ws://127.0.0.1:{port}/", response_delay, connected),),
+        daemon=True,
+    )
+    try:
+        # Wait for the router to come up, then for it to register the Mephisto socket
+        start_time = time.monotonic()
+        while True:
+            try:
+                requests.get(f"{base_url}/is_alive", timeout=1).raise_for_status()
+                break
+            except requests.exceptions.ConnectionError:
+                if time.monotonic() - start_time > ROUTER_STARTUP_TIMEOUT:
+                    raise
+                time.sleep(0.1)
+        mephisto_thread.start()
+        if not connected.wait(timeout=ROUTER_STARTUP_TIMEOUT):
+            raise TimeoutError("Router did not register the Mephisto socket")
+
+        cpu_start = _get_router_cpu_time(router)
+        start_time = time.monotonic()
+        with ThreadPoolExecutor(max_workers=num_requests) as executor:
+            latencies = list(
+                executor.map(
+                    lambda _: _request_agent(base_url, request_timeout),
+                    range(num_requests),
+                )
+            )
+        elapsed = time.monotonic() - start_time
+        cpu_seconds = _get_router_cpu_time(router) - cpu_start
+    finally:
+        router.terminate()
+        router.wait()
+        if router.stdout is not None:
+            router.stdout.close()
+    mephisto_thread.join(timeout=5)
+
+    return {
+        "num_requests": num_requests,
+        "response_delay": response_delay,
+        "elapsed_seconds": elapsed,
+        "p50_latency": _percentile(latencies, 50),
+        "p99_latency": _percentile(latencies, 99),
+        "router_cpu_seconds": cpu_seconds,
+    }
+
+
+def main():
+    table = create_table(
+        ["Requests", "Response delay", "Seconds", "p50 (ms)", "p99 (ms)", "Router CPU (s)"],
+        "Flask router /request_agent latency",
+    )
+    for num_requests in [100, 500]:
+        result = run_request_agent_benchmark(num_requests)
+        table.add_row(
+            str(result["num_requests"]),
+            f"{result['response_delay']:.2f}",
+            f"{result['elapsed_seconds']:.2f}",
+            f"{result['p50_latency'] * 1000:.1f}",
+            f"{result['p99_latency'] * 1000:.1f}",
+            f"{result['router_cpu_seconds']:.2f}",
+        )
+    console.print(table)
+
+
+if __name__ == "__main__":
+    main()
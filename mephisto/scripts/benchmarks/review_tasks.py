@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+
+# Copyright (c) Meta Platforms and its affiliates.
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""
+Benchmark for listing tasks on the Review App landing page.
+
+Seeds a database with `num_tasks` tasks of `units_per_task` units each, then times
+getting the unit counts of all tasks the way `TasksView` did before (loading every unit
+row of every task, three times, and parsing the config of every task's runs),
+against the `/api/tasks` endpoint that counts them in a single grouped query.
+
+To run this command:
+    mephisto scripts benchmarks review_tasks
+"""
+
+import os
+import shutil
+import tempfile
+import time
+from typing import Any
+from typing import Dict
+from typing import List
+
+from mephisto.abstractions.database import MephistoDB
+from mephisto.abstractions.databases.local_database import LocalMephistoDB
+from mephisto.data_model.constants.assignment_state import AssignmentState
+from mephisto.data_model.task_run import TaskRun
+from mephisto.review_app.server import create_app
+from mephisto.review_app.server.db_queries import find_units
+from mephisto.utils.rich import console
+from mephisto.utils.rich import create_table
+from mephisto.utils.testing import get_test_requester
+from mephisto.utils.testing import get_test_task
+from mephisto.utils.testing import get_test_task_run
+from mephisto.utils.testing import get_test_worker
+from mephisto.utils.testing import make_completed_units_bulk
+
+
+def _count_units_with_per_task_scans(db: MephistoDB) -> Dict[str, int]:
+    unit_counts = {}
+    for task in db.find_tasks():
+        all_units = find_units(db, int(task.db_id))
+        completed_units = find_units(db, int(task.db_id), statuses=AssignmentState.completed())
+        reviewed_units = find_units(db, int(task.db_id), statuses=AssignmentState.completed())
+        assert len(completed_units) == len(reviewed_units)
+        for task_run in task.get_runs():
+            task_run.get_task_args()
+        unit_counts[task.db_id] = len(all_units)
+    return unit_counts
+
+
+def run_review_tasks_benchmark(
+    num_tasks: int,
+    units_per_task: int,
+    num_requests: int = 3,
+) -> Dict[str, Any]:
+    """
+    Seed a database with `num_tasks` tasks of `units_per_task` units and return the mean time
+    to get unit counts of all tasks, with per-task scans and with the `/api/tasks` endpoint
+    """
+    data_dir = tempfile.mkdtemp()
+    db_path = os.path.join(data_dir, "mephisto.db")
+    db = LocalMephistoDB(db_path)
+    app = None
+    try:
+        _, requester_id = get_test_requester(db)
+        _, worker_id = get_test_worker(db)
+        for i in range(num_tasks):
+            _, task_id = get_test_task(db, f"task_{i}")
+            task_run = TaskRun.get(db, get_test_task_run(db, task_id, requester_id))
+            make_completed_units_bulk(db, task_run, [worker_id], units_per_task)
+
+        results: Dict[str, Any] = {"num_tasks": num_tasks, "units_per_task": units_per_task}
+
+        per_task_scans: List[float] = []
+        for _ in range(num_requests):
+            start_time = time.monotonic()
+            expected_counts = _count_units_with_per_task_scans(db)
+            per_task_scans.append(time.monotonic() - start_time)
+
+        app = create_app(database_path=db_path)
+        client = app.test_client()
+
+        # The first request finds out (and caches) whether seeded tasks have stats,
+        # as they were not launched through the Operator
+        start_time = time.monotonic()
+        client.get("/api/tasks")
+        first_request = time.monotonic() - start_time
+
+        summary_query: List[float] = []
+        for _ in range(num_requests):
+            start_time = time.monotonic()
+            response = client.get("/api/tasks")
+            summary_query.append(time.monotonic() - start_time)
+
+        unit_counts = {t["id"]: t["unit_all_count"] for t in response.json["tasks"]}
+        assert unit_counts == expected_counts
+
+        results.update(
+            {
+                "per_task_scans_seconds": sum(per_task_scans) / num_requests,
+                "first_request_seconds": first_request,
+                "summary_query_seconds": sum(summary_query) / num_requests,
+            }
+        )
+        return results
+    finally:
+        if app is not None:
+            app.db.shutdown()
+        db.shutdown()
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+
+def main():
+    table = create_table(
+        [
+            "Tasks",
+            "Units per task",
+            "Per-task scans (ms)",
+            "First /api/tasks (ms)",
+            "/api/tasks (ms)",
+        ],
+        "Review App tasks list latency",
+    )
+    for num_tasks, units_per_task in [(100, 1000), (300, 3000)]:
+        result = run_review_tasks_benchmark(num_tasks, units_per_task)
+        table.add_row(
+            str(result["num_tasks"]),
+            str(result["units_per_task"]),
+            f"{result['per_task_scans_seconds'] * 1000:.2f}",
+            f"{result['first_request_seconds'] * 1000:.2f}",
+            f"{result['summary_query_seconds'] * 1000:.2f}",
+        )
+    console.print(table)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+
+# Copyright (c) Meta Platforms and its affiliates.
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""
+Benchmark for finding the units a worker could be assigned to in a large run.
+
+Creates a run with `num_units` units, of which `num_launched` are launched and
+some are already assigned to the worker, then times
+`find_launchable_units_for_worker` (what `TaskRun.get_valid_units_for_worker`
+calls on every agent registration). Compares loading and filtering all of the
+run's units, the `LocalMephistoDB` query, and the `MephistoSingletonDB` index.
+
+To run this command:
+    mephisto scripts benchmarks valid_units
+"""
+
+import os
+import shutil
+import tempfile
+import time
+from typing import Any
+from typing import Dict
+from typing import List
+
+from mephisto.abstractions.database import MephistoDB
+from mephisto.abstractions.databases.local_database import LocalMephistoDB
+from mephisto.abstractions.databases.local_singleton_database import MephistoSingletonDB
+from mephisto.data_model.assignment import AssignmentState
+from mephisto.data_model.assignment import InitializationData
+from mephisto.data_model.task_run import TaskRun
+from mephisto.operations.task_launcher import TaskLauncher
+from mephisto.utils.rich import console
+from mephisto.utils.rich import create_table
+from mephisto.utils.testing import get_test_task_run
+from mephisto.utils.testing import get_test_worker
+
+NUM_WORKER_UNITS = 5
+
+
+def _time_lookups(
+    db: MephistoDB, task_run_id: str, worker_id: str, num_lookups: int, full_scan: bool
+) -> List[float]:
+    latencies = []
+    for _ in range(num_lookups):
+        start_time = time.monotonic()
+        if full_scan:
+            # The generic implementation, loading every unit of the run
+            MephistoDB._find_launchable_units_for_worker(db, task_run_id, worker_id)
+        else:
+            db.find_launchable_units_for_worker(task_run_id, worker_id)
+        latencies.append(time.monotonic() - start_time)
+    return latencies
+
+
+def run_valid_units_benchmark(
+    num_units: int,
+    num_launched: int = 100,
+    num_lookups: int = 3,
+) -> Dict[str, Any]:
+    """
+    Build a run with `num_units` units and return the mean time to find the
+    launchable units for a worker, for each way of finding them
+    """
+    data_dir = tempfile.mkdtemp()
+    db_path = os.path.join(data_dir, "mephisto.db")
+    db = LocalMephistoDB(db_path)
+    singleton_db = None
+    try:
+        task_run = TaskRun.get(db, get_test_task_run(db))
+        assignment_data = [InitializationData(shared={}, unit_data=[{}]) for _ in range(num_units)]
+        launcher = TaskLauncher(db, task_run, assignment_data)
+        launcher.create_assignments()
+        units = launcher.units
+        _, worker_id = get_test_worker(db)
+        for unit in units[: num_launched + NUM_WORKER_UNITS]:
+            db.update_unit(unit.db_id, status=AssignmentState.LAUNCHED)
+        for unit in units[:NUM_WORKER_UNITS]:
+            db.new_agent(
+                worker_id,
+                unit.db_id,
+                unit.task_id,
+                unit.task_run_id,
+                unit.assignment_id,
+                unit.task_type,
+                unit.provider_type,
+            )
+
+        results: Dict[str, Any] = {"num_units": num_units, "num_launched": num_launched}
+        full_scan = _time_lookups(db, task_run.db_id, worker_id, num_lookups, full_scan=True)
+        local = _time_lookups(db, task_run.db_id, worker_id, num_lookups, full_scan=False)
+
+        singleton_db = MephistoSingletonDB(db_path)
+        # The first lookup loads the run's index
+        index_load = _time_lookups(singleton_db, task_run.db_id, worker_id, 1, full_scan=False)
+        singleton = _time_lookups(
+            singleton_db, task_run.db_id, worker_id, num_lookups, full_scan=False
+        )
+        found = singleton_db.find_launchable_units_for_worker(task_run.db_id, worker_id)
+        expected = units[NUM_WORKER_UNITS : NUM_WORKER_UNITS + num_launched]
+        assert [u.db_id for u in found] == [u.db_id for u in expected]
+
+        results.update(
+            {
+                "num_found": len(found),
+                "full_scan_seconds": sum(full_scan) / num_lookups,
+                "local_query_seconds": sum(local) / num_lookups,
+                "singleton_index_load_seconds": index_load[0],
+                "singleton_index_seconds": sum(singleton) / num_lookups,
+            }
+        )
+        return results
+    finally:
+        if singleton_db is not None:
+            singleton_db.shutdown()
+        db.shutdown()
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+
+def main():
+    table = create_table(
+        [
+            "Units",
+            "Launched",
+            "Full scan (ms)",
+            "LocalMephistoDB (ms)",
+            "Singleton index load (ms)",
+            "Singleton index (ms)",
+        ],
+        "find_launchable_units_for_worker latency",
+    )
+    for num_units in [10000, 100000]:
+        result = run_valid_units_benchmark(num_units)
+        table.add_row(
+            str(result["num_units"]),
+            str(result["num_launched"]),
+            f"{result['full_scan_seconds'] * 1000:.2f}",
+            f"{result['local_query_seconds'] * 1000:.2f}",
+            f"{result['singleton_index_load_seconds'] * 1000:.2f}",
+            f"{result['singleton_index_seconds'] * 1000:.2f}",
+        )
+    console.print(table)
+
+
+if __name__ == "__main__":
+    main()
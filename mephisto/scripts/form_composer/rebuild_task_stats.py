@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+
+# Copyright (c) Meta Platforms and its affiliates.
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""
+Script for rebuilding stats of FormComposer tasks (histograms shown in Review App) from scratch.
+
+Review App stores these stats in the database, and only adds units completed since its
+previous request to them. Rebuilding is needed to backfill stats of many tasks at once
+(e.g. after importing them), or to recalculate them if data of already added units changed.
+
+To run this command:
+    mephisto scripts form_composer rebuild_task_stats [--task-ids 1 2 3]
+"""
+
+import argparse
+from typing import List
+
+from mephisto.abstractions.databases.local_database import LocalMephistoDB
+from mephisto.data_model.task import Task
+from mephisto.generators.form_composer.config_validation.config_validation_constants import (
+    FORM_COMPOSER_TASK_TAG,
+)
+from mephisto.generators.form_composer.stats import rebuild_task_stats
+from mephisto.utils.console_writer import ConsoleWriter
+
+logger = ConsoleWriter()
+
+
+def _is_form_composer_task(task: Task) -> bool:
+    task_runs = task.get_runs()
+    return bool(task_runs) and FORM_COMPOSER_TASK_TAG in task_runs[-1].get_task_args().task_tags
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("scripts")
+    parser.add_argument("form_composer")
+    parser.add_argument("rebuild_task_stats")
+    parser.add_argument(
+        "--task-ids",
+        nargs="+",
+        default=None,
+        help="IDs of tasks to rebuild stats for (by default, all FormComposer tasks)",
+    )
+    args = parser.parse_args()
+
+    db = LocalMephistoDB()
+
+    if args.task_ids:
+        tasks: List[Task] = [Task.get(db, task_id) for task_id in args.task_ids]
+    else:
+        tasks = [task for task in db.find_tasks() if _is_form_composer_task(task)]
+
+    for task in tasks:
+        logger.info(f"[blue]Rebuilding stats of task '{task.task_name}' ({task.db_id})[/blue]")
+        rebuild_task_stats(task)
+
+    logger.info(f"[green]Finished rebuilding stats of {len(tasks)} task(s) successfully![/green]")
+
+
+if __name__ == "__main__":
+    main()
@@ -224,6 +224,14 @@ LOCAL_DB_LABEL = "_"
 
 DEFAULT_ARCHIVE_FORMAT = "zip"
 
+# Inside dump archive, DB tables are written into `<DUMP_DIR_NAME>/<db_name>/<table_name>.jsonl`
+# files (one row per line), and metadata into `<DUMP_DIR_NAME>/<DUMP_METADATA_FILE_NAME>` file
+DUMP_DIR_NAME = "dump"
+DUMP_METADATA_FILE_NAME = "metadata.json"
+DUMP_TABLE_FILE_EXTENSION = "jsonl"
+# Number of rows read from DB at once, when tables are being exported or imported
+DUMP_ROWS_CHUNK_SIZE = 1000
+
 TABLE_NAMES_RELATED_TO_QUALIFICATIONS = [
     "granted_qualifications",
     "qualifications",
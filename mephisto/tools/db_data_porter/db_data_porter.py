@@ -4,9 +4,8 @@
 # This source code is licensed under the MIT license found in the
 # LICENSE file in the root directory of this source tree.
 
-import json
 import os
-import zipfile
+import shutil
 from datetime import datetime
 from typing import Dict
 from typing import List
@@ -19,12 +18,14 @@ from mephisto.abstractions.database import MephistoDB
 from mephisto.abstractions.databases.local_database import LocalMephistoDB
 from mephisto.generators.generators_utils.config_validation.utils import make_error_message
 from mephisto.tools.db_data_porter import backups
+from mephisto.tools.db_data_porter import dump_files
 from mephisto.tools.db_data_porter import dumps
 from mephisto.tools.db_data_porter import export_dump
 from mephisto.tools.db_data_porter import import_dump
 from mephisto.tools.db_data_porter.constants import BACKUP_OUTPUT_DIR
 from mephisto.tools.db_data_porter.constants import DEFAULT_ARCHIVE_FORMAT
 from mephisto.tools.db_data_porter.constants import DEFAULT_CONFLICT_RESOLVER
+from mephisto.tools.db_data_porter.constants import DUMP_DIR_NAME
 from mephisto.tools.db_data_porter.constants import EXPORT_OUTPUT_DIR
 from mephisto.tools.db_data_porter.constants import IMPORTED_DATA_TABLE_NAME
 from mephisto.tools.db_data_porter.constants import MEPHISTO_DUMP_KEY
@@ -91,12 +92,6 @@ class DBDataPorter:
     def _make_dump_name(timestamp: str) -> str:
         return f"{timestamp}_mephisto_dump"
 
-    @staticmethod
-    def _make_export_dump_file_path(export_path: str, dump_name: str) -> str:
-        file_name = f"{dump_name}.json"
-        file_path = os.path.join(export_path, file_name)
-        return file_path
-
     def _prepare_dump_data(
         self,
         task_names: Optional[List[str]] = None,
@@ -243,14 +238,13 @@ class DBDataPorter:
             qualification_names=qualification_names,
         )
 
-        # 3. Prepare export dirs and get dump file path.
-        # JSON file is going to be located in tmp directory,
+        # 3. Prepare export dirs.
+        # Dump files are going to be located in tmp directory,
         # where we add all related files and then archive them all together
         export_dir = self._get_export_dir()
         dump_timestamp = self._make_export_timestamp()
         dump_name = self._make_dump_name(dump_timestamp)
         tmp_export_dir = export_dump.make_tmp_export_dir()
-        tmp_dump_json_file_path = self._make_export_dump_file_path(tmp_export_dir, dump_name)
 
         # 4. Prepare metadata
         metadata = {
@@ -261,15 +255,14 @@ class DBDataPorter:
         }
         dump_data_to_export[METADATA_DUMP_KEY] = metadata
 
-        # 5. Save JSON file
+        # 5. Save dump files (tables are written row by row, one file per table)
         try:
-            with open(tmp_dump_json_file_path, "w") as f:
-                f.write(json.dumps(dump_data_to_export, indent=json_indent))
+            dump_files.write_dump_files(tmp_export_dir, dump_data_to_export, json_indent)
         except Exception as e:
-            # Remove file to not make a mess in export directory
-            error_message = f"Could not create dump file {dump_data_to_export}. Reason: {str(e)}."
+            # Remove files to not make a mess in export directory
+            error_message = f"Could not create dump files. Reason: {str(e)}."
             logger.exception(f"[red]{error_message}[/red]")
-            os.remove(tmp_dump_json_file_path)
+            shutil.rmtree(os.path.join(tmp_export_dir, DUMP_DIR_NAME), ignore_errors=True)
             exit()
 
         logger.info(f"Copying database records finished")
@@ -325,6 +318,7 @@ class DBDataPorter:
         keep_import_metadata: Optional[bool] = None,
         qualification_only: Optional[bool] = False,
         verbosity: int = 0,
+        bulk: bool = False,
     ):
         results = {}
 
@@ -353,22 +347,16 @@ class DBDataPorter:
             logger.error(f"[red]{error_message}[/red]")
             exit()
 
-        # 2. Read JSON dump file from archive
-        with zipfile.ZipFile(dump_archive_file_name_or_path) as archive:
-            dump_name = os.path.basename(os.path.splitext(dump_archive_file_name_or_path)[0])
-            json_dump_file_name = f"{dump_name}.json"
-
-            with archive.open(json_dump_file_name) as f:
-                try:
-                    dump_file_data: dict = json.loads(f.read())
-                except Exception as e:
-                    error_message = (
-                        f"Could not read JSON from dump file {dump_archive_file_name_or_path}. "
-                        f"Please, check if file '{json_dump_file_name}' in it "
-                        f"has the correct format. Reason: {str(e)}"
-                    )
-                    logger.exception(f"[red]{error_message}[/red]")
-                    exit()
+        # 2. Read dump from archive (tables' rows are read later, one by one)
+        try:
+            dump_file_data: dict = dump_files.read_dump_data(dump_archive_file_name_or_path)
+        except Exception as e:
+            error_message = (
+                f"Could not read JSON from dump file {dump_archive_file_name_or_path}. "
+                f"Please, check if files in it have the correct format. Reason: {str(e)}"
+            )
+            logger.exception(f"[red]{error_message}[/red]")
+            exit()
 
         # 3. Validate dump
         dump_data_errors = validate_dump_data(
@@ -453,6 +441,7 @@ class DBDataPorter:
                 conflict_resolver_name=conflict_resolver_name,
                 labels=labels,
                 verbosity=verbosity,
+                bulk=bulk,
             )
 
             errors = import_single_db_results["errors"]
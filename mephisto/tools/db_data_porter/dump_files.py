@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+
+# Copyright (c) Meta Platforms and its affiliates.
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""
+Reading and writing of DB data in dump archives.
+
+Every dumped table is written into its own JSON-lines file (one row per line),
+so that neither export nor import needs to keep a whole table in memory.
+Tables' rows are passed around as lists, or as `TableRows` that read rows one by one
+(from DB, or from dump archive) every time they are iterated over.
+"""
+
+import io
+import json
+import os
+import shutil
+import zipfile
+from abc import ABC
+from abc import abstractmethod
+from typing import Callable
+from typing import Iterable
+from typing import Iterator
+from typing import Optional
+
+from mephisto.abstractions.database import MephistoDB
+from mephisto.tools.db_data_porter.constants import DUMP_DIR_NAME
+from mephisto.tools.db_data_porter.constants import DUMP_METADATA_FILE_NAME
+from mephisto.tools.db_data_porter.constants import DUMP_ROWS_CHUNK_SIZE
+from mephisto.tools.db_data_porter.constants import DUMP_TABLE_FILE_EXTENSION
+from mephisto.tools.db_data_porter.constants import METADATA_DUMP_KEY
+from mephisto.utils import db as db_utils
+
+
+class TableRows(ABC):
+    """Rows of a table that are read one by one every time they are iterated over"""
+
+    @abstractmethod
+    def __iter__(self) -> Iterator[dict]:
+        raise NotImplementedError()
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __bool__(self) -> bool:
+        # Do not count all rows just to find out if there are any
+        for _ in self:
+            return True
+        return False
+
+
+class DBTableRows(TableRows):
+    """Rows of a table in DB, read in chunks"""
+
+    def __init__(self, db: "MephistoDB", table_name: str, chunk_size: int = DUMP_ROWS_CHUNK_SIZE):
+        self.db = db
+        self.table_name = table_name
+        self.chunk_size = chunk_size
+
+    def __iter__(self) -> Iterator[dict]:
+        return db_utils.iter_table_rows(self.db, self.table_name, self.chunk_size)
+
+    def __len__(self) -> int:
+        return db_utils.count_table_rows(self.db, self.table_name)
+
+
+class ArchiveTableRows(TableRows):
+    """Rows of a table in a JSON-lines file inside dump archive"""
+
+    def __init__(self, dump_archive_file_path: str, table_file_name: str):
+        self.dump_archive_file_path = dump_archive_file_path
+        self.table_file_name = table_file_name
+
+    def __iter__(self) -> Iterator[dict]:
+        with zipfile.ZipFile(self.dump_archive_file_path) as archive:
+            with archive.open(self.table_file_name) as f:
+                for line in io.TextIOWrapper(f, encoding="utf-8"):
+                    if line.strip():
+                        yield json.loads(line)
+
+
+class MappedTableRows(TableRows):
+    """Rows of another table rows, updated with `func` one by one"""
+
+    def __init__(self, rows: Iterable[dict], func: Callable[[dict], dict]):
+        self.rows = rows
+        self.func = func
+
+    def __iter__(self) -> Iterator[dict]:
+        for row in self.rows:
+            yield self.func(row)
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+
+def map_table_rows(rows: Iterable[dict], func: Callable[[dict], dict]) -> Iterable[dict]:
+    """
+    Update rows with `func`. Lists of rows are updated in place right away,
+    and other table rows are updated lazily, when they are read
+    """
+    if isinstance(rows, list):
+        for row in rows:
+            func(row)
+        return rows
+
+    return MappedTableRows(rows, func)
+
+
+def _get_table_file_name(db_name: str, table_name: str) -> str:
+    # Paths inside zip archive are always separated with "/"
+    return f"{DUMP_DIR_NAME}/{db_name}/{table_name}.{DUMP_TABLE_FILE_EXTENSION}"
+
+
+def write_dump_files(export_dir: str, dump_data: dict, json_indent: Optional[int] = None) -> str:
+    """
+    Write tables of all DBs from `dump_data` into `<export_dir>/<DUMP_DIR_NAME>` directory,
+    row by row, and return path to this directory. Metadata is written into a separate file
+    """
+    dump_dir = os.path.join(export_dir, DUMP_DIR_NAME)
+    # Remove leftovers of a failed export
+    if os.path.exists(dump_dir):
+        shutil.rmtree(dump_dir)
+
+    for db_name, db_dump_data in dump_data.items():
+        if db_name == METADATA_DUMP_KEY:
+            continue
+
+        os.makedirs(os.path.join(dump_dir, db_name), exist_ok=True)
+
+        for table_name, table_rows in db_dump_data.items():
+            table_file_path = os.path.join(
+                export_dir,
+                *_get_table_file_name(db_name, table_name).split("/"),
+            )
+            with open(table_file_path, "w", encoding="utf-8") as f:
+                for row in table_rows:
+                    f.write(json.dumps(row))
+                    f.write("\n")
+
+    metadata_file_path = os.path.join(dump_dir, DUMP_METADATA_FILE_NAME)
+    with open(metadata_file_path, "w", encoding="utf-8") as f:
+        f.write(json.dumps(dump_data.get(METADATA_DUMP_KEY, {}), indent=json_indent))
+
+    return dump_dir
+
+
+def read_dump_data(dump_archive_file_path: str) -> dict:
+    """
+    Read dump data from dump archive. Tables are not loaded into memory, they are read
+    row by row when iterated over. Old dumps with all data in a single JSON file
+    (`<dump_name>.json` in archive) are loaded into memory entirely
+    """
+    dump_name = os.path.basename(os.path.splitext(dump_archive_file_path)[0])
+    legacy_json_dump_file_name = f"{dump_name}.json"
+
+    with zipfile.ZipFile(dump_archive_file_path) as archive:
+        archive_file_names = archive.namelist()
+
+        if legacy_json_dump_file_name in archive_file_names:
+            with archive.open(legacy_json_dump_file_name) as f:
+                return json.loads(f.read())
+
+        with archive.open(f"{DUMP_DIR_NAME}/{DUMP_METADATA_FILE_NAME}") as f:
+            metadata = json.loads(f.read())
+
+    dump_data = {}
+    table_file_extension = f".{DUMP_TABLE_FILE_EXTENSION}"
+    for archive_file_name in archive_file_names:
+        path_parts = archive_file_name.split("/")
+        if len(path_parts) != 3 or path_parts[0] != DUMP_DIR_NAME:
+            continue
+
+        # DBs without tables have only a directory in archive
+        db_name, file_name = path_parts[1], path_parts[2]
+        db_dump_data = dump_data.setdefault(db_name, {})
+
+        if file_name.endswith(table_file_extension):
+            table_name = file_name[: -len(table_file_extension)]
+            db_dump_data[table_name] = ArchiveTableRows(dump_archive_file_path, archive_file_name)
+
+    dump_data[METADATA_DUMP_KEY] = metadata
+    return dump_data
@@ -20,6 +20,7 @@ from mephisto.tools.db_data_porter.constants import DATASTORE_EXPORT_METHOD_NAME
 from mephisto.tools.db_data_porter.constants import MEPHISTO_DUMP_KEY
 from mephisto.tools.db_data_porter.constants import TABLE_NAMES_RELATED_TO_QUALIFICATIONS
 from mephisto.tools.db_data_porter.constants import TASK_RUNS_TABLE_NAME
+from mephisto.tools.db_data_porter.dump_files import DBTableRows
 from mephisto.tools.db_data_porter.randomize_ids import get_old_pk_from_substitutions
 from mephisto.utils import db as db_utils
 from mephisto.utils.console_writer import ConsoleWriter
@@ -195,17 +196,26 @@ def prepare_partial_dump_data(
     return dump_data_to_export
 
 
+def _db_or_datastore_to_table_rows(db: "MephistoDB") -> Dict[str, DBTableRows]:
+    table_names = db_utils.get_list_of_tables_to_export(db)
+    return {table_name: DBTableRows(db, table_name) for table_name in table_names}
+
+
 def prepare_full_dump_data(db: "MephistoDB", provider_datastores: Dict[str, "MephistoDB"]) -> dict:
+    """
+    Prepare dump data with all tables of Mephisto DB and providers' datastores.
+    Tables are not loaded into memory, their rows are read from DB when they are being written
+    """
     dump_data_to_export = {}
 
     logger.info(f"No filter for TaskRuns specified - exporting all TaskRuns.")
 
     # Mephisto DB
-    dump_data_to_export[MEPHISTO_DUMP_KEY] = db_utils.db_or_datastore_to_dict(db)
+    dump_data_to_export[MEPHISTO_DUMP_KEY] = _db_or_datastore_to_table_rows(db)
 
     # Providers' DBs
     for provider_type, provider_datastore in provider_datastores.items():
-        dump_data_to_export[provider_type] = db_utils.db_or_datastore_to_dict(provider_datastore)
+        dump_data_to_export[provider_type] = _db_or_datastore_to_table_rows(provider_datastore)
 
     return dump_data_to_export
 
@@ -5,13 +5,19 @@
 # LICENSE file in the root directory of this source tree.
 
 import json
+import sqlite3
+from itertools import islice
 from typing import Dict
+from typing import Iterable
+from typing import Iterator
 from typing import List
 from typing import Optional
+from typing import Set
 from typing import TypedDict
 
 from mephisto.abstractions.database import MephistoDB
 from mephisto.tools.db_data_porter import conflict_resolvers
+from mephisto.tools.db_data_porter.constants import DUMP_ROWS_CHUNK_SIZE
 from mephisto.tools.db_data_porter.constants import IMPORTED_DATA_TABLE_NAME
 from mephisto.tools.db_data_porter.constants import IMPORTED_DATA_TABLE_NAMES
 from mephisto.tools.db_data_porter.constants import LOCAL_DB_LABEL
@@ -43,13 +49,16 @@ def _update_row_with_pks_from_resolvings_mappings(
     table_name: str,
     row: dict,
     resolvings_mapping: MappingResolvingsType,
+    table_fks: Optional[dict] = None,
 ) -> dict:
     """
     If comparing rows have conflicts,
     it may happen that Primary Keys of one of them must be updated with new ones.
     Here we pass row that was updated and dict with replacements after conflicts resolving.
+    FK mappings of the table (`table_fks`) can be passed to avoid querying them for every row.
     """
-    table_fks = db_utils.select_fk_mappings_for_single_table(db, table_name)
+    if table_fks is None:
+        table_fks = db_utils.select_fk_mappings_for_single_table(db, table_name)
 
     # Update FK fields from resolving mappings if needed
     for fk_table, fk_table_fields in table_fks.items():
@@ -66,6 +75,73 @@ def _update_row_with_pks_from_resolvings_mappings(
     return row
 
 
+def _iter_rows_chunks(rows: Iterable[dict], chunk_size: int) -> Iterator[List[dict]]:
+    rows_iterator = iter(rows)
+    while rows_chunk := list(islice(rows_iterator, chunk_size)):
+        yield rows_chunk
+
+
+def _make_imported_data_row(
+    dump_row: dict,
+    table_pk_field_name: str,
+    unique_field_names: Optional[List[str]],
+) -> dict:
+    unique_field_names = unique_field_names or [table_pk_field_name]
+    return {
+        UNIQUE_FIELD_NAMES: unique_field_names,
+        UNIQUE_FIELD_VALUES: [dump_row[fn] for fn in unique_field_names],
+    }
+
+
+def _resolve_conflicting_row(
+    db: "MephistoDB",
+    conflict_resolver: "conflict_resolvers.BaseMergeConflictResolver",
+    table_name: str,
+    table_pk_field_name: str,
+    existing_db_row: dict,
+    dump_row: dict,
+    resolvings_mapping: MappingResolvingsType,
+    verbosity: int = 0,
+):
+    """
+    Resolve a conflict between importing row and a row that local DB already has,
+    save the chosen row and remember the pair of their PKs in `resolvings_mapping`
+    """
+    if verbosity:
+        logger.debug(
+            f"Conflicts during inserting row in table '{table_name}': "
+            f"{dump_row}. "
+            f"Existing row in your database: {existing_db_row}"
+        )
+
+    resolved_conflicting_row = conflict_resolver.resolve(
+        table_name,
+        table_pk_field_name,
+        existing_db_row,
+        dump_row,
+    )
+
+    if verbosity:
+        logger.debug(f"Resolving finished successfully. Chosen row: {resolved_conflicting_row}")
+
+    db_utils.update_row_in_table(
+        db,
+        table_name,
+        resolved_conflicting_row,
+        table_pk_field_name,
+    )
+
+    # Saving resolved a pair of PKs
+    existing_row_pk_value = resolved_conflicting_row[table_pk_field_name]
+    importing_row_pk_value = dump_row[table_pk_field_name]
+
+    mappings_prev_value = resolvings_mapping.get(table_name, {})
+    resolvings_mapping[table_name] = {
+        **mappings_prev_value,
+        **{importing_row_pk_value: existing_row_pk_value},
+    }
+
+
 def import_single_db(
     db: "MephistoDB",
     provider_type: str,
@@ -73,7 +149,17 @@ def import_single_db(
     conflict_resolver_name: str,
     labels: List[str],
     verbosity: int = 0,
+    bulk: bool = False,
 ) -> ImportSingleDBsType:
+    """
+    Import rows of all tables of a dump into a single database (Mephisto DB or a datastore).
+
+    Tables' rows are read from dump in chunks. By default rows are imported one by one.
+    With `bulk`, each chunk of rows is checked for conflicts with a single query,
+    and all its non-conflicting rows are inserted at once.
+    That's much faster for large dumps, but an unexpected error (e.g. an FK constraint error)
+    cannot be attributed to a specific row.
+    """
     # Results of the function
     imported_data = {}
     errors = []
@@ -105,7 +191,7 @@ def import_single_db(
         error_message = f"Conflict resolver with name '{conflict_resolver_name}' has not found"
         logger.error(f"[red]{error_message}[/red]")
         raise ImportError(error_message)
-    conflict_resolver_name = conflict_resolver_class(db, provider_type)
+    conflict_resolver = conflict_resolver_class(db, provider_type)
 
     try:
         # Independent tables with their not PK unigue field names where can be conflicts.
@@ -118,6 +204,7 @@ def import_single_db(
                 continue
 
             table_pk_field_name = db_utils.get_table_pk_field_name(db, table_name)
+            table_fks = db_utils.select_fk_mappings_for_single_table(db, table_name)
             is_table_with_special_unique_field = unique_field_names is not None
 
             # Save data that in progress for better logging
@@ -136,48 +223,50 @@ def import_single_db(
                 conflicted_labels: [],
             }
 
-            for dump_row in dump_table_rows:
-                # Save data that in progress for better logging
-                in_progress_dump_row = dump_row
-
-                # --- HACK (#UNIT.AGENT_ID) START #2:
-                # We save pairs `unit_id: agent_id` in case `agent_id is not None` and
-                # replace `agent_id` with `None`
-                if provider_type == MEPHISTO_DUMP_KEY:
-                    if table_name == "units" and (unit_agent_id := dump_row.get("agent_id")):
-                        unit_id = dump_row[table_pk_field_name]
-                        units_agents[unit_id] = unit_agent_id
-                        dump_row["agent_id"] = None
-                # --- HACK (#UNIT.AGENT_ID) END #2:
-
-                imported_data_row_unique_field_values = [dump_row[table_pk_field_name]]
-                imported_data_conflicted_row = False
-
-                _update_row_with_pks_from_resolvings_mappings(
-                    db,
-                    table_name,
-                    dump_row,
-                    resolvings_mapping,
-                )
-
-                # Table with non-PK unique field
-                if is_table_with_special_unique_field:
-                    imported_data_row_unique_field_values = [
-                        dump_row[fn] for fn in unique_field_names
-                    ]
-
-                    unique_field_values: List[List[str]] = [
-                        [dump_row[fn]] for fn in unique_field_names
-                    ]
-                    existing_rows = db_utils.select_rows_by_list_of_field_values(
-                        db=db,
-                        table_name=table_name,
-                        field_names=unique_field_names,
-                        field_values=unique_field_values,
-                        order_by="creation_date",
+            # Rows are read and imported in chunks, as dump file can have too many of them
+            for dump_rows_chunk in _iter_rows_chunks(dump_table_rows, DUMP_ROWS_CHUNK_SIZE):
+                for dump_row in dump_rows_chunk:
+                    # Save data that in progress for better logging
+                    in_progress_dump_row = dump_row
+
+                    # --- HACK (#UNIT.AGENT_ID) START #2:
+                    # We save pairs `unit_id: agent_id` in case `agent_id is not None` and
+                    # replace `agent_id` with `None`
+                    if provider_type == MEPHISTO_DUMP_KEY:
+                        if table_name == "units" and (unit_agent_id := dump_row.get("agent_id")):
+                            unit_id = dump_row[table_pk_field_name]
+                            units_agents[unit_id] = unit_agent_id
+                            dump_row["agent_id"] = None
+                    # --- HACK (#UNIT.AGENT_ID) END #2:
+
+                    _update_row_with_pks_from_resolvings_mappings(
+                        db,
+                        table_name,
+                        dump_row,
+                        resolvings_mapping,
+                        table_fks=table_fks,
                     )
 
-                    # If local DB does not have this row
+                    if bulk:
+                        # Rows are checked for conflicts and inserted below, all at once
+                        continue
+
+                    existing_rows = None
+
+                    # Table with non-PK unique field
+                    if is_table_with_special_unique_field:
+                        unique_field_values: List[List[str]] = [
+                            [dump_row[fn]] for fn in unique_field_names
+                        ]
+                        existing_rows = db_utils.select_rows_by_list_of_field_values(
+                            db=db,
+                            table_name=table_name,
+                            field_names=unique_field_names,
+                            field_values=unique_field_values,
+                            order_by="creation_date",
+                        )
+
+                    # If local DB does not have this row (or it's a regular table), create it as is
                     if not existing_rows:
                         if verbosity:
                             logger.debug(f"Inserting new row into table '{table_name}': {dump_row}")
@@ -186,67 +275,120 @@ def import_single_db(
 
                     # If local DB already has row with specified unique field name
                     else:
-                        imported_data_conflicted_row = True
-
-                        existing_db_row = existing_rows[-1]
-
-                        if verbosity:
-                            logger.debug(
-                                f"Conflicts during inserting row in table '{table_name}': "
-                                f"{dump_row}. "
-                                f"Existing row in your database: {existing_db_row}"
-                            )
-
-                        resolved_conflicting_row = conflict_resolver_name.resolve(
+                        _resolve_conflicting_row(
+                            db,
+                            conflict_resolver,
                             table_name,
                             table_pk_field_name,
-                            existing_db_row,
+                            existing_rows[-1],
                             dump_row,
+                            resolvings_mapping,
+                            verbosity=verbosity,
                         )
 
-                        if verbosity:
-                            logger.debug(
-                                f"Resolving finished successfully. "
-                                f"Chosen row: {resolved_conflicting_row}"
+                    # Update table lists of Imported data
+                    if imported_data_needs_to_be_updated:
+                        _labels = conflicted_labels if existing_rows else newly_imported_labels
+                        imported_data_for_table[_labels].append(
+                            _make_imported_data_row(
+                                dump_row,
+                                table_pk_field_name,
+                                unique_field_names,
                             )
-
-                        db_utils.update_row_in_table(
-                            db,
-                            table_name,
-                            resolved_conflicting_row,
-                            table_pk_field_name,
                         )
 
-                        # Saving resolved a pair of PKs
-                        existing_row_pk_value = resolved_conflicting_row[table_pk_field_name]
-                        importing_row_pk_value = dump_row[table_pk_field_name]
+                if bulk:
+                    in_progress_dump_row = None
+
+                    # Find rows that local DB already has, with a single query
+                    existing_db_rows: Dict[int, dict] = {}
+                    if is_table_with_special_unique_field:
+                        existing_db_rows = db_utils.select_existing_rows_for_rows(
+                            db=db,
+                            table_name=table_name,
+                            field_names=unique_field_names,
+                            rows=dump_rows_chunk,
+                            order_by="creation_date",
+                        )
 
-                        mappings_prev_value = resolvings_mapping.get(table_name, {})
-                        resolvings_mapping[table_name] = {
-                            **mappings_prev_value,
-                            **{importing_row_pk_value: existing_row_pk_value},
-                        }
+                    # Rows repeating unique field values of an earlier row in the chunk
+                    # conflict with it once it's inserted, as they would one by one
+                    duplicate_row_indices: Set[int] = set()
+                    if is_table_with_special_unique_field:
+                        chunk_unique_values = set()
+                        for i, dump_row in enumerate(dump_rows_chunk):
+                            if i in existing_db_rows:
+                                continue
+                            unique_values = tuple(dump_row[fn] for fn in unique_field_names)
+                            if unique_values in chunk_unique_values:
+                                duplicate_row_indices.add(i)
+                            chunk_unique_values.add(unique_values)
+                    conflicting_row_indices = sorted([*existing_db_rows, *duplicate_row_indices])
+
+                    new_dump_rows = [
+                        r
+                        for i, r in enumerate(dump_rows_chunk)
+                        if i not in existing_db_rows and i not in duplicate_row_indices
+                    ]
 
-                # Regular table. Create new row as is
-                else:
                     if verbosity:
-                        logger.debug(f"Inserting new row into table '{table_name}': {dump_row}")
-
-                    db_utils.insert_new_row_in_table(db, table_name, dump_row)
+                        logger.debug(
+                            f"Inserting {len(new_dump_rows)} new rows into table '{table_name}' "
+                            f"({len(conflicting_row_indices)} rows have conflicts)"
+                        )
 
-                # Update table lists of Imported data
-                if imported_data_needs_to_be_updated:
-                    if imported_data_conflicted_row:
-                        _labels = conflicted_labels
-                    else:
-                        _labels = newly_imported_labels
+                    try:
+                        db_utils.insert_new_rows_in_table(db, table_name, new_dump_rows)
+                    except sqlite3.IntegrityError:
+                        # Point error message at the first row with already existing PK, if any
+                        existing_pk_rows = db_utils.select_existing_rows_for_rows(
+                            db=db,
+                            table_name=table_name,
+                            field_names=[table_pk_field_name],
+                            rows=new_dump_rows,
+                        )
+                        if existing_pk_rows:
+                            in_progress_dump_row = new_dump_rows[min(existing_pk_rows)]
+                        raise
+
+                    # Only conflicting rows go through the conflict resolver, one by one
+                    for i in conflicting_row_indices:
+                        in_progress_dump_row = dump_rows_chunk[i]
+                        existing_db_row = existing_db_rows.get(i)
+                        if existing_db_row is None:
+                            # Duplicate within the chunk, conflicting with the row stored by now
+                            existing_db_row = db_utils.select_rows_by_list_of_field_values(
+                                db=db,
+                                table_name=table_name,
+                                field_names=unique_field_names,
+                                field_values=[
+                                    [in_progress_dump_row[fn]] for fn in unique_field_names
+                                ],
+                                order_by="creation_date",
+                            )[-1]
+                        _resolve_conflicting_row(
+                            db,
+                            conflict_resolver,
+                            table_name,
+                            table_pk_field_name,
+                            existing_db_row,
+                            in_progress_dump_row,
+                            resolvings_mapping,
+                            verbosity=verbosity,
+                        )
 
-                    imported_data_for_table[_labels].append(
-                        {
-                            UNIQUE_FIELD_NAMES: unique_field_names or [table_pk_field_name],
-                            UNIQUE_FIELD_VALUES: imported_data_row_unique_field_values,
-                        }
-                    )
+                    if imported_data_needs_to_be_updated:
+                        for i, dump_row in enumerate(dump_rows_chunk):
+                            _labels = newly_imported_labels
+                            if i in existing_db_rows or i in duplicate_row_indices:
+                                _labels = conflicted_labels
+                            imported_data_for_table[_labels].append(
+                                _make_imported_data_row(
+                                    dump_row,
+                                    table_pk_field_name,
+                                    unique_field_names,
+                                )
+                            )
 
             # Add table into Imported data
             if imported_data_needs_to_be_updated:
@@ -255,13 +397,7 @@ def import_single_db(
         # --- HACK (#UNIT.AGENT_ID) START #3:
         # Update all created `units` rows in #2 with presaved `agent_id` values
         if provider_type == MEPHISTO_DUMP_KEY:
-            for unit_id, agent_id in units_agents.items():
-                db_utils.update_row_in_table(
-                    db,
-                    "units",
-                    {"unit_id": unit_id, "agent_id": agent_id},
-                    "unit_id",
-                )
+            db_utils.update_field_in_table_rows(db, "units", "unit_id", "agent_id", units_agents)
         # --- HACK (#UNIT.AGENT_ID) END #3:
 
     except Exception as e:
@@ -289,6 +425,11 @@ def import_single_db(
             error_message_beginning = "Unexpected error happened: "
 
         error_row = in_progress_dump_row or json.dumps(in_progress_dump_row, indent=2)
+        if bulk and in_progress_dump_row is None:
+            error_row = (
+                "unknown, rows were imported in bulk "
+                "(import the dump without `-b/--bulk` option to find the row)"
+            )
         errors.append(
             f"{error_message_beginning}{e}{error_message_ending}"
             f"{possible_issue}"
@@ -315,6 +456,7 @@ def fill_imported_data_with_imported_dump(
         if imported_data:
             logger.debug("Saving information about imported data ...")
 
+    imported_data_rows = []
     for table_name, table_info in imported_data.items():
         for labels, labels_rows in table_info.items():
             for row in labels_rows:
@@ -323,18 +465,19 @@ def fill_imported_data_with_imported_dump(
 
                 unique_field_names = json.dumps(row["unique_field_names"])
                 unique_field_values = json.dumps(row["unique_field_values"])
-                db_utils.insert_new_row_in_table(
-                    db=db,
-                    table_name=IMPORTED_DATA_TABLE_NAME,
-                    row={
+                imported_data_rows.append(
+                    {
                         "source_file_name": source_file_name,
                         "data_labels": labels,
                         "table_name": table_name,
                         "unique_field_names": unique_field_names,
                         "unique_field_values": unique_field_values,
-                    },
+                    }
                 )
 
+    # There's a row for every imported row of some tables, so they are inserted all at once
+    db_utils.insert_new_rows_in_table(db, IMPORTED_DATA_TABLE_NAME, imported_data_rows)
+
     if verbosity:
         if imported_data:
             logger.debug("Saving information about imported data finished")
@@ -4,7 +4,10 @@
 # This source code is licensed under the MIT license found in the
 # LICENSE file in the root directory of this source tree.
 
+from functools import partial
 from typing import Dict
+from typing import Iterable
+from typing import Optional
 from typing import TypedDict
 from typing import Union
 
@@ -14,6 +17,7 @@ from mephisto.tools.db_data_porter.constants import IMPORTED_DATA_TABLE_NAME
 from mephisto.tools.db_data_porter.constants import MEPHISTO_DUMP_KEY
 from mephisto.tools.db_data_porter.constants import PROVIDER_DATASTORES__MEPHISTO_FK__MAPPINGS
 from mephisto.tools.db_data_porter.constants import PROVIDER_DATASTORES__RANDOMIZABLE_PK__MAPPINGS
+from mephisto.tools.db_data_porter.dump_files import map_table_rows
 from mephisto.utils import db as db_utils
 from mephisto.utils.console_writer import ConsoleWriter
 
@@ -29,11 +33,55 @@ class RandomizedIDsType(TypedDict):
     updated_dump: dict
 
 
+def _make_table_pk_substitutions(
+    table_rows: Iterable[dict],
+    pk_field_name: str,
+    legacy_only: bool = False,
+) -> TablePKSubstitutionsType:
+    table_pk_substitutions = {}
+    for row in table_rows:
+        old_pk = row[pk_field_name]
+
+        is_legacy_value = int(old_pk) < db_utils.SQLITE_ID_MIN
+        if not legacy_only or legacy_only and is_legacy_value:
+            table_pk_substitutions[old_pk] = str(db_utils.make_randomized_int_id())
+
+    return table_pk_substitutions
+
+
+def _substitute_ids_in_row(
+    row: dict,
+    pk_field_name: Optional[str],
+    table_pk_substitutions: TablePKSubstitutionsType,
+    fk_substitutions: Dict[str, TablePKSubstitutionsType],
+) -> dict:
+    """
+    Replace Primary Key of the row and its Foreign Keys with new values.
+    `fk_substitutions` are substitutions of related tables by names of FK fields
+    """
+    if pk_field_name:
+        new_pk = table_pk_substitutions.get(row[pk_field_name])
+        if new_pk:
+            row[pk_field_name] = new_pk
+
+    for fk_field_name, related_table_pk_substitutions in fk_substitutions.items():
+        substitution = related_table_pk_substitutions.get(row[fk_field_name])
+        if substitution:
+            row[fk_field_name] = substitution
+
+    return row
+
+
 def _randomize_ids_for_mephisto(
     db: "MephistoDB",
     mephisto_dump: dict,
     legacy_only: bool = False,
 ) -> DBPKSubstitutionsType:
+    """
+    Make new Primary Keys for rows of all tables and update dump with them.
+    Tables' rows can be read from DB lazily (not kept in memory),
+    so new PKs are generated first, and then they are substituted while rows are being read
+    """
     table_names = [t for t in mephisto_dump.keys() if t not in [IMPORTED_DATA_TABLE_NAME]]
 
     # Find Foreign Keys' field names for all tables in Mephist DB
@@ -41,46 +89,31 @@ def _randomize_ids_for_mephisto(
 
     # Make new Primary Keys for all or legacy values
     mephisto_pk_substitutions = {}
+    tables_pk_field_names = {}
     for table_name in table_names:
         pk_field_name = db_utils.get_table_pk_field_name(db, table_name)
-        table_rows_from_mephisto_dump = mephisto_dump[table_name]
-
-        table_pk_substitutions = {}
-        for row in table_rows_from_mephisto_dump:
-            old_pk = row[pk_field_name]
-
-            is_legacy_value = int(old_pk) < db_utils.SQLITE_ID_MIN
-            if not legacy_only or legacy_only and is_legacy_value:
-                new_pk = str(db_utils.make_randomized_int_id())
-                table_pk_substitutions.update({old_pk: new_pk})
-                row[pk_field_name] = new_pk
-
-        prev_value = mephisto_pk_substitutions.get(table_name, {})
-        mephisto_pk_substitutions[table_name] = {**prev_value, **table_pk_substitutions}
-
-    # Update Foreign Keys in related tables
-    for table_name, fks in tables_fks.items():
-        table_pk_substitutions = mephisto_pk_substitutions[table_name]
-        # If nothing to update in related table, just skip it
-        if not table_pk_substitutions:
-            continue
-
-        table_fks = tables_fks[table_name]
-        # If table does not have any Foreign Keys, just skip it
-        if not table_fks:
-            continue
-
-        # Change value in related tables rows
-        table_rows_from_mephisto_dump = mephisto_dump[table_name]
-        for row in table_rows_from_mephisto_dump:
-            for fk_table_name, relation_data in table_fks.items():
-                row_fk_value = row[relation_data["from"]]
-                substitution = mephisto_pk_substitutions[fk_table_name].get(row_fk_value)
-
-                if not substitution:
-                    continue
+        tables_pk_field_names[table_name] = pk_field_name
+        mephisto_pk_substitutions[table_name] = _make_table_pk_substitutions(
+            mephisto_dump[table_name],
+            pk_field_name,
+            legacy_only,
+        )
 
-                row[relation_data["from"]] = substitution
+    # Update Primary Keys and Foreign Keys in related tables
+    for table_name in table_names:
+        fk_substitutions = {
+            relation_data["from"]: mephisto_pk_substitutions.get(fk_table_name, {})
+            for fk_table_name, relation_data in tables_fks[table_name].items()
+        }
+        mephisto_dump[table_name] = map_table_rows(
+            mephisto_dump[table_name],
+            partial(
+                _substitute_ids_in_row,
+                pk_field_name=tables_pk_field_names[table_name],
+                table_pk_substitutions=mephisto_pk_substitutions[table_name],
+                fk_substitutions=fk_substitutions,
+            ),
+        )
 
     return mephisto_pk_substitutions
 
@@ -110,45 +143,43 @@ def _randomize_ids_for_provider(
     provider_pks_mappings = PROVIDER_DATASTORES__RANDOMIZABLE_PK__MAPPINGS.get(provider_type, {})
 
     for table_name, pk_field_name in provider_pks_mappings.items():
-        table_rows_from_mephisto_dump = provider_dump[table_name]
-        table_pk_substitutions = {}
-        for row in table_rows_from_mephisto_dump:
-            old_pk = row[pk_field_name]
-
-            is_legacy_value = int(old_pk) < db_utils.SQLITE_ID_MIN
-            if not legacy_only or legacy_only and is_legacy_value:
-                new_pk = str(db_utils.make_randomized_int_id())
-                table_pk_substitutions.update({old_pk: new_pk})
-                row[pk_field_name] = new_pk
-
-        prev_value = provider_pk_substitutions.get(table_name, {})
-        provider_pk_substitutions[table_name] = {**prev_value, **table_pk_substitutions}
-
-    # Update Foreign Keys in related tables
-    for table_name, fks in provider_fks_mappings.items():
-        table_fks = provider_fks_mappings[table_name]
-        # If table does not have any Foreign Keys, just skip it
-        if not table_fks:
-            continue
-
-        table_rows_from_provider_dump = provider_dump.get(table_name, [])
-        for row in table_rows_from_provider_dump:
-            for fk_table_name, relation_data in table_fks.items():
-                row_fk_value = row[relation_data["from"]]
-
-                # FKs from Mephisto DB
-                is_fk_to_mephisto_db = fk_table_name.startswith(FK_MEPHISTO_TABLE_PREFIX)
-                if is_fk_to_mephisto_db:
-                    fk_table_name = fk_table_name.split(FK_MEPHISTO_TABLE_PREFIX)[1]
-                    substitution = mephisto_pk_substitutions[fk_table_name].get(row_fk_value)
-                # FKs from provider DB
-                else:
-                    substitution = provider_pk_substitutions[fk_table_name].get(row_fk_value)
+        provider_pk_substitutions[table_name] = _make_table_pk_substitutions(
+            provider_dump[table_name],
+            pk_field_name,
+            legacy_only,
+        )
 
-                if not substitution:
-                    continue
+    # Update Primary Keys and Foreign Keys in related tables
+    table_names = list(provider_pks_mappings.keys()) + [
+        t for t in provider_fks_mappings.keys() if t not in provider_pks_mappings
+    ]
+    for table_name in table_names:
+        table_rows_from_provider_dump = provider_dump.get(table_name)
+        if table_rows_from_provider_dump is None:
+            continue
 
-                row[relation_data["from"]] = substitution
+        fk_substitutions = {}
+        for fk_table_name, relation_data in (provider_fks_mappings.get(table_name) or {}).items():
+            # FKs from Mephisto DB
+            is_fk_to_mephisto_db = fk_table_name.startswith(FK_MEPHISTO_TABLE_PREFIX)
+            if is_fk_to_mephisto_db:
+                fk_table_name = fk_table_name.split(FK_MEPHISTO_TABLE_PREFIX)[1]
+                related_table_pk_substitutions = mephisto_pk_substitutions.get(fk_table_name, {})
+            # FKs from provider DB
+            else:
+                related_table_pk_substitutions = provider_pk_substitutions.get(fk_table_name, {})
+
+            fk_substitutions[relation_data["from"]] = related_table_pk_substitutions
+
+        provider_dump[table_name] = map_table_rows(
+            table_rows_from_provider_dump,
+            partial(
+                _substitute_ids_in_row,
+                pk_field_name=provider_pks_mappings.get(table_name),
+                table_pk_substitutions=provider_pk_substitutions.get(table_name, {}),
+                fk_substitutions=fk_substitutions,
+            ),
+        )
 
     return provider_pk_substitutions
 
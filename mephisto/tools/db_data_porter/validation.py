@@ -13,6 +13,7 @@ from mephisto.tools.db_data_porter.constants import AVAILABLE_PROVIDER_TYPES
 from mephisto.tools.db_data_porter.constants import MEPHISTO_DUMP_KEY
 from mephisto.tools.db_data_porter.constants import METADATA_DUMP_KEY
 from mephisto.tools.db_data_porter.constants import METADATA_EXPORT_OPTIONS_KEY
+from mephisto.tools.db_data_porter.dump_files import TableRows
 from mephisto.utils import db as db_utils
 
 
@@ -80,8 +81,8 @@ def validate_dump_data(
             if not isinstance(table_name, str):
                 errors.append(f"Expecting table name to be a string, not `{table_name}`.")
 
-            # Table data is a list or rows
-            if not isinstance(table_data, list):
+            # Table data is a list or rows (or rows that are read from dump file one by one)
+            if not isinstance(table_data, (list, TableRows)):
                 errors.append(f"Expecting table data to be a JSON-array, not `{table_data}`.")
 
             # Local DB/Datastore has same tables as a dump
@@ -98,22 +99,26 @@ def validate_dump_data(
                 errors.append(error_message)
 
             # Check table rows
-            for i, table_row in enumerate(table_data):
-                if not isinstance(table_row, dict):
-                    errors.append(
-                        f"Table `{table_name}`, row {i}: "
-                        f"expecting it to be a JSON-object, not `{table_row}`."
-                    )
-                    continue
-
-                incorrect_field_names = list(
-                    filter(lambda fn: not isinstance(fn, str), table_row.keys())
-                )
-                if incorrect_field_names:
-                    errors.append(
-                        f"Table `{table_name}`, row {i+1}: "
-                        f"names of these fields must be strings: "
-                        f"{', '.join([str(i) for i in incorrect_field_names])}."
+            try:
+                for i, table_row in enumerate(table_data):
+                    if not isinstance(table_row, dict):
+                        errors.append(
+                            f"Table `{table_name}`, row {i}: "
+                            f"expecting it to be a JSON-object, not `{table_row}`."
+                        )
+                        continue
+
+                    incorrect_field_names = list(
+                        filter(lambda fn: not isinstance(fn, str), table_row.keys())
                     )
+                    if incorrect_field_names:
+                        errors.append(
+                            f"Table `{table_name}`, row {i+1}: "
+                            f"names of these fields must be strings: "
+                            f"{', '.join([str(i) for i in incorrect_field_names])}."
+                        )
+            except ValueError as e:
+                # Row in dump file is not a valid JSON
+                errors.append(f"Table `{table_name}`: could not read rows. Reason: {e}.")
 
     return errors
@@ -27,8 +27,12 @@ from omegaconf import OmegaConf
 from rich import print
 from rich.markdown import Markdown
 
+from mephisto.abstractions.databases.entity_cache import DEFAULT_CACHE_MAX_SIZE
+from mephisto.abstractions.databases.entity_cache import DEFAULT_INDEX_MAX_COUNT
+from mephisto.abstractions.databases.local_database import DEFAULT_READ_POOL_SIZE
 from mephisto.abstractions.databases.local_database import LocalMephistoDB
 from mephisto.abstractions.databases.local_singleton_database import MephistoSingletonDB
+from mephisto.abstractions.databases.write_behind_flusher import DEFAULT_WRITE_BEHIND_WINDOW
 from mephisto.abstractions.providers.mturk.mturk_utils import try_prerun_cleanup
 from mephisto.operations.hydra_config import build_default_task_config
 from mephisto.operations.hydra_config import register_script_config
@@ -138,11 +142,25 @@ def get_db_from_config(cfg: DictConfig) -> "MephistoDB":
     database_path = os.path.join(datapath, "database.db")
 
     database_type = cfg.mephisto.database._database_type
+    database_kwargs = {
+        "use_wal": cfg.mephisto.database.get("wal_mode", False),
+        "read_pool_size": cfg.mephisto.database.get("read_pool_size", DEFAULT_READ_POOL_SIZE),
+        "write_behind": cfg.mephisto.database.get("write_behind", False),
+        "write_behind_window": cfg.mephisto.database.get(
+            "write_behind_window", DEFAULT_WRITE_BEHIND_WINDOW
+        ),
+    }
 
     if database_type == "local":
-        return LocalMephistoDB(database_path=database_path)
+        return LocalMephistoDB(database_path=database_path, **database_kwargs)
     elif database_type == "singleton":
-        return MephistoSingletonDB(database_path=database_path)
+        return MephistoSingletonDB(
+            database_path=database_path,
+            cache_max_size=cfg.mephisto.database.get("cache_max_size", DEFAULT_CACHE_MAX_SIZE),
+            cache_max_age=cfg.mephisto.database.get("cache_max_age", None),
+            index_max_count=cfg.mephisto.database.get("index_max_count", DEFAULT_INDEX_MAX_COUNT),
+            **database_kwargs,
+        )
     else:
         raise AssertionError(f"Provided database_type {database_type} is not valid")
 
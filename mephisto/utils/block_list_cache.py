@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+
+# Copyright (c) Meta Platforms and its affiliates.
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+import threading
+import time
+from collections import defaultdict
+from typing import Callable
+from typing import DefaultDict
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import Optional
+from typing import Set
+from typing import Tuple
+
+DEFAULT_BLOCK_LIST_TTL = 5 * 60  # seconds
+
+
+class BlockListCache:
+    """
+    Cache of the workers blocked on a crowd provider, for any number of block
+    lists (such as one per requester).
+
+    A block list is loaded in full the first time it's checked, and again once
+    it's `ttl` seconds old to pick up blocks made outside of Mephisto. Blocks
+    and unblocks made through Mephisto are recorded as they happen, including
+    ones made while the list is being reloaded, so checks never need to wait
+    on the provider between reloads.
+    """
+
+    def __init__(self, ttl: float = DEFAULT_BLOCK_LIST_TTL):
+        self.ttl = ttl
+        # List key -> (time of the load, blocked worker ids)
+        self._block_lists: Dict[str, Tuple[float, Set[str]]] = {}
+        # List key -> (worker id, is blocked) changes made during a load of the list
+        self._changes_during_load: Dict[str, List[Tuple[str, bool]]] = {}
+        self._load_locks: DefaultDict[str, threading.Lock] = defaultdict(threading.Lock)
+        self._lock = threading.Lock()
+
+    def _get_block_list(
+        self, list_key: str, load_blocked_ids: Callable[[], Iterable[str]]
+    ) -> Set[str]:
+        with self._lock:
+            load_lock = self._load_locks[list_key]
+            load_time, blocked_ids = self._block_lists.get(list_key, (0.0, None))
+        if blocked_ids is not None and time.monotonic() - load_time < self.ttl:
+            return blocked_ids
+        with load_lock:
+            with self._lock:
+                load_time, blocked_ids = self._block_lists.get(list_key, (0.0, None))
+                if blocked_ids is not None and time.monotonic() - load_time < self.ttl:
+                    # Loaded by another thread while we waited
+                    return blocked_ids
+                self._changes_during_load[list_key] = []
+            load_time = time.monotonic()
+            try:
+                loaded_ids = set(load_blocked_ids())
+            finally:
+                with self._lock:
+                    changes = self._changes_during_load.pop(list_key)
+            with self._lock:
+                for worker_id, is_blocked in changes:
+                    if is_blocked:
+                        loaded_ids.add(worker_id)
+                    else:
+                        loaded_ids.discard(worker_id)
+                self._block_lists[list_key] = (load_time, loaded_ids)
+            return loaded_ids
+
+    def _record_change(self, list_key: str, worker_id: str, is_blocked: bool) -> None:
+        with self._lock:
+            if list_key in self._changes_during_load:
+                self._changes_during_load[list_key].append((worker_id, is_blocked))
+            if list_key not in self._block_lists:
+                # Not loaded yet, the first check will load the change
+                return
+            _, blocked_ids = self._block_lists[list_key]
+            if is_blocked:
+                blocked_ids.add(worker_id)
+            else:
+                blocked_ids.discard(worker_id)
+
+    def is_blocked(
+        self,
+        list_key: str,
+        worker_id: str,
+        load_blocked_ids: Callable[[], Iterable[str]],
+    ) -> bool:
+        """
+        Determine if the worker is on the given block list, calling
+        `load_blocked_ids` to get the whole list if it isn't loaded or is stale
+        """
+        return worker_id in self._get_block_list(list_key, load_blocked_ids)
+
+    def add_block(self, list_key: str, worker_id: str) -> None:
+        """Record that the worker was added to the given block list"""
+        self._record_change(list_key, worker_id, True)
+
+    def remove_block(self, list_key: str, worker_id: str) -> None:
+        """Record that the worker was removed from the given block list"""
+        self._record_change(list_key, worker_id, False)
+
+    def clear(self, list_key: Optional[str] = None) -> None:
+        """Drop the given block list, or all of them, so they're loaded again"""
+        with self._lock:
+            if list_key is None:
+                self._block_lists.clear()
+            else:
+                self._block_lists.pop(list_key, None)
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+
+# Copyright (c) Meta Platforms and its affiliates.
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+import threading
+import time
+from concurrent.futures import as_completed
+from concurrent.futures import Future
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import Optional
+
+from tqdm import tqdm  # type: ignore
+
+
+class TokenBucket:
+    """
+    Thread safe token bucket rate limiter. Tokens are added at `rate` per second,
+    up to `capacity`, and `acquire` blocks until one can be taken.
+    """
+
+    def __init__(self, rate: float, capacity: float = 1):
+        assert rate > 0, "TokenBucket rate must be positive"
+        self.rate = rate
+        self.capacity = max(capacity, 1)
+        self._tokens = self.capacity
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _take(self) -> float:
+        """Take a token if there is one and return 0, otherwise the time until there is"""
+        with self._lock:
+            now = time.monotonic()
+            elapsed = now - self._last_refill
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+            self._last_refill = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0
+            return (1 - self._tokens) / self.rate
+
+    def try_acquire(self) -> bool:
+        """Take a token if one is available right away"""
+        return self._take() == 0
+
+    def acquire(self) -> None:
+        """Take a token, waiting for one if needed"""
+        wait_time = self._take()
+        while wait_time > 0:
+            time.sleep(wait_time)
+            wait_time = self._take()
+
+
+@dataclass
+class CallGroup:
+    """
+    A call to make for each of `items`, with at most `concurrency` calls running
+    at once and at most `rate_limit` started per second (0 for no limit). If
+    `is_rate_limited` is given, only the items it returns True for wait on the
+    rate limit.
+    """
+
+    name: str
+    items: List[Any]
+    call: Callable[[Any], Any]
+    concurrency: int = 1
+    rate_limit: float = 0
+    is_rate_limited: Optional[Callable[[Any], bool]] = None
+
+
+@dataclass
+class CallResult:
+    """The result of a CallGroup's call on one item, or the error it raised"""
+
+    item: Any
+    result: Any = None
+    error: Optional[Exception] = None
+
+
+def run_call_groups(
+    groups: List[CallGroup],
+    description: Optional[str] = None,
+    quiet: bool = False,
+) -> List[CallResult]:
+    """
+    Make the calls of all the given groups, each group from its own pool of
+    threads so that all groups make progress at the same time within their
+    own limits. Shows a progress bar over all the calls unless quiet.
+
+    Errors are caught and returned with the results, which are in the order
+    of the groups and their items.
+    """
+
+    def make_call(group: CallGroup, rate_limiter: Optional[TokenBucket], item: Any) -> Any:
+        if rate_limiter is not None and (
+            group.is_rate_limited is None or group.is_rate_limited(item)
+        ):
+            rate_limiter.acquire()
+        return group.call(item)
+
+    executors: List[ThreadPoolExecutor] = []
+    futures: Dict[Future, CallResult] = {}
+    results: List[CallResult] = []
+    try:
+        for group in groups:
+            if len(group.items) == 0:
+                continue
+            concurrency = max(1, group.concurrency)
+            rate_limiter = None
+            if group.rate_limit > 0:
+                rate_limiter = TokenBucket(group.rate_limit, capacity=concurrency)
+            executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix=group.name)
+            executors.append(executor)
+            for item in group.items:
+                call_result = CallResult(item=item)
+                results.append(call_result)
+                futures[executor.submit(make_call, group, rate_limiter, item)] = call_result
+
+        for future in tqdm(
+            as_completed(futures), total=len(futures), desc=description, disable=quiet
+        ):
+            call_result = futures[future]
+            try:
+                call_result.result = future.result()
+            except Exception as e:
+                call_result.error = e
+    finally:
+        # Drop any calls that haven't started if we were interrupted
+        for future in futures:
+            future.cancel()
+        for executor in executors:
+            executor.shutdown(wait=True)
+    return results
@@ -9,8 +9,10 @@ import json
 import random
 from copy import deepcopy
 from datetime import datetime
+from typing import Any
 from typing import Callable
 from typing import Dict
+from typing import Iterator
 from typing import List
 from typing import Optional
 from typing import Type
@@ -24,6 +26,13 @@ from mephisto.utils.misc import serialize_date_to_python
 SQLITE_ID_MIN = 1_000_000
 SQLITE_ID_MAX = 2**63 - 1
 
+# Tables with data derived from other tables, that is recomputed instead of being exported
+DERIVED_DATA_TABLE_NAMES = [
+    "task_stats",
+    "task_stats_flags",
+    "task_stats_units",
+]
+
 logger = ConsoleWriter()
 
 
@@ -179,6 +188,51 @@ def select_all_table_rows(
         return [dict(row) for row in rows]
 
 
+def iter_table_rows(db: "MephistoDB", table_name: str, chunk_size: int = 1000) -> Iterator[dict]:
+    """
+    Iterate over all rows of a table (serialized the same way as for a dump),
+    reading them from DB in chunks of `chunk_size` rows in `rowid` order
+    """
+    last_rowid = None
+    while True:
+        with db.table_access_condition, db.get_connection() as conn:
+            c = conn.cursor()
+            if last_rowid is None:
+                c.execute(
+                    f"SELECT rowid AS dump_rowid, * FROM {table_name} ORDER BY rowid LIMIT ?;",
+                    (chunk_size,),
+                )
+            else:
+                c.execute(
+                    f"""
+                    SELECT rowid AS dump_rowid, * FROM {table_name}
+                    WHERE rowid > ?
+                    ORDER BY rowid
+                    LIMIT ?;
+                    """,
+                    (last_rowid, chunk_size),
+                )
+            rows = [dict(row) for row in c.fetchall()]
+
+        if not rows:
+            return
+
+        last_rowid = rows[-1]["dump_rowid"]
+        for row in rows:
+            row.pop("dump_rowid")
+        yield from serialize_data_for_table(rows)
+
+        if len(rows) < chunk_size:
+            return
+
+
+def count_table_rows(db: "MephistoDB", table_name: str) -> int:
+    with db.table_access_condition, db.get_connection() as conn:
+        c = conn.cursor()
+        c.execute(f"SELECT COUNT(*) AS rows_count FROM {table_name};")
+        return c.fetchone()["rows_count"]
+
+
 def select_rows_by_list_of_field_values(
     db: "MephistoDB",
     table_name: str,
@@ -360,7 +414,10 @@ def get_list_of_tables_to_export(db: "MephistoDB") -> List[str]:
 
     filtered_table_names = []
     for table_name in table_names:
-        if not table_name.startswith("sqlite_") and table_name not in ["migrations"]:
+        if not table_name.startswith("sqlite_") and table_name not in [
+            "migrations",
+            *DERIVED_DATA_TABLE_NAMES,
+        ]:
             filtered_table_names.append(table_name)
 
     return filtered_table_names
@@ -630,6 +687,227 @@ def update_row_in_table(
         )
 
 
+def insert_new_rows_in_table(db: "MephistoDB", table_name: str, rows: List[dict]):
+    """Insert many rows in a table at once, in a single transaction"""
+    # Group rows by their columns (normally all rows of a table have the same ones)
+    rows_values_by_columns: Dict[tuple, List[tuple]] = {}
+    for row in rows:
+        rows_values_by_columns.setdefault(tuple(row.keys()), []).append(tuple(row.values()))
+
+    with db.table_access_condition, db.get_connection() as conn:
+        c = conn.cursor()
+
+        for columns, rows_values in rows_values_by_columns.items():
+            columns_string = ",".join(columns)
+            columns_questions_string = ",".join(["?"] * len(columns))
+
+            c.executemany(
+                f"""
+                INSERT INTO {table_name}(
+                    {columns_string}
+                ) VALUES ({columns_questions_string});
+                """,
+                rows_values,
+            )
+
+
+def update_field_in_table_rows(
+    db: "MephistoDB",
+    table_name: str,
+    pk_field_name: str,
+    field_name: str,
+    values: Dict[str, Any],
+):
+    """Set values of one field of many rows at once. `values` maps PK of a row to its new value"""
+    with db.table_access_condition, db.get_connection() as conn:
+        c = conn.cursor()
+        c.executemany(
+            f"UPDATE {table_name} SET {field_name} = ? WHERE {pk_field_name} = ?;",
+            [(value, pk_field_value) for pk_field_value, value in values.items()],
+        )
+
+
+def select_existing_rows_for_rows(
+    db: "MephistoDB",
+    table_name: str,
+    field_names: List[str],
+    rows: List[dict],
+    order_by: Optional[str] = None,
+) -> Dict[int, dict]:
+    """
+    Find rows of a table with the same values of `field_names` as `rows` (that are not in DB yet).
+    Values of `rows` are staged in a temporary table, that is joined with the table only once.
+
+    Returns a dict that maps index of a row in `rows` to the last matching table row
+    (in `order_by` order), only for rows that have matching ones.
+    """
+    if not rows:
+        return {}
+
+    staging_field_names = [f"field_{i}" for i in range(len(field_names))]
+    staging_rows_values = [
+        (i, *[row[field_name] for field_name in field_names]) for i, row in enumerate(rows)
+    ]
+
+    order_by_string = ""
+    if order_by:
+        order_by_direction = "DESC" if order_by.startswith("-") else "ASC"
+        order_by_field_name = order_by[1:] if order_by.startswith("-") else order_by
+        order_by_string = f", t.{order_by_field_name} {order_by_direction}"
+
+    join_string = " AND ".join(
+        [f"t.{fn} = s.{sfn}" for fn, sfn in zip(field_names, staging_field_names)]
+    )
+
+    with db.table_access_condition, db.get_connection() as conn:
+        c = conn.cursor()
+        c.execute("DROP TABLE IF EXISTS temp.staging_rows;")
+        # Columns without type, so that values are compared with affinity of table columns
+        c.execute(
+            f"""
+            CREATE TEMP TABLE staging_rows (
+                row_index INTEGER PRIMARY KEY,
+                {", ".join(staging_field_names)}
+            );
+            """
+        )
+        c.executemany(
+            f"INSERT INTO temp.staging_rows VALUES ({','.join(['?'] * (len(field_names) + 1))});",
+            staging_rows_values,
+        )
+        c.execute(
+            f"""
+            SELECT s.row_index AS staging_row_index, t.*
+            FROM temp.staging_rows AS s
+            JOIN {table_name} AS t ON {join_string}
+            ORDER BY s.row_index{order_by_string};
+            """
+        )
+        existing_rows = {}
+        for existing_row in c.fetchall():
+            existing_row = dict(existing_row)
+            # Later rows of the same staged row overwrite earlier ones
+            existing_rows[existing_row.pop("staging_row_index")] = existing_row
+        c.execute("DROP TABLE temp.staging_rows;")
+
+        return existing_rows
+
+
+def get_task_has_stats(db: "MephistoDB", task_id: str) -> Optional[bool]:
+    """Cached flag whether Task has fields for stats (`None` if it was not cached yet)"""
+    with db.table_access_condition, db.get_connection() as conn:
+        c = conn.cursor()
+        c.execute(
+            "SELECT has_stats FROM task_stats_flags WHERE task_id = ?;",
+            (int(task_id),),
+        )
+        row = c.fetchone()
+        return bool(row["has_stats"]) if row else None
+
+
+def set_task_has_stats(db: "MephistoDB", task_id: str, has_stats: Optional[bool]):
+    """Cache flag whether Task has fields for stats (`None` drops the cached value)"""
+    with db.table_access_condition, db.get_connection() as conn:
+        c = conn.cursor()
+        if has_stats is None:
+            c.execute("DELETE FROM task_stats_flags WHERE task_id = ?;", (int(task_id),))
+            return
+
+        c.execute(
+            "INSERT OR REPLACE INTO task_stats_flags(task_id, has_stats) VALUES (?, ?);",
+            (int(task_id), has_stats),
+        )
+
+
+def find_unit_ids_missing_from_task_stats(
+    db: "MephistoDB",
+    task_id: str,
+    statuses: List[str],
+) -> List[str]:
+    """Find units of Task with given statuses that have not been added to its stats yet"""
+    with db.table_access_condition, db.get_connection() as conn:
+        c = conn.cursor()
+        c.execute(
+            f"""
+            SELECT unit_id FROM units
+            WHERE
+                task_id = ? AND
+                status IN ({",".join("?" * len(statuses))}) AND
+                unit_id NOT IN (SELECT unit_id FROM task_stats_units WHERE task_id = ?);
+            """,
+            [int(task_id), *statuses, int(task_id)],
+        )
+        rows = c.fetchall()
+        return [r["unit_id"] for r in rows]
+
+
+def count_task_workers(db: "MephistoDB", task_id: str, statuses: List[str]) -> int:
+    """Number of distinct workers that units of Task with given statuses were assigned to"""
+    with db.table_access_condition, db.get_connection() as conn:
+        c = conn.cursor()
+        c.execute(
+            f"""
+            SELECT COUNT(DISTINCT worker_id) AS workers_count FROM units
+            WHERE task_id = ? AND status IN ({",".join("?" * len(statuses))});
+            """,
+            [int(task_id), *statuses],
+        )
+        return c.fetchone()["workers_count"]
+
+
+def get_task_stats(db: "MephistoDB", task_id: str) -> Optional[dict]:
+    """Stats accumulated for Task (`None` if nothing has been added to them yet)"""
+    with db.table_access_condition, db.get_connection() as conn:
+        c = conn.cursor()
+        c.execute("SELECT stats FROM task_stats WHERE task_id = ?;", (int(task_id),))
+        row = c.fetchone()
+        return json.loads(row["stats"]) if row else None
+
+
+def add_units_to_task_stats(
+    db: "MephistoDB",
+    task_id: str,
+    unit_ids: List[str],
+    add_units: Callable[[dict, List[str]], dict],
+) -> dict:
+    """
+    Update stats of Task with `add_units(stats, unit_ids)`, in a single transaction,
+    passing it only units that have not been added to the stats yet (e.g. by a concurrent call)
+    """
+    with db.table_access_condition, db.get_connection() as conn:
+        c = conn.cursor()
+
+        new_unit_ids = []
+        for unit_id in unit_ids:
+            c.execute(
+                "INSERT OR IGNORE INTO task_stats_units(unit_id, task_id) VALUES (?, ?);",
+                (int(unit_id), int(task_id)),
+            )
+            if c.rowcount:
+                new_unit_ids.append(unit_id)
+
+        c.execute("SELECT stats FROM task_stats WHERE task_id = ?;", (int(task_id),))
+        row = c.fetchone()
+        stats = json.loads(row["stats"]) if row else {}
+
+        if new_unit_ids or not row:
+            stats = add_units(stats, new_unit_ids)
+            c.execute(
+                "INSERT OR REPLACE INTO task_stats(task_id, stats) VALUES (?, ?);",
+                (int(task_id), json.dumps(stats)),
+            )
+
+        return stats
+
+
+def delete_task_stats(db: "MephistoDB", task_id: str):
+    """Drop stats accumulated for Task, so that they can be rebuilt from scratch"""
+    with db.table_access_condition, db.get_connection() as conn:
+        c = conn.cursor()
+        c.execute("DELETE FROM task_stats_units WHERE task_id = ?;", (int(task_id),))
+        c.execute("DELETE FROM task_stats WHERE task_id = ?;", (int(task_id),))
+
+
 # --- Decorators ---
 
 
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+
+# Copyright (c) Meta Platforms and its affiliates.
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+import threading
+import time
+from typing import Any
+from typing import Dict
+from typing import Iterator
+from typing import MutableMapping
+from typing import Optional
+from typing import TypeVar
+
+K = TypeVar("K")
+V = TypeVar("V")
+
+DEFAULT_STORE_TTL = 60 * 60  # seconds
+DEFAULT_STORE_MAX_SIZE = 100000
+
+
+class ExpiringStore(MutableMapping[K, V]):
+    """
+    Mapping that forgets its entries once they're old, or once there are too many.
+
+    Entries are kept in two generations. New entries go into the current one,
+    and when it's `ttl` seconds old or holds half of `max_size` entries, it
+    becomes the previous generation, and the old previous generation is dropped.
+    So an entry is kept for at least `ttl` seconds unless the store fills up,
+    at most twice that, and the store never holds more than `max_size` entries.
+
+    If a prometheus `size_gauge` is given, it's kept up to date with the number
+    of entries in the store.
+    """
+
+    def __init__(
+        self,
+        ttl: float = DEFAULT_STORE_TTL,
+        max_size: int = DEFAULT_STORE_MAX_SIZE,
+        size_gauge: Optional[Any] = None,
+    ):
+        assert max_size >= 2, "ExpiringStore max_size must be at least 2"
+        self.ttl = ttl
+        self.max_size = max_size
+        self.size_gauge = size_gauge
+        self._current: Dict[K, V] = {}
+        self._previous: Dict[K, V] = {}
+        self._current_start = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _resize_gauge(self, change: int) -> None:
+        if self.size_gauge is not None and change != 0:
+            self.size_gauge.inc(change)
+
+    def _maybe_rotate(self) -> None:
+        """Start a new generation if the current one is full or old. Needs the lock"""
+        if (
+            len(self._current) < self.max_size // 2
+            and time.monotonic() - self._current_start < self.ttl
+        ):
+            return
+        if time.monotonic() - self._current_start >= 2 * self.ttl:
+            # Both generations have expired
+            self._resize_gauge(-len(self._current))
+            self._current = {}
+        self._resize_gauge(-len(self._previous))
+        self._previous = self._current
+        self._current = {}
+        self._current_start = time.monotonic()
+
+    def __setitem__(self, key: K, value: V) -> None:
+        with self._lock:
+            self._maybe_rotate()
+            if key in self._previous:
+                del self._previous[key]
+            elif key not in self._current:
+                self._resize_gauge(1)
+            self._current[key] = value
+
+    def __getitem__(self, key: K) -> V:
+        with self._lock:
+            self._maybe_rotate()
+            if key in self._current:
+                return self._current[key]
+            return self._previous[key]
+
+    def __delitem__(self, key: K) -> None:
+        with self._lock:
+            if key in self._current:
+                del self._current[key]
+            else:
+                del self._previous[key]
+            self._resize_gauge(-1)
+
+    def __contains__(self, key: object) -> bool:
+        with self._lock:
+            self._maybe_rotate()
+            return key in self._current or key in self._previous
+
+    def __iter__(self) -> Iterator[K]:
+        with self._lock:
+            self._maybe_rotate()
+            return iter(list(self._previous) + list(self._current))
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._current) + len(self._previous)
+
+    def add(self, key: K) -> None:
+        """Record the key, for using the store as a set"""
+        self[key] = None  # type: ignore
+
+    def clear(self) -> None:
+        with self._lock:
+            self._resize_gauge(-(len(self._current) + len(self._previous)))
+            self._current = {}
+            self._previous = {}
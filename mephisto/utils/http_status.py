@@ -15,6 +15,10 @@ HTTP_302_FOUND = 302
 HTTP_400_BAD_REQUEST = 400
 HTTP_401_UNAUTHORIZED = 401
 HTTP_404_NOT_FOUND = 404
+HTTP_429_TOO_MANY_REQUESTS = 429
 
 # 5xx
 HTTP_500_INTERNAL_SERVER_ERROR = 500
+HTTP_502_BAD_GATEWAY = 502
+HTTP_503_SERVICE_UNAVAILABLE = 503
+HTTP_504_GATEWAY_TIMEOUT = 504
@@ -32,65 +32,114 @@ logger = get_logger(name=__name__)
 QualificationType = Dict[str, Any]
 
 
-def worker_is_qualified(
-    worker: "Worker",
-    shared_state_qualifications: List[QualificationType],
-    task_run: Optional["TaskRun"] = None,
-):
-    db = worker.db
-
-    # 1. Check if provider has `admit_workers_with_no_prior_qualification` setting
-    provider_args = task_run.get_provider_args()
-    admit_with_no_prior_qualification = provider_args.get(
-        "admit_workers_with_no_prior_qualification"
-    )
-    all_worker_granted_qualifications = db.find_granted_qualifications(worker_id=worker.db_id)
-    worker_has_granted_qualifications = len(all_worker_granted_qualifications) > 0
-    task_run_has_qualifications = len(shared_state_qualifications) > 0
-    if (
-        admit_with_no_prior_qualification is True
-        and task_run_has_qualifications
-        and not worker_has_granted_qualifications
-    ):
-        # If TaskRun has quelifications and Worker has no granted qualifications,
-        # they should be considered as quailified
-        return True
+class QualificationEvaluator:
+    """
+    Checks workers against the qualifications of a task run.
 
-    # 2. Check Worker's qualification
-    for shared_state_qualification in shared_state_qualifications:
-        qualification_name = shared_state_qualification["qualification_name"]
-        qualifications = db.find_qualifications(qualification_name)
+    Each check loads the worker's granted qualifications in one query and compares
+    them in memory. The ids of the qualification names are looked up once, and
+    kept for the life of the evaluator, so WorkerPools keep one per run.
+    """
 
-        if not qualifications:
-            logger.warning(
-                f"Expected to create qualification for {qualification_name}, "
-                f"but none found... skipping."
+    def __init__(
+        self,
+        db: "MephistoDB",
+        shared_state_qualifications: List[QualificationType],
+        task_run: Optional["TaskRun"] = None,
+    ):
+        self.db = db
+        self.shared_state_qualifications = shared_state_qualifications
+        self.task_run = task_run
+        self._admit_with_no_prior_qualification: Optional[bool] = None
+        # Qualification name -> id, only for qualifications that exist
+        self._qualification_ids: Dict[str, str] = {}
+
+    def _get_admit_with_no_prior_qualification(self) -> bool:
+        if self._admit_with_no_prior_qualification is None:
+            provider_args = self.task_run.get_provider_args()
+            self._admit_with_no_prior_qualification = (
+                provider_args.get("admit_workers_with_no_prior_qualification") is True
             )
-            continue
-
-        qualification = qualifications[0]
-        granted_qualifications = db.find_granted_qualifications(
-            qualification_id=qualification.db_id,
+        return self._admit_with_no_prior_qualification
+
+    def _get_qualification_id(self, qualification_name: str) -> Optional[str]:
+        qualification_id = self._qualification_ids.get(qualification_name)
+        if qualification_id is None:
+            qualifications = self.db.find_qualifications(qualification_name)
+            if not qualifications:
+                return None
+            qualification_id = qualifications[0].db_id
+            self._qualification_ids[qualification_name] = qualification_id
+        return qualification_id
+
+    def is_qualified(self, worker: "Worker") -> bool:
+        """Return whether the worker meets all of the qualifications"""
+        all_worker_granted_qualifications = self.db.find_granted_qualifications(
             worker_id=worker.db_id,
         )
-        comparator = shared_state_qualification["comparator"]
-        compare_value = shared_state_qualification["value"]
-
-        if comparator == QUAL_EXISTS and not granted_qualifications:
-            return False
-        elif comparator == QUAL_NOT_EXIST and granted_qualifications:
-            return False
-        elif comparator in [QUAL_EXISTS, QUAL_NOT_EXIST]:
-            continue
-        else:
-            if not granted_qualifications:
-                return False
 
-            granted_qualification = granted_qualifications[0]
-            if not COMPARATOR_OPERATIONS[comparator](granted_qualification.value, compare_value):
+        # 1. Check if provider has `admit_workers_with_no_prior_qualification` setting
+        worker_has_granted_qualifications = len(all_worker_granted_qualifications) > 0
+        task_run_has_qualifications = len(self.shared_state_qualifications) > 0
+        if (
+            task_run_has_qualifications
+            and not worker_has_granted_qualifications
+            and self._get_admit_with_no_prior_qualification()
+        ):
+            # If TaskRun has quelifications and Worker has no granted qualifications,
+            # they should be considered as quailified
+            return True
+
+        # 2. Check Worker's qualification
+        granted_values = {}
+        for granted_qualification in all_worker_granted_qualifications:
+            granted_values.setdefault(
+                granted_qualification.qualification_id, granted_qualification.value
+            )
+
+        for shared_state_qualification in self.shared_state_qualifications:
+            qualification_name = shared_state_qualification["qualification_name"]
+            qualification_id = self._get_qualification_id(qualification_name)
+
+            if qualification_id is None:
+                logger.warning(
+                    f"Expected to create qualification for {qualification_name}, "
+                    f"but none found... skipping."
+                )
+                continue
+
+            is_granted = qualification_id in granted_values
+            comparator = shared_state_qualification["comparator"]
+            compare_value = shared_state_qualification["value"]
+
+            if comparator == QUAL_EXISTS and not is_granted:
+                return False
+            elif comparator == QUAL_NOT_EXIST and is_granted:
                 return False
+            elif comparator in [QUAL_EXISTS, QUAL_NOT_EXIST]:
+                continue
+            else:
+                if not is_granted:
+                    return False
+
+                granted_value = granted_values[qualification_id]
+                if not COMPARATOR_OPERATIONS[comparator](granted_value, compare_value):
+                    return False
+
+        return True
 
-    return True
+
+def worker_is_qualified(
+    worker: "Worker",
+    shared_state_qualifications: List[QualificationType],
+    task_run: Optional["TaskRun"] = None,
+) -> bool:
+    """
+    Return whether the worker meets all of the given qualifications. To check
+    many workers, reuse a QualificationEvaluator instead.
+    """
+    evaluator = QualificationEvaluator(worker.db, shared_state_qualifications, task_run)
+    return evaluator.is_qualified(worker)
 
 
 def as_valid_qualification_dict(qual_dict: Dict[str, Any]) -> Dict[str, Any]:
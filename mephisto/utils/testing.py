@@ -21,6 +21,7 @@ from mephisto.abstractions.databases.local_database import StringIDRow
 from mephisto.abstractions.providers.mock.mock_provider import MockProviderArgs
 from mephisto.data_model.agent import Agent
 from mephisto.data_model.assignment import Assignment
+from mephisto.data_model.constants.assignment_state import AssignmentState
 from mephisto.data_model.requester import Requester
 from mephisto.data_model.task_run import TaskRun
 from mephisto.data_model.task_run import TaskRunArgs
@@ -216,6 +217,53 @@ def make_completed_unit(db: MephistoDB) -> str:
     return unit.db_id
 
 
+def make_completed_units_bulk(
+    db: MephistoDB,
+    task_run: TaskRun,
+    worker_ids: List[str],
+    num_units: int,
+) -> List[str]:
+    """
+    Quickly creates `num_units` COMPLETED units (without agents) for the task run, spread
+    round robin between the workers and over creation dates shared by up to 10 units each
+    """
+    assignment_rows = db.new_assignments_bulk(
+        task_run.task_id,
+        task_run.db_id,
+        task_run.requester_id,
+        task_run.task_type,
+        task_run.provider_type,
+        num_units,
+    )
+    unit_rows = db.new_units_bulk(
+        task_run.task_id,
+        task_run.db_id,
+        task_run.requester_id,
+        [(row["assignment_id"], 0) for row in assignment_rows],
+        0.2,
+        task_run.provider_type,
+        task_run.task_type,
+    )
+    with db.table_access_condition, db.get_connection() as conn:
+        conn.executemany(
+            """
+            UPDATE units
+            SET status = ?, worker_id = ?, creation_date = DATETIME('2024-01-01', ?)
+            WHERE unit_id = ?;
+            """,
+            [
+                (
+                    AssignmentState.COMPLETED,
+                    nonesafe_int(worker_ids[i % len(worker_ids)]),
+                    f"+{i // 10} seconds",
+                    nonesafe_int(row["unit_id"]),
+                )
+                for i, row in enumerate(unit_rows)
+            ],
+        )
+    return [row["unit_id"] for row in unit_rows]
+
+
 def get_test_qualification(db: MephistoDB, name: str = "test_qualification") -> str:
     return db.make_qualification(name)
 
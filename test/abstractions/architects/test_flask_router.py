@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+
+# Copyright (c) Meta Platforms and its affiliates.
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+import json
+import unittest
+import zlib
+from unittest import mock
+
+import gevent
+
+from mephisto.abstractions.architects.router.flask import mephisto_flask_blueprint
+from mephisto.abstractions.architects.router.flask.mephisto_flask_blueprint import (
+    MephistoRouter,
+)
+from mephisto.abstractions.architects.router.flask.mephisto_flask_blueprint import (
+    PACKET_TYPE_AGENT_DETAILS,
+)
+from mephisto.abstractions.architects.router.flask.mephisto_flask_blueprint import (
+    PACKET_TYPE_ALIVE,
+)
+from mephisto.abstractions.architects.router.flask.mephisto_flask_blueprint import (
+    PACKET_TYPE_HEARTBEAT,
+)
+from mephisto.abstractions.architects.router.flask.mephisto_flask_blueprint import (
+    PACKET_TYPE_REGISTER_AGENT,
+)
+from mephisto.abstractions.architects.router.flask.mephisto_flask_blueprint import (
+    SYSTEM_CHANNEL_ID,
+)
+from mephisto.scripts.benchmarks.request_agent import run_request_agent_benchmark
+
+
+class TestFlaskRouterAgentRequests(unittest.TestCase):
+    """Unit testing for awaiting agent requests made through the Flask router"""
+
+    def setUp(self) -> None:
+        self.router = MephistoRouter(mock.MagicMock())
+        self.mephisto_socket = self.router.mephisto_state.mephisto_socket = mock.MagicMock()
+        self.mephisto_socket.closed = False
+
+    def tearDown(self) -> None:
+        mephisto_flask_blueprint.mephisto_router_state = None
+        mephisto_flask_blueprint.mephisto_router_app = None
+
+    def _make_request_packet(self, request_id: str) -> dict:
+        return {
+            "packet_type": PACKET_TYPE_REGISTER_AGENT,
+            "subject_id": request_id,
+            "data": {"provider_data": {}, "request_id": request_id},
+        }
+
+    def _respond(self, request_id: str) -> None:
+        self.router.on_message(
+            json.dumps(
+                {
+                    "packet_type": PACKET_TYPE_AGENT_DETAILS,
+                    "subject_id": request_id,
+                    "data": {"request_id": request_id, "agent_id": f"agent_{request_id}"},
+                }
+            )
+        )
+
+    def test_responses_wake_their_requests(self) -> None:
+        requests = [
+            gevent.spawn(self.router.make_agent_request, self._make_request_packet(f"req_{idx}"))
+            for idx in range(3)
+        ]
+        gevent.sleep(0)
+        self.assertEqual(self.mephisto_socket.send.call_count, 3)
+        # Answered out of order, each request gets its own response
+        for idx in [2, 0, 1]:
+            gevent.spawn_later(0.01 * idx, self._respond, f"req_{idx}")
+        gevent.joinall(requests, timeout=5)
+        self.assertEqual(
+            [request.value["data"]["agent_id"] for request in requests],
+            ["agent_req_0", "agent_req_1", "agent_req_2"],
+        )
+        self.assertEqual(self.router.mephisto_state.pending_agent_requests, {})
+
+    def test_unanswered_request_times_out(self) -> None:
+        with mock.patch.object(mephisto_flask_blueprint, "AGENT_REQUEST_TIMEOUT", 0.05):
+            self.assertIsNone(self.router.make_agent_request(self._make_request_packet("req")))
+        self.assertEqual(self.router.mephisto_state.pending_agent_requests, {})
+        # A late response is dropped
+        self._respond("req")
+
+    def test_request_agent_benchmark(self) -> None:
+        result = run_request_agent_benchmark(num_requests=20, response_delay=0.1)
+        self.assertEqual(result["num_requests"], 20)
+        self.assertGreaterEqual(result["p99_latency"], result["p50_latency"])
+        self.assertGreaterEqual(result["p50_latency"], 0.1)
+
+
+class TestFlaskRouterBatching(unittest.TestCase):
+    """Unit testing for batched frames between Mephisto and the Flask router"""
+
+    def setUp(self) -> None:
+        self.ws = mock.MagicMock()
+        self.ws.closed = False
+        self.router = MephistoRouter(self.ws)
+        self.ws.handler.active_client.ws = self.ws
+
+    def tearDown(self) -> None:
+        mephisto_flask_blueprint.mephisto_router_state = None
+        mephisto_flask_blueprint.mephisto_router_app = None
+
+    def _send_alive(self, data: dict) -> None:
+        self.router.on_message(
+            json.dumps(
+                {"packet_type": PACKET_TYPE_ALIVE, "subject_id": SYSTEM_CHANNEL_ID, "data": data}
+            )
+        )
+
+    def _heartbeat(self, agent_id: str) -> dict:
+        return {"packet_type": PACKET_TYPE_HEARTBEAT, "subject_id": agent_id, "data": {}}
+
+    def test_no_batching_without_offer(self) -> None:
+        self._send_alive({})
+        self.ws.send.assert_not_called()
+        self.router._send_message(self.ws, self._heartbeat("agent"))
+        self.assertEqual(json.loads(self.ws.send.call_args[0][0])["subject_id"], "agent")
+
+    def test_batched_frames(self) -> None:
+        self._send_alive({"batching": {"window": 0.01, "compression": "zlib"}})
+        ack = json.loads(self.ws.send.call_args[0][0])
+        self.assertEqual(ack["packet_type"], PACKET_TYPE_ALIVE)
+        self.assertEqual(ack["data"]["batching"], {"window": 0.01, "compression": "zlib"})
+        self.ws.send.reset_mock()
+
+        # Outgoing packets to Mephisto within the window go out as one compressed frame
+        for idx in range(3):
+            self.router._send_message(self.ws, self._heartbeat(f"agent_{idx}"))
+        self.ws.send.assert_not_called()
+        gevent.sleep(0.05)
+        self.assertEqual(self.ws.send.call_count, 1)
+        frame = self.ws.send.call_args[0][0]
+        self.assertTrue(self.ws.send.call_args[1]["binary"])
+        packets = json.loads(zlib.decompress(frame))
+        self.assertEqual([p["subject_id"] for p in packets], ["agent_0", "agent_1", "agent_2"])
+
+        # Incoming batches are unpacked, whether compressed or not
+        with mock.patch.object(self.router, "_handle_packet") as handle_packet:
+            batch = [self._heartbeat("agent_0"), self._heartbeat("agent_1")]
+            self.router.on_message(json.dumps(batch))
+            self.router.on_message(zlib.compress(json.dumps(batch).encode()))
+        self.assertEqual(handle_packet.call_count, 4)
+
+        # Reconnecting without an offer turns batching off again
+        self._send_alive({})
+        self.ws.send.reset_mock()
+        self.router._send_message(self.ws, self._heartbeat("agent"))
+        self.assertEqual(self.ws.send.call_count, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+
+# Copyright (c) Meta Platforms and its affiliates.
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+import asyncio
+import json
+import threading
+import time
+import unittest
+import zlib
+from typing import List
+from typing import Union
+
+import websockets
+
+from mephisto.abstractions.architects.channels.websocket_channel import pack_packets
+from mephisto.abstractions.architects.channels.websocket_channel import unpack_frame
+from mephisto.abstractions.architects.channels.websocket_channel import WebsocketChannel
+from mephisto.data_model.packet import Packet
+from mephisto.data_model.packet import PACKET_TYPE_ALIVE
+from mephisto.data_model.packet import PACKET_TYPE_MEPHISTO_BOUND_LIVE_UPDATE
+from mephisto.data_model.packet import PACKET_TYPE_REQUEST_STATUSES
+from mephisto.operations.client_io_handler import SYSTEM_CHANNEL_ID
+
+NUM_PACKETS = 20
+
+
+class FakeRouter:
+    """
+    Websocket server standing in for a router, recording the frames it gets.
+    Answers batching offers only if `supports_batching` is set.
+    """
+
+    def __init__(self, supports_batching: bool):
+        self.supports_batching = supports_batching
+        self.frames: List[Union[str, bytes]] = []
+        self.port = 0
+        self._ready = threading.Event()
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        self._ready.wait()
+
+    def _run(self) -> None:
+        asyncio.set_event_loop(self._loop)
+        server = self._loop.run_until_complete(websockets.serve(self._handle, "127.0.0.1", 0))
+        self.port = server.sockets[0].getsockname()[1]
+        self._ready.set()
+        self._loop.run_forever()
+        server.close()
+        self._loop.run_until_complete(server.wait_closed())
+
+    async def _handle(self, websocket, path=None) -> None:
+        async for frame in websocket:
+            self.frames.append(frame)
+            for packet in unpack_frame(frame):
+                offer = packet["data"].get("batching")
+                if packet["packet_type"] == PACKET_TYPE_ALIVE and offer is not None:
+                    if self.supports_batching:
+                        await websocket.send(json.dumps({**packet, "data": {"batching": offer}}))
+                    # Send back a compressed batch of live updates
+                    updates = [
+                        Packet(
+                            packet_type=PACKET_TYPE_MEPHISTO_BOUND_LIVE_UPDATE,
+                            subject_id=f"agent_{idx}",
+                        ).to_sendable_dict()
+                        for idx in range(3)
+                    ]
+                    await websocket.send(pack_packets(updates, compress=True))
+
+    def stop(self) -> None:
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+
+
+class TestWebsocketChannelBatching(unittest.TestCase):
+    """Unit testing for batched frames sent and received by the WebsocketChannel"""
+
+    def _open_channel(self, router: FakeRouter) -> WebsocketChannel:
+        self.received: List[Packet] = []
+
+        def on_channel_open(channel_id: str) -> None:
+            channel.enqueue_send(
+                Packet(packet_type=PACKET_TYPE_ALIVE, subject_id=SYSTEM_CHANNEL_ID)
+            )
+
+        channel = WebsocketChannel(
+            "test_channel",
+            on_channel_open=on_channel_open,
+            on_catastrophic_disconnect=lambda channel_id: None,
+            on_message=lambda channel_id, packet: self.received.append(packet),
+            socket_url=f"ws://127.0.0.1:{router.port}/",
+            batch_window=0.05,
+            compress_batches=True,
+        )
+        channel.open()
+        self._wait_for(lambda: len(self.received) == 3)
+        return channel
+
+    def _wait_for(self, condition, timeout: float = 5) -> None:
+        start_time = time.time()
+        while not condition():
+            self.assertLess(time.time() - start_time, timeout, "Timed out waiting")
+            time.sleep(0.01)
+
+    def _send_status_requests(self, channel: WebsocketChannel) -> None:
+        for _ in range(NUM_PACKETS):
+            channel.enqueue_send(
+                Packet(packet_type=PACKET_TYPE_REQUEST_STATUSES, subject_id=SYSTEM_CHANNEL_ID)
+            )
+
+    def test_frames_round_trip(self) -> None:
+        packets = [{"packet_type": "test", "subject_id": str(idx), "data": {}} for idx in range(3)]
+        for compress in [False, True]:
+            self.assertEqual(unpack_frame(pack_packets(packets, compress)), packets)
+            self.assertEqual(unpack_frame(pack_packets(packets[:1], compress)), packets[:1])
+        self.assertIsInstance(pack_packets(packets[:1], False), str)
+        self.assertIsInstance(pack_packets(packets, True), bytes)
+
+    def test_batches_after_router_accepts(self) -> None:
+        router = FakeRouter(supports_batching=True)
+        channel = self._open_channel(router)
+        try:
+            # The batched live updates are all delivered, and the ack isn't passed on
+            self.assertEqual(
+                [packet.subject_id for packet in self.received],
+                ["agent_0", "agent_1", "agent_2"],
+            )
+            self._wait_for(lambda: channel._batching is not None)
+            num_frames = len(router.frames)
+            self._send_status_requests(channel)
+            self._wait_for(lambda: len(router.frames) > num_frames)
+            time.sleep(0.1)
+            batch_frames = router.frames[num_frames:]
+            self.assertEqual(len(batch_frames), 1)
+            self.assertIsInstance(batch_frames[0], bytes)
+            self.assertEqual(len(json.loads(zlib.decompress(batch_frames[0]))), NUM_PACKETS)
+        finally:
+            channel.close()
+            router.stop()
+
+    def test_single_frames_for_older_routers(self) -> None:
+        router = FakeRouter(supports_batching=False)
+        channel = self._open_channel(router)
+        try:
+            self.assertIsNone(channel._batching)
+            num_frames = len(router.frames)
+            self._send_status_requests(channel)
+            self._wait_for(lambda: len(router.frames) == num_frames + NUM_PACKETS)
+            self.assertTrue(all(isinstance(frame, str) for frame in router.frames))
+        finally:
+            channel.close()
+            router.stop()
+
+
+if __name__ == "__main__":
+    unittest.main()
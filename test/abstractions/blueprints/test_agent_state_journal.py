@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+
+# Copyright (c) Meta Platforms and its affiliates.
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from mephisto.abstractions._subcomponents import agent_state
+from mephisto.abstractions.blueprints.parlai_chat.parlai_chat_agent_state import (
+    ParlAIChatAgentState,
+)
+from mephisto.abstractions.blueprints.remote_procedure.remote_procedure_agent_state import (
+    RemoteProcedureAgentState,
+)
+from mephisto.abstractions.databases.local_database import LocalMephistoDB
+from mephisto.data_model.agent import Agent
+from mephisto.scripts.benchmarks.chat_agent_state import run_chat_agent_state_benchmark
+from mephisto.utils.testing import get_test_agent
+
+
+class TestAgentStateJournal(unittest.TestCase):
+    """Unit testing for journaling live updates of ParlAI chat and remote procedure states"""
+
+    def setUp(self) -> None:
+        self.data_dir = tempfile.mkdtemp()
+        self.db = LocalMephistoDB(os.path.join(self.data_dir, "mephisto.db"))
+        self.agent = Agent.get(self.db, get_test_agent(self.db))
+        self.journal_path = os.path.join(self.agent.get_data_dir(), agent_state.JOURNAL_FILE)
+        self.state_path = os.path.join(self.agent.get_data_dir(), "state.json")
+
+    def tearDown(self) -> None:
+        self.db.shutdown()
+        shutil.rmtree(self.data_dir)
+
+    def _send_messages(self, state: ParlAIChatAgentState, num_messages: int) -> None:
+        for idx in range(num_messages):
+            state.update_data({"text": f"message {idx}", "task_data": {}})
+
+    def test_chat_messages_replayed_from_journal(self) -> None:
+        state = ParlAIChatAgentState(self.agent)
+        state.set_init_state({"persona": "test"})
+        self._send_messages(state, 5)
+
+        # Messages are only appended to the journal, not saved in full
+        self.assertEqual(self.db.read_dict(self.state_path)["outputs"]["messages"], [])
+        self.assertEqual(len(self.db.read_dict_lines(self.journal_path)), 5)
+        loaded_state = ParlAIChatAgentState(self.agent)
+        self.assertEqual(loaded_state.messages, state.messages)
+        self.assertEqual(loaded_state.get_init_state(), state.get_init_state())
+
+        # Submitting saves everything and clears the journal
+        state.update_submit({"rating": 5})
+        self.assertEqual(len(self.db.read_dict(self.state_path)["outputs"]["messages"]), 5)
+        self.assertEqual(self.db.read_dict_lines(self.journal_path), [])
+        self.assertEqual(ParlAIChatAgentState(self.agent).get_data(), state.get_data())
+
+    def test_journal_compaction(self) -> None:
+        state = ParlAIChatAgentState(self.agent)
+        state.set_init_state({})
+        num_messages = agent_state.MIN_JOURNAL_COMPACTION_LENGTH + 10
+        self._send_messages(state, num_messages)
+        saved_messages = self.db.read_dict(self.state_path)["outputs"]["messages"]
+        self.assertEqual(len(saved_messages), agent_state.MIN_JOURNAL_COMPACTION_LENGTH)
+        self.assertEqual(len(self.db.read_dict_lines(self.journal_path)), 10)
+        self.assertEqual(len(ParlAIChatAgentState(self.agent).messages), num_messages)
+
+    def test_interrupted_writes(self) -> None:
+        state = ParlAIChatAgentState(self.agent)
+        state.set_init_state({})
+        self._send_messages(state, 3)
+        journal_text = self.db.read_text(self.journal_path)
+
+        # A save that wasn't followed by the journal being cleared replays nothing twice
+        state.save_data()
+        self.db.write_text(self.journal_path, journal_text + '{"index": 3, "mess')
+        loaded_state = ParlAIChatAgentState(self.agent)
+        self.assertEqual(loaded_state.messages, state.messages)
+
+        # The partial line of an interrupted append is dropped
+        loaded_state.update_data({"text": "after restart", "task_data": {}})
+        self.assertEqual(len(ParlAIChatAgentState(self.agent).messages), 4)
+
+    def test_remote_procedure_requests_journaled(self) -> None:
+        state = RemoteProcedureAgentState(self.agent)
+        state.set_init_state({})
+        state.update_data({"request_id": "req_1", "target": "query", "args": "{}"})
+        state.update_data({"handles": "req_1", "response": '{"answer": 1}'})
+        self.assertEqual(len(self.db.read_dict_lines(self.journal_path)), 2)
+
+        loaded_state = RemoteProcedureAgentState(self.agent)
+        self.assertEqual(loaded_state.get_init_state(), state.get_init_state())
+        self.assertEqual(len(loaded_state.requests), 2)
+
+    def test_chat_agent_state_benchmark(self) -> None:
+        full_save = run_chat_agent_state_benchmark(50, journal=False)
+        journal = run_chat_agent_state_benchmark(50, journal=True)
+        self.assertEqual(journal["num_turns"], 50)
+        self.assertLess(journal["live_bytes_written"], full_save["live_bytes_written"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+
+# Copyright (c) Meta Platforms and its affiliates.
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+import csv
+import json
+import os
+import shutil
+import tempfile
+import types
+import unittest
+from unittest import mock
+
+from omegaconf import OmegaConf
+
+from mephisto.abstractions.blueprints.abstract.static_task import static_data_source
+from mephisto.abstractions.blueprints.abstract.static_task.static_blueprint import (
+    DATA_INDEX_FILENAME,
+)
+from mephisto.abstractions.blueprints.abstract.static_task.static_blueprint import (
+    SharedStaticTaskState,
+)
+from mephisto.abstractions.blueprints.abstract.static_task.static_data_source import (
+    StaticDataSource,
+)
+from mephisto.abstractions.blueprints.static_html_task.static_html_blueprint import (
+    StaticHTMLBlueprint,
+)
+from mephisto.abstractions.blueprints.static_html_task.static_html_blueprint import (
+    StaticHTMLBlueprintArgs,
+)
+from mephisto.abstractions.databases.local_database import LocalMephistoDB
+from mephisto.data_model.task_run import TaskRun
+from mephisto.operations.task_launcher import GeneratorType
+from mephisto.operations.task_launcher import TaskLauncher
+from mephisto.utils.testing import get_test_task_run
+
+NUM_RECORDS = 25
+
+RECORDS = [
+    {"text": f'Row {idx}, with "quotes" and ünïcödé', "idx": str(idx)} for idx in range(NUM_RECORDS)
+]
+
+
+class TestStaticDataSource(unittest.TestCase):
+    def setUp(self):
+        self.data_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.data_dir, ignore_errors=True)
+
+    def _write_data_files(self):
+        csv_path = os.path.join(self.data_dir, "data.csv")
+        with open(csv_path, "w", encoding="utf-8-sig", newline="") as csv_fp:
+            writer = csv.writer(csv_fp)
+            writer.writerow(["text", "idx"])
+            for record in RECORDS:
+                writer.writerow([record["text"], record["idx"]])
+        json_path = os.path.join(self.data_dir, "data.json")
+        with open(json_path, "w", encoding="utf-8") as json_fp:
+            json.dump(RECORDS, json_fp, indent=2, ensure_ascii=False)
+        jsonl_path = os.path.join(self.data_dir, "data.jsonl")
+        with open(jsonl_path, "w", encoding="utf-8") as jsonl_fp:
+            for record in RECORDS:
+                jsonl_fp.write(json.dumps(record, ensure_ascii=False) + "\n\n")
+        return {"csv": csv_path, "json": json_path, "jsonl": jsonl_path}
+
+    def test_streams_all_formats(self):
+        """Every format should stream the same records a full load would give"""
+        # Small reads so that records get split across chunks of the JSON file
+        with mock.patch.object(static_data_source, "JSON_READ_CHUNK_SIZE", 7):
+            for data_format, path in self._write_data_files().items():
+                data_source = StaticDataSource(path, data_format)
+                self.assertEqual(list(data_source), RECORDS, data_format)
+                self.assertEqual(data_source.first_record(), RECORDS[0], data_format)
+                self.assertEqual(
+                    list(data_source.iter_records(start_row=20)), RECORDS[20:], data_format
+                )
+
+    def test_multiline_csv_fields(self):
+        """Quoted csv values may span lines"""
+        path = os.path.join(self.data_dir, "multiline.csv")
+        with open(path, "w", newline="") as csv_fp:
+            writer = csv.writer(csv_fp)
+            writer.writerow(["text"])
+            writer.writerows([["first\nsecond"], ["third"]])
+        data_source = StaticDataSource(path, "csv")
+        self.assertEqual(list(data_source), [{"text": "first\nsecond"}, {"text": "third"}])
+
+    def test_empty_files(self):
+        """Empty data files have no first record"""
+        contents = {"csv": "", "json": "[ ]", "jsonl": "\n"}
+        for data_format, content in contents.items():
+            path = os.path.join(self.data_dir, f"empty.{data_format}")
+            with open(path, "w") as data_fp:
+                data_fp.write(content)
+            self.assertIsNone(StaticDataSource(path, data_format).first_record())
+
+    def test_json_must_be_list(self):
+        path = os.path.join(self.data_dir, "object.json")
+        with open(path, "w") as json_fp:
+            json.dump({"text": "not a list"}, json_fp)
+        with self.assertRaises(ValueError):
+            StaticDataSource(path, "json").first_record()
+
+    def test_offset_index(self):
+        """Rows should be indexed while streaming, and used to skip ahead later"""
+        index_path = os.path.join(self.data_dir, "index", DATA_INDEX_FILENAME)
+        for data_format, path in self._write_data_files().items():
+            if os.path.exists(index_path):
+                os.remove(index_path)
+            data_source = StaticDataSource(path, data_format, index_path, index_stride=10)
+            self.assertEqual(list(data_source.iter_records()), RECORDS)
+            self.assertEqual(data_source.get_indexed_rows(), [0, 10, 20])
+
+            # A new source reuses the index, seeking past the earlier rows
+            data_source = StaticDataSource(path, data_format, index_path, index_stride=10)
+            self.assertEqual(data_source.get_indexed_rows(), [0, 10, 20])
+            with mock.patch.object(
+                data_source, "_iter_from_offset", wraps=data_source._iter_from_offset
+            ) as iter_from_offset:
+                self.assertEqual(list(data_source.iter_records(start_row=23)), RECORDS[23:])
+            self.assertIsNotNone(iter_from_offset.call_args[0][0])
+
+            # Changing the data file invalidates the index
+            with open(path, "a") as data_fp:
+                data_fp.write("\n")
+            data_source = StaticDataSource(path, data_format, index_path, index_stride=10)
+            self.assertEqual(data_source.get_indexed_rows(), [])
+
+
+class TestStaticBlueprintDataLoading(unittest.TestCase):
+    def setUp(self):
+        self.data_dir = tempfile.mkdtemp()
+        self.db = LocalMephistoDB(os.path.join(self.data_dir, "mephisto.db"))
+        self.task_run = TaskRun.get(self.db, get_test_task_run(self.db))
+        self.html_path = os.path.join(self.data_dir, "task.html")
+        with open(self.html_path, "w") as html_fp:
+            html_fp.write("<div>${text}</div>")
+        self.jsonl_path = os.path.join(self.data_dir, "data.jsonl")
+        with open(self.jsonl_path, "w") as jsonl_fp:
+            for record in RECORDS:
+                jsonl_fp.write(json.dumps(record) + "\n")
+
+    def tearDown(self):
+        self.db.shutdown()
+        shutil.rmtree(self.data_dir, ignore_errors=True)
+
+    def _get_args(self, data_path: str, **kwargs):
+        blueprint_args = StaticHTMLBlueprintArgs(
+            task_source=self.html_path,
+            data_jsonl=data_path,
+            **kwargs,
+        )
+        return OmegaConf.create({"blueprint": OmegaConf.structured(blueprint_args)})
+
+    def test_assert_task_args_reads_first_record(self):
+        args = self._get_args(self.jsonl_path)
+        shared_state = SharedStaticTaskState()
+        with mock.patch.object(static_data_source.json, "loads", wraps=json.loads) as loads:
+            StaticHTMLBlueprint.assert_task_args(args, shared_state)
+        self.assertEqual(loads.call_count, 1)
+
+        empty_path = os.path.join(self.data_dir, "empty.jsonl")
+        open(empty_path, "w").close()
+        with self.assertRaises(AssertionError):
+            StaticHTMLBlueprint.assert_task_args(self._get_args(empty_path), shared_state)
+
+    def test_streamed_assignments(self):
+        """File data is generated lazily, and every row becomes an assignment"""
+        args = self._get_args(self.jsonl_path)
+        blueprint = StaticHTMLBlueprint(self.task_run, args, SharedStaticTaskState())
+        initialization_data = blueprint.get_initialization_data()
+        self.assertIsInstance(initialization_data, types.GeneratorType)
+
+        launcher = TaskLauncher(self.db, self.task_run, initialization_data)
+        self.assertEqual(launcher.generator_type, GeneratorType.ASSIGNMENT)
+        launcher.create_assignments()
+        assert launcher.assignments_thread is not None
+        launcher.assignments_thread.join()
+        self.assertTrue(launcher.get_assignments_are_all_created())
+        self.assertEqual(
+            [a.get_assignment_data().shared for a in launcher.assignments],
+            [dict(record, html="task.html") for record in RECORDS],
+        )
+
+    def test_resumed_assignments(self):
+        """A resumed run creates assignments for the rows it hadn't reached, seeking to them"""
+        args = self._get_args(self.jsonl_path, data_index_stride=10)
+        blueprint = StaticHTMLBlueprint(self.task_run, args, SharedStaticTaskState())
+        initialization_data = blueprint.get_initialization_data()
+        launcher = TaskLauncher(self.db, self.task_run, initialization_data)
+        # The run stops after creating part of the data
+        launcher._create_assignments([next(initialization_data) for _ in range(12)])
+        self.assertTrue(
+            os.path.exists(os.path.join(self.task_run.get_run_dir(), DATA_INDEX_FILENAME))
+        )
+
+        blueprint = StaticHTMLBlueprint(self.task_run, args, SharedStaticTaskState())
+        launcher = TaskLauncher(self.db, self.task_run, blueprint.get_initialization_data())
+        iter_from_offset = StaticDataSource._iter_from_offset
+        with mock.patch.object(
+            StaticDataSource, "_iter_from_offset", autospec=True, side_effect=iter_from_offset
+        ) as mock_iter_from_offset:
+            launcher.resume_assignments(blueprint.get_resumed_initialization_data())
+            assert launcher.assignments_thread is not None
+            launcher.assignments_thread.join()
+        # Reading resumed from the indexed offset of row 10, rather than from the start
+        self.assertIsNotNone(mock_iter_from_offset.call_args[0][1])
+        self.assertEqual(
+            [a.get_assignment_data().shared["idx"] for a in launcher.assignments],
+            [record["idx"] for record in RECORDS],
+        )
+        self.assertEqual(len(self.db.find_assignments(task_run_id=self.task_run.db_id)), 25)
+
+    def test_other_task_data_not_resumed(self):
+        args = OmegaConf.create(
+            {"blueprint": OmegaConf.structured(StaticHTMLBlueprintArgs(task_source=self.html_path))}
+        )
+        shared_state = SharedStaticTaskState(static_task_data=RECORDS)
+        blueprint = StaticHTMLBlueprint(self.task_run, args, shared_state)
+        self.assertIsNone(blueprint.get_resumed_initialization_data())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -8,9 +8,19 @@ import unittest
 import shutil
 import os
 import tempfile
+import threading
+from unittest import mock
 
 from mephisto.abstractions.test.data_model_database_tester import BaseDatabaseTests
 from mephisto.abstractions.databases.local_database import LocalMephistoDB
+from mephisto.data_model.assignment import Assignment
+from mephisto.data_model.task_run import TaskRun
+from mephisto.scripts.benchmarks.register_worker import run_register_worker_benchmark
+from mephisto.utils.db import EntryAlreadyExistsException
+from mephisto.utils.testing import get_test_assignment
+from mephisto.utils.testing import get_test_task_run
+from mephisto.utils.testing import get_test_unit
+from mephisto.utils.testing import get_test_worker
 
 
 class TestLocalMephistoDB(BaseDatabaseTests):
@@ -35,5 +45,131 @@ class TestLocalMephistoDB(BaseDatabaseTests):
     # TODO(#97) are there any other unit tests we'd like to have?
 
 
+class TestLocalMephistoDBWAL(BaseDatabaseTests):
+    """
+    Unit testing for the LocalMephistoDB running in WAL mode, with pooled
+    readers and a single writer connection
+    """
+
+    is_base = False
+
+    def setUp(self):
+        self.data_dir = tempfile.mkdtemp()
+        database_path = os.path.join(self.data_dir, "mephisto.db")
+        self.db = LocalMephistoDB(database_path, use_wal=True, read_pool_size=4)
+
+    def tearDown(self):
+        self.db.shutdown()
+        shutil.rmtree(self.data_dir)
+
+    def test_journal_mode_is_wal(self) -> None:
+        with self.db.table_access_condition, self.db.get_connection() as conn:
+            journal_mode = conn.execute("PRAGMA journal_mode;").fetchone()["journal_mode"]
+        self.assertEqual(journal_mode, "wal")
+
+    def test_reads_do_not_wait_for_writer_lock(self) -> None:
+        worker_name, _ = get_test_worker(self.db)
+        found_workers = []
+
+        def find_worker():
+            found_workers.extend(self.db.find_workers(worker_name=worker_name))
+
+        with self.db.table_access_condition:
+            reader = threading.Thread(target=find_worker)
+            reader.start()
+            reader.join(timeout=5)
+            self.assertFalse(reader.is_alive(), "Read blocked on the writer lock")
+
+        self.assertEqual(len(found_workers), 1)
+
+    def test_concurrent_reads_and_writes(self) -> None:
+        num_threads = 16
+        errors = []
+
+        def create_and_find_worker(idx: int):
+            try:
+                worker_name = f"worker_{idx}"
+                worker_id = self.db.new_worker(worker_name, "mock")
+                workers = self.db.find_workers(worker_name=worker_name)
+                assert [w.db_id for w in workers] == [worker_id]
+                assert self.db.get_worker(worker_id)["worker_name"] == worker_name
+            except Exception as e:
+                errors.append(e)
+
+        threads = [
+            threading.Thread(target=create_and_find_worker, args=(idx,))
+            for idx in range(num_threads)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        self.assertEqual(len(self.db.find_workers()), num_threads)
+        self.assertLessEqual(len(self.db._read_conns), 4)
+
+
+class TestLocalMephistoDBBulkInserts(unittest.TestCase):
+    def setUp(self):
+        self.data_dir = tempfile.mkdtemp()
+        database_path = os.path.join(self.data_dir, "mephisto.db")
+        self.db = LocalMephistoDB(database_path)
+
+    def tearDown(self):
+        self.db.shutdown()
+        shutil.rmtree(self.data_dir)
+
+    def test_failed_bulk_insert_creates_nothing(self) -> None:
+        assignment = Assignment.get(self.db, get_test_assignment(self.db))
+        get_test_unit(self.db, 1, assignment)
+
+        with self.assertRaises(EntryAlreadyExistsException):
+            self.db.new_units_bulk(
+                assignment.task_id,
+                assignment.task_run_id,
+                assignment.requester_id,
+                [(assignment.db_id, 0), (assignment.db_id, 1), (assignment.db_id, 2)],
+                15.0,
+                assignment.provider_type,
+                assignment.task_type,
+            )
+        units = self.db.find_units(assignment_id=assignment.db_id)
+        self.assertEqual([u.unit_index for u in units], [1])
+
+    def test_bulk_insert_retries_id_collisions(self) -> None:
+        task_run = TaskRun.get(self.db, get_test_task_run(self.db))
+        existing_id = get_test_assignment(self.db, task_run)
+        generated_ids = iter([int(existing_id), 1, 2, 3])
+
+        with mock.patch(
+            "mephisto.abstractions.databases.local_database.make_randomized_int_id",
+            side_effect=lambda: next(generated_ids),
+        ):
+            assignment_rows = self.db.new_assignments_bulk(
+                task_run.task_id,
+                task_run.db_id,
+                task_run.requester_id,
+                task_run.task_type,
+                task_run.provider_type,
+                2,
+            )
+        self.assertEqual([r["assignment_id"] for r in assignment_rows], ["2", "3"])
+        self.assertEqual(len(self.db.find_assignments(task_run_id=task_run.db_id)), 3)
+
+
+class TestRegisterWorkerBenchmark(unittest.TestCase):
+    def test_register_worker_benchmark(self) -> None:
+        for use_wal in [False, True]:
+            result = run_register_worker_benchmark(
+                use_wal=use_wal,
+                num_workers=10,
+                num_qualifications=2,
+                executor_threads=4,
+            )
+            self.assertEqual(result["num_assigned"], 10)
+            self.assertGreater(result["registrations_per_second"], 0)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -4,13 +4,36 @@
 # This source code is licensed under the MIT license found in the
 # LICENSE file in the root directory of this source tree.
 
+import gc
 import unittest
 import shutil
 import os
 import tempfile
+import time
+from typing import List
+from unittest import mock
 
+from prometheus_client import REGISTRY
+
+from mephisto.abstractions.database import MephistoDB
 from mephisto.abstractions.test.data_model_database_tester import BaseDatabaseTests
+from mephisto.abstractions.databases.entity_cache import EntityCache
+from mephisto.abstractions.databases.entity_cache import EntityIndex
+from mephisto.abstractions.databases.local_database import LocalMephistoDB
 from mephisto.abstractions.databases.local_singleton_database import MephistoSingletonDB
+from mephisto.data_model.agent import Agent
+from mephisto.data_model.agent import AgentState
+from mephisto.data_model.assignment import Assignment
+from mephisto.data_model.assignment import AssignmentState
+from mephisto.data_model.task_run import TaskRun
+from mephisto.data_model.unit import Unit
+from mephisto.data_model.worker import Worker
+from mephisto.utils.testing import get_test_assignment
+from mephisto.utils.testing import get_test_requester
+from mephisto.utils.testing import get_test_task
+from mephisto.utils.testing import get_test_task_run
+from mephisto.utils.testing import get_test_unit
+from mephisto.utils.testing import get_test_worker
 
 
 class TestMephistoSingletonDB(BaseDatabaseTests):
@@ -35,5 +58,385 @@ class TestMephistoSingletonDB(BaseDatabaseTests):
     # TODO(#97) are there any other unit tests we'd like to have?
 
 
+class TestMephistoSingletonDBWAL(BaseDatabaseTests):
+    """
+    Unit testing for the MephistoSingletonDB running in WAL mode
+    """
+
+    is_base = False
+
+    def setUp(self):
+        self.data_dir = tempfile.mkdtemp()
+        database_path = os.path.join(self.data_dir, "mephisto.db")
+        self.db = MephistoSingletonDB(database_path, use_wal=True)
+
+    def tearDown(self):
+        self.db.shutdown()
+        shutil.rmtree(self.data_dir)
+
+
+class _Entity:
+    """Weak-referenceable stand-in for a data model object"""
+
+    def __init__(self, db_id: str):
+        self.db_id = db_id
+
+
+class TestEntityCache(unittest.TestCase):
+    def test_size_bound_evicts_least_recently_used(self) -> None:
+        cache = EntityCache("TestEntitySize", max_size=2)
+        cache.put("1", _Entity("1"))
+        cache.put("2", _Entity("2"))
+        self.assertIsNotNone(cache.get("1"))
+        cache.put("3", _Entity("3"))
+        gc.collect()
+
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.evictions, 1)
+        self.assertIsNotNone(cache.get("1"))
+        self.assertIsNone(cache.get("2"))
+        self.assertIsNotNone(cache.get("3"))
+        self.assertEqual(cache.hits, 3)
+        self.assertEqual(cache.misses, 1)
+
+    def test_age_bound_evicts_stale_entries(self) -> None:
+        cache = EntityCache("TestEntityAge", max_size=None, max_age=0.05)
+        cache.put("1", _Entity("1"))
+        time.sleep(0.1)
+        cache.put("2", _Entity("2"))
+        gc.collect()
+
+        self.assertEqual(len(cache), 1)
+        self.assertIsNone(cache.get("1"))
+        self.assertIsNotNone(cache.get("2"))
+
+    def test_referenced_entries_stay_pinned(self) -> None:
+        cache = EntityCache("TestEntityPinned", max_size=1)
+        pinned = _Entity("1")
+        cache.put("1", pinned)
+        cache.put("2", _Entity("2"))
+        gc.collect()
+
+        self.assertEqual(len(cache), 1)
+        self.assertIs(cache.get("1"), pinned)
+
+    def test_metrics_are_exported(self) -> None:
+        cache = EntityCache("TestEntityMetrics", max_size=1)
+        cache.put("1", _Entity("1"))
+        cache.get("1")
+        cache.get("2")
+        labels = {"entity": "TestEntityMetrics"}
+        self.assertEqual(
+            REGISTRY.get_sample_value(
+                "singleton_db_cache_lookups_total", {**labels, "result": "hit"}
+            ),
+            1,
+        )
+        self.assertEqual(
+            REGISTRY.get_sample_value(
+                "singleton_db_cache_lookups_total", {**labels, "result": "miss"}
+            ),
+            1,
+        )
+        self.assertEqual(REGISTRY.get_sample_value("singleton_db_cache_size", labels), 1)
+
+
+class TestMephistoSingletonDBCacheBounds(unittest.TestCase):
+    def setUp(self):
+        self.data_dir = tempfile.mkdtemp()
+        database_path = os.path.join(self.data_dir, "mephisto.db")
+        self.db = MephistoSingletonDB(database_path, cache_max_size=5)
+
+    def tearDown(self):
+        self.db.shutdown()
+        shutil.rmtree(self.data_dir)
+
+    def test_worker_cache_is_bounded(self) -> None:
+        pinned_worker = Worker.get(self.db, self.db.new_worker("pinned_worker", "mock"))
+        for idx in range(20):
+            Worker.get(self.db, self.db.new_worker(f"worker_{idx}", "mock"))
+        gc.collect()
+
+        worker_cache = self.db._singleton_cache[Worker]
+        self.assertEqual(len(worker_cache), 5)
+        self.assertGreater(worker_cache.evictions, 0)
+        # Objects still referenced elsewhere keep their singleton identity
+        self.assertIs(Worker.get(self.db, pinned_worker.db_id), pinned_worker)
+        # Evicted objects are transparently loaded again
+        self.assertEqual(len(self.db.find_workers()), 21)
+
+    def test_evicted_units_loaded_in_one_query(self) -> None:
+        task_run = TaskRun.get(self.db, get_test_task_run(self.db))
+        assignment = Assignment.get(self.db, get_test_assignment(self.db, task_run))
+        for idx in range(12):
+            get_test_unit(self.db, idx, assignment)
+        _, worker_id = get_test_worker(self.db)
+        for unit in self.db.find_units(task_run_id=task_run.db_id):
+            self.db.new_agent(
+                worker_id,
+                unit.db_id,
+                task_run.task_id,
+                task_run.db_id,
+                assignment.db_id,
+                task_run.task_type,
+                task_run.provider_type,
+            )
+        self.db.find_agents(worker_id=worker_id)
+        gc.collect()
+        self.assertGreater(self.db._singleton_cache[Unit].evictions, 0)
+        self.assertGreater(self.db._singleton_cache[Agent].evictions, 0)
+
+        statements: List[str] = []
+        self.db.get_connection().set_trace_callback(statements.append)
+        try:
+            units = self.db.find_units(task_run_id=task_run.db_id)
+            agents = self.db.find_agents(worker_id=worker_id)
+        finally:
+            self.db.get_connection().set_trace_callback(None)
+        expected_units = LocalMephistoDB._find_units(self.db, task_run_id=task_run.db_id)
+        self.assertEqual([u.db_id for u in units], [u.db_id for u in expected_units])
+        expected_agents = LocalMephistoDB._find_agents(self.db, worker_id=worker_id)
+        self.assertEqual([a.db_id for a in agents], [a.db_id for a in expected_agents])
+        self.assertEqual(len([q for q in statements if "FROM units" in q]), 1)
+        self.assertEqual(len([q for q in statements if "FROM agents" in q]), 1)
+
+
+class TestEntityIndex(unittest.TestCase):
+    def test_select_by_worker_and_status(self) -> None:
+        index = EntityIndex()
+        index.add("1", None, AssignmentState.LAUNCHED)
+        index.add("2", "w1", AssignmentState.ASSIGNED)
+        index.add("3", "w1", AssignmentState.COMPLETED)
+        index.add("4", None, AssignmentState.LAUNCHED)
+
+        self.assertEqual(index.select(), ["1", "2", "3", "4"])
+        self.assertEqual(index.select(worker_id="w1"), ["2", "3"])
+        self.assertEqual(index.select(status=AssignmentState.LAUNCHED), ["1", "4"])
+        self.assertEqual(
+            index.select(worker_id="w1", status=AssignmentState.ASSIGNED),
+            ["2"],
+        )
+        self.assertEqual(index.select(worker_id="w2"), [])
+
+    def test_updates_move_entries(self) -> None:
+        index = EntityIndex()
+        index.add("1", None, AssignmentState.LAUNCHED)
+        index.add("2", None, AssignmentState.LAUNCHED)
+
+        index.set_worker("2", "w1")
+        index.set_status("2", AssignmentState.ASSIGNED)
+        self.assertEqual(index.select(status=AssignmentState.LAUNCHED), ["1"])
+        self.assertEqual(index.select(worker_id="w1"), ["2"])
+
+        index.set_worker("2", None)
+        index.set_status("2", AssignmentState.LAUNCHED)
+        self.assertEqual(index.select(status=AssignmentState.LAUNCHED), ["1", "2"])
+        self.assertEqual(index.select(worker_id="w1"), [])
+
+        # Entities outside of the index are ignored
+        index.set_status("3", AssignmentState.ASSIGNED)
+        self.assertNotIn("3", index)
+
+
+class TestMephistoSingletonDBIndexes(unittest.TestCase):
+    def setUp(self):
+        self.data_dir = tempfile.mkdtemp()
+        database_path = os.path.join(self.data_dir, "mephisto.db")
+        self.db = MephistoSingletonDB(database_path)
+
+    def tearDown(self):
+        self.db.shutdown()
+        shutil.rmtree(self.data_dir)
+
+    def assert_matches_database(self, **kwargs) -> None:
+        """Compare an indexed query against the same query run in SQL"""
+        indexed = [u.db_id for u in self.db.find_units(**kwargs)]
+        queried = [u.db_id for u in LocalMephistoDB._find_units(self.db, **kwargs)]
+        self.assertEqual(indexed, queried, f"Index diverged for {kwargs}")
+
+    def test_unit_indexes_follow_writes(self) -> None:
+        task_run = TaskRun.get(self.db, get_test_task_run(self.db))
+        assignment = Assignment.get(self.db, get_test_assignment(self.db, task_run))
+        unit_ids = [get_test_unit(self.db, idx, assignment) for idx in range(4)]
+        _, worker_id = get_test_worker(self.db)
+
+        # Load the indexes before any of the writes below
+        self.assertEqual(len(self.db.find_units(task_run_id=task_run.db_id)), 4)
+        self.assertEqual(
+            self.db.find_units(task_id=task_run.task_id, worker_id=worker_id),
+            [],
+        )
+        queries = [
+            {"task_run_id": task_run.db_id},
+            {"task_run_id": task_run.db_id, "status": AssignmentState.LAUNCHED},
+            {"task_run_id": task_run.db_id, "status": AssignmentState.ASSIGNED},
+            {
+                "task_run_id": task_run.db_id,
+                "worker_id": worker_id,
+                "status": AssignmentState.ASSIGNED,
+            },
+            {"task_id": task_run.task_id, "worker_id": worker_id},
+        ]
+
+        for unit_id in unit_ids:
+            Unit.get(self.db, unit_id).set_db_status(AssignmentState.LAUNCHED)
+        agent_id = self.db.new_agent(
+            worker_id,
+            unit_ids[0],
+            task_run.task_id,
+            task_run.db_id,
+            assignment.db_id,
+            task_run.task_type,
+            task_run.provider_type,
+        )
+        self.db.new_agent(
+            worker_id,
+            unit_ids[1],
+            task_run.task_id,
+            task_run.db_id,
+            assignment.db_id,
+            task_run.task_type,
+            task_run.provider_type,
+        )
+        for query in queries:
+            self.assert_matches_database(**query)
+
+        Unit.get(self.db, unit_ids[1]).clear_assigned_agent()
+        self.db.update_unit(unit_ids[0], status=AssignmentState.COMPLETED)
+        get_test_unit(self.db, 4, assignment)
+        for query in queries:
+            self.assert_matches_database(**query)
+
+        self.assertEqual(
+            [a.db_id for a in self.db.find_agents(worker_id=worker_id)],
+            [a.db_id for a in LocalMephistoDB._find_agents(self.db, worker_id=worker_id)],
+        )
+        self.assertEqual(Unit.get(self.db, unit_ids[0]).agent_id, agent_id)
+
+    def test_agent_index_follows_writes(self) -> None:
+        task_run = TaskRun.get(self.db, get_test_task_run(self.db))
+        assignment = Assignment.get(self.db, get_test_assignment(self.db, task_run))
+        unit_ids = [get_test_unit(self.db, idx, assignment) for idx in range(2)]
+        _, worker_id = get_test_worker(self.db)
+        self.assertEqual(self.db.find_agents(worker_id=worker_id), [])
+
+        agent_ids = [
+            self.db.new_agent(
+                worker_id,
+                unit_id,
+                task_run.task_id,
+                task_run.db_id,
+                assignment.db_id,
+                task_run.task_type,
+                task_run.provider_type,
+            )
+            for unit_id in unit_ids
+        ]
+        self.db.update_agent(agent_ids[1], status=AgentState.STATUS_COMPLETED)
+
+        self.assertEqual([a.db_id for a in self.db.find_agents(worker_id=worker_id)], agent_ids)
+        self.assertEqual(
+            [
+                a.db_id
+                for a in self.db.find_agents(
+                    worker_id=worker_id, status=AgentState.STATUS_COMPLETED
+                )
+            ],
+            agent_ids[1:],
+        )
+        self.assertEqual(
+            self.db.find_agents(worker_id=worker_id, status=AgentState.STATUS_NONE)[0].db_id,
+            agent_ids[0],
+        )
+
+    def test_completed_run_index_dropped(self) -> None:
+        task_run = TaskRun.get(self.db, get_test_task_run(self.db))
+        assignment = Assignment.get(self.db, get_test_assignment(self.db, task_run))
+        unit_ids = [get_test_unit(self.db, idx, assignment) for idx in range(2)]
+        self.assertEqual(len(self.db.find_units(task_run_id=task_run.db_id)), 2)
+        self.assertIn(task_run.db_id, self.db._task_run_unit_indexes)
+
+        self.db.update_task_run(task_run.db_id, is_completed=True)
+        self.assertNotIn(task_run.db_id, self.db._task_run_unit_indexes)
+        for unit_id in unit_ids:
+            self.assertNotIn(unit_id, self.db._unit_index_scopes)
+        # Units created outside of any loaded index aren't tracked either
+        self.assertNotIn(get_test_unit(self.db, 2, assignment), self.db._unit_index_scopes)
+
+    def test_unit_indexes_bounded(self) -> None:
+        self.db._index_max_count = 1
+        _, task_id = get_test_task(self.db)
+        _, requester_id = get_test_requester(self.db)
+        task_run_ids = [
+            get_test_task_run(self.db, task_id=task_id, requester_id=requester_id) for _ in range(3)
+        ]
+        unit_ids = []
+        for task_run_id in task_run_ids:
+            task_run = TaskRun.get(self.db, task_run_id)
+            assignment = Assignment.get(self.db, get_test_assignment(self.db, task_run))
+            unit_ids.append(get_test_unit(self.db, 0, assignment))
+            self.assertEqual(len(self.db.find_units(task_run_id=task_run_id)), 1)
+
+        self.assertEqual(list(self.db._task_run_unit_indexes.keys()), task_run_ids[-1:])
+        self.assertEqual(list(self.db._unit_index_scopes.keys()), unit_ids[-1:])
+        # Dropped indexes are loaded again on next use
+        Unit.get(self.db, unit_ids[0]).set_db_status(AssignmentState.LAUNCHED)
+        self.assert_matches_database(task_run_id=task_run_ids[0], status=AssignmentState.LAUNCHED)
+        self.assertEqual(list(self.db._task_run_unit_indexes.keys()), task_run_ids[:1])
+
+    def test_valid_units_lookup_uses_indexes(self) -> None:
+        task_run = TaskRun.get(self.db, get_test_task_run(self.db))
+        assignment = Assignment.get(self.db, get_test_assignment(self.db, task_run))
+        for idx in range(2):
+            unit = Unit.get(self.db, get_test_unit(self.db, idx, assignment))
+            unit.set_db_status(AssignmentState.LAUNCHED)
+        worker = Worker.get(self.db, get_test_worker(self.db)[1])
+
+        task_run.get_valid_units_for_worker(worker)
+        with mock.patch.object(LocalMephistoDB, "_find_units") as find_units:
+            valid_units = task_run.get_valid_units_for_worker(worker)
+            find_units.assert_not_called()
+        self.assertEqual(len(valid_units), 2)
+
+    def test_valid_units_match_full_scan(self) -> None:
+        task_run = TaskRun.get(self.db, get_test_task_run(self.db))
+        _, worker_id = get_test_worker(self.db)
+        assignments = [
+            Assignment.get(self.db, get_test_assignment(self.db, task_run)) for _ in range(4)
+        ]
+        for assignment in assignments:
+            for idx in range(2):
+                unit = Unit.get(self.db, get_test_unit(self.db, idx, assignment))
+                unit.set_db_status(AssignmentState.LAUNCHED)
+        # The worker joined the first assignment, and a special unit isn't valid either
+        worker_unit = assignments[0].get_units()[0]
+        self.db.new_agent(
+            worker_id,
+            worker_unit.db_id,
+            task_run.task_id,
+            task_run.db_id,
+            worker_unit.assignment_id,
+            task_run.task_type,
+            task_run.provider_type,
+        )
+        Unit.get(self.db, get_test_unit(self.db, -1, assignments[1])).set_db_status(
+            AssignmentState.LAUNCHED
+        )
+        worker = Worker.get(self.db, worker_id)
+        expected = MephistoDB._find_launchable_units_for_worker(self.db, task_run.db_id, worker_id)
+        self.assertEqual(len(expected), 6)
+
+        task_run.get_valid_units_for_worker(worker)
+        statements: List[str] = []
+        self.db.get_connection().set_trace_callback(statements.append)
+        try:
+            valid_units = task_run.get_valid_units_for_worker(worker)
+        finally:
+            self.db.get_connection().set_trace_callback(None)
+        self.assertEqual([u.db_id for u in valid_units], [u.db_id for u in expected])
+        # Once loaded, the index answers without going over the run's units in SQL
+        self.assertEqual([q for q in statements if "FROM units" in q], [])
+
+
 if __name__ == "__main__":
     unittest.main()
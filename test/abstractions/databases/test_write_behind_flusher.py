@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+
+# Copyright (c) Meta Platforms and its affiliates.
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+from mephisto.abstractions.blueprints.parlai_chat.parlai_chat_agent_state import (
+    ParlAIChatAgentState,
+)
+from mephisto.abstractions.databases import write_behind_flusher
+from mephisto.abstractions.databases.local_database import LocalMephistoDB
+from mephisto.data_model.agent import Agent
+from mephisto.utils.testing import get_test_agent
+
+
+class TestWriteBehindFlusher(unittest.TestCase):
+    """Unit testing for deferred, coalesced file writes in the LocalMephistoDB"""
+
+    def setUp(self) -> None:
+        self.data_dir = tempfile.mkdtemp()
+        self.db = LocalMephistoDB(
+            os.path.join(self.data_dir, "mephisto.db"),
+            write_behind=True,
+            write_behind_window=0.05,
+        )
+        self.path = os.path.join(self.db.db_root, "files", "state.json")
+        self.disk_writes = []
+        write_file_atomically = write_behind_flusher.write_file_atomically
+
+        def record_write(path: str, contents: str) -> None:
+            self.disk_writes.append((path, contents))
+            write_file_atomically(path, contents)
+
+        patcher = mock.patch.object(write_behind_flusher, "write_file_atomically", record_write)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self) -> None:
+        self.db.shutdown()
+        shutil.rmtree(self.data_dir)
+
+    def _wait_for_disk(self, timeout: float = 5) -> None:
+        start_time = time.time()
+        while not os.path.exists(self.path):
+            self.assertLess(time.time() - start_time, timeout, "Timed out waiting")
+            time.sleep(0.01)
+
+    def test_writes_coalesced_in_background(self) -> None:
+        for idx in range(20):
+            self.db.write_dict(self.path, {"idx": idx})
+        # Queued writes are visible through the database before reaching disk
+        self.assertTrue(self.db.key_exists(self.path))
+        self.assertEqual(self.db.read_dict(self.path), {"idx": 19})
+
+        self._wait_for_disk()
+        self.assertEqual(self.disk_writes, [(self.path, json.dumps({"idx": 19}))])
+        with open(self.path) as data_file:
+            self.assertEqual(json.load(data_file), {"idx": 19})
+        # Only the renamed file is left behind
+        self.assertEqual(os.listdir(os.path.dirname(self.path)), ["state.json"])
+
+    def test_slow_disk_does_not_block_writers(self) -> None:
+        flush_started = threading.Event()
+        release_disk = threading.Event()
+
+        def slow_write(path: str, contents: str) -> None:
+            flush_started.set()
+            release_disk.wait()
+            self.disk_writes.append((path, contents))
+
+        with mock.patch.object(write_behind_flusher, "write_file_atomically", slow_write):
+            self.db.write_text(self.path, "first")
+            self.assertTrue(flush_started.wait(timeout=5))
+            # Writes made while the disk is busy return right away and are readable
+            start_time = time.time()
+            self.db.write_text(self.path, "second")
+            self.assertLess(time.time() - start_time, 0.5)
+            self.assertEqual(self.db.read_text(self.path), "second")
+            release_disk.set()
+            self.db.flush_writes()
+        self.assertEqual(self.disk_writes, [(self.path, "first"), (self.path, "second")])
+
+    def test_flushed_on_submit(self) -> None:
+        agent = Agent.get(self.db, get_test_agent(self.db))
+        state = ParlAIChatAgentState(agent)
+        state.set_init_state({"persona": "test"})
+        with mock.patch.object(write_behind_flusher.WriteBehindFlusher, "_run"):
+            # With no background flushes, only the submit can write the state to disk
+            self.db._file_flusher.shutdown()
+            state.update_data({"text": "hello", "task_data": {}})
+            state.update_submit({"rating": 5})
+        state_path = os.path.join(agent.get_data_dir(), "state.json")
+        with open(state_path) as state_file:
+            self.assertEqual(json.load(state_file)["outputs"]["final_submission"], {"rating": 5})
+
+    def test_flushed_on_shutdown(self) -> None:
+        self.db._file_flusher.window = 60
+        self.db.write_dict(self.path, {"done": True})
+        self.assertFalse(os.path.exists(self.path))
+        self.db.shutdown()
+        with open(self.path) as data_file:
+            self.assertEqual(json.load(data_file), {"done": True})
+        self.db = LocalMephistoDB(os.path.join(self.data_dir, "mephisto.db"))
+
+    def test_failed_writes_requeued_and_raised(self) -> None:
+        self.db._file_flusher.window = 60
+        other_path = os.path.join(self.db.db_root, "files", "other.json")
+        self.db.write_text(self.path, "first")
+        self.db.write_text(other_path, "other")
+        record_write = write_behind_flusher.write_file_atomically
+
+        def fail_first_path(path: str, contents: str) -> None:
+            if path == self.path:
+                raise OSError("Disk full")
+            record_write(path, contents)
+
+        with mock.patch.object(write_behind_flusher, "write_file_atomically", fail_first_path):
+            with self.assertRaises(OSError):
+                self.db.flush_writes()
+        # Other files are still written, and later writes replace the failed ones
+        self.assertEqual(self.disk_writes, [(other_path, "other")])
+        self.assertEqual(self.db.read_text(self.path), "first")
+        self.db.write_text(self.path, "second")
+        self.db.flush_writes()
+        self.assertEqual(self.disk_writes, [(other_path, "other"), (self.path, "second")])
+
+    def test_failing_write_retried_with_backoff(self) -> None:
+        other_path = os.path.join(self.db.db_root, "files", "other.json")
+        record_write = write_behind_flusher.write_file_atomically
+        attempts = []
+
+        def fail_other_path(path: str, contents: str) -> None:
+            if path == other_path:
+                attempts.append(contents)
+                raise OSError("Disk full")
+            record_write(path, contents)
+
+        with mock.patch.object(
+            write_behind_flusher, "write_file_atomically", fail_other_path
+        ), mock.patch.object(write_behind_flusher, "logger") as logger:
+            self.db.write_text(other_path, "other")
+            self.db.write_text(self.path, "contents")
+            self._wait_for_disk()
+            time.sleep(0.6)
+            # Without backoff, the window would allow around a dozen attempts
+            self.assertLess(len(attempts), 6)
+            self.assertEqual(logger.error.call_count, 1)
+        self.assertEqual(self.db.read_text(other_path), "other")
+        self.db.flush_writes()
+        with open(other_path) as data_file:
+            self.assertEqual(data_file.read(), "other")
+
+    def test_flushers_released_on_shutdown(self) -> None:
+        flusher = self.db._file_flusher
+        self.db.write_text(self.path, "contents")
+        self.assertIn(flusher, write_behind_flusher._active_flushers)
+        self.db.shutdown()
+        self.assertNotIn(flusher, write_behind_flusher._active_flushers)
+        self.db = LocalMephistoDB(os.path.join(self.data_dir, "mephisto.db"))
+
+
+if __name__ == "__main__":
+    unittest.main()
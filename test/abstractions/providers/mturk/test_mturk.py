@@ -8,14 +8,36 @@ import unittest
 import shutil
 import os
 import tempfile
+import threading
 import time
 import pytest
+from unittest import mock
+
+from botocore.exceptions import ClientError  # type: ignore
 
 from mephisto.abstractions.databases.local_database import LocalMephistoDB
+from mephisto.abstractions.providers.mturk import mturk_utils
+from mephisto.abstractions.providers.mturk.mturk_datastore import MTurkDatastore
+from mephisto.abstractions.providers.mturk.mturk_launch_pipeline import DEFAULT_LAUNCH_RATE_LIMIT
+from mephisto.abstractions.providers.mturk.mturk_launch_pipeline import MTurkHitLauncher
+from mephisto.abstractions.providers.mturk.mturk_status_sync import MTurkHitStatusSync
+from mephisto.abstractions.providers.mturk.mturk_unit import MTurkUnit
 from mephisto.abstractions.providers.mturk.mturk_worker import MTurkWorker
+from mephisto.abstractions.providers.mturk.mturk_utils import DEFAULT_EXPIRE_CONCURRENCY
+from mephisto.abstractions.providers.mturk.mturk_utils import expire_and_dispose_hits
+from mephisto.abstractions.providers.mturk.mturk_utils import SANDBOX_ENDPOINT
+from mephisto.abstractions.providers.mturk.provider_type import PROVIDER_TYPE
+from mephisto.data_model.assignment import Assignment
+from mephisto.data_model.constants.assignment_state import AssignmentState
+from mephisto.data_model.requester import Requester
+from mephisto.data_model.task_run import TaskRun
 from mephisto.data_model.worker import Worker
+from mephisto.operations.unit_expiration import expire_units
+from mephisto.scripts.benchmarks.expire_units import run_expire_units_benchmark
+from mephisto.scripts.benchmarks.mturk_launch import run_mturk_launch_benchmark
+from mephisto.utils.testing import get_test_task_run
 
-from typing import cast
+from typing import Any, Dict, List, Optional, cast
 
 
 class TestMTurkComponents(unittest.TestCase):
@@ -127,5 +149,593 @@ class TestMTurkComponents(unittest.TestCase):
         self.assertIsNone(datastore.get_qualification_mapping("fake_id"))
 
 
+class StubMTurkClient:
+    """Boto client stand-in serving a fixed set of HITs, two per list_hits page"""
+
+    def __init__(self, hits: List[Dict[str, Any]]):
+        self.hits = hits
+        self.calls: Dict[str, int] = {"list_hits": 0, "get_hit": 0}
+
+    def list_hits(self, MaxResults: int, NextToken: str = "0") -> Dict[str, Any]:
+        self.calls["list_hits"] += 1
+        start = int(NextToken)
+        return {"HITs": self.hits[start : start + 2], "NextToken": str(start + 2)}
+
+    def get_hit(self, HITId: str) -> Dict[str, Any]:
+        self.calls["get_hit"] += 1
+        return {"HIT": next(h for h in self.hits if h["HITId"] == HITId)}
+
+
+def make_hit(hit_id: str, hit_status: str, hit_type_id: str = "test_hit_type"):
+    return {
+        "HITId": hit_id,
+        "HITTypeId": hit_type_id,
+        "HITStatus": hit_status,
+        "NumberOfAssignmentsAvailable": 1 if hit_status == "Assignable" else 0,
+    }
+
+
+class TestMTurkHitStatusSync(unittest.TestCase):
+    """
+    Unit testing for resolving MTurk unit statuses from a snapshot of the run's HITs
+    """
+
+    def setUp(self) -> None:
+        self.data_dir = tempfile.mkdtemp()
+        database_path = os.path.join(self.data_dir, "mephisto.db")
+        self.db = LocalMephistoDB(database_path)
+        self.datastore = cast(MTurkDatastore, self.db.get_datastore_for_provider(PROVIDER_TYPE))
+        requester_id = self.db.new_requester("test_mturk_requester", PROVIDER_TYPE)
+        self.task_run = TaskRun.get(self.db, get_test_task_run(self.db, requester_id=requester_id))
+        self.datastore.register_run(self.task_run.db_id, "test_hit_type", "unused")
+
+    def tearDown(self) -> None:
+        self.db.shutdown()
+        shutil.rmtree(self.data_dir)
+
+    def _make_launched_unit(self, hit_id: str) -> MTurkUnit:
+        task_run = self.task_run
+        assignment_id = self.db.new_assignment(
+            task_run.task_id,
+            task_run.db_id,
+            task_run.requester_id,
+            task_run.task_type,
+            PROVIDER_TYPE,
+        )
+        unit = cast(
+            MTurkUnit, MTurkUnit.new(self.db, Assignment.get(self.db, assignment_id), 0, 1.0)
+        )
+        self.datastore.new_hit(hit_id, "test_link", 600, task_run.db_id)
+        unit.register_from_provider_data(hit_id, f"{hit_id}_assignment")
+        unit.set_db_status(AssignmentState.LAUNCHED)
+        return unit
+
+    def test_sync_pages_through_run_hits(self) -> None:
+        client = StubMTurkClient(
+            [
+                make_hit("hit_1", "Assignable"),
+                make_hit("other_hit", "Assignable", hit_type_id="other_hit_type"),
+                make_hit("hit_2", "Reviewable"),
+                make_hit("older_hit", "Reviewable", hit_type_id="other_hit_type"),
+                make_hit("oldest_hit", "Reviewable"),
+            ]
+        )
+        for hit_id in ["hit_1", "hit_2"]:
+            self.datastore.new_hit(hit_id, "test_link", 600, self.task_run.db_id)
+        snapshot = self.datastore.hit_status_sync.sync_run(client, self.task_run.db_id)
+        self.assertEqual(sorted(snapshot.keys()), ["hit_1", "hit_2"])
+        # Paging stops once all of the run's HITs were found
+        self.assertEqual(client.calls["list_hits"], 2)
+
+    def test_sync_retries_throttled_listing(self) -> None:
+        client = StubMTurkClient([make_hit("hit_1", "Assignable")])
+        self.datastore.new_hit("hit_1", "test_link", 600, self.task_run.db_id)
+        list_hits = client.list_hits
+        throttled_error = ClientError(
+            {"Error": {"Code": "ThrottlingException"}}, operation_name="ListHITs"
+        )
+        with mock.patch.object(
+            client, "list_hits", side_effect=[throttled_error, list_hits(MaxResults=100)]
+        ), mock.patch.object(mturk_utils, "RETRY_BACKOFF_SECONDS", 0.01):
+            snapshot = self.datastore.hit_status_sync.sync_run(client, self.task_run.db_id)
+        self.assertEqual(list(snapshot.keys()), ["hit_1"])
+
+    def test_unit_statuses_from_snapshot(self) -> None:
+        hit_statuses = ["Assignable", "Unassignable", "Reviewable"] * 10
+        hits = [make_hit(f"hit_{idx}", status) for idx, status in enumerate(hit_statuses)]
+        units = [self._make_launched_unit(hit["HITId"]) for hit in hits]
+        client = StubMTurkClient(hits)
+
+        with mock.patch.object(MTurkUnit, "_get_client", return_value=client):
+            statuses = [unit.get_status() for unit in units]
+            expected = {
+                "Assignable": AssignmentState.LAUNCHED,
+                "Unassignable": AssignmentState.ASSIGNED,
+                "Reviewable": AssignmentState.COMPLETED,
+            }
+            self.assertEqual(statuses, [expected[s] for s in hit_statuses])
+            # One paged scan for the whole run, no per-unit lookups
+            self.assertEqual(client.calls["list_hits"], 15)
+            self.assertEqual(client.calls["get_hit"], 0)
+
+            # A HIT mapping changing after the snapshot falls back to a direct lookup
+            units[0].register_from_provider_data("hit_0", "hit_0_new_assignment")
+            self.assertEqual(units[0].get_status(), AssignmentState.LAUNCHED)
+            self.assertEqual(client.calls["list_hits"], 15)
+            self.assertEqual(client.calls["get_hit"], 1)
+
+    def test_untouched_units_use_snapshot(self) -> None:
+        client = StubMTurkClient([make_hit("hit_1", "Unassignable")])
+        self.datastore.new_hit("hit_1", "test_link", 600, self.task_run.db_id)
+        self.datastore.register_assignment_to_hit("hit_1", "unit_1", "hit_1_assignment")
+        # A fresh datastore, as if the mapping was made before a restart
+        datastore = MTurkDatastore(self.datastore.datastore_root)
+
+        hit_data = datastore.hit_status_sync.get_hit_for_unit(
+            client, self.task_run.db_id, "unit_1", "hit_1"
+        )
+        self.assertEqual(hit_data["HITStatus"], "Unassignable")
+        self.assertEqual(client.calls["get_hit"], 0)
+
+    def test_sync_clears_returned_assignments(self) -> None:
+        returned_unit = self._make_launched_unit("hit_1")
+        accepted_unit = self._make_launched_unit("hit_2")
+        client = StubMTurkClient(
+            [make_hit("hit_1", "Assignable"), make_hit("hit_2", "Unassignable")]
+        )
+        hit_status_sync = self.datastore.hit_status_sync
+
+        hit_status_sync.sync_run(client, self.task_run.db_id)
+        self.assertIsNone(returned_unit.get_mturk_assignment_id())
+        self.assertEqual(accepted_unit.get_mturk_assignment_id(), "hit_2_assignment")
+
+        # Mappings registered after MTurk was listed are newer, so they're kept
+        sync_time = time.monotonic()
+        returned_unit.register_from_provider_data("hit_1", "hit_1_new_assignment")
+        cleared_unit_ids, _ = self.datastore.clear_returned_assignments(
+            self.task_run.db_id, ["hit_1"], sync_time
+        )
+        self.assertEqual(cleared_unit_ids, [])
+        self.assertEqual(returned_unit.get_mturk_assignment_id(), "hit_1_new_assignment")
+
+    def test_stale_run_snapshots_dropped(self) -> None:
+        other_task_run_id = get_test_task_run(
+            self.db, task_id=self.task_run.task_id, requester_id=self.task_run.requester_id
+        )
+        other_task_run = TaskRun.get(self.db, other_task_run_id)
+        self.datastore.register_run(other_task_run.db_id, "other_hit_type", "unused")
+        client = StubMTurkClient(
+            [
+                make_hit("hit_1", "Assignable"),
+                make_hit("other_hit", "Assignable", hit_type_id="other_hit_type"),
+            ]
+        )
+        hit_status_sync = MTurkHitStatusSync(self.datastore, sync_interval=0, snapshot_max_age=0.05)
+
+        hit_status_sync.get_hit_for_unit(client, self.task_run.db_id, "unit_1", "hit_1")
+        self.assertEqual(hit_status_sync.snapshots.keys(), [self.task_run.db_id])
+        time.sleep(0.1)
+        hit_status_sync.get_hit_for_unit(client, other_task_run.db_id, "unit_2", "other_hit")
+
+        # The first run's snapshot wasn't used since, so it was dropped
+        self.assertEqual(hit_status_sync.snapshots.keys(), [other_task_run.db_id])
+        self.assertEqual(list(hit_status_sync.snapshots._key_locks.keys()), [other_task_run.db_id])
+
+
+class StubHitExpirationClient(StubMTurkClient):
+    """Boto client stand-in expiring and deleting HITs, throttling the first delete of each"""
+
+    def __init__(self, hits: List[Dict[str, Any]], undeletable_hit_ids: List[str]):
+        super().__init__(hits)
+        self.undeletable_hit_ids = undeletable_hit_ids
+        self.deleted_hit_ids: List[str] = []
+        self.expired_hit_ids: List[str] = []
+        self.throttled_hit_ids: List[str] = []
+        self.num_in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+
+    def _start_call(self) -> None:
+        with self.lock:
+            self.num_in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.num_in_flight)
+        time.sleep(0.01)
+
+    def update_expiration_for_hit(self, HITId: str, ExpireAt: Any) -> None:
+        self._start_call()
+        with self.lock:
+            self.num_in_flight -= 1
+            self.expired_hit_ids.append(HITId)
+
+    def delete_hit(self, HITId: str) -> None:
+        self._start_call()
+        with self.lock:
+            self.num_in_flight -= 1
+            if HITId not in self.throttled_hit_ids:
+                self.throttled_hit_ids.append(HITId)
+                raise ClientError(
+                    {"Error": {"Code": "ThrottlingException", "Message": "test"}}, "DeleteHIT"
+                )
+            if HITId in self.undeletable_hit_ids:
+                raise ClientError(
+                    {"Error": {"Code": "RequestError", "Message": "HIT not reviewable"}},
+                    "DeleteHIT",
+                )
+            self.deleted_hit_ids.append(HITId)
+
+
+class TestMTurkExpiration(unittest.TestCase):
+    """
+    Unit testing for expiring many MTurk units and HITs at once
+    """
+
+    def setUp(self) -> None:
+        self.data_dir = tempfile.mkdtemp()
+        database_path = os.path.join(self.data_dir, "mephisto.db")
+        self.db = LocalMephistoDB(database_path)
+        self.datastore = cast(MTurkDatastore, self.db.get_datastore_for_provider(PROVIDER_TYPE))
+        requester_id = self.db.new_requester("test_mturk_requester", PROVIDER_TYPE)
+        self.task_run = TaskRun.get(self.db, get_test_task_run(self.db, requester_id=requester_id))
+        self.datastore.register_run(self.task_run.db_id, "test_hit_type", "unused")
+        patcher = mock.patch.object(mturk_utils, "RETRY_BACKOFF_SECONDS", 0.01)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self) -> None:
+        self.db.shutdown()
+        shutil.rmtree(self.data_dir)
+
+    def test_expire_and_dispose_hits(self) -> None:
+        hits = [make_hit(f"hit_{idx}", "Reviewable") for idx in range(20)]
+        client = StubHitExpirationClient(hits, undeletable_hit_ids=["hit_3", "hit_7"])
+        remaining_hits = expire_and_dispose_hits(client, hits, quiet=True, rate_limit=0)
+
+        self.assertEqual([h["HITId"] for h in remaining_hits], ["hit_3", "hit_7"])
+        self.assertTrue(all("dispose_exception" in h for h in remaining_hits))
+        self.assertEqual(sorted(client.expired_hit_ids), ["hit_3", "hit_7"])
+        # Every throttled delete was retried
+        self.assertEqual(len(client.throttled_hit_ids), 20)
+        self.assertEqual(len(client.deleted_hit_ids), 18)
+        self.assertGreater(client.max_in_flight, 1)
+        self.assertLessEqual(client.max_in_flight, DEFAULT_EXPIRE_CONCURRENCY)
+
+    def test_expire_units(self) -> None:
+        hit_statuses = ["Assignable", "Unassignable", "Reviewable"] * 4
+        hits = [make_hit(f"hit_{idx}", status) for idx, status in enumerate(hit_statuses)]
+        units = []
+        for hit in hits:
+            assignment_id = self.db.new_assignment(
+                self.task_run.task_id,
+                self.task_run.db_id,
+                self.task_run.requester_id,
+                self.task_run.task_type,
+                PROVIDER_TYPE,
+            )
+            unit = MTurkUnit.new(self.db, Assignment.get(self.db, assignment_id), 0, 1.0)
+            self.datastore.new_hit(hit["HITId"], "test_link", 600, self.task_run.db_id)
+            cast(MTurkUnit, unit).register_from_provider_data(hit["HITId"], "test_assignment")
+            unit.set_db_status(AssignmentState.LAUNCHED)
+            units.append(unit)
+        client = StubHitExpirationClient(hits, undeletable_hit_ids=[])
+
+        with mock.patch.object(MTurkUnit, "_get_client", return_value=client):
+            max_delay = expire_units(units, quiet=True)
+
+        # Completed HITs are left alone, and assigned ones may take their duration
+        self.assertEqual(max_delay, 600)
+        expected_hit_ids = [h["HITId"] for h in hits if h["HITStatus"] != "Reviewable"]
+        self.assertEqual(sorted(client.expired_hit_ids), sorted(expected_hit_ids))
+        self.assertGreater(client.max_in_flight, 1)
+
+    def test_expire_unmapped_units(self) -> None:
+        # Launched units aren't mapped to HITs until a worker accepts one
+        hits = [make_hit(f"hit_{idx}", "Assignable") for idx in range(16)]
+        units = []
+        for hit in hits:
+            assignment_id = self.db.new_assignment(
+                self.task_run.task_id,
+                self.task_run.db_id,
+                self.task_run.requester_id,
+                self.task_run.task_type,
+                PROVIDER_TYPE,
+            )
+            unit = MTurkUnit.new(self.db, Assignment.get(self.db, assignment_id), 0, 1.0)
+            self.datastore.new_hit(hit["HITId"], "test_link", 600, self.task_run.db_id)
+            unit.set_db_status(AssignmentState.LAUNCHED)
+            units.append(unit)
+        client = StubHitExpirationClient(hits, undeletable_hit_ids=[])
+
+        with mock.patch.object(MTurkUnit, "_get_client", return_value=client):
+            expire_units(units, quiet=True)
+
+        # Every HIT was expired exactly once, and claimed by its own unit
+        self.assertEqual(sorted(client.expired_hit_ids), sorted(h["HITId"] for h in hits))
+        self.assertGreater(client.max_in_flight, 1)
+        self.assertEqual(self.datastore.get_unassigned_hit_ids(self.task_run.db_id), [])
+        self.assertTrue(all(u.get_db_status() == AssignmentState.EXPIRED for u in units))
+        claimed_hit_ids = [cast(MTurkUnit, u).get_mturk_hit_id() for u in units]
+        self.assertEqual(sorted(claimed_hit_ids), sorted(h["HITId"] for h in hits))
+
+    def test_claim_unassigned_hit(self) -> None:
+        self.datastore.new_hit("hit_1", "test_link", 600, self.task_run.db_id)
+
+        self.assertEqual(self.datastore.claim_unassigned_hit(self.task_run.db_id, "1"), "hit_1")
+        self.assertIsNone(self.datastore.claim_unassigned_hit(self.task_run.db_id, "2"))
+
+    def test_concurrent_client_creation(self) -> None:
+        created = {"sessions": 0, "clients": 0}
+
+        class StubSession:
+            def __init__(self, **kwargs):
+                time.sleep(0.01)
+                created["sessions"] += 1
+
+            def client(self, *args, **kwargs):
+                time.sleep(0.01)
+                created["clients"] += 1
+                return object()
+
+        num_threads = 16
+        barrier = threading.Barrier(num_threads)
+        clients = []
+
+        def get_client():
+            barrier.wait()
+            clients.append(self.datastore.get_client_for_requester("test_mturk_requester"))
+
+        with mock.patch("boto3.Session", StubSession):
+            threads = [threading.Thread(target=get_client) for _ in range(num_threads)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        # Expiring units at once share a single session and client
+        self.assertEqual(created, {"sessions": 1, "clients": 1})
+        self.assertEqual(len(set(id(c) for c in clients)), 1)
+
+    def test_expire_units_benchmark(self) -> None:
+        serial = run_expire_units_benchmark(20, 1, latency=0.02)
+        concurrent = run_expire_units_benchmark(20, 8, latency=0.02)
+        self.assertEqual(serial["throttled_calls"], 0)
+        self.assertEqual(concurrent["not_expired"] + concurrent["not_disposed"], 0)
+        self.assertEqual(concurrent["expired_more_than_once"], 0)
+        self.assertGreater(
+            concurrent["units_expired_per_second"], serial["units_expired_per_second"]
+        )
+        self.assertGreater(
+            concurrent["hits_disposed_per_second"], serial["hits_disposed_per_second"]
+        )
+
+
+class StubWorkerBlockClient:
+    """Boto client stand-in holding a requester's worker blocks, 100 per page"""
+
+    def __init__(self, blocked_ids: List[str]):
+        self.blocked_ids = blocked_ids
+        self.calls: Dict[str, int] = {"list_worker_blocks": 0}
+
+    def list_worker_blocks(self, MaxResults: int, NextToken: str = "0") -> Dict[str, Any]:
+        self.calls["list_worker_blocks"] += 1
+        start = int(NextToken)
+        blocks = [
+            {"WorkerId": worker_id, "Reason": "test"}
+            for worker_id in self.blocked_ids[start : start + MaxResults]
+        ]
+        if start + MaxResults >= len(self.blocked_ids):
+            return {"WorkerBlocks": blocks}
+        return {"WorkerBlocks": blocks, "NextToken": str(start + MaxResults)}
+
+    def create_worker_block(self, WorkerId: str, Reason: str) -> None:
+        self.blocked_ids.append(WorkerId)
+
+    def delete_worker_block(self, WorkerId: str, Reason: str) -> None:
+        self.blocked_ids.remove(WorkerId)
+
+
+class TestMTurkWorkerBlocks(unittest.TestCase):
+    """
+    Unit testing for checking MTurk worker blocks against the cached block list
+    """
+
+    def setUp(self) -> None:
+        self.data_dir = tempfile.mkdtemp()
+        database_path = os.path.join(self.data_dir, "mephisto.db")
+        self.db = LocalMephistoDB(database_path)
+        requester_id = self.db.new_requester("test_mturk_requester", PROVIDER_TYPE)
+        self.requester = Requester.get(self.db, requester_id)
+
+    def tearDown(self) -> None:
+        self.db.shutdown()
+        shutil.rmtree(self.data_dir)
+
+    def test_list_blocked_worker_ids_pages(self) -> None:
+        blocked_ids = [f"worker_{idx}" for idx in range(250)]
+        client = StubWorkerBlockClient(list(blocked_ids))
+        self.assertEqual(mturk_utils.list_blocked_worker_ids(client), blocked_ids)
+        self.assertEqual(client.calls["list_worker_blocks"], 3)
+        # Blocks past the first page are found
+        self.assertTrue(mturk_utils.is_worker_blocked(client, "worker_249"))
+
+    def test_is_blocked_uses_cache(self) -> None:
+        client = StubWorkerBlockClient([f"worker_{idx}" for idx in range(150)])
+        workers = [MTurkWorker.new(self.db, f"worker_{idx}") for idx in range(140, 160)]
+
+        with mock.patch.object(MTurkWorker, "_get_client", return_value=client):
+            blocked = [worker.is_blocked(self.requester) for worker in workers]
+            self.assertEqual(blocked, [True] * 10 + [False] * 10)
+            # One paged load for all of the checks
+            self.assertEqual(client.calls["list_worker_blocks"], 2)
+
+            workers[0].unblock_worker("test", self.requester)
+            workers[-1].block_worker("test", requester=self.requester)
+            self.assertFalse(workers[0].is_blocked(self.requester))
+            self.assertTrue(workers[-1].is_blocked(self.requester))
+            self.assertEqual(client.calls["list_worker_blocks"], 2)
+
+
+class StubHitCreationClient:
+    """Boto client stand-in creating HITs, throttling the first call for each unit"""
+
+    def __init__(
+        self,
+        fail_codes: Dict[int, str],
+        held_calls: Optional[Dict[int, threading.Event]] = None,
+    ):
+        self.meta = type("meta", (), {"endpoint_url": SANDBOX_ENDPOINT})()
+        self.fail_codes = fail_codes
+        self.held_calls = held_calls or {}
+        self.num_calls = 0
+        self.num_in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+
+    def create_hit_with_hit_type(self, HITTypeId: str, **kwargs) -> Dict[str, Any]:
+        with self.lock:
+            call_idx = self.num_calls
+            self.num_calls += 1
+            self.num_in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.num_in_flight)
+        try:
+            time.sleep(0.01)
+            if call_idx in self.held_calls:
+                self.held_calls[call_idx].wait(timeout=5)
+            if call_idx in self.fail_codes:
+                raise ClientError(
+                    {"Error": {"Code": self.fail_codes[call_idx], "Message": "test"}},
+                    "CreateHITWithHITType",
+                )
+            return {"HIT": {"HITId": f"hit_{call_idx}", "HITTypeId": HITTypeId}}
+        finally:
+            with self.lock:
+                self.num_in_flight -= 1
+
+
+class TestMTurkHitLauncher(unittest.TestCase):
+    """
+    Unit testing for launching many MTurk units at once
+    """
+
+    def setUp(self) -> None:
+        self.data_dir = tempfile.mkdtemp()
+        database_path = os.path.join(self.data_dir, "mephisto.db")
+        self.db = LocalMephistoDB(database_path)
+        self.datastore = cast(MTurkDatastore, self.db.get_datastore_for_provider(PROVIDER_TYPE))
+        requester_id = self.db.new_requester("test_mturk_requester", PROVIDER_TYPE)
+        self.task_run = TaskRun.get(self.db, get_test_task_run(self.db, requester_id=requester_id))
+        self.datastore.register_run(self.task_run.db_id, "test_hit_type", "unused")
+        patcher = mock.patch.object(mturk_utils, "RETRY_BACKOFF_SECONDS", 0.01)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self) -> None:
+        self.db.shutdown()
+        shutil.rmtree(self.data_dir)
+
+    def _make_units(self, num_units: int) -> List[MTurkUnit]:
+        task_run = self.task_run
+        assignment_rows = self.db.new_assignments_bulk(
+            task_run.task_id,
+            task_run.db_id,
+            task_run.requester_id,
+            task_run.task_type,
+            PROVIDER_TYPE,
+            num_units,
+        )
+        unit_specs = [
+            (Assignment.get(self.db, r["assignment_id"], row=r), 0) for r in assignment_rows
+        ]
+        return cast(List[MTurkUnit], MTurkUnit.new_bulk(self.db, unit_specs, 1.0))
+
+    def test_launch_concurrently_with_retries(self) -> None:
+        units = self._make_units(20)
+        client = StubHitCreationClient({0: "ThrottlingException", 3: "ServiceUnavailable"})
+        launcher = MTurkHitLauncher(concurrency=4, rate_limit=0, batch_size=5)
+        with mock.patch.object(MTurkUnit, "_get_client", return_value=client), mock.patch.object(
+            self.datastore, "new_hits_bulk", wraps=self.datastore.new_hits_bulk
+        ) as new_hits_bulk:
+            launcher.launch(units, "https://example.com/task")
+
+        # Every unit gets its HIT, with the throttled calls retried
+        self.assertEqual(client.num_calls, 22)
+        self.assertTrue(all(u.get_db_status() == AssignmentState.LAUNCHED for u in units))
+        self.assertEqual(len(self.datastore.get_unassigned_hit_ids(self.task_run.db_id)), 20)
+        self.assertGreater(client.max_in_flight, 1)
+        self.assertLessEqual(client.max_in_flight, 4)
+        # The mappings are written in batches of at most batch_size
+        self.assertTrue(all(len(c.args[0]) <= 5 for c in new_hits_bulk.call_args_list))
+
+    def test_launch_writes_mappings_as_hits_return(self) -> None:
+        units = self._make_units(2)
+        release = threading.Event()
+        client = StubHitCreationClient({}, held_calls={1: release})
+        launcher = MTurkHitLauncher(concurrency=2, rate_limit=0)
+        with mock.patch.object(MTurkUnit, "_get_client", return_value=client):
+            launch_thread = threading.Thread(
+                target=launcher.launch, args=(units, "https://example.com/task")
+            )
+            launch_thread.start()
+            # The first HIT is registered while the second is still being created
+            deadline = time.monotonic() + 0.5
+            while time.monotonic() < deadline:
+                if len(self.datastore.get_unassigned_hit_ids(self.task_run.db_id)) == 1:
+                    break
+                time.sleep(0.01)
+            statuses = [u.get_db_status() for u in units]
+            release.set()
+            launch_thread.join()
+        self.assertEqual(len(self.datastore.get_unassigned_hit_ids(self.task_run.db_id)), 2)
+        self.assertEqual(statuses.count(AssignmentState.LAUNCHED), 1)
+
+    def test_launch_single_unit(self) -> None:
+        units = self._make_units(1)
+        client = StubHitCreationClient({0: "ThrottlingException"})
+        with mock.patch.object(MTurkUnit, "_get_client", return_value=client), mock.patch.object(
+            MTurkHitLauncher, "launch"
+        ) as launcher_launch:
+            MTurkUnit.launch_bulk(units, "https://example.com/task")
+        # A single unit is launched directly, still retrying throttled calls
+        launcher_launch.assert_not_called()
+        self.assertEqual(client.num_calls, 2)
+        self.assertEqual(units[0].get_db_status(), AssignmentState.LAUNCHED)
+        self.assertEqual(len(self.datastore.get_unassigned_hit_ids(self.task_run.db_id)), 1)
+
+    def test_launch_failure_raised_after_others(self) -> None:
+        units = self._make_units(5)
+        client = StubHitCreationClient({2: "RequestError"})
+        launcher = MTurkHitLauncher(concurrency=2, rate_limit=0)
+        with mock.patch.object(MTurkUnit, "_get_client", return_value=client):
+            with self.assertRaises(ClientError):
+                launcher.launch(units, "https://example.com/task")
+        statuses = [u.get_db_status() for u in units]
+        self.assertEqual(statuses.count(AssignmentState.LAUNCHED), 4)
+        self.assertEqual(statuses.count(AssignmentState.CREATED), 1)
+
+    def test_launch_bulk(self) -> None:
+        units = self._make_units(6)
+        client = StubHitCreationClient({})
+        with mock.patch.object(MTurkUnit, "_get_client", return_value=client):
+            start_time = time.monotonic()
+            # Uses the default launch args, as the test run's provider is not MTurk
+            MTurkUnit.launch_bulk(units, "https://example.com/task")
+            elapsed = time.monotonic() - start_time
+        self.assertTrue(all(u.get_db_status() == AssignmentState.LAUNCHED for u in units))
+        self.assertEqual(client.num_calls, 6)
+        # Up to the default concurrency can be created at once
+        self.assertLess(elapsed, 1)
+
+    def test_mturk_launch_benchmark(self) -> None:
+        serial = run_mturk_launch_benchmark(20, 1, latency=0.02)
+        concurrent = run_mturk_launch_benchmark(20, 8, latency=0.02)
+        self.assertEqual(serial["throttled_calls"], 0)
+        self.assertGreater(concurrent["hits_per_second"], serial["hits_per_second"])
+
+    def test_default_launch_not_slower_than_serial(self) -> None:
+        serial = run_mturk_launch_benchmark(20, 1)
+        default = run_mturk_launch_benchmark(20)
+        self.assertEqual(default["rate_limit"], DEFAULT_LAUNCH_RATE_LIMIT)
+        self.assertGreaterEqual(default["hits_per_second"], serial["hits_per_second"])
+
+
 if __name__ == "__main__":
     unittest.main()
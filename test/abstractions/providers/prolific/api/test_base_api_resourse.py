@@ -32,7 +32,7 @@ class TestApiResource(BaseAPIResource):
 
 @pytest.mark.prolific
 class TestBaseAPIResource(unittest.TestCase):
-    @patch("requests.get")
+    @patch("requests.Session.get")
     def test__base_request_success(self, mock_requests_get, *args):
         method = HTTPMethod.GET
         api_endpoint = "test/"
@@ -66,7 +66,7 @@ class TestBaseAPIResource(unittest.TestCase):
             params=params,
         )
 
-    @patch("requests.get")
+    @patch("requests.Session.get")
     def test__base_request_success_no_content(self, mock_requests_get, *args):
         method = HTTPMethod.GET
         api_endpoint = "test/"
@@ -101,7 +101,7 @@ class TestBaseAPIResource(unittest.TestCase):
         )
 
     @patch(API_KEY_PATH, "")
-    @patch("requests.get")
+    @patch("requests.Session.get")
     def test__base_request_no_api_key(self, mock_requests_get, *args):
         method = HTTPMethod.GET
         api_endpoint = "test/"
@@ -123,7 +123,7 @@ class TestBaseAPIResource(unittest.TestCase):
         self.assertEqual(cm.exception.message, ProlificAPIKeyError.default_message)
         mock_requests_get.assert_not_called()
 
-    @patch("requests.get")
+    @patch("requests.Session.get")
     def test__base_request_incorrect_request_method(self, mock_requests_get, *args):
         method = "unreal_method"
         api_endpoint = "test/"
@@ -146,7 +146,7 @@ class TestBaseAPIResource(unittest.TestCase):
         self.assertEqual(cm.exception.message, "Invalid HTTP method.")
         mock_requests_get.assert_not_called()
 
-    @patch("requests.get")
+    @patch("requests.Session.get")
     def test__base_request_request_httperror(self, mock_requests_get, *args):
         method = HTTPMethod.GET
         api_endpoint = "test/"
@@ -185,7 +185,7 @@ class TestBaseAPIResource(unittest.TestCase):
             params=params,
         )
 
-    @patch("requests.get")
+    @patch("requests.Session.get")
     def test__base_request_request_httperror_unauthorized(self, mock_requests_get, *args):
         method = HTTPMethod.GET
         api_endpoint = "test/"
@@ -225,7 +225,7 @@ class TestBaseAPIResource(unittest.TestCase):
             params=params,
         )
 
-    @patch("requests.get")
+    @patch("requests.Session.get")
     def test__base_request_unexpected_exception(self, mock_requests_get, *args):
         method = HTTPMethod.GET
         api_endpoint = "test/"
@@ -258,7 +258,7 @@ class TestBaseAPIResource(unittest.TestCase):
         )
 
     @patch(API_KEY_PATH, API_KEY)
-    @patch("requests.get")
+    @patch("requests.Session.get")
     def test_get(self, mock_requests_get, *args):
         api_endpoint = "test-get/"
         params = {
@@ -283,7 +283,7 @@ class TestBaseAPIResource(unittest.TestCase):
         )
 
     @patch(API_KEY_PATH, API_KEY)
-    @patch("requests.post")
+    @patch("requests.Session.post")
     def test_post(self, mock_requests_post, *args):
         api_endpoint = "test-post/"
         params = {
@@ -308,7 +308,7 @@ class TestBaseAPIResource(unittest.TestCase):
         )
 
     @patch(API_KEY_PATH, API_KEY)
-    @patch("requests.patch")
+    @patch("requests.Session.patch")
     def test_patch(self, mock_requests_patch, *args):
         api_endpoint = "test-patch/"
         params = {
@@ -333,7 +333,7 @@ class TestBaseAPIResource(unittest.TestCase):
         )
 
     @patch(API_KEY_PATH, API_KEY)
-    @patch("requests.delete")
+    @patch("requests.Session.delete")
     def test_delete(self, mock_requests_delete, *args):
         api_endpoint = "test-delete/"
         params = {
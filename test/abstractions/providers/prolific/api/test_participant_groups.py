@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+
+# Copyright (c) Meta Platforms and its affiliates.
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+import unittest
+from unittest.mock import call
+from unittest.mock import patch
+
+import pytest
+
+from mephisto.abstractions.providers.prolific.api.participant_groups import ParticipantGroups
+
+
+API_PATH = "mephisto.abstractions.providers.prolific.api"
+
+
+@pytest.mark.prolific
+class TestParticipantGroups(unittest.TestCase):
+    @patch(f"{API_PATH}.participant_groups.ParticipantGroups.get")
+    def test_list_participants_for_group_pages(self, mock_get, *args):
+        next_page = "https://api.prolific.co/api/v1/participant-groups/test/participants/?page=2"
+        mock_get.side_effect = [
+            {
+                "results": [
+                    {"participant_id": "test1", "datetime_created": "2023-01-01"},
+                    {"participant_id": "test2", "datetime_created": "2023-01-01"},
+                ],
+                "_links": {"next": {"href": next_page}},
+            },
+            {
+                "results": [
+                    {"participant_id": "test3", "datetime_created": "2023-01-01"},
+                ],
+                "_links": {"next": {"href": None}},
+            },
+        ]
+
+        participants = ParticipantGroups.list_participants_for_group("test")
+
+        self.assertEqual(
+            ["test1", "test2", "test3"],
+            [p.participant_id for p in participants],
+        )
+        self.assertEqual(
+            [call("participant-groups/test/participants/"), call(next_page)],
+            mock_get.call_args_list,
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+
+# Copyright (c) Meta Platforms and its affiliates.
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+import json
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from collections import Counter
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+from typing import Set
+from unittest import mock
+from urllib.parse import parse_qs
+from urllib.parse import urlparse
+
+from mephisto.abstractions.providers.prolific.api import base_api_resource
+from mephisto.abstractions.providers.prolific.api.constants import StudyStatus
+from mephisto.abstractions.providers.prolific.api.constants import SubmissionStatus
+from mephisto.abstractions.providers.prolific.prolific_datastore import ProlificDatastore
+from mephisto.abstractions.providers.prolific.prolific_utils import DEFAULT_CLIENT
+from mephisto.utils import http_status
+
+STUDY_ID = "test_study"
+NUM_SUBMISSIONS = 25
+PAGE_SIZE = 10
+
+
+class FakeProlificHandler(BaseHTTPRequestHandler):
+    """Serves Studies and paged Submissions, counting requests and connections"""
+
+    protocol_version = "HTTP/1.1"
+    server: "FakeProlificServer"
+
+    def setup(self) -> None:
+        # Called once for every new TCP connection
+        super().setup()
+        self.server.num_connections += 1
+
+    def log_message(self, *args) -> None:
+        pass
+
+    def _respond(self, status: int, data: dict) -> None:
+        body = json.dumps(data).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self) -> None:
+        url = urlparse(self.path)
+        path = url.path[len("/api/v1/") :]
+        self.server.requests[path] += 1
+        if path in self.server.failing_paths:
+            self.server.failing_paths.remove(path)
+            self._respond(http_status.HTTP_503_SERVICE_UNAVAILABLE, {"error": "unavailable"})
+        elif path == f"studies/{STUDY_ID}/":
+            self._respond(http_status.HTTP_200_OK, {"id": STUDY_ID, "status": self.server.status})
+        elif path == "submissions/":
+            page = int(parse_qs(url.query).get("page", ["1"])[0])
+            start = (page - 1) * PAGE_SIZE
+            results = self.server.submissions[start : start + PAGE_SIZE]
+            next_link = None
+            if start + PAGE_SIZE < len(self.server.submissions):
+                next_link = {
+                    "href": f"{self.server.base_url}submissions/?study={STUDY_ID}&page={page + 1}"
+                }
+            self._respond(
+                http_status.HTTP_200_OK, {"results": results, "_links": {"next": next_link}}
+            )
+        elif path.startswith("submissions/"):
+            submission_id = path.split("/")[1]
+            self._respond(
+                http_status.HTTP_200_OK,
+                {"id": submission_id, "status": SubmissionStatus.ACTIVE},
+            )
+        else:
+            self._respond(http_status.HTTP_404_NOT_FOUND, {"error": "not found"})
+
+
+class FakeProlificServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), FakeProlificHandler)
+        self.base_url = f"http://127.0.0.1:{self.server_address[1]}/api/v1/"
+        self.requests: Counter = Counter()
+        self.failing_paths: Set[str] = set()
+        self.num_connections = 0
+        self.status = StudyStatus.ACTIVE
+        self.submissions = [
+            {"id": f"submission_{idx}", "status": SubmissionStatus.AWAITING_REVIEW}
+            for idx in range(NUM_SUBMISSIONS)
+        ]
+
+
+class TestProlificStatusCache(unittest.TestCase):
+    """
+    Unit testing for resolving Prolific Study and Submission statuses from
+    per-Study snapshots, fetched over a shared session from a local fake Prolific
+    """
+
+    def setUp(self) -> None:
+        self.server = FakeProlificServer()
+        self.server_thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.server_thread.start()
+        self.patchers = [
+            mock.patch.object(base_api_resource, "BASE_URL", self.server.base_url),
+            mock.patch.object(base_api_resource, "PROLIFIC_API_KEY", "test_api_key"),
+            mock.patch.object(base_api_resource, "_session", None),
+        ]
+        for patcher in self.patchers:
+            patcher.start()
+
+        self.data_dir = tempfile.mkdtemp()
+        self.datastore = ProlificDatastore(self.data_dir)
+        self.unit_submissions = {
+            f"unit_{idx}": submission["id"]
+            for idx, submission in enumerate(self.server.submissions)
+        }
+        for unit_id, submission_id in self.unit_submissions.items():
+            self.datastore.set_submission_for_unit(unit_id, submission_id)
+
+    def tearDown(self) -> None:
+        for patcher in reversed(self.patchers):
+            patcher.stop()
+        self.server.shutdown()
+        self.server.server_close()
+        shutil.rmtree(self.data_dir)
+
+    def _sweep(self) -> Counter:
+        """Resolve the Study and Submission status of every unit, like a status sweep"""
+        cache = self.datastore.status_cache
+        statuses: Counter = Counter()
+        for unit_id, submission_id in self.unit_submissions.items():
+            study = cache.get_study(DEFAULT_CLIENT, STUDY_ID)
+            submission = cache.get_submission_for_unit(
+                DEFAULT_CLIENT, STUDY_ID, unit_id, submission_id
+            )
+            assert submission is not None
+            statuses[(study.status, submission.status)] += 1
+        return statuses
+
+    def test_sweep_uses_one_study_request_and_paged_submissions(self) -> None:
+        statuses = self._sweep()
+        self.assertEqual(
+            statuses,
+            {(StudyStatus.ACTIVE, SubmissionStatus.AWAITING_REVIEW): NUM_SUBMISSIONS},
+        )
+        # One Study request and 3 pages of Submissions, rather than 2 requests per unit,
+        # all over a single kept-alive connection
+        self.assertEqual(
+            self.server.requests,
+            {f"studies/{STUDY_ID}/": 1, "submissions/": 3},
+        )
+        self.assertEqual(self.server.num_connections, 1)
+
+        # Within the sync interval, nothing is requested again
+        self._sweep()
+        self.assertEqual(sum(self.server.requests.values()), 4)
+
+        # Once the snapshots are dropped they're refreshed, still on the same connection
+        self.server.status = StudyStatus.AWAITING_REVIEW
+        self.datastore.status_cache.clear_study(STUDY_ID)
+        statuses = self._sweep()
+        self.assertEqual(list(statuses.keys())[0][0], StudyStatus.AWAITING_REVIEW)
+        self.assertEqual(sum(self.server.requests.values()), 8)
+        self.assertEqual(self.server.num_connections, 1)
+
+    def test_changed_mapping_is_not_answered_from_snapshot(self) -> None:
+        cache = self.datastore.status_cache
+        submission = cache.get_submission_for_unit(
+            DEFAULT_CLIENT, STUDY_ID, "unit_0", "submission_0"
+        )
+        assert submission is not None
+        self.assertEqual(submission.id, "submission_0")
+
+        self.datastore.set_submission_for_unit("unit_0", "submission_1")
+        self.assertIsNone(
+            cache.get_submission_for_unit(DEFAULT_CLIENT, STUDY_ID, "unit_0", "submission_1")
+        )
+
+    def test_untouched_units_use_snapshot(self) -> None:
+        # A fresh datastore, as if the mappings were made before a restart
+        datastore = ProlificDatastore(self.data_dir)
+        submission = datastore.status_cache.get_submission_for_unit(
+            DEFAULT_CLIENT, STUDY_ID, "unit_0", "submission_0"
+        )
+        assert submission is not None
+        self.assertEqual(submission.id, "submission_0")
+        self.assertEqual(self.server.requests, {"submissions/": 3})
+
+    def test_stale_study_snapshots_dropped(self) -> None:
+        cache = self.datastore.status_cache
+        # A Study whose run ended a while ago
+        old_sync_time = time.monotonic() - 120
+        cache.studies._snapshots["old_study"] = (old_sync_time, mock.Mock())
+        cache.submissions._snapshots["old_study"] = (old_sync_time, {})
+
+        self._sweep()
+
+        self.assertEqual(cache.studies.keys(), [STUDY_ID])
+        self.assertEqual(cache.submissions.keys(), [STUDY_ID])
+
+    def test_unavailable_responses_are_retried(self) -> None:
+        self.server.failing_paths.add(f"studies/{STUDY_ID}/")
+        study = self.datastore.status_cache.get_study(DEFAULT_CLIENT, STUDY_ID)
+        self.assertEqual(study.status, StudyStatus.ACTIVE)
+        self.assertEqual(self.server.requests[f"studies/{STUDY_ID}/"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -70,6 +70,7 @@ from mephisto.abstractions.providers.prolific.prolific_utils import setup_creden
 from mephisto.abstractions.providers.prolific.prolific_utils import stop_study
 from mephisto.abstractions.providers.prolific.prolific_utils import unblock_worker
 from mephisto.data_model.requester import RequesterArgs
+from mephisto.utils.block_list_cache import BlockListCache
 
 MOCK_PROLIFIC_CONFIG_DIR = "/tmp/"
 MOCK_PROLIFIC_CONFIG_PATH = "/tmp/test_conf_credentials"
@@ -1267,6 +1268,53 @@ class TestProlificUtils(unittest.TestCase):
         self.assertEqual(cm.exception.message, exception_message)
         mock_list_participants_for_group.assert_called_once()
 
+    @patch(f"{API_PATH}.participant_groups.ParticipantGroups.remove_participants_from_group")
+    @patch(f"{UTILS_PATH}.add_workers_to_qualification")
+    @patch(f"{UTILS_PATH}._get_block_list_qualification")
+    @patch(f"{UTILS_PATH}.find_or_create_prolific_project")
+    @patch(f"{UTILS_PATH}.find_or_create_prolific_workspace")
+    @patch(f"{API_PATH}.participant_groups.ParticipantGroups.list_participants_for_group")
+    @patch(f"{UTILS_PATH}._find_qualification")
+    def test_is_worker_blocked_with_cache(
+        self,
+        mock__find_qualification,
+        mock_list_participants_for_group,
+        mock_find_or_create_prolific_workspace,
+        mock_find_or_create_prolific_project,
+        mock__get_block_list_qualification,
+        mock_add_workers_to_qualification,
+        mock_remove_participants_from_group,
+        *args,
+    ):
+        mock_participant_group = ParticipantGroup()
+        mock_participant_group.id = "test2"
+        mock_participants = []
+        for worker_id in ["test", "test3"]:
+            mock_participant = Participant()
+            mock_participant.participant_id = worker_id
+            mock_participants.append(mock_participant)
+
+        mock__find_qualification.return_value = (True, mock_participant_group)
+        mock_list_participants_for_group.return_value = mock_participants
+        cache = BlockListCache()
+
+        self.assertTrue(is_worker_blocked(self.client, mock_task_run_args, "test", cache))
+        self.assertFalse(is_worker_blocked(self.client, mock_task_run_args, "test4", cache))
+
+        block_worker(self.client, mock_task_run_args, "test4", block_list_cache=cache)
+        unblock_worker(self.client, mock_task_run_args, "test", block_list_cache=cache)
+        self.assertTrue(is_worker_blocked(self.client, mock_task_run_args, "test4", cache))
+        self.assertFalse(is_worker_blocked(self.client, mock_task_run_args, "test", cache))
+        mock_list_participants_for_group.assert_called_once()
+        mock_add_workers_to_qualification.assert_called_once()
+        mock_remove_participants_from_group.assert_called_once()
+
+        # Repeating a block or an unblock doesn't write to Prolific again
+        block_worker(self.client, mock_task_run_args, "test4", block_list_cache=cache)
+        unblock_worker(self.client, mock_task_run_args, "test", block_list_cache=cache)
+        mock_add_workers_to_qualification.assert_called_once()
+        mock_remove_participants_from_group.assert_called_once()
+
     @patch(f"{API_PATH}.studies.Studies.calculate_cost")
     def test_calculate_pay_amount_success(self, mock_calculate_cost, *args):
         task_amount = 1000
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+
+# Copyright (c) Meta Platforms and its affiliates.
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from mephisto.abstractions.databases.local_database import LocalMephistoDB
+from mephisto.abstractions.providers.prolific import prolific_utils
+from mephisto.abstractions.providers.prolific.prolific_worker import ProlificWorker
+
+WORKER_PATH = "mephisto.abstractions.providers.prolific.prolific_worker"
+
+
+class TestProlificWorkerBlocks(unittest.TestCase):
+    """
+    Unit testing for how a ProlificWorker tracks blocks, without Prolific credentials
+    """
+
+    def setUp(self) -> None:
+        self.data_dir = tempfile.mkdtemp()
+        database_path = os.path.join(self.data_dir, "mephisto.db")
+        self.db = LocalMephistoDB(database_path)
+        self.worker = ProlificWorker.new(self.db, "test_worker")
+        self.requester = mock.MagicMock(requester_name="test_requester")
+        self.patchers = [
+            mock.patch.object(prolific_utils, "block_worker"),
+            mock.patch.object(prolific_utils, "unblock_worker"),
+            mock.patch.object(ProlificWorker, "_get_client"),
+            mock.patch.object(ProlificWorker, "_get_last_task_run"),
+        ]
+        for patcher in self.patchers:
+            patcher.start()
+
+    def tearDown(self) -> None:
+        for patcher in reversed(self.patchers):
+            patcher.stop()
+        self.db.shutdown()
+        shutil.rmtree(self.data_dir)
+
+    def _is_blocked_for_grants(self) -> bool:
+        """Whether `_grant_crowd_qualifications` treats the worker as blocked"""
+        with mock.patch.object(self.db, "find_qualifications", return_value=[]) as mock_find:
+            self.worker._grant_crowd_qualifications(mock.MagicMock())
+        return not mock_find.called
+
+    def test_blocked_checks_agree(self) -> None:
+        """Ensure is_blocked and the qualification grants see the same block"""
+        self.assertFalse(self.worker.is_blocked(self.requester))
+        self.assertFalse(self._is_blocked_for_grants())
+
+        self.worker.block_worker("test_reason", requester=self.requester)
+        prolific_utils.block_worker.assert_called_once()
+        self.assertTrue(self.worker.is_blocked(self.requester))
+        self.assertTrue(self._is_blocked_for_grants())
+
+        self.worker.unblock_worker("test_reason", self.requester)
+        prolific_utils.unblock_worker.assert_called_once()
+        self.assertFalse(self.worker.is_blocked(self.requester))
+        self.assertFalse(self._is_blocked_for_grants())
+
+    def test_is_blocked_stays_local(self) -> None:
+        """Ensure is_blocked doesn't need to reach Prolific"""
+        with mock.patch.object(prolific_utils, "is_worker_blocked") as mock_is_worker_blocked:
+            self.worker.block_worker("test_reason", requester=self.requester)
+            self.assertTrue(self.worker.is_blocked(self.requester))
+        mock_is_worker_blocked.assert_not_called()
+        ProlificWorker._get_client.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+
+# Copyright (c) Meta Platforms and its affiliates.
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+import threading
+import time
+import unittest
+
+from mephisto.abstractions.providers.snapshot_cache import SnapshotCache
+
+
+class TestSnapshotCache(unittest.TestCase):
+    """
+    Unit testing for the per-key provider snapshots shared by crowd providers
+    """
+
+    def test_snapshot_refreshed_once_stale(self) -> None:
+        cache: SnapshotCache[int] = SnapshotCache(sync_interval=0.05, max_age=60)
+        fetches = []
+
+        def fetch(sync_time: float) -> int:
+            fetches.append(sync_time)
+            return len(fetches)
+
+        first_sync_time, snapshot = cache.get("run", fetch)
+        self.assertEqual(snapshot, 1)
+        self.assertEqual(fetches, [first_sync_time])
+        self.assertEqual(cache.get("run", fetch), (first_sync_time, 1))
+
+        time.sleep(0.1)
+        _, snapshot = cache.get("run", fetch)
+        self.assertEqual(snapshot, 2)
+        _, snapshot = cache.sync("run", fetch)
+        self.assertEqual(snapshot, 3)
+
+    def test_stale_snapshots_dropped(self) -> None:
+        cache: SnapshotCache[str] = SnapshotCache(sync_interval=0, max_age=0.05)
+        cache.get("old_run", lambda _: "old")
+        time.sleep(0.1)
+        cache.get("new_run", lambda _: "new")
+
+        self.assertEqual(cache.keys(), ["new_run"])
+        self.assertEqual(list(cache._key_locks.keys()), ["new_run"])
+
+    def test_clear_keeps_lock_of_sync_in_progress(self) -> None:
+        cache: SnapshotCache[str] = SnapshotCache(sync_interval=0, max_age=60)
+        fetch_started = threading.Event()
+        finish_fetch = threading.Event()
+        num_fetching = 0
+        max_fetching = 0
+        fetching_lock = threading.Lock()
+
+        def slow_fetch(_sync_time: float) -> str:
+            nonlocal num_fetching, max_fetching
+            with fetching_lock:
+                num_fetching += 1
+                max_fetching = max(max_fetching, num_fetching)
+            fetch_started.set()
+            finish_fetch.wait(timeout=5)
+            with fetching_lock:
+                num_fetching -= 1
+            return "snapshot"
+
+        first_sync = threading.Thread(target=cache.sync, args=("run", slow_fetch))
+        first_sync.start()
+        self.assertTrue(fetch_started.wait(timeout=5))
+        cache.clear("run")
+        # A sync started after the clear still waits for the one in progress
+        second_sync = threading.Thread(target=cache.sync, args=("run", slow_fetch))
+        second_sync.start()
+        time.sleep(0.1)
+        finish_fetch.set()
+        first_sync.join(timeout=5)
+        second_sync.join(timeout=5)
+
+        self.assertEqual(max_fetching, 1)
+        self.assertEqual(cache.keys(), ["run"])
+
+
+if __name__ == "__main__":
+    unittest.main()
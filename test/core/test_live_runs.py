@@ -11,6 +11,7 @@ import shutil
 import tempfile
 import time
 import unittest
+from unittest import mock
 from typing import Callable
 from typing import ClassVar
 from typing import List
@@ -30,10 +31,12 @@ from mephisto.abstractions.blueprints.mock.mock_blueprint import MockSharedState
 from mephisto.abstractions.blueprints.mock.mock_task_runner import MockTaskRunner
 from mephisto.abstractions.databases.local_database import LocalMephistoDB
 from mephisto.abstractions.databases.local_singleton_database import MephistoSingletonDB
+from mephisto.abstractions.providers.mock.mock_agent import MockAgent
 from mephisto.abstractions.providers.mock.mock_provider import (
     MockProvider,
 )
 from mephisto.data_model.assignment import InitializationData
+from mephisto.data_model.constants.assignment_state import AssignmentState
 from mephisto.data_model.packet import PACKET_TYPE_ALIVE
 from mephisto.data_model.packet import PACKET_TYPE_CLIENT_BOUND_LIVE_UPDATE
 from mephisto.data_model.packet import PACKET_TYPE_MEPHISTO_BOUND_LIVE_UPDATE
@@ -471,6 +474,45 @@ class BaseTestLiveRuns:
         live_run.shutdown()
         self.assertTrue(channel.is_closed())
 
+    def test_agent_creation_failure_releases_unit(self):
+        """Ensure a unit reserved for a worker is released if its agent can't be created"""
+        TaskRunnerClass = MockBlueprint.TaskRunnerClass
+        args = MockBlueprint.ArgsClass()
+        args.timeout_time = 5
+        config = OmegaConf.structured(MephistoConfig(blueprint=args))
+        task_runner = TaskRunnerClass(self.task_run, config, EMPTY_STATE)
+        blueprint = self.task_run.get_blueprint(args=config)
+        live_run = self.get_mock_run(blueprint, task_runner)
+        self.live_run = live_run
+        live_run.client_io.launch_channels()
+        self.assert_server_subbed_in_time(self.architect.server)
+
+        mock_worker_name = "MOCK_WORKER"
+        with mock.patch.object(
+            MockAgent,
+            "new_from_provider_data",
+            side_effect=RuntimeError("Provider failure"),
+        ):
+            self.architect.server.register_mock_agent(mock_worker_name, "FAKE_ASSIGNMENT")
+            self.assert_sandbox_worker_created(live_run, mock_worker_name)
+            self._await_current_tasks(live_run)
+
+        self.assertEqual(len(self.db.find_agents()), 0)
+        units = self.task_run.get_units()
+        self.assertTrue(
+            self._run_loop_until(
+                live_run,
+                lambda: all(u.get_status() == AssignmentState.LAUNCHED for u in units),
+                2,
+            ),
+            "Unit was left reserved for the failed agent",
+        )
+
+        # The released unit can still be given to a worker
+        self.architect.server.register_mock_agent(mock_worker_name, "FAKE_ASSIGNMENT")
+        self.await_channel_requests(live_run)
+        self.assertEqual(len(self.db.find_agents()), 1, "Agent was not created properly")
+
     def test_register_concurrent_run_with_onboarding(self):
         """Test registering and running a run with onboarding"""
         # Handle baseline setup
@@ -28,7 +28,11 @@ from mephisto.abstractions.architects.mock_architect import (
 from mephisto.operations.hydra_config import MephistoConfig
 from mephisto.abstractions.providers.mock.mock_provider import MockProviderArgs
 from mephisto.abstractions.blueprints.mock.mock_blueprint import MockBlueprintArgs
+from mephisto.data_model.task_run import TaskRun
 from mephisto.data_model.task_run import TaskRunArgs
+from mephisto.utils.db import get_task_has_stats
+from mephisto.utils.db import set_task_has_stats
+from mephisto.utils.testing import get_test_task_run
 from omegaconf import OmegaConf
 
 from typing import Type, ClassVar, TYPE_CHECKING
@@ -114,6 +118,26 @@ class OperatorBaseTest(object):
         """Quick test to ensure that the operator can be initialized"""
         self.operator = Operator(self.db)
 
+    def test_reset_task_has_stats(self):
+        """Ensure that a new run drops only the cached flag that the task has no stats"""
+        self.operator = Operator(self.db)
+        requester = self.db.find_requesters(requester_name=self.requester_name)[0]
+        task_run = TaskRun.get(self.db, get_test_task_run(self.db, requester_id=requester.db_id))
+        task_id = task_run.task_id
+
+        # Not cached yet, so left for the Review App to find out
+        self.operator._reset_task_has_stats(task_id)
+        self.assertIsNone(get_task_has_stats(self.db, task_id))
+
+        set_task_has_stats(self.db, task_id, True)
+        self.operator._reset_task_has_stats(task_id)
+        self.assertTrue(get_task_has_stats(self.db, task_id))
+
+        # Units of the new run may bring fields for stats
+        set_task_has_stats(self.db, task_id, False)
+        self.operator._reset_task_has_stats(task_id)
+        self.assertIsNone(get_task_has_stats(self.db, task_id))
+
     def assert_sandbox_worker_created(self, worker_name, timeout=2) -> None:
         self.assertTrue(  # type: ignore
             self.operator._run_loop_until(
@@ -8,6 +8,7 @@ import unittest
 import shutil
 import os
 import tempfile
+from unittest import mock
 from typing import List, Iterable
 import time
 
@@ -15,11 +16,15 @@ from mephisto.utils.testing import get_test_task_run
 from mephisto.abstractions.databases.local_database import LocalMephistoDB
 from mephisto.abstractions.databases.local_singleton_database import MephistoSingletonDB
 from mephisto.operations.task_launcher import TaskLauncher
+from mephisto.operations.task_launcher import UNIT_GENERATOR_WAIT_SECONDS
+from mephisto.scripts.benchmarks.create_assignments import run_create_assignments_benchmark
 from mephisto.data_model.assignment import InitializationData
 from mephisto.data_model.constants.assignment_state import AssignmentState
 from mephisto.data_model.task_run import TaskRun
+from mephisto.data_model.unit import Unit
 
 from mephisto.abstractions.providers.mock.mock_provider import MockProvider
+from mephisto.abstractions.providers.mock.mock_unit import MockUnit
 from mephisto.abstractions.blueprints.mock.mock_blueprint import MockBlueprint
 from mephisto.abstractions.blueprints.mock.mock_task_runner import MockTaskRunner
 
@@ -121,6 +126,38 @@ class BaseTestTaskLauncher:
         for assignment in launcher.assignments:
             self.assertEqual(assignment.get_status(), AssignmentState.EXPIRED)
 
+    def test_expire_units_concurrently(self):
+        """Expire many units at once, returning the longest of their delays"""
+        mock_data_array = [MockTaskRunner.get_mock_assignment_data() for _ in range(10)]
+        launcher = TaskLauncher(self.db, self.task_run, mock_data_array)
+        launcher.create_assignments()
+        launcher.launch_units("dummy-url:3000")
+        failing_unit_id = launcher.units[3].db_id
+        delays = {unit.db_id: float(idx) for idx, unit in enumerate(launcher.units)}
+        original_expire = MockUnit.expire
+
+        def slow_expire(unit):
+            if unit.db_id == failing_unit_id:
+                raise Exception("Failed to expire")
+            time.sleep(0.05)
+            original_expire(unit)
+            return delays[unit.db_id]
+
+        with mock.patch.object(
+            MockUnit, "get_expire_limits", return_value=(10, 0)
+        ), mock.patch.object(MockUnit, "expire", slow_expire):
+            start_time = time.monotonic()
+            max_delay = launcher.expire_units()
+            elapsed = time.monotonic() - start_time
+
+        self.assertEqual(max_delay, max(delays.values()))
+        self.assertLess(elapsed, 0.05 * len(launcher.units))
+        for unit in launcher.units:
+            expected_status = AssignmentState.EXPIRED
+            if unit.db_id == failing_unit_id:
+                expected_status = AssignmentState.LAUNCHED
+            self.assertEqual(unit.get_db_status(), expected_status)
+
     def test_launch_assignments_with_concurrent_unit_cap(self):
         """Initialize a launcher on a task run, then create the assignments"""
         cap_values = [1, 2, 3, 4, 5]
@@ -149,6 +186,78 @@ class BaseTestTaskLauncher:
             self.tearDown()
             self.setUp()
 
+    def test_create_assignments_in_chunks(self):
+        """Create assignments from static data in several bulk chunks"""
+        mock_data_array = [MockTaskRunner.get_mock_assignment_data() for _ in range(5)]
+        launcher = TaskLauncher(self.db, self.task_run, mock_data_array, assignment_chunk_size=2)
+        with mock.patch.object(
+            self.db, "_get_assignment", wraps=self.db._get_assignment
+        ) as get_assignment, mock.patch.object(
+            self.db, "_get_unit", wraps=self.db._get_unit
+        ) as get_unit:
+            launcher.create_assignments()
+        # Objects are built from the rows returned by the bulk calls
+        get_assignment.assert_not_called()
+        get_unit.assert_not_called()
+
+        self.assertEqual(len(launcher.assignments), 5)
+        self.assertEqual(len(launcher.units), 10)
+        self.assertEqual(len(launcher.unlaunched_units), 10)
+        self.assertEqual(len(self.db.find_units(task_run_id=self.task_run_id)), 10)
+        for assignment, assignment_data in zip(launcher.assignments, mock_data_array):
+            self.assertEqual(assignment.get_assignment_data(), assignment_data)
+            self.assertEqual(
+                sorted(u.unit_index for u in assignment.get_units()),
+                list(range(len(assignment_data.unit_data))),
+            )
+
+    def test_event_driven_launch_refills_slots(self):
+        """Freed slots should be refilled right away, checking only the changed unit"""
+        mock_data_array = [MockTaskRunner.get_mock_assignment_data() for _ in range(4)]
+        launcher = TaskLauncher(
+            self.db,
+            self.task_run,
+            mock_data_array,
+            max_num_concurrent_units=2,
+            event_driven_launch=True,
+        )
+        launcher.create_assignments()
+
+        def wait_for_launched(num_unlaunched: int) -> float:
+            start_time = time.time()
+            while len(launcher.unlaunched_units) != num_unlaunched:
+                self.assertLess(time.time() - start_time, MAX_WAIT_TIME_UNIT_LAUNCH)
+                time.sleep(0.01)
+            self.assertEqual(len(launcher.launched_units), 2)
+            return time.time() - start_time
+
+        with mock.patch.object(
+            MockUnit, "get_status", autospec=True, side_effect=Unit.get_status
+        ) as get_status:
+            launcher.launch_units("dummy-url:3000")
+            wait_for_launched(6)
+
+            # Units finishing through their status are replaced without queries
+            for num_unlaunched in [5, 4, 3]:
+                unit_id = next(iter(launcher.launched_units.keys()))
+                Unit.get(self.db, unit_id).set_db_status(AssignmentState.COMPLETED)
+                latency = wait_for_launched(num_unlaunched)
+                self.assertLess(latency, 1)
+            self.assertEqual(get_status.call_count, 0)
+
+            # Units finishing through their agents take one query each
+            for num_unlaunched in [2, 1]:
+                unit_id = next(iter(launcher.launched_units.keys()))
+                self.db.update_unit(unit_id, status=AssignmentState.COMPLETED)
+                calls_before = get_status.call_count
+                launcher.notify_unit_status_update(unit_id)
+                latency = wait_for_launched(num_unlaunched)
+                self.assertLess(latency, 1)
+                self.assertEqual(get_status.call_count - calls_before, 1)
+
+        launcher.shutdown()
+        self.assertFalse(launcher.units_thread.is_alive())
+
     def test_assignments_generator(self):
         """Initialize a launcher on a task run, then try generate the assignments"""
         mock_data_array = self.get_mock_assignment_data_generator()
@@ -162,6 +271,28 @@ class BaseTestTaskLauncher:
             (NUM_GENERATED_ASSIGNMENTS * WAIT_TIME_TILL_NEXT_ASSIGNMENT) / 2,
         )
 
+    def test_generated_units_launch_without_waiting(self):
+        """Units of generated assignments launch as soon as they're created"""
+
+        def slow_start_generator() -> Iterable[InitializationData]:
+            time.sleep(0.2)
+            for _ in range(2):
+                yield MockTaskRunner.get_mock_assignment_data()
+
+        launcher = TaskLauncher(self.db, self.task_run, slow_start_generator())
+        launcher.create_assignments()
+        start_time = time.time()
+        launcher.launch_units("dummy-url:3000")
+        try:
+            while len(launcher.units) == 0 or any(
+                u.get_db_status() != AssignmentState.LAUNCHED for u in launcher.units
+            ):
+                self.assertLess(time.time() - start_time, UNIT_GENERATOR_WAIT_SECONDS / 2)
+                time.sleep(0.05)
+        finally:
+            launcher.expire_units()
+            launcher.shutdown()
+
 
 class TestTaskLauncherLocal(BaseTestTaskLauncher, unittest.TestCase):
     DB_CLASS = LocalMephistoDB
@@ -171,5 +302,18 @@ class TestTaskLauncherSingleton(BaseTestTaskLauncher, unittest.TestCase):
     DB_CLASS = MephistoSingletonDB
 
 
+class TestCreateAssignmentsBenchmark(unittest.TestCase):
+    def test_create_assignments_benchmark(self):
+        for chunk_size in [1, 50]:
+            result = run_create_assignments_benchmark(
+                100,
+                chunk_size=chunk_size,
+                units_per_assignment=2,
+            )
+            self.assertEqual(result["num_assignments"], 100)
+            self.assertEqual(result["num_units"], 200)
+            self.assertGreater(result["assignments_per_second"], 0)
+
+
 if __name__ == "__main__":
     unittest.main()
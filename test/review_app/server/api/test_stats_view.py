@@ -11,11 +11,13 @@ from flask import url_for
 from mephisto.abstractions._subcomponents.agent_state import AgentState
 from mephisto.utils import http_status
 from mephisto.data_model.constants.assignment_state import AssignmentState
+from mephisto.data_model.task_run import TaskRun
 from mephisto.data_model.unit import Unit
 from mephisto.utils.testing import get_test_qualification
 from mephisto.utils.testing import get_test_task_run
 from mephisto.utils.testing import get_test_worker
 from mephisto.utils.testing import make_completed_unit
+from mephisto.utils.testing import make_completed_units_bulk
 from test.review_app.server.api.base_test_api_view_case import BaseTestApiViewCase
 
 
@@ -57,6 +59,49 @@ class TestStatsView(BaseTestApiViewCase):
             },
         )
 
+    def test_stats_of_large_task_success(self, *args, **kwargs):
+        task_run = TaskRun.get(self.db, get_test_task_run(self.db))
+        worker_ids = [get_test_worker(self.db, f"worker_{i}")[1] for i in range(3)]
+        unit_ids = make_completed_units_bulk(self.db, task_run, worker_ids, 5000)
+        for i, unit_id in enumerate(unit_ids[:30]):
+            self.db.new_worker_review(
+                unit_id=unit_id,
+                task_id=task_run.task_id,
+                worker_id=worker_ids[i % 3],
+                status=[AgentState.STATUS_APPROVED, AgentState.STATUS_REJECTED][i % 2],
+            )
+
+        with self.app_context:
+            url = url_for("review-stats") + f"?task_id={task_run.task_id}"
+            task_stats = self.client.get(url).json["stats"]
+            url += f"&worker_id={worker_ids[0]}"
+            worker_stats = self.client.get(url).json["stats"]
+            url += "&limit=4"
+            limited_worker_stats = self.client.get(url).json["stats"]
+
+        self.assertEqual(
+            task_stats,
+            {
+                "approved_count": 15,
+                "rejected_count": 15,
+                "reviewed_count": 30,
+                "soft_rejected_count": 0,
+                "total_count": 5000,
+            },
+        )
+        self.assertEqual(worker_stats["total_count"], 1667)
+        self.assertEqual(worker_stats["reviewed_count"], 10)
+        self.assertEqual(
+            limited_worker_stats,
+            {
+                "approved_count": 4,
+                "rejected_count": 4,
+                "reviewed_count": 8,
+                "soft_rejected_count": 0,
+                "total_count": 4,
+            },
+        )
+
 
 if __name__ == "__main__":
     unittest.main()
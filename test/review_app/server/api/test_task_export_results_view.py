@@ -4,6 +4,7 @@
 # This source code is licensed under the MIT license found in the
 # LICENSE file in the root directory of this source tree.
 
+import json
 import unittest
 from unittest.mock import patch
 
@@ -12,10 +13,14 @@ from flask import url_for
 from mephisto.utils import http_status
 from mephisto.review_app.server.api.views.task_export_results_view import get_result_file_path
 from mephisto.data_model.constants.assignment_state import AssignmentState
+from mephisto.data_model.task_run import TaskRun
 from mephisto.data_model.unit import Unit
+from mephisto.review_app.server.utils import results_export
 from mephisto.utils.testing import get_test_qualification
+from mephisto.utils.testing import get_test_task_run
 from mephisto.utils.testing import get_test_unit
 from mephisto.utils.testing import get_test_worker
+from mephisto.utils.testing import make_completed_units_bulk
 from test.review_app.server.api.base_test_api_view_case import BaseTestApiViewCase
 
 
@@ -105,6 +110,65 @@ class TestTaskExportResultsView(BaseTestApiViewCase):
             ),
         )
 
+    @patch("mephisto.review_app.server.utils.results_export.EXPORT_UNITS_PAGE_SIZE", 10)
+    @patch("mephisto.tools.data_browser.DataBrowser.get_data_from_unit")
+    @patch("mephisto.review_app.server.api.views.task_export_results_view.get_results_dir")
+    def test_task_export_result_streamed_and_cached_success(
+        self,
+        mock_get_results_dir,
+        mock_get_data_from_unit,
+        *args,
+        **kwargs,
+    ):
+        mock_get_results_dir.return_value = self.data_dir
+        mock_get_data_from_unit.side_effect = lambda unit: {
+            "unit_id": unit.db_id,
+            "data": {"outputs": {"answer": [1, 2]}},
+        }
+        _, worker_id = get_test_worker(self.db)
+        task_run = TaskRun.get(self.db, get_test_task_run(self.db))
+        # Spread over several pages of units, loaded in parallel
+        unit_ids = make_completed_units_bulk(self.db, task_run, [worker_id], 25)
+
+        with self.app_context:
+            url = url_for("task_export_results", task_id=task_run.task_id)
+            first_response = self.client.get(url)
+            first_read_units_count = mock_get_data_from_unit.call_count
+            # Nothing changed, the file is reused
+            self.client.get(url)
+            second_read_units_count = mock_get_data_from_unit.call_count
+
+            Unit.get(self.db, unit_ids[0]).set_db_status(AssignmentState.ACCEPTED)
+            self.client.get(url)
+            third_read_units_count = mock_get_data_from_unit.call_count
+
+        self.assertEqual(first_response.status_code, http_status.HTTP_200_OK)
+        self.assertEqual(first_read_units_count, 25)
+        self.assertEqual(second_read_units_count, 25)
+        self.assertEqual(third_read_units_count, 50)
+
+        results_file_path = get_result_file_path(self.data_dir, task_run.task_id, 25)
+        with open(results_file_path) as f:
+            results_file_data = f.read()
+
+        # Same content as `json.dumps` of all units' data at once would give
+        expected_data = {
+            u["unit_id"]: {"unit_id": u["unit_id"], "data": {"outputs": {"answer": [1, 2]}}}
+            for page in results_export.iter_completed_units_pages(self.db, int(task_run.task_id))
+            for u in page
+        }
+        self.assertEqual(results_file_data, json.dumps(expected_data, indent=4))
+        self.assertEqual(sorted(json.loads(results_file_data).keys()), sorted(unit_ids))
+
+    def test_write_results_file_no_units(self, *args, **kwargs):
+        results_file_path = get_result_file_path(self.data_dir, "1", 0)
+
+        results_export.write_results_file(results_file_path, iter([]), "fingerprint")
+
+        with open(results_file_path) as f:
+            self.assertEqual(f.read(), json.dumps({}, indent=4))
+        self.assertTrue(results_export.is_results_file_up_to_date(results_file_path, "fingerprint"))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -11,9 +11,11 @@ from flask import url_for
 from omegaconf import OmegaConf
 
 from mephisto.utils import http_status
+from mephisto.data_model.constants.assignment_state import AssignmentState
 from mephisto.data_model.task import Task
 from mephisto.data_model.task_run import TaskRunArgs
 from mephisto.data_model.unit import Unit
+from mephisto.generators.form_composer.stats import rebuild_task_stats
 from mephisto.operations.hydra_config import MephistoConfig
 from mephisto.utils.testing import get_test_task
 from mephisto.utils.testing import get_test_task_run
@@ -38,6 +40,31 @@ MOCK_CONFIG = MephistoConfig(
     task=MOCK_TASK_ARGS,
 )
 
+MOCK_FORM_FIELD = {
+    "name": "color",
+    "label": "Color",
+    "type": "radio",
+    "options": [
+        {"value": "red", "label": "Red"},
+        {"value": "blue", "label": "Blue"},
+    ],
+}
+
+MOCK_UNIT_DATA = {
+    "data": {
+        "inputs": {
+            "form": {"sections": [{"fieldsets": [{"rows": [{"fields": [MOCK_FORM_FIELD]}]}]}]},
+        },
+        "outputs": {"color": "red"},
+    },
+}
+
+
+def _make_submitted_unit(db) -> str:
+    unit_id = make_completed_unit(db)
+    db.update_unit(unit_id, status=AssignmentState.COMPLETED)
+    return unit_id
+
 
 class TestTaskStatsResultsView(BaseTestApiViewCase):
     def test_task_stats_result_not_found_error(self, *args, **kwargs):
@@ -104,6 +131,45 @@ class TestTaskStatsResultsView(BaseTestApiViewCase):
         self.assertEqual(response.status_code, http_status.HTTP_200_OK)
         self.assertEqual(result, expected_value)
 
+    @patch("mephisto.tools.data_browser.DataBrowser.get_data_from_unit")
+    def test_task_stats_result_incremental_success(
+        self,
+        mock_get_data_from_unit,
+        *args,
+        **kwargs,
+    ):
+        mock_get_data_from_unit.return_value = MOCK_UNIT_DATA
+        _, worker_id = get_test_worker(self.db)
+        init_params = OmegaConf.to_yaml(OmegaConf.structured(MOCK_CONFIG))
+        get_test_task_run(self.db, init_params=init_params)
+        unit_id = _make_submitted_unit(self.db)
+        _make_submitted_unit(self.db)
+        # Units that are not submitted yet are not added to stats, nor their workers counted
+        get_test_worker(self.db, "not_submitted_worker")
+        make_completed_unit(self.db)
+        unit: Unit = Unit.get(self.db, unit_id)
+
+        with self.app_context:
+            url = url_for("task_stats_results", task_id=unit.task_id)
+            first_result = self.client.get(url).json
+            first_read_units_count = mock_get_data_from_unit.call_count
+
+            _make_submitted_unit(self.db)
+            second_result = self.client.get(url).json
+            second_read_units_count = mock_get_data_from_unit.call_count
+
+        self.assertEqual(first_result["stats"], {"Color": {"Red": 2, "Blue": 0}})
+        self.assertEqual(first_result["workers_count"], 1)
+        self.assertEqual(first_read_units_count, 2)
+        # Only the newly completed unit is read
+        self.assertEqual(second_result["stats"], {"Color": {"Red": 3, "Blue": 0}})
+        self.assertEqual(second_read_units_count, 3)
+
+        rebuilt_stats = rebuild_task_stats(Task.get(self.db, unit.task_id))
+
+        self.assertEqual(rebuilt_stats, {"Color": {"Red": 3, "Blue": 0}})
+        self.assertEqual(mock_get_data_from_unit.call_count, 6)
+
 
 if __name__ == "__main__":
     unittest.main()
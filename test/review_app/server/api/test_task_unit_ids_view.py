@@ -10,11 +10,13 @@ from flask import url_for
 
 from mephisto.utils import http_status
 from mephisto.data_model.constants.assignment_state import AssignmentState
+from mephisto.data_model.task_run import TaskRun
 from mephisto.data_model.unit import Unit
 from mephisto.utils.testing import get_test_task
 from mephisto.utils.testing import get_test_task_run
 from mephisto.utils.testing import get_test_worker
 from mephisto.utils.testing import make_completed_unit
+from mephisto.utils.testing import make_completed_units_bulk
 from test.review_app.server.api.base_test_api_view_case import BaseTestApiViewCase
 
 
@@ -48,6 +50,43 @@ class TestTaskUnitIdsView(BaseTestApiViewCase):
         self.assertEqual(first_worker_unit_ids["worker_id"], worker_id)
         self.assertEqual(first_worker_unit_ids["unit_id"], unit_id)
 
+    def test_units_pages_of_large_task_success(self, *args, **kwargs):
+        task_run = TaskRun.get(self.db, get_test_task_run(self.db))
+        worker_ids = [get_test_worker(self.db, f"worker_{i}")[1] for i in range(3)]
+        unit_ids = make_completed_units_bulk(self.db, task_run, worker_ids, 5000)
+        # Only COMPLETED units are listed
+        Unit.get(self.db, unit_ids[0]).set_db_status(AssignmentState.ACCEPTED)
+
+        with self.app_context:
+            url = url_for("worker_units_ids", task_id=task_run.task_id)
+            response = self.client.get(url)
+            all_worker_units_ids = response.json["worker_units_ids"]
+
+        self.assertEqual(len(all_worker_units_ids), 4999)
+
+        paged_worker_units_ids = []
+        after = None
+        while True:
+            with self.app_context:
+                url = url_for("worker_units_ids", task_id=task_run.task_id) + "?page_size=700"
+                if after:
+                    url += f"&after={after}"
+                response = self.client.get(url)
+                result = response.json
+
+            self.assertEqual(response.status_code, http_status.HTTP_200_OK)
+            self.assertLessEqual(len(result["worker_units_ids"]), 700)
+            paged_worker_units_ids += result["worker_units_ids"]
+            after = result["next_cursor"]
+            if after is None:
+                break
+
+        self.assertEqual(paged_worker_units_ids, all_worker_units_ids)
+        self.assertEqual(
+            {(ids["worker_id"], ids["unit_id"]) for ids in paged_worker_units_ids},
+            {(worker_ids[i % 3], unit_id) for i, unit_id in enumerate(unit_ids) if i > 0},
+        )
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -8,8 +8,17 @@ import unittest
 
 from flask import url_for
 
+from mephisto.abstractions.databases.local_database import nonesafe_int
+from mephisto.data_model.constants.assignment_state import AssignmentState
+from mephisto.data_model.task_run import TaskRun
+from mephisto.scripts.benchmarks.review_tasks import run_review_tasks_benchmark
 from mephisto.utils import http_status
+from mephisto.utils.db import get_task_has_stats
+from mephisto.utils.db import set_task_has_stats
 from mephisto.utils.testing import get_test_task
+from mephisto.utils.testing import get_test_task_run
+from mephisto.utils.testing import get_test_worker
+from mephisto.utils.testing import make_completed_units_bulk
 from test.review_app.server.api.base_test_api_view_case import BaseTestApiViewCase
 
 
@@ -43,6 +52,75 @@ class TestTasksView(BaseTestApiViewCase):
         self.assertTrue("unit_finished_count" in first_response_task)
         self.assertTrue("has_stats" in first_response_task)
 
+    def test_tasks_unit_counts_success(self, *args, **kwargs):
+        _, worker_id = get_test_worker(self.db)
+        task_run_1 = TaskRun.get(self.db, get_test_task_run(self.db))
+        _, task_2_id = get_test_task(self.db, "test_task_2")
+        task_run_2_id = get_test_task_run(self.db, task_2_id, task_run_1.requester_id)
+        task_run_2 = TaskRun.get(self.db, task_run_2_id)
+
+        unit_ids_1 = make_completed_units_bulk(self.db, task_run_1, [worker_id], 10)
+        unit_ids_2 = make_completed_units_bulk(self.db, task_run_2, [worker_id], 5)
+        # Task 1: 3 approved, 2 launched, 5 completed. Task 2: all units reviewed
+        new_statuses = [(AssignmentState.ACCEPTED, u) for u in unit_ids_1[:3]]
+        new_statuses += [(AssignmentState.LAUNCHED, u) for u in unit_ids_1[3:5]]
+        new_statuses += [(AssignmentState.REJECTED, u) for u in unit_ids_2]
+        with self.db.table_access_condition, self.db.get_connection() as conn:
+            conn.executemany(
+                "UPDATE units SET status = ? WHERE unit_id = ?;",
+                [(status, nonesafe_int(unit_id)) for status, unit_id in new_statuses],
+            )
+
+        with self.app_context:
+            url = url_for("tasks")
+            response = self.client.get(url)
+            result = response.json
+
+        self.assertEqual(response.status_code, http_status.HTTP_200_OK)
+        tasks = {t["id"]: t for t in result["tasks"]}
+        self.assertEqual(len(tasks), 2)
+
+        task_1 = tasks[task_run_1.task_id]
+        self.assertEqual(task_1["unit_all_count"], 10)
+        self.assertEqual(task_1["unit_completed_count"], 8)
+        self.assertEqual(task_1["unit_finished_count"], 8)
+        self.assertFalse(task_1["is_reviewed"])
+
+        task_2 = tasks[task_2_id]
+        self.assertEqual(task_2["unit_all_count"], 5)
+        self.assertEqual(task_2["unit_completed_count"], 5)
+        self.assertTrue(task_2["is_reviewed"])
+
+    def test_tasks_has_stats_cached_flag_success(self, *args, **kwargs):
+        _, task_id = get_test_task(self.db)
+        set_task_has_stats(self.db, task_id, True)
+
+        with self.app_context:
+            url = url_for("tasks")
+            response = self.client.get(url)
+            result = response.json
+
+        self.assertEqual(response.status_code, http_status.HTTP_200_OK)
+        self.assertTrue(result["tasks"][0]["has_stats"])
+
+    def test_tasks_has_stats_not_cached_flag_success(self, *args, **kwargs):
+        task_run = TaskRun.get(self.db, get_test_task_run(self.db))
+        self.assertIsNone(get_task_has_stats(self.db, task_run.task_id))
+
+        with self.app_context:
+            url = url_for("tasks")
+            response = self.client.get(url)
+            result = response.json
+
+        self.assertEqual(response.status_code, http_status.HTTP_200_OK)
+        self.assertFalse(result["tasks"][0]["has_stats"])
+        # Not a Form Composer task, so it's found out once and for all
+        self.assertFalse(get_task_has_stats(self.db, task_run.task_id))
+
+    def test_review_tasks_benchmark(self, *args, **kwargs):
+        result = run_review_tasks_benchmark(10, 100, num_requests=2)
+        self.assertLess(result["summary_query_seconds"], result["per_task_scans_seconds"])
+
 
 if __name__ == "__main__":
     unittest.main()
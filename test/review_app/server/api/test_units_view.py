@@ -5,13 +5,21 @@
 # LICENSE file in the root directory of this source tree.
 
 import unittest
+from unittest.mock import patch
 
 from flask import url_for
 
+from mephisto.abstractions._subcomponents.agent_state import AgentState
 from mephisto.utils import http_status
 from mephisto.data_model.constants.assignment_state import AssignmentState
+from mephisto.data_model.task_run import TaskRun
 from mephisto.data_model.unit import Unit
+from mephisto.review_app.server.utils.pagination import MAX_PAGE_SIZE
+from mephisto.tools.data_browser import DataBrowser
+from mephisto.utils.testing import get_test_task_run
 from mephisto.utils.testing import get_test_unit
+from mephisto.utils.testing import get_test_worker
+from mephisto.utils.testing import make_completed_units_bulk
 from test.review_app.server.api.base_test_api_view_case import BaseTestApiViewCase
 
 
@@ -130,6 +138,68 @@ class TestUnitsView(BaseTestApiViewCase):
         self.assertEqual(first_response_unit["id"], unit_1_id)
         self.assertEqual(second_response_unit["id"], unit_2_id)
 
+    @patch.object(DataBrowser, "get_data_from_unit")
+    def test_units_pages_of_large_task_success(self, mock_get_data_from_unit, *args, **kwargs):
+        task_run = TaskRun.get(self.db, get_test_task_run(self.db))
+        worker_ids = [get_test_worker(self.db, f"worker_{i}")[1] for i in range(3)]
+        unit_ids = make_completed_units_bulk(self.db, task_run, worker_ids, 5000)
+        self.db.new_worker_review(
+            unit_id=unit_ids[0],
+            task_id=task_run.task_id,
+            worker_id=worker_ids[0],
+            status=AgentState.STATUS_APPROVED,
+            review_note="Good work",
+            bonus="2",
+        )
+
+        response_units = []
+        num_pages = 0
+        after = None
+        while True:
+            url = url_for("units") + f"?task_id={task_run.task_id}&page_size={MAX_PAGE_SIZE}"
+            if after:
+                url += f"&after={after}"
+            with self.app_context:
+                response = self.client.get(url)
+                result = response.json
+
+            self.assertEqual(response.status_code, http_status.HTTP_200_OK)
+            response_units += result["units"]
+            num_pages += 1
+            after = result["next_cursor"]
+            if after is None:
+                break
+
+        self.assertEqual(num_pages, 5)
+        response_unit_ids = [u["id"] for u in response_units]
+        self.assertEqual(sorted(response_unit_ids), sorted(unit_ids))
+        self.assertEqual(
+            [(u["creation_date"], int(u["id"])) for u in response_units],
+            sorted((u["creation_date"], int(u["id"])) for u in response_units),
+        )
+        first_unit = next(u for u in response_units if u["id"] == unit_ids[0])
+        self.assertEqual(first_unit["review"], {"bonus": 2, "review_note": "Good work"})
+        self.assertEqual(first_unit["status"], AssignmentState.COMPLETED)
+        # Summaries don't read any agent data
+        mock_get_data_from_unit.assert_not_called()
+
+    def test_units_page_params_error(self, *args, **kwargs):
+        unit_id = get_test_unit(self.db)
+        unit: Unit = Unit.get(self.db, unit_id)
+
+        for params, error in [
+            (f"page_size={MAX_PAGE_SIZE + 1}", f"between 1 and {MAX_PAGE_SIZE}"),
+            ("page_size=10&after=not-a-cursor", "must be a cursor"),
+            ("after=not-a-cursor", "can only be used with `page_size`"),
+        ]:
+            with self.app_context:
+                url = url_for("units") + f"?task_id={unit.task_id}&{params}"
+                response = self.client.get(url)
+                result = response.json
+
+            self.assertEqual(response.status_code, http_status.HTTP_400_BAD_REQUEST)
+            self.assertIn(error, result["error"])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -24,6 +24,8 @@ from mephisto.abstractions.database import MephistoDB
 from mephisto.abstractions.databases.local_database import LocalMephistoDB
 from mephisto.data_model.task_run import TaskRun
 from mephisto.tools.db_data_porter import DBDataPorter
+from mephisto.tools.db_data_porter.constants import DUMP_DIR_NAME
+from mephisto.tools.db_data_porter.constants import DUMP_METADATA_FILE_NAME
 from mephisto.tools.db_data_porter.constants import EXAMPLE_CONFLICT_RESOLVER
 from mephisto.tools.db_data_porter.constants import MEPHISTO_DUMP_KEY
 from mephisto.tools.db_data_porter.constants import METADATA_DUMP_KEY
@@ -31,6 +33,7 @@ from mephisto.tools.db_data_porter.constants import METADATA_EXPORT_OPTIONS_KEY
 from mephisto.tools.db_data_porter.constants import METADATA_MIGRATIONS_KEY
 from mephisto.tools.db_data_porter.constants import METADATA_PK_SUBSTITUTIONS_KEY
 from mephisto.tools.db_data_porter.constants import METADATA_TIMESTAMP_KEY
+from mephisto.tools.db_data_porter.dump_files import read_dump_data
 from mephisto.utils import db as db_utils
 from mephisto.utils.testing import get_test_qualification
 from mephisto.utils.testing import get_test_requester
@@ -120,6 +123,17 @@ class TestDBDataPorter(unittest.TestCase):
             "dump_archive_file_path": dump_archive_file_path,
         }
 
+    @staticmethod
+    def _read_dump_file_data(dump_archive_file_path: str) -> dict:
+        # Load all tables' rows into memory
+        dump_file_data = read_dump_data(dump_archive_file_path)
+        return {
+            db_name: {t: list(rows) for t, rows in db_dump_data.items()}
+            if db_name != METADATA_DUMP_KEY
+            else db_dump_data
+            for db_name, db_dump_data in dump_file_data.items()
+        }
+
     @patch("mephisto.tools.db_data_porter.backups.get_data_dir")
     @patch("mephisto.tools.db_data_porter.db_data_porter.DBDataPorter._make_export_timestamp")
     def test_create_backup(self, mock__make_export_timestamp, mock_get_data_dir, *args):
@@ -256,55 +270,46 @@ class TestDBDataPorter(unittest.TestCase):
         self.assertEqual(export_results["backup_path"], None)
 
         # Test dump archive
-        with zipfile.ZipFile(export_results["dump_path"]) as archive:
-            dump_name = os.path.basename(os.path.splitext(export_results["dump_path"])[0])
-            json_dump_file_name = f"{dump_name}.json"
-
-            with archive.open(json_dump_file_name) as f:
-                dump_file_data = json.loads(f.read())
-
-                # Test main keys
-                self.assertIn(METADATA_DUMP_KEY, dump_file_data)
-                self.assertIn(MEPHISTO_DUMP_KEY, dump_file_data)
-
-                # Test `dump_metadata`
-                self.assertEqual(
-                    dump_file_data[METADATA_DUMP_KEY][METADATA_EXPORT_OPTIONS_KEY],
-                    {},
-                )
-                self.assertEqual(
-                    dump_file_data[METADATA_DUMP_KEY][METADATA_MIGRATIONS_KEY],
-                    {MEPHISTO_DUMP_KEY: "20240418_data_porter_feature"},
-                )
-                self.assertEqual(
-                    dump_file_data[METADATA_DUMP_KEY][METADATA_PK_SUBSTITUTIONS_KEY], {}
-                )
-                self.assertEqual(
-                    dump_file_data[METADATA_DUMP_KEY][METADATA_TIMESTAMP_KEY], FILE_TIMESTAMP
-                )
-
-                # Test `mephisto`
-                mephisto_dump = dump_file_data[MEPHISTO_DUMP_KEY]
-
-                tables_without_task_run_id = [
-                    "workers",
-                    "tasks",
-                    "requesters",
-                    "qualifications",
-                    "granted_qualifications",
-                ]
-
-                for table_name in mephisto_dump.keys():
-                    if table_name == "imported_data":
-                        continue
-
-                    table_data = mephisto_dump[table_name]
-                    if table_name in ["onboarding_agents", "worker_review", "projects"]:
-                        self.assertEqual(len(table_data), 0)
-                    else:
-                        if table_name not in tables_without_task_run_id:
-                            self.assertEqual(table_data[0]["task_run_id"], task_run_id_1)
-                        self.assertEqual(len(table_data), 1)
+        dump_file_data = self._read_dump_file_data(export_results["dump_path"])
+
+        # Test main keys
+        self.assertIn(METADATA_DUMP_KEY, dump_file_data)
+        self.assertIn(MEPHISTO_DUMP_KEY, dump_file_data)
+
+        # Test `dump_metadata`
+        self.assertEqual(
+            dump_file_data[METADATA_DUMP_KEY][METADATA_EXPORT_OPTIONS_KEY],
+            {},
+        )
+        self.assertEqual(
+            dump_file_data[METADATA_DUMP_KEY][METADATA_MIGRATIONS_KEY],
+            {MEPHISTO_DUMP_KEY: "20240418_data_porter_feature"},
+        )
+        self.assertEqual(dump_file_data[METADATA_DUMP_KEY][METADATA_PK_SUBSTITUTIONS_KEY], {})
+        self.assertEqual(dump_file_data[METADATA_DUMP_KEY][METADATA_TIMESTAMP_KEY], FILE_TIMESTAMP)
+
+        # Test `mephisto`
+        mephisto_dump = dump_file_data[MEPHISTO_DUMP_KEY]
+
+        tables_without_task_run_id = [
+            "workers",
+            "tasks",
+            "requesters",
+            "qualifications",
+            "granted_qualifications",
+        ]
+
+        for table_name in mephisto_dump.keys():
+            if table_name == "imported_data":
+                continue
+
+            table_data = mephisto_dump[table_name]
+            if table_name in ["onboarding_agents", "worker_review", "projects"]:
+                self.assertEqual(len(table_data), 0)
+            else:
+                if table_name not in tables_without_task_run_id:
+                    self.assertEqual(table_data[0]["task_run_id"], task_run_id_1)
+                self.assertEqual(len(table_data), 1)
 
     @patch("mephisto.tools.db_data_porter.db_data_porter.DBDataPorter._make_export_timestamp")
     @patch("mephisto.tools.db_data_porter.export_dump.get_data_dir")
@@ -352,31 +357,26 @@ class TestDBDataPorter(unittest.TestCase):
         self.assertEqual(files_count_after, 1)
 
         # Test dump archive
-        with zipfile.ZipFile(export_results["dump_path"]) as archive:
-            dump_name = os.path.basename(os.path.splitext(export_results["dump_path"])[0])
-            json_dump_file_name = f"{dump_name}.json"
-
-            with archive.open(json_dump_file_name) as f:
-                dump_file_data = json.loads(f.read())
-                mephisto_dump = dump_file_data[MEPHISTO_DUMP_KEY]
-
-                self.assertEqual(len(mephisto_dump["tasks"]), 1)
-                self.assertEqual(len(db_utils.select_all_table_rows(self.db, "tasks")), 2)
-                self.assertEqual(mephisto_dump["tasks"][0]["task_id"], task_1_id)
-                self.assertEqual(len(mephisto_dump["task_runs"]), 1)
-                self.assertEqual(len(db_utils.select_all_table_rows(self.db, "task_runs")), 2)
-                self.assertEqual(mephisto_dump["task_runs"][0]["task_run_id"], task_run_1_id)
-                self.assertEqual(len(mephisto_dump["workers"]), 0)
-                self.assertEqual(len(db_utils.select_all_table_rows(self.db, "workers")), 1)
-                self.assertEqual(len(mephisto_dump["units"]), 0)
-                self.assertEqual(len(db_utils.select_all_table_rows(self.db, "units")), 1)
-                self.assertEqual(len(mephisto_dump["qualifications"]), 0)
-                self.assertEqual(len(db_utils.select_all_table_rows(self.db, "qualifications")), 1)
-                self.assertEqual(len(mephisto_dump["granted_qualifications"]), 0)
-                self.assertEqual(
-                    len(db_utils.select_all_table_rows(self.db, "granted_qualifications")),
-                    1,
-                )
+        dump_file_data = self._read_dump_file_data(export_results["dump_path"])
+        mephisto_dump = dump_file_data[MEPHISTO_DUMP_KEY]
+
+        self.assertEqual(len(mephisto_dump["tasks"]), 1)
+        self.assertEqual(len(db_utils.select_all_table_rows(self.db, "tasks")), 2)
+        self.assertEqual(mephisto_dump["tasks"][0]["task_id"], task_1_id)
+        self.assertEqual(len(mephisto_dump["task_runs"]), 1)
+        self.assertEqual(len(db_utils.select_all_table_rows(self.db, "task_runs")), 2)
+        self.assertEqual(mephisto_dump["task_runs"][0]["task_run_id"], task_run_1_id)
+        self.assertEqual(len(mephisto_dump["workers"]), 0)
+        self.assertEqual(len(db_utils.select_all_table_rows(self.db, "workers")), 1)
+        self.assertEqual(len(mephisto_dump["units"]), 0)
+        self.assertEqual(len(db_utils.select_all_table_rows(self.db, "units")), 1)
+        self.assertEqual(len(mephisto_dump["qualifications"]), 0)
+        self.assertEqual(len(db_utils.select_all_table_rows(self.db, "qualifications")), 1)
+        self.assertEqual(len(mephisto_dump["granted_qualifications"]), 0)
+        self.assertEqual(
+            len(db_utils.select_all_table_rows(self.db, "granted_qualifications")),
+            1,
+        )
 
     @patch("mephisto.tools.db_data_porter.db_data_porter.DBDataPorter._make_export_timestamp")
     @patch("mephisto.tools.db_data_porter.export_dump.get_data_dir")
@@ -424,31 +424,26 @@ class TestDBDataPorter(unittest.TestCase):
         self.assertEqual(files_count_after, 1)
 
         # Test dump archive
-        with zipfile.ZipFile(export_results["dump_path"]) as archive:
-            dump_name = os.path.basename(os.path.splitext(export_results["dump_path"])[0])
-            json_dump_file_name = f"{dump_name}.json"
-
-            with archive.open(json_dump_file_name) as f:
-                dump_file_data = json.loads(f.read())
-                mephisto_dump = dump_file_data[MEPHISTO_DUMP_KEY]
-
-                self.assertEqual(len(mephisto_dump["tasks"]), 1)
-                self.assertEqual(len(db_utils.select_all_table_rows(self.db, "tasks")), 2)
-                self.assertEqual(mephisto_dump["tasks"][0]["task_id"], task_1_id)
-                self.assertEqual(len(mephisto_dump["task_runs"]), 1)
-                self.assertEqual(len(db_utils.select_all_table_rows(self.db, "task_runs")), 2)
-                self.assertEqual(mephisto_dump["task_runs"][0]["task_run_id"], task_run_1_id)
-                self.assertEqual(len(mephisto_dump["workers"]), 0)
-                self.assertEqual(len(db_utils.select_all_table_rows(self.db, "workers")), 1)
-                self.assertEqual(len(mephisto_dump["units"]), 0)
-                self.assertEqual(len(db_utils.select_all_table_rows(self.db, "units")), 1)
-                self.assertEqual(len(mephisto_dump["qualifications"]), 0)
-                self.assertEqual(len(db_utils.select_all_table_rows(self.db, "qualifications")), 1)
-                self.assertEqual(len(mephisto_dump["granted_qualifications"]), 0)
-                self.assertEqual(
-                    len(db_utils.select_all_table_rows(self.db, "granted_qualifications")),
-                    1,
-                )
+        dump_file_data = self._read_dump_file_data(export_results["dump_path"])
+        mephisto_dump = dump_file_data[MEPHISTO_DUMP_KEY]
+
+        self.assertEqual(len(mephisto_dump["tasks"]), 1)
+        self.assertEqual(len(db_utils.select_all_table_rows(self.db, "tasks")), 2)
+        self.assertEqual(mephisto_dump["tasks"][0]["task_id"], task_1_id)
+        self.assertEqual(len(mephisto_dump["task_runs"]), 1)
+        self.assertEqual(len(db_utils.select_all_table_rows(self.db, "task_runs")), 2)
+        self.assertEqual(mephisto_dump["task_runs"][0]["task_run_id"], task_run_1_id)
+        self.assertEqual(len(mephisto_dump["workers"]), 0)
+        self.assertEqual(len(db_utils.select_all_table_rows(self.db, "workers")), 1)
+        self.assertEqual(len(mephisto_dump["units"]), 0)
+        self.assertEqual(len(db_utils.select_all_table_rows(self.db, "units")), 1)
+        self.assertEqual(len(mephisto_dump["qualifications"]), 0)
+        self.assertEqual(len(db_utils.select_all_table_rows(self.db, "qualifications")), 1)
+        self.assertEqual(len(mephisto_dump["granted_qualifications"]), 0)
+        self.assertEqual(
+            len(db_utils.select_all_table_rows(self.db, "granted_qualifications")),
+            1,
+        )
 
     @patch("mephisto.tools.db_data_porter.db_data_porter.DBDataPorter._make_export_timestamp")
     @patch("mephisto.tools.db_data_porter.export_dump.get_data_dir")
@@ -496,31 +491,26 @@ class TestDBDataPorter(unittest.TestCase):
         self.assertEqual(files_count_after, 1)
 
         # Test dump archive
-        with zipfile.ZipFile(export_results["dump_path"]) as archive:
-            dump_name = os.path.basename(os.path.splitext(export_results["dump_path"])[0])
-            json_dump_file_name = f"{dump_name}.json"
-
-            with archive.open(json_dump_file_name) as f:
-                dump_file_data = json.loads(f.read())
-                mephisto_dump = dump_file_data[MEPHISTO_DUMP_KEY]
-
-                self.assertEqual(len(mephisto_dump["tasks"]), 1)
-                self.assertEqual(len(db_utils.select_all_table_rows(self.db, "tasks")), 2)
-                self.assertEqual(mephisto_dump["tasks"][0]["task_id"], task_1_id)
-                self.assertEqual(len(mephisto_dump["task_runs"]), 1)
-                self.assertEqual(len(db_utils.select_all_table_rows(self.db, "task_runs")), 2)
-                self.assertEqual(mephisto_dump["task_runs"][0]["task_run_id"], task_run_1_id)
-                self.assertEqual(len(mephisto_dump["workers"]), 0)
-                self.assertEqual(len(db_utils.select_all_table_rows(self.db, "workers")), 1)
-                self.assertEqual(len(mephisto_dump["units"]), 0)
-                self.assertEqual(len(db_utils.select_all_table_rows(self.db, "units")), 1)
-                self.assertEqual(len(mephisto_dump["qualifications"]), 0)
-                self.assertEqual(len(db_utils.select_all_table_rows(self.db, "qualifications")), 1)
-                self.assertEqual(len(mephisto_dump["granted_qualifications"]), 0)
-                self.assertEqual(
-                    len(db_utils.select_all_table_rows(self.db, "granted_qualifications")),
-                    1,
-                )
+        dump_file_data = self._read_dump_file_data(export_results["dump_path"])
+        mephisto_dump = dump_file_data[MEPHISTO_DUMP_KEY]
+
+        self.assertEqual(len(mephisto_dump["tasks"]), 1)
+        self.assertEqual(len(db_utils.select_all_table_rows(self.db, "tasks")), 2)
+        self.assertEqual(mephisto_dump["tasks"][0]["task_id"], task_1_id)
+        self.assertEqual(len(mephisto_dump["task_runs"]), 1)
+        self.assertEqual(len(db_utils.select_all_table_rows(self.db, "task_runs")), 2)
+        self.assertEqual(mephisto_dump["task_runs"][0]["task_run_id"], task_run_1_id)
+        self.assertEqual(len(mephisto_dump["workers"]), 0)
+        self.assertEqual(len(db_utils.select_all_table_rows(self.db, "workers")), 1)
+        self.assertEqual(len(mephisto_dump["units"]), 0)
+        self.assertEqual(len(db_utils.select_all_table_rows(self.db, "units")), 1)
+        self.assertEqual(len(mephisto_dump["qualifications"]), 0)
+        self.assertEqual(len(db_utils.select_all_table_rows(self.db, "qualifications")), 1)
+        self.assertEqual(len(mephisto_dump["granted_qualifications"]), 0)
+        self.assertEqual(
+            len(db_utils.select_all_table_rows(self.db, "granted_qualifications")),
+            1,
+        )
 
     @patch("mephisto.tools.db_data_porter.db_data_porter.DBDataPorter._make_export_timestamp")
     @patch("mephisto.tools.db_data_porter.export_dump.get_data_dir")
@@ -568,20 +558,15 @@ class TestDBDataPorter(unittest.TestCase):
         self.assertEqual(files_count_after, 1)
 
         # Test dump archive
-        with zipfile.ZipFile(export_results["dump_path"]) as archive:
-            dump_name = os.path.basename(os.path.splitext(export_results["dump_path"])[0])
-            json_dump_file_name = f"{dump_name}.json"
+        dump_file_data = self._read_dump_file_data(export_results["dump_path"])
+        mephisto_dump = dump_file_data[MEPHISTO_DUMP_KEY]
 
-            with archive.open(json_dump_file_name) as f:
-                dump_file_data = json.loads(f.read())
-                mephisto_dump = dump_file_data[MEPHISTO_DUMP_KEY]
-
-                self.assertEqual(len(mephisto_dump["tasks"]), 1)
-                self.assertEqual(len(db_utils.select_all_table_rows(self.db, "tasks")), 2)
-                self.assertEqual(mephisto_dump["tasks"][0]["task_id"], task_2_id)
-                self.assertEqual(len(mephisto_dump["task_runs"]), 1)
-                self.assertEqual(len(db_utils.select_all_table_rows(self.db, "task_runs")), 2)
-                self.assertEqual(mephisto_dump["task_runs"][0]["task_run_id"], task_run_2_id)
+        self.assertEqual(len(mephisto_dump["tasks"]), 1)
+        self.assertEqual(len(db_utils.select_all_table_rows(self.db, "tasks")), 2)
+        self.assertEqual(mephisto_dump["tasks"][0]["task_id"], task_2_id)
+        self.assertEqual(len(mephisto_dump["task_runs"]), 1)
+        self.assertEqual(len(db_utils.select_all_table_rows(self.db, "task_runs")), 2)
+        self.assertEqual(mephisto_dump["task_runs"][0]["task_run_id"], task_run_2_id)
 
     @patch("mephisto.tools.db_data_porter.db_data_porter.DBDataPorter._make_export_timestamp")
     @patch("mephisto.tools.db_data_porter.export_dump.get_data_dir")
@@ -642,31 +627,26 @@ class TestDBDataPorter(unittest.TestCase):
         self.assertEqual(files_count_after, 1)
 
         # Test dump archive
-        with zipfile.ZipFile(export_results["dump_path"]) as archive:
-            dump_name = os.path.basename(os.path.splitext(export_results["dump_path"])[0])
-            json_dump_file_name = f"{dump_name}.json"
-
-            with archive.open(json_dump_file_name) as f:
-                dump_file_data = json.loads(f.read())
-                mephisto_dump = dump_file_data[MEPHISTO_DUMP_KEY]
-
-                self.assertEqual(len(mephisto_dump["tasks"]), 1)
-                self.assertEqual(len(db_utils.select_all_table_rows(self.db, "tasks")), 2)
-                self.assertEqual(mephisto_dump["tasks"][0]["task_id"], task_1_id)
-                self.assertEqual(len(mephisto_dump["task_runs"]), 1)
-                self.assertEqual(len(db_utils.select_all_table_rows(self.db, "task_runs")), 2)
-                self.assertEqual(mephisto_dump["task_runs"][0]["task_run_id"], task_run_1_id)
-                self.assertEqual(len(mephisto_dump["workers"]), 0)
-                self.assertEqual(len(db_utils.select_all_table_rows(self.db, "workers")), 1)
-                self.assertEqual(len(mephisto_dump["units"]), 0)
-                self.assertEqual(len(db_utils.select_all_table_rows(self.db, "units")), 1)
-                self.assertEqual(len(mephisto_dump["qualifications"]), 0)
-                self.assertEqual(len(db_utils.select_all_table_rows(self.db, "qualifications")), 1)
-                self.assertEqual(len(mephisto_dump["granted_qualifications"]), 0)
-                self.assertEqual(
-                    len(db_utils.select_all_table_rows(self.db, "granted_qualifications")),
-                    1,
-                )
+        dump_file_data = self._read_dump_file_data(export_results["dump_path"])
+        mephisto_dump = dump_file_data[MEPHISTO_DUMP_KEY]
+
+        self.assertEqual(len(mephisto_dump["tasks"]), 1)
+        self.assertEqual(len(db_utils.select_all_table_rows(self.db, "tasks")), 2)
+        self.assertEqual(mephisto_dump["tasks"][0]["task_id"], task_1_id)
+        self.assertEqual(len(mephisto_dump["task_runs"]), 1)
+        self.assertEqual(len(db_utils.select_all_table_rows(self.db, "task_runs")), 2)
+        self.assertEqual(mephisto_dump["task_runs"][0]["task_run_id"], task_run_1_id)
+        self.assertEqual(len(mephisto_dump["workers"]), 0)
+        self.assertEqual(len(db_utils.select_all_table_rows(self.db, "workers")), 1)
+        self.assertEqual(len(mephisto_dump["units"]), 0)
+        self.assertEqual(len(db_utils.select_all_table_rows(self.db, "units")), 1)
+        self.assertEqual(len(mephisto_dump["qualifications"]), 0)
+        self.assertEqual(len(db_utils.select_all_table_rows(self.db, "qualifications")), 1)
+        self.assertEqual(len(mephisto_dump["granted_qualifications"]), 0)
+        self.assertEqual(
+            len(db_utils.select_all_table_rows(self.db, "granted_qualifications")),
+            1,
+        )
 
     @patch("mephisto.tools.db_data_porter.db_data_porter.DBDataPorter._get_backup_dir")
     @patch("mephisto.tools.db_data_porter.backups.get_data_dir")
@@ -732,47 +712,42 @@ class TestDBDataPorter(unittest.TestCase):
         self.assertEqual(files_count_after, 1)
 
         # Test dump archive
-        with zipfile.ZipFile(export_results["dump_path"]) as archive:
-            dump_name = os.path.basename(os.path.splitext(export_results["dump_path"])[0])
-            json_dump_file_name = f"{dump_name}.json"
-
-            with archive.open(json_dump_file_name) as f:
-                dump_file_data = json.loads(f.read())
-                mephisto_dump = dump_file_data[MEPHISTO_DUMP_KEY]
-
-                # Tables where we deleted entries
-                task_run_rows_after = db_utils.select_all_table_rows(self.db, "task_runs")
-                unit_rows_after = db_utils.select_all_table_rows(self.db, "units")
-                self.assertEqual(len(mephisto_dump["task_runs"]), 1)
-                self.assertEqual(len(task_run_rows_before), 2)
-                self.assertEqual(len(task_run_rows_after), 1)
-                self.assertEqual(mephisto_dump["task_runs"][0]["task_run_id"], task_run_2_id)
-                self.assertEqual(task_run_rows_after[0]["task_run_id"], task_run_1_id)
-                self.assertEqual(len(mephisto_dump["units"]), 1)
-                self.assertEqual(len(unit_rows_before), 1)
-                self.assertEqual(len(unit_rows_after), 0)
-
-                # Tables where we left entries untouched
-                task_rows_after = db_utils.select_all_table_rows(self.db, "tasks")
-                worker_rows_after = db_utils.select_all_table_rows(self.db, "workers")
-                qualification_rows_after = db_utils.select_all_table_rows(self.db, "qualifications")
-                granted_qualification_rows_after = db_utils.select_all_table_rows(
-                    self.db,
-                    "granted_qualifications",
-                )
-                self.assertEqual(len(mephisto_dump["tasks"]), 1)
-                self.assertEqual(len(task_rows_before), 2)
-                self.assertEqual(len(task_rows_after), 2)
-                self.assertEqual(mephisto_dump["tasks"][0]["task_id"], task_2_id)
-                self.assertEqual(len(mephisto_dump["workers"]), 1)
-                self.assertEqual(len(worker_rows_before), 1)
-                self.assertEqual(len(worker_rows_after), 1)
-                self.assertEqual(len(mephisto_dump["qualifications"]), 1)
-                self.assertEqual(len(qualification_rows_before), 1)
-                self.assertEqual(len(qualification_rows_after), 1)
-                self.assertEqual(len(mephisto_dump["granted_qualifications"]), 1)
-                self.assertEqual(len(granted_qualification_rows_before), 1)
-                self.assertEqual(len(granted_qualification_rows_after), 1)
+        dump_file_data = self._read_dump_file_data(export_results["dump_path"])
+        mephisto_dump = dump_file_data[MEPHISTO_DUMP_KEY]
+
+        # Tables where we deleted entries
+        task_run_rows_after = db_utils.select_all_table_rows(self.db, "task_runs")
+        unit_rows_after = db_utils.select_all_table_rows(self.db, "units")
+        self.assertEqual(len(mephisto_dump["task_runs"]), 1)
+        self.assertEqual(len(task_run_rows_before), 2)
+        self.assertEqual(len(task_run_rows_after), 1)
+        self.assertEqual(mephisto_dump["task_runs"][0]["task_run_id"], task_run_2_id)
+        self.assertEqual(task_run_rows_after[0]["task_run_id"], task_run_1_id)
+        self.assertEqual(len(mephisto_dump["units"]), 1)
+        self.assertEqual(len(unit_rows_before), 1)
+        self.assertEqual(len(unit_rows_after), 0)
+
+        # Tables where we left entries untouched
+        task_rows_after = db_utils.select_all_table_rows(self.db, "tasks")
+        worker_rows_after = db_utils.select_all_table_rows(self.db, "workers")
+        qualification_rows_after = db_utils.select_all_table_rows(self.db, "qualifications")
+        granted_qualification_rows_after = db_utils.select_all_table_rows(
+            self.db,
+            "granted_qualifications",
+        )
+        self.assertEqual(len(mephisto_dump["tasks"]), 1)
+        self.assertEqual(len(task_rows_before), 2)
+        self.assertEqual(len(task_rows_after), 2)
+        self.assertEqual(mephisto_dump["tasks"][0]["task_id"], task_2_id)
+        self.assertEqual(len(mephisto_dump["workers"]), 1)
+        self.assertEqual(len(worker_rows_before), 1)
+        self.assertEqual(len(worker_rows_after), 1)
+        self.assertEqual(len(mephisto_dump["qualifications"]), 1)
+        self.assertEqual(len(qualification_rows_before), 1)
+        self.assertEqual(len(qualification_rows_after), 1)
+        self.assertEqual(len(mephisto_dump["granted_qualifications"]), 1)
+        self.assertEqual(len(granted_qualification_rows_before), 1)
+        self.assertEqual(len(granted_qualification_rows_after), 1)
 
     @patch("mephisto.tools.db_data_porter.db_data_porter.DBDataPorter._make_export_timestamp")
     @patch("mephisto.tools.db_data_porter.export_dump.get_data_dir")
@@ -827,37 +802,32 @@ class TestDBDataPorter(unittest.TestCase):
         self.assertEqual(files_count_after, 1)
 
         # Test dump archive
-        with zipfile.ZipFile(export_results["dump_path"]) as archive:
-            dump_name = os.path.basename(os.path.splitext(export_results["dump_path"])[0])
-            json_dump_file_name = f"{dump_name}.json"
-
-            with archive.open(json_dump_file_name) as f:
-                dump_file_data = json.loads(f.read())
-                mephisto_dump = dump_file_data[MEPHISTO_DUMP_KEY]
-                pk_substitutions = dump_file_data[METADATA_DUMP_KEY][METADATA_PK_SUBSTITUTIONS_KEY][
-                    MEPHISTO_DUMP_KEY
-                ]["task_runs"]
-                task_runs_dump = sorted(
-                    mephisto_dump["task_runs"],
-                    key=lambda k: k["creation_date"],
-                )
-
-                self.assertEqual(task_run_rows_before[0]["task_run_id"], task_run_1_id)
-                self.assertEqual(task_run_rows_before[1]["task_run_id"], legacy_task_run_id)
-                self.assertEqual(
-                    task_runs_dump[0]["task_run_id"],
-                    task_run_1_id,
-                )
-                self.assertNotEqual(
-                    task_runs_dump[1]["task_run_id"],
-                    legacy_task_run_id,
-                )
-                self.assertEqual(
-                    pk_substitutions,
-                    {
-                        legacy_task_run_id: task_runs_dump[1]["task_run_id"],
-                    },
-                )
+        dump_file_data = self._read_dump_file_data(export_results["dump_path"])
+        mephisto_dump = dump_file_data[MEPHISTO_DUMP_KEY]
+        pk_substitutions = dump_file_data[METADATA_DUMP_KEY][METADATA_PK_SUBSTITUTIONS_KEY][
+            MEPHISTO_DUMP_KEY
+        ]["task_runs"]
+        task_runs_dump = sorted(
+            mephisto_dump["task_runs"],
+            key=lambda k: k["creation_date"],
+        )
+
+        self.assertEqual(task_run_rows_before[0]["task_run_id"], task_run_1_id)
+        self.assertEqual(task_run_rows_before[1]["task_run_id"], legacy_task_run_id)
+        self.assertEqual(
+            task_runs_dump[0]["task_run_id"],
+            task_run_1_id,
+        )
+        self.assertNotEqual(
+            task_runs_dump[1]["task_run_id"],
+            legacy_task_run_id,
+        )
+        self.assertEqual(
+            pk_substitutions,
+            {
+                legacy_task_run_id: task_runs_dump[1]["task_run_id"],
+            },
+        )
 
     @patch("mephisto.tools.db_data_porter.db_data_porter.DBDataPorter._make_export_timestamp")
     @patch("mephisto.tools.db_data_porter.export_dump.get_data_dir")
@@ -895,11 +865,9 @@ class TestDBDataPorter(unittest.TestCase):
         self.assertEqual(files_count_after, 1)
 
         # Test dump archive
+        # (tables are written one row per line, so indentation is used only for metadata)
         with zipfile.ZipFile(export_results["dump_path"]) as archive:
-            dump_name = os.path.basename(os.path.splitext(export_results["dump_path"])[0])
-            json_dump_file_name = f"{dump_name}.json"
-
-            with archive.open(json_dump_file_name) as f:
+            with archive.open(f"{DUMP_DIR_NAME}/{DUMP_METADATA_FILE_NAME}") as f:
                 first_line = f.readline().decode("utf-8")
                 second_line = f.readline().decode("utf-8")
                 third_line = f.readline().decode("utf-8")
@@ -977,6 +945,49 @@ class TestDBDataPorter(unittest.TestCase):
             elif table_name == "units":
                 self.assertEqual(rows[0]["unit_id"], unit_id)
 
+    @patch("mephisto.tools.db_data_porter.db_data_porter.DBDataPorter._get_backup_dir")
+    @patch("mephisto.tools.db_data_porter.backups.get_data_dir")
+    @patch("mephisto.tools.db_data_porter.db_data_porter.DBDataPorter._make_export_timestamp")
+    @patch("mephisto.tools.db_data_porter.export_dump.get_data_dir")
+    @patch("mephisto.tools.db_data_porter.db_data_porter.DBDataPorter._get_export_dir")
+    @patch("mephisto.tools.db_data_porter.db_data_porter.DBDataPorter._ask_user_if_they_are_sure")
+    def test_import_dump_legacy_single_json_file(
+        self,
+        mock__ask_user_if_they_are_sure,
+        mock__get_export_dir,
+        mock_get_data_dir,
+        mock__make_export_timestamp,
+        mock_backups_get_data_dir,
+        mock__get_backup_dir,
+        *args,
+    ):
+        mock__ask_user_if_they_are_sure.return_value = True
+        mock__get_export_dir.return_value = self.export_dir
+        mock_get_data_dir.return_value = self.data_dir
+        mock__make_export_timestamp.return_value = FILE_TIMESTAMP
+        mock_backups_get_data_dir.return_value = self.data_dir
+        mock__get_backup_dir.return_value = self.backup_dir
+
+        # Make a dump and convert it into old format with all data in a single JSON file
+        dump_data = self._prepare_dump_for_importing()
+        dump_archive_file_path = dump_data["dump_archive_file_path"]
+        dump_file_data = self._read_dump_file_data(dump_archive_file_path)
+        dump_name = os.path.basename(os.path.splitext(dump_archive_file_path)[0])
+        with zipfile.ZipFile(dump_archive_file_path, "w") as archive:
+            archive.writestr(f"{dump_name}.json", json.dumps(dump_file_data))
+
+        # Import dump
+        results = self.porter.import_dump(dump_archive_file_name_or_path=dump_archive_file_path)
+
+        # Test imported data in database
+        self.assertEqual(results["task_runs_number"], 1)
+        task_runs = db_utils.select_all_table_rows(self.db, "task_runs")
+        units = db_utils.select_all_table_rows(self.db, "units")
+        self.assertEqual(len(task_runs), 1)
+        self.assertEqual(task_runs[0]["task_run_id"], dump_data["task_run_id"])
+        self.assertEqual(len(units), 1)
+        self.assertEqual(units[0]["unit_id"], dump_data["unit_id"])
+
     @patch("mephisto.tools.db_data_porter.db_data_porter.get_data_dir")
     @patch("mephisto.tools.db_data_porter.db_data_porter.DBDataPorter._ask_user_if_they_are_sure")
     def test_import_dump_no_option_file(
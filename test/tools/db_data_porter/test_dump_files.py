@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+
+# Copyright (c) Meta Platforms and its affiliates.
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from typing import ClassVar
+from typing import Type
+
+import pytest
+
+from mephisto.abstractions.database import MephistoDB
+from mephisto.abstractions.databases.local_database import LocalMephistoDB
+from mephisto.tools.db_data_porter.constants import DUMP_DIR_NAME
+from mephisto.tools.db_data_porter.constants import DUMP_METADATA_FILE_NAME
+from mephisto.tools.db_data_porter.constants import MEPHISTO_DUMP_KEY
+from mephisto.tools.db_data_porter.constants import METADATA_DUMP_KEY
+from mephisto.tools.db_data_porter.dump_files import ArchiveTableRows
+from mephisto.tools.db_data_porter.dump_files import DBTableRows
+from mephisto.tools.db_data_porter.dump_files import map_table_rows
+from mephisto.tools.db_data_porter.dump_files import MappedTableRows
+from mephisto.tools.db_data_porter.dump_files import read_dump_data
+from mephisto.tools.db_data_porter.dump_files import write_dump_files
+from mephisto.utils.testing import get_test_worker
+
+MOCK_METADATA = {"timestamp": "2024_01_01_00_00_00"}
+
+
+@pytest.mark.db_data_porter
+class TestDumpFiles(unittest.TestCase):
+    DB_CLASS: ClassVar[Type["MephistoDB"]] = LocalMephistoDB
+
+    def setUp(self):
+        # Configure test database
+        self.data_dir = tempfile.mkdtemp()
+        database_path = os.path.join(self.data_dir, "test_mephisto.db")
+
+        assert self.DB_CLASS is not None, "Did not specify db to use"
+        self.db = self.DB_CLASS(database_path)
+
+        self.export_dir = os.path.join(self.data_dir, "export")
+        os.makedirs(self.export_dir, exist_ok=True)
+
+    def tearDown(self):
+        # Clean test database
+        self.db.shutdown()
+        shutil.rmtree(self.data_dir, ignore_errors=True)
+
+    def _make_archive(self, dump_name: str) -> str:
+        return shutil.make_archive(
+            base_name=os.path.join(self.data_dir, dump_name),
+            format="zip",
+            root_dir=self.export_dir,
+        )
+
+    def test_db_table_rows(self, *args):
+        worker_ids = [get_test_worker(self.db, f"worker_{i}")[1] for i in range(5)]
+
+        rows = DBTableRows(self.db, "workers", chunk_size=2)
+
+        self.assertEqual(len(rows), 5)
+        self.assertTrue(rows)
+        self.assertFalse(DBTableRows(self.db, "projects"))
+        # Rows are read from DB every time
+        self.assertEqual(sorted(r["worker_id"] for r in rows), sorted(worker_ids))
+        self.assertEqual(sorted(r["worker_id"] for r in rows), sorted(worker_ids))
+
+    def test_map_table_rows(self, *args):
+        add_field = lambda row: {**row, "field": "value"} if "id" in row else row.update(a=1)
+
+        list_rows = [{"b": 1}]
+        mapped_list_rows = map_table_rows(list_rows, add_field)
+
+        table_rows = MappedTableRows([{"id": 1}], lambda row: row)
+        mapped_table_rows = map_table_rows(table_rows, add_field)
+
+        # Lists are updated in place
+        self.assertIs(mapped_list_rows, list_rows)
+        self.assertEqual(list_rows, [{"b": 1, "a": 1}])
+        # Other rows are updated when they are read
+        self.assertIsInstance(mapped_table_rows, MappedTableRows)
+        self.assertEqual(len(mapped_table_rows), 1)
+        self.assertEqual(list(mapped_table_rows), [{"id": 1, "field": "value"}])
+
+    def test_write_and_read_dump_files(self, *args):
+        worker_ids = [get_test_worker(self.db, f"worker_{i}")[1] for i in range(3)]
+        dump_data = {
+            MEPHISTO_DUMP_KEY: {
+                "workers": DBTableRows(self.db, "workers", chunk_size=2),
+                "projects": [],
+            },
+            "mock": {},
+            METADATA_DUMP_KEY: MOCK_METADATA,
+        }
+
+        dump_dir = write_dump_files(self.export_dir, dump_data, json_indent=2)
+        dump_archive_file_path = self._make_archive("test_dump")
+
+        # Every table is written into its own file, one row per line
+        workers_file_path = os.path.join(dump_dir, MEPHISTO_DUMP_KEY, "workers.jsonl")
+        with open(workers_file_path) as f:
+            workers_file_lines = f.read().splitlines()
+        with open(os.path.join(dump_dir, DUMP_METADATA_FILE_NAME)) as f:
+            metadata_file_content = f.read()
+
+        result = read_dump_data(dump_archive_file_path)
+
+        self.assertEqual(len(workers_file_lines), 3)
+        self.assertEqual(
+            sorted(json.loads(line)["worker_id"] for line in workers_file_lines),
+            sorted(worker_ids),
+        )
+        self.assertEqual(metadata_file_content, json.dumps(MOCK_METADATA, indent=2))
+        self.assertEqual(sorted(result.keys()), sorted(dump_data.keys()))
+        self.assertEqual(result[METADATA_DUMP_KEY], MOCK_METADATA)
+        self.assertEqual(result["mock"], {})
+        self.assertIsInstance(result[MEPHISTO_DUMP_KEY]["workers"], ArchiveTableRows)
+        self.assertEqual(len(result[MEPHISTO_DUMP_KEY]["workers"]), 3)
+        self.assertEqual(
+            sorted(r["worker_id"] for r in result[MEPHISTO_DUMP_KEY]["workers"]),
+            sorted(worker_ids),
+        )
+        self.assertFalse(result[MEPHISTO_DUMP_KEY]["projects"])
+        self.assertEqual(list(result[MEPHISTO_DUMP_KEY]["projects"]), [])
+
+    def test_write_dump_files_removes_previous_files(self, *args):
+        previous_file_path = os.path.join(self.export_dir, DUMP_DIR_NAME, "mock", "units.jsonl")
+        os.makedirs(os.path.dirname(previous_file_path))
+        with open(previous_file_path, "w") as f:
+            f.write("")
+
+        write_dump_files(self.export_dir, {MEPHISTO_DUMP_KEY: {"workers": []}})
+
+        self.assertFalse(os.path.exists(previous_file_path))
+
+    def test_read_dump_data_legacy_single_json_file(self, *args):
+        dump_name = "2024_01_01_00_00_00_mephisto_dump"
+        dump_data = {
+            MEPHISTO_DUMP_KEY: {"workers": [{"worker_id": "1", "worker_name": "worker_1"}]},
+            METADATA_DUMP_KEY: MOCK_METADATA,
+        }
+        with open(os.path.join(self.export_dir, f"{dump_name}.json"), "w") as f:
+            f.write(json.dumps(dump_data))
+        dump_archive_file_path = self._make_archive(dump_name)
+
+        result = read_dump_data(dump_archive_file_path)
+
+        self.assertEqual(result, dump_data)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -748,6 +748,11 @@ class TestDumps(unittest.TestCase):
         provider_datastores = db_utils.get_providers_datastores(self.db)
 
         result = prepare_full_dump_data(db=self.db, provider_datastores=provider_datastores)
+        # Rows are read from DB lazily
+        result = {
+            db_name: {t: list(rows) for t, rows in db_dump_data.items()}
+            for db_name, db_dump_data in result.items()
+        }
 
         self.assertIn("mephisto", result)
         self.assertIn("mephisto", result)
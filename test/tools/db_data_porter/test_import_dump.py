@@ -24,6 +24,7 @@ from mephisto.tools.db_data_porter.import_dump import import_single_db
 
 from mephisto.abstractions.database import MephistoDB
 from mephisto.abstractions.databases.local_database import LocalMephistoDB
+from mephisto.scripts.benchmarks.import_dump import run_import_dump_benchmark
 from mephisto.tools.db_data_porter.import_dump import _update_row_with_pks_from_resolvings_mappings
 from mephisto.utils import db as db_utils
 
@@ -257,6 +258,182 @@ class TestImportDump(unittest.TestCase):
         self.assertEqual(len(task_run_rows), 1)
         self.assertEqual(len(requester_rows), 1)
 
+    @staticmethod
+    def _make_mephisto_dump_data(task_id: str, requester_id: str, task_run_id: str) -> dict:
+        return {
+            "imported_data": [],
+            "projects": [],
+            "tasks": [
+                {
+                    "task_id": task_id,
+                    "task_name": "test_task",
+                    "task_type": "mock",
+                    "project_id": None,
+                    "parent_task_id": None,
+                    "creation_date": "2024-05-01T00:00:00.000000",
+                }
+            ],
+            "requesters": [
+                {
+                    "requester_id": requester_id,
+                    "requester_name": "test_requester",
+                    "provider_type": "mock",
+                    "creation_date": "2024-05-01T00:00:00.000000",
+                }
+            ],
+            "task_runs": [
+                {
+                    "task_run_id": task_run_id,
+                    "task_id": task_id,
+                    "requester_id": requester_id,
+                    "init_params": "",
+                    "is_completed": 0,
+                    "provider_type": "mock",
+                    "task_type": "mock",
+                    "sandbox": 1,
+                    "creation_date": "2024-05-01T00:00:00.000000",
+                }
+            ],
+            "assignments": [],
+            "units": [],
+            "workers": [],
+            "agents": [],
+            "onboarding_agents": [],
+            "qualifications": [],
+            "granted_qualifications": [],
+            "worker_review": [],
+        }
+
+    def test_import_single_db_bulk_with_conflicts_success(self, *args):
+        label = "test_label"
+
+        task_id = "1111111111111111111"
+        requester_id = "2222222222222222222"
+        task_run_id = "3333333333333333333"
+        dump_data = self._make_mephisto_dump_data(task_id, requester_id, task_run_id)
+
+        # Local DB already has a requester with the same name, but another ID
+        existing_requester_id = "4444444444444444444"
+        db_utils.insert_new_row_in_table(
+            self.db,
+            "requesters",
+            {**dump_data["requesters"][0], "requester_id": existing_requester_id},
+        )
+
+        result = import_single_db(
+            db=self.db,
+            dump_data=dump_data,
+            provider_type=MEPHISTO_DUMP_KEY,
+            conflict_resolver_name=DEFAULT_CONFLICT_RESOLVER,
+            labels=[label],
+            bulk=True,
+        )
+
+        task_rows = db_utils.select_all_table_rows(self.db, "tasks")
+        task_run_rows = db_utils.select_all_table_rows(self.db, "task_runs")
+        requester_rows = db_utils.select_all_table_rows(self.db, "requesters")
+
+        self.assertEqual(result["errors"], [])
+        self.assertEqual(len(task_rows), 1)
+        self.assertEqual(len(task_run_rows), 1)
+        self.assertEqual(len(requester_rows), 1)
+        self.assertEqual(requester_rows[0]["requester_id"], existing_requester_id)
+        # Imported TaskRun refers to the requester that local DB had
+        self.assertEqual(task_run_rows[0]["task_run_id"], task_run_id)
+        self.assertEqual(task_run_rows[0]["requester_id"], existing_requester_id)
+        self.assertEqual(
+            result["imported_data"]["requesters"],
+            {
+                '["test_label"]': [],
+                '["_", "test_label"]': [
+                    {
+                        "unique_field_names": ["requester_name"],
+                        "unique_field_values": ["test_requester"],
+                    },
+                ],
+            },
+        )
+
+    def test_import_single_db_bulk_with_duplicates_in_dump_success(self, *args):
+        label = "test_label"
+
+        task_id = "1111111111111111111"
+        requester_id = "2222222222222222222"
+        task_run_id = "3333333333333333333"
+        dump_data = self._make_mephisto_dump_data(task_id, requester_id, task_run_id)
+
+        # Dump has two requesters with the same name, and TaskRun refers to the second one
+        duplicate_requester_id = "4444444444444444444"
+        dump_data["requesters"].append(
+            {**dump_data["requesters"][0], "requester_id": duplicate_requester_id},
+        )
+        dump_data["task_runs"][0]["requester_id"] = duplicate_requester_id
+
+        result = import_single_db(
+            db=self.db,
+            dump_data=dump_data,
+            provider_type=MEPHISTO_DUMP_KEY,
+            conflict_resolver_name=DEFAULT_CONFLICT_RESOLVER,
+            labels=[label],
+            bulk=True,
+        )
+
+        task_run_rows = db_utils.select_all_table_rows(self.db, "task_runs")
+        requester_rows = db_utils.select_all_table_rows(self.db, "requesters")
+
+        self.assertEqual(result["errors"], [])
+        self.assertEqual(len(requester_rows), 1)
+        self.assertEqual(requester_rows[0]["requester_id"], requester_id)
+        # Duplicate is resolved against the first requester, as it would be row by row
+        self.assertEqual(task_run_rows[0]["requester_id"], requester_id)
+        imported_requester = {
+            "unique_field_names": ["requester_name"],
+            "unique_field_values": ["test_requester"],
+        }
+        self.assertEqual(
+            result["imported_data"]["requesters"],
+            {
+                '["test_label"]': [imported_requester],
+                '["_", "test_label"]': [imported_requester],
+            },
+        )
+
+    def test_import_single_db_bulk_pk_error(self, *args):
+        task_id = "1111111111111111111"
+        requester_id = "2222222222222222222"
+        task_run_id = "3333333333333333333"
+        dump_data = self._make_mephisto_dump_data(task_id, requester_id, task_run_id)
+
+        db_utils.insert_new_row_in_table(self.db, "requesters", dump_data["requesters"][0])
+        db_utils.insert_new_row_in_table(self.db, "tasks", dump_data["tasks"][0])
+        db_utils.insert_new_row_in_table(self.db, "task_runs", dump_data["task_runs"][0])
+
+        result = import_single_db(
+            db=self.db,
+            dump_data=dump_data,
+            provider_type=MEPHISTO_DUMP_KEY,
+            conflict_resolver_name=DEFAULT_CONFLICT_RESOLVER,
+            labels=["test_label"],
+            bulk=True,
+        )
+
+        self.assertEqual(len(result["errors"]), 1)
+        self.assertIn(
+            (
+                "UNIQUE constraint failed: task_runs.task_run_id. "
+                f"Local database already has Primary Key '{task_run_id}' in table 'task_runs'."
+            ),
+            result["errors"][0],
+        )
+        self.assertEqual(len(db_utils.select_all_table_rows(self.db, "task_runs")), 1)
+
+    def test_import_dump_benchmark(self, *args):
+        result = run_import_dump_benchmark(num_units=20, num_workers=4)
+
+        self.assertEqual(result["num_units"], 20)
+        self.assertGreater(result["row_by_row_seconds"], 0)
+        self.assertGreater(result["bulk_seconds"], 0)
+
     def test_fill_imported_data_with_imported_dump(self, *args):
         data_labels = '["test_label"]'
         imported_data = {
@@ -19,12 +19,18 @@ import pytest
 from mephisto.abstractions.database import MephistoDB
 from mephisto.abstractions.databases.local_database import LocalMephistoDB
 from mephisto.tools.db_data_porter.constants import MEPHISTO_DUMP_KEY
+from mephisto.tools.db_data_porter.dump_files import DBTableRows
+from mephisto.tools.db_data_porter.dump_files import TableRows
 from mephisto.tools.db_data_porter.randomize_ids import _randomize_ids_for_mephisto
 from mephisto.tools.db_data_porter.randomize_ids import _randomize_ids_for_provider
 from mephisto.tools.db_data_porter.randomize_ids import get_old_pk_from_substitutions
 from mephisto.tools.db_data_porter.randomize_ids import randomize_ids
+from mephisto.utils import db as db_utils
 from mephisto.utils.db import SQLITE_ID_MAX
 from mephisto.utils.db import SQLITE_ID_MIN
+from mephisto.utils.testing import get_test_qualification
+from mephisto.utils.testing import get_test_worker
+from mephisto.utils.testing import grant_test_qualification
 from mephisto.abstractions.providers.prolific.provider_type import (
     PROVIDER_TYPE as PROLIFIC_PROVIDER_TYPE,
 )
@@ -200,6 +206,44 @@ class TestRandomizeIds(unittest.TestCase):
         self.assertNotEqual(result["tasks"][task_2_id], task_2_id)
         self.assertEqual(len(result["requesters"].keys()), 1)
 
+    def test__randomize_ids_for_mephisto_db_table_rows(self, *args):
+        qualification_id = get_test_qualification(self.db)
+        _, worker_id = get_test_worker(self.db)
+        grant_test_qualification(self.db, qualification_id, worker_id)
+
+        mephisto_dump = {
+            table_name: DBTableRows(self.db, table_name)
+            for table_name in db_utils.get_list_of_tables_to_export(self.db)
+        }
+
+        result = _randomize_ids_for_mephisto(
+            db=self.db,
+            mephisto_dump=mephisto_dump,
+            legacy_only=False,
+        )
+
+        new_worker_id = result["workers"][worker_id]
+        new_qualification_id = result["qualifications"][qualification_id]
+        dump_workers = list(mephisto_dump["workers"])
+        dump_granted_qualifications = list(mephisto_dump["granted_qualifications"])
+
+        # Rows are still read from DB, and IDs are substituted the same way every time
+        self.assertIsInstance(mephisto_dump["workers"], TableRows)
+        self.assertEqual(dump_workers, list(mephisto_dump["workers"]))
+        self.assertEqual(len(dump_workers), 1)
+        self.assertEqual(dump_workers[0]["worker_id"], new_worker_id)
+        self.assertEqual(len(dump_granted_qualifications), 1)
+        self.assertEqual(dump_granted_qualifications[0]["worker_id"], new_worker_id)
+        self.assertEqual(
+            dump_granted_qualifications[0]["qualification_id"],
+            new_qualification_id,
+        )
+        # DB itself is not changed
+        self.assertEqual(
+            db_utils.select_all_table_rows(self.db, "workers")[0]["worker_id"],
+            worker_id,
+        )
+
     @patch("mephisto.utils.db.make_randomized_int_id")
     def test__randomize_ids_for_provider_no_provider_dump(self, mock_make_randomized_int_id, *args):
         provider_type = PROLIFIC_PROVIDER_TYPE
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+
+# Copyright (c) Meta Platforms and its affiliates.
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+import threading
+import unittest
+from typing import List
+from unittest import mock
+
+import pytest
+
+from mephisto.utils import block_list_cache
+from mephisto.utils.block_list_cache import BlockListCache
+
+
+class BlockListLoader:
+    """Stand-in for listing a provider's blocks, counting the calls"""
+
+    def __init__(self, blocked_ids: List[str]):
+        self.blocked_ids = blocked_ids
+        self.num_loads = 0
+
+    def __call__(self) -> List[str]:
+        self.num_loads += 1
+        return list(self.blocked_ids)
+
+
+@pytest.mark.utils
+class TestBlockListCache(unittest.TestCase):
+    def setUp(self) -> None:
+        self.now = 1000.0
+        patcher = mock.patch.object(block_list_cache.time, "monotonic", lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_loads_once_per_ttl(self) -> None:
+        cache = BlockListCache(ttl=60)
+        loader = BlockListLoader([f"worker_{idx}" for idx in range(250)])
+        self.assertTrue(cache.is_blocked("requester", "worker_249", loader))
+        self.assertFalse(cache.is_blocked("requester", "other_worker", loader))
+        self.assertEqual(loader.num_loads, 1)
+
+        # Blocks made elsewhere are picked up once the list is stale
+        loader.blocked_ids.append("other_worker")
+        self.now += 59
+        self.assertFalse(cache.is_blocked("requester", "other_worker", loader))
+        self.now += 2
+        self.assertTrue(cache.is_blocked("requester", "other_worker", loader))
+        self.assertEqual(loader.num_loads, 2)
+
+        # Each list is loaded separately
+        self.assertFalse(cache.is_blocked("other_requester", "worker_0", BlockListLoader([])))
+
+    def test_blocks_update_loaded_lists(self) -> None:
+        cache = BlockListCache(ttl=60)
+        loader = BlockListLoader(["worker_1"])
+        # Changes before the first load are left to the load
+        cache.add_block("requester", "worker_2")
+        loader.blocked_ids.append("worker_2")
+        self.assertTrue(cache.is_blocked("requester", "worker_2", loader))
+
+        cache.add_block("requester", "worker_3")
+        cache.remove_block("requester", "worker_1")
+        self.assertTrue(cache.is_blocked("requester", "worker_3", loader))
+        self.assertFalse(cache.is_blocked("requester", "worker_1", loader))
+        self.assertEqual(loader.num_loads, 1)
+
+        cache.clear("requester")
+        self.assertTrue(cache.is_blocked("requester", "worker_1", loader))
+        self.assertEqual(loader.num_loads, 2)
+
+    def test_changes_during_load_are_kept(self) -> None:
+        cache = BlockListCache(ttl=60)
+        load_started = threading.Event()
+        finish_load = threading.Event()
+
+        def slow_loader() -> List[str]:
+            # The listing was taken before the changes below were made
+            blocked_ids = ["worker_1"]
+            load_started.set()
+            finish_load.wait(timeout=5)
+            return blocked_ids
+
+        check_thread = threading.Thread(
+            target=cache.is_blocked, args=("requester", "worker_1", slow_loader)
+        )
+        check_thread.start()
+        self.assertTrue(load_started.wait(timeout=5))
+        cache.add_block("requester", "worker_2")
+        cache.remove_block("requester", "worker_1")
+        finish_load.set()
+        check_thread.join()
+
+        loader = BlockListLoader([])
+        self.assertTrue(cache.is_blocked("requester", "worker_2", loader))
+        self.assertFalse(cache.is_blocked("requester", "worker_1", loader))
+        self.assertEqual(loader.num_loads, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
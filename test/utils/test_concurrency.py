@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+
+# Copyright (c) Meta Platforms and its affiliates.
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+import threading
+import time
+import unittest
+
+import pytest
+
+from mephisto.utils.concurrency import CallGroup
+from mephisto.utils.concurrency import run_call_groups
+from mephisto.utils.concurrency import TokenBucket
+
+
+class ConcurrencyTracker:
+    """Call that sleeps briefly, tracking the most calls that were running at once"""
+
+    def __init__(self, delay: float = 0.02):
+        self.delay = delay
+        self.running = 0
+        self.max_running = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, item: int) -> int:
+        with self._lock:
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        time.sleep(self.delay)
+        with self._lock:
+            self.running -= 1
+        if item < 0:
+            raise ValueError(f"Negative item {item}")
+        return item * 2
+
+
+@pytest.mark.utils
+class TestRunCallGroups(unittest.TestCase):
+    def test_token_bucket_rate(self) -> None:
+        bucket = TokenBucket(rate=50, capacity=1)
+        start_time = time.monotonic()
+        for _ in range(11):
+            bucket.acquire()
+        self.assertGreaterEqual(time.monotonic() - start_time, 0.19)
+        self.assertFalse(bucket.try_acquire())
+
+    def test_groups_run_within_their_own_concurrency(self) -> None:
+        serial = ConcurrencyTracker()
+        concurrent = ConcurrencyTracker()
+        results = run_call_groups(
+            [
+                CallGroup("serial", list(range(5)), serial),
+                CallGroup("concurrent", list(range(5, 25)), concurrent, concurrency=4),
+            ],
+            quiet=True,
+        )
+        self.assertEqual([r.item for r in results], list(range(25)))
+        self.assertEqual([r.result for r in results], [i * 2 for i in range(25)])
+        self.assertEqual(serial.max_running, 1)
+        self.assertEqual(concurrent.max_running, 4)
+
+    def test_errors_are_returned(self) -> None:
+        results = run_call_groups(
+            [CallGroup("errors", [1, -1, 2], ConcurrencyTracker(0), concurrency=2)],
+            quiet=True,
+        )
+        self.assertEqual([r.result for r in results], [2, None, 4])
+        self.assertIsNone(results[0].error)
+        self.assertIsInstance(results[1].error, ValueError)
+
+    def test_rate_limit_only_applies_to_limited_items(self) -> None:
+        tracker = ConcurrencyTracker(0)
+        start_time = time.monotonic()
+        run_call_groups(
+            [
+                CallGroup(
+                    "limited",
+                    list(range(50)),
+                    tracker,
+                    concurrency=1,
+                    rate_limit=50,
+                    is_rate_limited=lambda item: item < 11,
+                )
+            ],
+            quiet=True,
+        )
+        elapsed = time.monotonic() - start_time
+        # 11 limited calls take at least 0.2s at 50 per second, the rest don't wait
+        self.assertGreaterEqual(elapsed, 0.19)
+        self.assertLess(elapsed, 0.6)
+
+
+if __name__ == "__main__":
+    unittest.main()
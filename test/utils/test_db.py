@@ -21,6 +21,8 @@ from mephisto.abstractions.databases.local_database import is_unique_failure
 from mephisto.abstractions.databases.local_database import LocalMephistoDB
 from mephisto.abstractions.providers.mock.mock_datastore import MockDatastore
 from mephisto.abstractions.providers.prolific.prolific_datastore import ProlificDatastore
+from mephisto.data_model.assignment import Assignment
+from mephisto.data_model.constants.assignment_state import AssignmentState
 from mephisto.data_model.requester import Requester
 from mephisto.data_model.task import Task
 from mephisto.data_model.task_run import TaskRun
@@ -227,6 +229,25 @@ class TestUtilsDB(unittest.TestCase):
         self.assertEqual(len(rows), 2)
         self.assertEqual(set([p["project_name"] for p in rows]), {"project_1", "project_2"})
 
+    def test_iter_table_rows(self, *args):
+        # Empty table
+        rows = list(db_utils.iter_table_rows(self.db, "projects", chunk_size=2))
+        self.assertEqual(rows, [])
+        self.assertEqual(db_utils.count_table_rows(self.db, "projects"), 0)
+
+        # Table with 5 entries, read in 3 chunks
+        project_names = [f"project_{i}" for i in range(5)]
+        for project_name in project_names:
+            get_test_project(self.db, project_name)
+        rows = list(db_utils.iter_table_rows(self.db, "projects", chunk_size=2))
+        self.assertEqual(sorted([p["project_name"] for p in rows]), project_names)
+        self.assertNotIn("dump_rowid", rows[0])
+        # Rows are serialized the same way as for a full dump
+        dump_rows = db_utils.db_or_datastore_to_dict(self.db)["projects"]
+        sort_key = lambda p: p["project_id"]
+        self.assertEqual(sorted(rows, key=sort_key), sorted(dump_rows, key=sort_key))
+        self.assertEqual(db_utils.count_table_rows(self.db, "projects"), 5)
+
     def test_select_rows_by_list_of_field_values(self, *args):
         qualification_1_id = get_test_qualification(self.db, "qual_1")
         qualification_2_id = get_test_qualification(self.db, "qual_2")
@@ -380,6 +401,9 @@ class TestUtilsDB(unittest.TestCase):
                     "requesters",
                     "sqlite_sequence",
                     "task_runs",
+                    "task_stats",
+                    "task_stats_flags",
+                    "task_stats_units",
                     "tasks",
                     "worker_review",
                     "units",
@@ -649,6 +673,46 @@ class TestUtilsDB(unittest.TestCase):
         self.assertEqual(rows_count_before, 0)
         self.assertEqual(rows_count_after, 1)
 
+    def test_insert_new_rows_in_table(self, *args):
+        db_utils.insert_new_rows_in_table(
+            self.db,
+            "workers",
+            [
+                {"worker_name": "worker_1", "provider_type": "mock"},
+                {"worker_name": "worker_2", "provider_type": "mock"},
+            ],
+        )
+
+        rows = db_utils.select_all_table_rows(self.db, "workers", order_by="worker_name")
+
+        self.assertEqual([r["worker_name"] for r in rows], ["worker_1", "worker_2"])
+
+    def test_select_existing_rows_for_rows(self, *args):
+        qualification_1_id = get_test_qualification(self.db, "qual_1")
+        qualification_2_id = get_test_qualification(self.db, "qual_2")
+        _, worker_1_id = get_test_worker(self.db, worker_name="worker_1")
+        grant_test_qualification(
+            self.db,
+            worker_id=worker_1_id,
+            qualification_id=qualification_2_id,
+            value=1,
+        )
+
+        existing_rows = db_utils.select_existing_rows_for_rows(
+            self.db,
+            "granted_qualifications",
+            field_names=["worker_id", "qualification_id"],
+            rows=[
+                {"worker_id": worker_1_id, "qualification_id": qualification_1_id},
+                {"worker_id": worker_1_id, "qualification_id": qualification_2_id},
+            ],
+            order_by="creation_date",
+        )
+
+        self.assertEqual(list(existing_rows.keys()), [1])
+        self.assertEqual(str(existing_rows[1]["qualification_id"]), qualification_2_id)
+        self.assertEqual(existing_rows[1]["value"], 1)
+
     def test_update_row_in_table(self, *args):
         updated_requester_name = "updated_requester_name"
 
@@ -664,6 +728,50 @@ class TestUtilsDB(unittest.TestCase):
         self.assertNotEqual(row_before["requester_name"], updated_requester_name)
         self.assertEqual(row_after["requester_name"], updated_requester_name)
 
+    def test_get_and_set_task_has_stats(self, *args):
+        _, task_id = get_test_task(self.db)
+
+        has_stats_before = db_utils.get_task_has_stats(self.db, task_id)
+        db_utils.set_task_has_stats(self.db, task_id, True)
+        has_stats_set = db_utils.get_task_has_stats(self.db, task_id)
+        db_utils.set_task_has_stats(self.db, task_id, False)
+        has_stats_updated = db_utils.get_task_has_stats(self.db, task_id)
+        db_utils.set_task_has_stats(self.db, task_id, None)
+        has_stats_dropped = db_utils.get_task_has_stats(self.db, task_id)
+
+        self.assertIsNone(has_stats_before)
+        self.assertTrue(has_stats_set)
+        self.assertFalse(has_stats_updated)
+        self.assertIsNone(has_stats_dropped)
+
+    def test_add_units_to_task_stats(self, *args):
+        unit_id_1 = get_test_unit(self.db)
+        unit = self.db.get_unit(unit_id_1)
+        assignment = Assignment.get(self.db, unit["assignment_id"])
+        unit_id_2 = get_test_unit(self.db, unit_index=1, assignment=assignment)
+        task_id = unit["task_id"]
+
+        def add_units(stats: dict, unit_ids: list) -> dict:
+            return {"units": stats.get("units", 0) + len(unit_ids)}
+
+        missing_unit_ids_before = db_utils.find_unit_ids_missing_from_task_stats(
+            self.db, task_id, statuses=[AssignmentState.CREATED]
+        )
+        db_utils.add_units_to_task_stats(self.db, task_id, [unit_id_1], add_units)
+        # Units already added to stats are not added again
+        stats = db_utils.add_units_to_task_stats(
+            self.db, task_id, [unit_id_1, unit_id_2], add_units
+        )
+        missing_unit_ids_after = db_utils.find_unit_ids_missing_from_task_stats(
+            self.db, task_id, statuses=[AssignmentState.CREATED]
+        )
+        db_utils.delete_task_stats(self.db, task_id)
+
+        self.assertEqual(sorted(missing_unit_ids_before), sorted([unit_id_1, unit_id_2]))
+        self.assertEqual(stats, {"units": 2})
+        self.assertEqual(missing_unit_ids_after, [])
+        self.assertIsNone(db_utils.get_task_stats(self.db, task_id))
+
     def test_retry_generate_id(self, *args):
 
         # Function to simulate methods in Mephisto DB and provider-specific datastores
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+
+# Copyright (c) Meta Platforms and its affiliates.
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+import unittest
+from unittest import mock
+
+import pytest
+from prometheus_client import Gauge
+
+from mephisto.data_model.packet import Packet
+from mephisto.data_model.packet import PACKET_TYPE_MEPHISTO_BOUND_LIVE_UPDATE
+from mephisto.operations.client_io_handler import ClientIOHandler
+from mephisto.utils import expiring_store
+from mephisto.utils.expiring_store import ExpiringStore
+
+TEST_GAUGE = Gauge("test_expiring_store_size", "Size of the ExpiringStore under test")
+
+
+@pytest.mark.utils
+class TestExpiringStore(unittest.TestCase):
+    def setUp(self) -> None:
+        self.now = 1000.0
+        patcher = mock.patch.object(expiring_store.time, "monotonic", lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        TEST_GAUGE.set(0)
+
+    def test_entries_expire(self) -> None:
+        store: ExpiringStore[str, int] = ExpiringStore(ttl=10, size_gauge=TEST_GAUGE)
+        store["old"] = 1
+        self.now += 9
+        self.assertEqual(store["old"], 1)
+        self.now += 2
+        # Rotated into the previous generation, but still within twice the ttl
+        store["new"] = 2
+        self.assertIn("old", store)
+        self.now += 10
+        self.assertNotIn("old", store)
+        self.assertEqual(dict(store), {"new": 2})
+        self.now += 20
+        self.assertEqual(len(store), 1)
+        self.assertNotIn("new", store)
+        self.assertEqual(len(store), 0)
+        self.assertEqual(TEST_GAUGE._value.get(), 0)
+
+    def test_size_bounded(self) -> None:
+        store: ExpiringStore[int, None] = ExpiringStore(max_size=10, size_gauge=TEST_GAUGE)
+        for idx in range(100):
+            store.add(idx)
+            self.assertLessEqual(len(store), 10)
+        self.assertIn(99, store)
+        self.assertNotIn(0, store)
+        self.assertEqual(TEST_GAUGE._value.get(), len(store))
+
+        del store[99]
+        store[98] = None
+        self.assertEqual(TEST_GAUGE._value.get(), len(store))
+        self.assertIsNone(store.pop(97))
+        self.assertIsNone(store.pop(97, None))
+        store.clear()
+        self.assertEqual(TEST_GAUGE._value.get(), 0)
+
+    def test_live_update_dedupe(self) -> None:
+        io_handler = ClientIOHandler(mock.MagicMock())
+        io_handler._live_run = mock.MagicMock()
+        io_handler.seen_update_ids = ExpiringStore(ttl=10)
+        with mock.patch.object(io_handler, "_on_live_update") as on_live_update:
+            for update_id in ["update_1", "update_1", None, None, "update_2"]:
+                packet = Packet(
+                    packet_type=PACKET_TYPE_MEPHISTO_BOUND_LIVE_UPDATE,
+                    subject_id="agent",
+                    data={"update_id": update_id},
+                )
+                packet.server_timestamp = self.now
+                io_handler._on_message(packet, "channel")
+            self.assertEqual(on_live_update.call_count, 4)
+            # Past the ttl, a repeated update is no longer recognized
+            self.now += 30
+            io_handler._on_message(packet, "channel")
+            self.assertEqual(on_live_update.call_count, 5)
+        self.assertEqual(list(io_handler.seen_update_ids), ["update_2"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+
+# Copyright (c) Meta Platforms and its affiliates.
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+import pytest
+
+from mephisto.abstractions.databases.local_database import LocalMephistoDB
+from mephisto.data_model.qualification import QUAL_EXISTS
+from mephisto.data_model.qualification import QUAL_GREATER_EQUAL
+from mephisto.data_model.qualification import QUAL_IN_LIST
+from mephisto.data_model.qualification import QUAL_NOT_EXIST
+from mephisto.data_model.task_run import TaskRun
+from mephisto.data_model.worker import Worker
+from mephisto.utils.qualifications import make_qualification_dict
+from mephisto.utils.qualifications import QualificationEvaluator
+from mephisto.utils.qualifications import worker_is_qualified
+from mephisto.utils.testing import get_test_task_run
+from mephisto.utils.testing import get_test_worker
+
+NUM_QUALIFICATIONS = 12
+NUM_WORKERS = 100
+
+
+@pytest.mark.utils
+class TestWorkerIsQualified(unittest.TestCase):
+    def setUp(self) -> None:
+        self.data_dir = tempfile.mkdtemp()
+        self.db = LocalMephistoDB(os.path.join(self.data_dir, "mephisto.db"))
+        self.task_run = TaskRun.get(self.db, get_test_task_run(self.db))
+
+    def tearDown(self) -> None:
+        self.db.shutdown()
+        shutil.rmtree(self.data_dir)
+
+    def _make_worker(self, name: str, granted_values: dict) -> Worker:
+        _, worker_id = get_test_worker(self.db, name)
+        for qualification_name, value in granted_values.items():
+            qualification_id = self.db.find_qualifications(qualification_name)[0].db_id
+            self.db.grant_qualification(qualification_id, worker_id, value)
+        return Worker.get(self.db, worker_id)
+
+    def test_comparators(self) -> None:
+        for qualification_name in ["skill", "language", "blocked"]:
+            self.db.make_qualification(qualification_name)
+        qualifications = [
+            make_qualification_dict("skill", QUAL_GREATER_EQUAL, 3),
+            make_qualification_dict("language", QUAL_IN_LIST, [1, 2]),
+            make_qualification_dict("blocked", QUAL_NOT_EXIST, None),
+            make_qualification_dict("not_created", QUAL_EXISTS, None),
+        ]
+        cases = [
+            ("qualified", {"skill": 5, "language": 2}, True),
+            ("low_skill", {"skill": 2, "language": 2}, False),
+            ("wrong_language", {"skill": 5, "language": 3}, False),
+            ("no_language", {"skill": 5}, False),
+            ("blocked", {"skill": 5, "language": 1, "blocked": 1}, False),
+            ("no_qualifications", {}, False),
+        ]
+        evaluator = QualificationEvaluator(self.db, qualifications, self.task_run)
+        for worker_name, granted_values, expected in cases:
+            worker = self._make_worker(worker_name, granted_values)
+            self.assertEqual(evaluator.is_qualified(worker), expected, worker_name)
+            self.assertEqual(
+                worker_is_qualified(worker, qualifications, self.task_run), expected, worker_name
+            )
+
+    def test_admit_workers_with_no_prior_qualification(self) -> None:
+        self.db.make_qualification("skill")
+        qualifications = [make_qualification_dict("skill", QUAL_EXISTS, None)]
+        worker = self._make_worker("new_worker", {})
+        with mock.patch.object(
+            self.task_run,
+            "get_provider_args",
+            return_value={"admit_workers_with_no_prior_qualification": True},
+        ):
+            self.assertTrue(worker_is_qualified(worker, qualifications, self.task_run))
+        self.assertFalse(worker_is_qualified(worker, qualifications, self.task_run))
+
+    def test_microbenchmark_queries_per_worker(self) -> None:
+        """
+        Evaluate a run with many qualifications for a stream of arriving workers,
+        counting the queries made for each and timing the evaluation
+        """
+        names = [f"qualification_{idx}" for idx in range(NUM_QUALIFICATIONS)]
+        for name in names:
+            self.db.make_qualification(name)
+        qualifications = [make_qualification_dict(name, QUAL_GREATER_EQUAL, 1) for name in names]
+        workers = [
+            self._make_worker(f"worker_{idx}", {name: 1 + idx % 2 for name in names})
+            for idx in range(NUM_WORKERS)
+        ]
+
+        evaluator = QualificationEvaluator(self.db, qualifications, self.task_run)
+        with mock.patch.object(
+            self.db, "find_granted_qualifications", wraps=self.db.find_granted_qualifications
+        ) as find_granted, mock.patch.object(
+            self.db, "find_qualifications", wraps=self.db.find_qualifications
+        ) as find_qualifications:
+            start_time = time.monotonic()
+            self.assertTrue(all(evaluator.is_qualified(worker) for worker in workers))
+            elapsed = time.monotonic() - start_time
+
+        # One granted qualifications query per worker, and the qualification ids
+        # are only looked up for the first one
+        self.assertEqual(find_granted.call_count, NUM_WORKERS)
+        self.assertEqual(find_qualifications.call_count, NUM_QUALIFICATIONS)
+        # Well under the time of the 2 * NUM_QUALIFICATIONS queries per worker
+        # made by evaluating each qualification separately
+        self.assertLess(elapsed / NUM_WORKERS, 0.05)
+
+
+if __name__ == "__main__":
+    unittest.main()